@@ -9,6 +9,7 @@ import base64
 from PIL import Image
 import io
 import sys
+import asyncio
 
 # 캘리그래피 동기화 서비스 import
 try:
@@ -33,6 +34,15 @@ router = APIRouter()
 IMAGES_DIR = "data/images_webp"
 FLOWER_DB_FILE = "data/flower_database.json"
 
+async def reload_flower_catalog() -> bool:
+    """flower_dictionary.json 을 고친 뒤 전역 카탈로그 다시 로드 + 교체 (백그라운드 동기화와 같은 경로, 실패해도 요청은 성공)"""
+    from app.services.catalog_sync_scheduler import catalog_sync_scheduler
+    try:
+        return await asyncio.to_thread(catalog_sync_scheduler.reload_catalog)
+    except Exception as e:
+        print(f"⚠️ 꽃 카탈로그 다시 로드 실패 (기존 카탈로그 유지): {e}")
+        return False
+
 @router.get("/flowers", response_model=List[FlowerInfo])
 async def get_available_flowers():
     """사용 가능한 꽃 목록 조회"""
@@ -352,7 +362,8 @@ async def update_flower_dictionary(flower_id: str, request: FlowerDictionaryUpda
         success = service.update_flower_info(flower_id, request.update_fields)
         
         if success:
-            return {"success": True, "message": f"꽃 정보 업데이트 완료: {flower_id}"}
+            catalog_reloaded = await reload_flower_catalog()
+            return {"success": True, "message": f"꽃 정보 업데이트 완료: {flower_id}", "catalog_reloaded": catalog_reloaded}
         else:
             raise HTTPException(status_code=404, detail="꽃을 찾을 수 없습니다")
     except Exception as e:
@@ -369,7 +380,8 @@ async def delete_flower_dictionary(flower_id: str):
         success = service.delete_flower_entry(flower_id)
         
         if success:
-            return {"success": True, "message": f"꽃 정보 삭제 완료: {flower_id}"}
+            catalog_reloaded = await reload_flower_catalog()
+            return {"success": True, "message": f"꽃 정보 삭제 완료: {flower_id}", "catalog_reloaded": catalog_reloaded}
         else:
             raise HTTPException(status_code=404, detail="꽃을 찾을 수 없습니다")
     except Exception as e:
@@ -646,10 +658,12 @@ async def sync_spreadsheet():
         success = syncer.sync()
         
         if success:
+            catalog_reloaded = await reload_flower_catalog()
             return {
                 "success": True,
                 "message": "스프레드시트 동기화 완료",
-                "status": "success"
+                "status": "success",
+                "catalog_reloaded": catalog_reloaded
             }
         else:
             raise HTTPException(status_code=500, detail="스프레드시트 동기화 실패")
@@ -657,6 +671,118 @@ async def sync_spreadsheet():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/catalog/sync-status")
+async def get_catalog_sync_status():
+    """꽃 카탈로그 백그라운드 동기화 상태 (마지막 동기화 시간, 소요 시간, 버전)"""
+    from app.services.catalog_sync_scheduler import catalog_sync_scheduler
+    return catalog_sync_scheduler.get_status()
+
+@router.post("/catalog/sync")
+async def trigger_catalog_sync():
+    """꽃 카탈로그 즉시 동기화 요청 (백그라운드 실행, 완료 후 새 버전으로 교체)"""
+    from app.services.catalog_sync_scheduler import catalog_sync_scheduler
+    accepted = catalog_sync_scheduler.trigger()
+    return {
+        "success": accepted,
+        "message": "카탈로그 동기화 요청 완료" if accepted else "카탈로그 동기화가 이미 진행 중입니다",
+        "status": catalog_sync_scheduler.get_status()
+    }
+
+@router.get("/llm-cache/stats")
+async def get_llm_cache_stats():
+    """LLM 응답 캐시 통계 (호출 지점별 메모리/디스크 적중, 실패, 저장 횟수)"""
+    from app.services.llm_cache import llm_cache
+    return llm_cache.get_stats()
+
+@router.post("/llm-cache/clear")
+async def clear_llm_cache(call_site: str = None):
+    """LLM 응답 캐시 비우기 (call_site 지정 시 해당 호출 지점만)"""
+    from app.services.llm_cache import llm_cache
+    try:
+        deleted = llm_cache.clear(call_site)
+        return {
+            "success": True,
+            "message": f"LLM 캐시 삭제 완료 ({deleted}건)",
+            "deleted": deleted
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/llm-scheduler/stats")
+async def get_llm_scheduler_stats():
+    """전역 LLM 스케줄러 상태 (모델별 실행 중 호출 수, 대기열 깊이, 대기 시간, 거절 횟수)"""
+    from app.services.llm_scheduler import llm_scheduler
+    return llm_scheduler.get_stats()
+
+@router.get("/sample-stories/precomputed")
+async def get_precomputed_sample_stories():
+    """샘플 사연 사전 계산 응답 상태 (fingerprint, 보관 응답 수, 적중 / 무효화 횟수)"""
+    from app.services.sample_story_responses import sample_story_responses
+    return sample_story_responses.get_stats()
+
+@router.post("/sample-stories/precomputed/reload")
+async def reload_precomputed_sample_stories():
+    """샘플 사연 사전 계산 아티팩트 다시 읽기 (빌드 후 재시작 없이 반영)"""
+    from app.services.sample_story_responses import sample_story_responses
+    try:
+        count = sample_story_responses.reload()
+        return {
+            "success": True,
+            "message": f"샘플 사연 사전 계산 응답 {count}개 로드",
+            "count": count
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/llm-router/stats")
+async def get_llm_router_stats():
+    """모델 라우터 상태 (작업별 SLO, 모델별 예상 지연, 작업별 full / light / skip 선택 횟수)"""
+    from app.services.model_router import model_router
+    return model_router.get_stats()
+
+@router.get("/emotion-classifier/stats")
+async def get_emotion_classifier_stats():
+    """로컬 감정 분류기 상태 (모드 / 임계값 / 모델 정보, 로컬 사용 비율, LLM 으로 넘긴 사연의 1위 감정 일치율)"""
+    from app.services.local_emotion_classifier import local_emotion_classifier
+    return local_emotion_classifier.get_stats()
+
+@router.get("/speculative-prefetch/stats")
+async def get_speculative_prefetch_stats():
+    """추천 예측 실행 상태 (시작 / 이어받음 / 취소 / 상한으로 건너뜀 횟수, 적중률)"""
+    from app.services.speculative_prefetch import speculative_prefetcher
+    return speculative_prefetcher.get_stats()
+
+@router.get("/ranking-sessions/stats")
+async def get_ranking_session_stats():
+    """꽃 순위 세션 상태 (보관 중인 사연 수, 다시 순위 계산 적중 / 만료 / 제거 횟수)"""
+    from app.services.flower_ranking import ranking_sessions
+    return ranking_sessions.get_stats()
+
+@router.get("/stage-memo/stats")
+async def get_stage_memo_stats():
+    """감정 분석 + 맥락 추출 메모 상태 (적중률, 폴백이라 메모하지 않은 횟수, 만료 / 제거 횟수)"""
+    from app.services.fused_extractor import extraction_memo
+    if extraction_memo is None:
+        return {"enabled": False}
+    return {"enabled": True, **extraction_memo.get_stats()}
+
+@router.get("/llm-circuit-breaker/stats")
+async def get_llm_circuit_breaker_stats():
+    """OpenAI 서킷 브레이커 상태 (closed / open / half_open, 최근 실패 수, 상태 전환 기록)"""
+    from app.services.llm_circuit_breaker import llm_circuit_breaker
+    return llm_circuit_breaker.get_stats()
+
+@router.post("/llm-circuit-breaker/reset")
+async def reset_llm_circuit_breaker():
+    """서킷 브레이커를 수동으로 closed 로 되돌림"""
+    from app.services.llm_circuit_breaker import llm_circuit_breaker
+    llm_circuit_breaker.reset()
+    return {
+        "success": True,
+        "message": "LLM 서킷 브레이커 초기화 완료",
+        "state": llm_circuit_breaker.state
+    }
+
 @router.post("/full-sync")
 async def full_sync():
     """전체 동기화: 스프레드시트 + 이미지 + flower_matcher + base64"""
@@ -665,6 +791,7 @@ async def full_sync():
         from scripts.sync_flower_database import FlowerDatabaseSync
         syncer = FlowerDatabaseSync()
         spreadsheet_sync = syncer.sync()
+        catalog_reloaded = await reload_flower_catalog() if spreadsheet_sync else False
         
         # 2. 이미지 폴더 스캔
         flowers = []
@@ -692,6 +819,7 @@ async def full_sync():
             "success": True,
             "message": "전체 동기화 완료",
             "spreadsheet_sync": spreadsheet_sync,
+            "catalog_reloaded": catalog_reloaded,
             "flowers": flowers
         }
     except Exception as e:
@@ -707,10 +835,12 @@ async def sync_google_drive():
         success = syncer.sync()
         
         if success:
+            catalog_reloaded = await reload_flower_catalog()
             return {
                 "success": True,
                 "message": "구글 드라이브 동기화 완료",
-                "stats": syncer.stats
+                "stats": syncer.stats,
+                "catalog_reloaded": catalog_reloaded
             }
         else:
             raise HTTPException(status_code=500, detail="구글 드라이브 동기화 실패")
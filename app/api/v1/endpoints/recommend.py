@@ -1,9 +1,11 @@
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import StreamingResponse
-from typing import List, Any, Dict
+from typing import List, Any, Dict, Optional, Tuple
 import os
 import json
+import time
 import asyncio
+import dataclasses
 from app.models.schemas import (
     RecommendRequest,
     RecommendResponse,
@@ -12,7 +14,10 @@ from app.models.schemas import (
     FlowerMatch,
     FlowerComposition,
     StoryCreateRequest,
-    FlowerCardMessage
+    FlowerCardMessage,
+    RankedFlower,
+    RerankRequest,
+    RerankResponse
 )
 # from app.pipelines.integrated_recommendation_chain import IntegratedRecommendationChain
 from app.services.emotion_analyzer import EmotionAnalyzer
@@ -22,8 +27,19 @@ from app.services.composition_recommender import CompositionRecommender
 from app.services.story_classifier import StoryClassifier
 from app.services.design_flower_matcher import DesignFlowerMatcher
 from app.services.realtime_context_extractor import RealtimeContextExtractor
+from app.services.fused_extractor import extract_emotions_and_context_async, extraction_memo
 from app.services.story_manager import story_manager
+from app.services.flower_catalog import get_flower_catalog
+from app.services.openai_client import get_openai_client, get_async_openai_client
+from app.services.llm_cache import llm_cache
+from app.services.model_router import model_router
+from app.services.quote_index import CardQuote, get_quote_index, select_card_quote, select_card_quote_async
+from app.services.flower_ranking import ranking_sessions
+from app.services.keyword_automaton import scan_keywords
+from app.services.request_deadline import deadline_scope
+from app.services.speculative_prefetch import speculative_prefetcher
 from app.utils.request_deduplication import request_deduplicator
+from app.pipelines.dag_executor import Pipeline
 
 router = APIRouter()
 
@@ -32,7 +48,7 @@ def get_chain():
     return IntegratedRecommendationChain()
 
 @router.post("/recommendations", response_model=RecommendResponse)
-def recommendations(req: RecommendRequest, chain = Depends(get_chain)):
+async def recommendations(req: RecommendRequest, chain = Depends(get_chain)):
     """통합 추천 엔드포인트 (중복 요청 방지 포함)"""
     try:
         # 요청 ID 생성
@@ -54,8 +70,7 @@ def recommendations(req: RecommendRequest, chain = Depends(get_chain)):
         if not request_deduplicator.should_process_request(request_id):
             print(f"⏳ 중복 요청 대기 중: {request_id}")
             # 잠시 대기 후 다시 확인
-            import time
-            time.sleep(0.1)
+            await asyncio.sleep(0.1)
             cached_result = request_deduplicator.get_cached_result(request_id)
             if cached_result:
                 return RecommendResponse(**cached_result)
@@ -64,7 +79,10 @@ def recommendations(req: RecommendRequest, chain = Depends(get_chain)):
         
         # 실제 요청 처리
         print(f"🚀 새로운 요청 처리 시작: {request_id}")
-        result = chain.run(req)
+        # 요청 예산 안에서 실행 (예산이 끝난 LLM 스테이지는 규칙 기반 폴백)
+        with deadline_scope() as deadline:
+            result = await chain.arun(req)
+        result.degraded_stages = deadline.degraded_stages()
         
         # 결과 캐시에 저장
         request_deduplicator.mark_request_completed(request_id, result.dict())
@@ -78,7 +96,7 @@ def recommendations(req: RecommendRequest, chain = Depends(get_chain)):
 
 
 @router.post("/emotion-analysis", response_model=EmotionAnalysisResponse)
-def emotion_analysis(req: RecommendRequest):
+async def emotion_analysis(req: RecommendRequest):
     """감정 분석 + 꽃 매칭 + 구성 추천 (사연 유형 분류 포함) - 중복 요청 방지 포함"""
     
     try:
@@ -100,7 +118,7 @@ def emotion_analysis(req: RecommendRequest):
         
         print(f"🔍 Emotion Analysis 요청 ID 생성: {request_id}")
         
-        # 업데이트된 컨텍스트가 있으면 캐시 무시하고 새로 처리
+        # 업데이트된 컨텍스트가 있으면 결과 캐시는 무시하고 새로 처리 (감정 분석 / 맥락 추출은 사연 메모 재사용, 꽃 매칭부터 다시 계산)
         has_updated_context = hasattr(req, 'updated_context') and req.updated_context
         
         # 캐시된 결과가 있는지 확인 (업데이트된 컨텍스트가 없을 때만)
@@ -114,8 +132,7 @@ def emotion_analysis(req: RecommendRequest):
         if not has_updated_context and not request_deduplicator.should_process_request(request_id):
             print(f"⏳ Emotion Analysis 중복 요청 대기 중: {request_id}")
             # 잠시 대기 후 다시 확인
-            import time
-            time.sleep(0.1)
+            await asyncio.sleep(0.1)
             cached_result = request_deduplicator.get_cached_result(request_id)
             if cached_result:
                 return EmotionAnalysisResponse(**cached_result)
@@ -124,111 +141,26 @@ def emotion_analysis(req: RecommendRequest):
         
         # 실제 요청 처리
         print(f"🚀 Emotion Analysis 새로운 요청 처리 시작: {request_id}")
-        # 1. 감정 분석 (사연에 맞는 감정 비중)
-        emotion_analyzer = EmotionAnalyzer()
-        emotions = emotion_analyzer.analyze(req.story)
-        
-        # 2. 컨텍스트 추출 (제외된 키워드 고려)
-        context_extractor = RealtimeContextExtractor()
-        excluded_keywords = req.excluded_keywords if hasattr(req, 'excluded_keywords') and req.excluded_keywords else []
-        context = context_extractor.extract_context_realtime(req.story, emotions, excluded_keywords)
-        print(f"📊 추출된 맥락: {context}")
-        
-        # 3. 선택된 키워드나 업데이트된 컨텍스트가 있으면 컨텍스트 업데이트
-        if hasattr(req, 'selected_keywords') and req.selected_keywords:
-            print(f"🎯 선택된 키워드: {req.selected_keywords}")
-            # 선택된 키워드로 컨텍스트 업데이트
-            if req.selected_keywords.get('emotions'):
-                context.emotions = req.selected_keywords['emotions']
-            if req.selected_keywords.get('situations'):
-                context.situations = req.selected_keywords['situations']
-            if req.selected_keywords.get('moods'):
-                context.moods = req.selected_keywords['moods']
-            if req.selected_keywords.get('colors'):
-                context.colors = req.selected_keywords['colors']
-            print(f"🔄 업데이트된 컨텍스트: {context}")
-        
-        # 업데이트된 컨텍스트가 있으면 우선 적용
-        if hasattr(req, 'updated_context') and req.updated_context:
-            print(f"🔄 업데이트된 컨텍스트: {req.updated_context}")
-            # 업데이트된 컨텍스트로 덮어쓰기
-            if req.updated_context.get('emotions'):
-                context.emotions = req.updated_context['emotions']
-            if req.updated_context.get('situations'):
-                context.situations = req.updated_context['situations']
-            if req.updated_context.get('moods'):
-                context.moods = req.updated_context['moods']
-            if req.updated_context.get('colors'):
-                context.colors = req.updated_context['colors']
-            print(f"🔄 최종 업데이트된 컨텍스트: {context}")
-        
-        # 4. 제외된 키워드가 있으면 컨텍스트에서 제거
-        if hasattr(req, 'excluded_keywords') and req.excluded_keywords:
-            print(f"🚫 제외된 키워드: {req.excluded_keywords}")
-            
-            # 제외된 키워드들을 각 카테고리에서 제거
-            excluded_texts = [kw.get('text', '') for kw in req.excluded_keywords]
-            
-            context.emotions = [emotion for emotion in context.emotions if emotion not in excluded_texts]
-            context.situations = [situation for situation in context.situations if situation not in excluded_texts]
-            context.moods = [mood for mood in context.moods if mood not in excluded_texts]
-            context.colors = [color for color in context.colors if color not in excluded_texts]
-            
-            print(f"🔄 제외 키워드 제거 후 컨텍스트: {context}")
-        
-        # 4. 꽃 매칭 (제외 조건 반영)
-        flower_matcher = FlowerMatcher()
-        
-        # 언급된 꽃 정보 전달
-        mentioned_flower = context.mentioned_flower if hasattr(context, 'mentioned_flower') else None
-        matched_flower = flower_matcher.match(emotions, req.story, context.user_intent, excluded_keywords, mentioned_flower, context)
-        
-        # 5. 꽃 구성 추천
-        composition_recommender = CompositionRecommender()
-        composition = composition_recommender.recommend(matched_flower, emotions)
-        
-        # 6. LLM 기반 추천 이유 생성 (제외 조건 반영)
-        reason = _generate_unified_recommendation_reason(matched_flower, composition, emotions, req.story, context, excluded_keywords)
-        
-        # 7. 꽃카드 메시지 생성
-        flower_card_message = _generate_flower_card_message(matched_flower, emotions, req.story)
-        
-        # 8. 계절 정보 가져오기
-        season_info = _get_season_info(matched_flower.flower_name)
-        
-        # 9. 스토리 데이터베이스에 저장
-        # Story ID 생성
-        story_id = None
-        story_data = None
-        
-        try:
-            story_request = StoryCreateRequest(
+        # 실시간 키워드 WebSocket 에서 미리 실행한 결과가 있으면 이어받음 (사연 / 키워드 선택이 다르면 취소됨)
+        prefetched = speculative_prefetcher.take(req.session_token, req.story, req)
+        if prefetched is not None:
+            pipeline_run = prefetched.pipeline_run
+        else:
+            # DAG 파이프라인 실행 (추천 이유 / 카드 메시지 / 계절 정보는 동시에 실행)
+            pipeline_run = emotion_analysis_pipeline.new_run(
                 story=req.story,
-                emotions=emotions,
-                matched_flower=matched_flower,
-                composition=composition,
-                recommendation_reason=reason,
-                flower_card_message=flower_card_message,
-                season_info=season_info,
-                keywords=context.emotions + context.situations + context.moods + context.colors if hasattr(context, 'emotions') else [],
-                hashtags=matched_flower.hashtags,
-                color_keywords=matched_flower.color_keywords,
-                excluded_keywords=excluded_keywords or []
+                req=req,
+                excluded_keywords=req.excluded_keywords if hasattr(req, 'excluded_keywords') and req.excluded_keywords else []
             )
-            
-            story_data = story_manager.create_story(story_request)
-            story_id = story_data.story_id
-            print(f"✅ 스토리 저장 완료: {story_id}")
-            
-        except Exception as e:
-            print(f"⚠️ 스토리 저장 실패: {e}")
-            # Fallback: 꽃 이름으로 story_id 생성
+        # 요청 예산 안에서 실행 (예산이 끝난 LLM 스테이지는 규칙 기반 폴백)
+        with deadline_scope() as deadline:
             try:
-                story_id = story_manager._generate_story_id(matched_flower.flower_name)
-                print(f"✅ Fallback story_id 생성: {story_id}")
-            except Exception as e:
-                print(f"⚠️ Fallback story_id 생성 실패: {e}")
-                story_id = f"FALLBACK-{int(time.time())}"
+                emotions, matched_flower, composition, reason, flower_card_message, story_id, ranked_flowers = await pipeline_run.resolve(
+                    "emotions", "matched_flower", "composition", "reason", "flower_card_message", "story_id", "ranked_flowers"
+                )
+            finally:
+                pipeline_run.cancel_pending()
+                print(pipeline_run.summary())
         
         # 결과 생성
         result = EmotionAnalysisResponse(
@@ -237,7 +169,11 @@ def emotion_analysis(req: RecommendRequest):
             composition=composition,
             recommendation_reason=reason,
             flower_card_message=flower_card_message,
-            story_id=story_id
+            story_id=story_id,
+            degraded_stages=list(dict.fromkeys(
+                deadline.degraded_stages() + (prefetched.deadline.degraded_stages() if prefetched else [])
+            )),
+            ranked_flowers=ranked_flowers
         )
         
         # 결과 캐시에 저장 (updated_context가 있으면 우선순위 높게)
@@ -255,16 +191,46 @@ def emotion_analysis(req: RecommendRequest):
         print(f"❌ 감정 분석 API 오류: {e}")
         raise HTTPException(status_code=500, detail=f"감정 분석 실패: {str(e)}")
 
+@router.post("/emotion-analysis/rerank", response_model=RerankResponse)
+async def emotion_analysis_rerank(req: RerankRequest):
+    """키워드 제외 / 다른 꽃 보기 / 색상 변경 - story_id 의 보관된 점수로 다시 순위만 계산
+    (감정 분석 / 맥락 추출 / 추천 이유 LLM 은 다시 실행하지 않음, 세션이 없으면 404 → /emotion-analysis 로 다시 요청)"""
+    ranking = ranking_sessions.get(req.story_id)
+    if ranking is None:
+        raise HTTPException(status_code=404, detail="순위 세션이 없거나 만료되었습니다. /emotion-analysis 로 다시 요청해주세요.")
+    
+    try:
+        flower_matcher = await asyncio.to_thread(FlowerMatcher)
+        reranked = await asyncio.to_thread(
+            flower_matcher.rerank, ranking, req.excluded_keywords, req.excluded_flowers,
+            req.preferred_colors, req.show_another, req.top_k
+        )
+    except Exception as e:
+        print(f"❌ 다시 순위 계산 오류: {e}")
+        raise HTTPException(status_code=500, detail=f"다시 순위 계산 실패: {str(e)}")
+    if reranked is None:
+        raise HTTPException(status_code=409, detail="제외 조건을 적용하면 추천할 꽃이 남지 않습니다.")
+    
+    matched_flower, ranked_flowers = reranked
+    composition = _recommend_composition_stage(matched_flower, ranking.emotions)
+    return RerankResponse(
+        story_id=req.story_id,
+        matched_flower=matched_flower,
+        composition=composition,
+        recommendation_reason=_fallback_recommendation_reason(matched_flower, composition, ranking.emotions, ranking.story),
+        flower_card_message=_local_flower_card_message(matched_flower, ranking.emotions, ranking.story),
+        ranked_flowers=ranked_flowers
+    )
+
 @router.get("/flower-season/{flower_name}")
 def get_flower_season(flower_name: str):
     """꽃별 계절 정보 반환"""
     try:
-        # flower_dictionary.json에서 꽃 정보 찾기
-        with open("data/flower_dictionary.json", "r", encoding="utf-8") as f:
-            flower_data = json.load(f)
+        # 공유 꽃 카탈로그에서 꽃 정보 찾기
+        catalog = get_flower_catalog()
         
         # 꽃 이름으로 검색 (한글명, 영문명, 또는 flower_id의 일부)
-        for flower_id, flower_info in flower_data["flowers"].items():
+        for flower_id, flower_info in catalog.flowers.items():
             # flower_id에서 꽃 이름 부분 추출 (색상 제외)
             flower_name_from_id = flower_id.split('-')[0] if '-' in flower_id else flower_id
             
@@ -284,37 +250,34 @@ def get_flower_season(flower_name: str):
         print(f"❌ 꽃 계절 정보 조회 실패: {e}")
         return {"seasonality": ["봄", "여름"]}
 
-def _generate_unified_recommendation_reason(matched_flower: FlowerMatch, composition: FlowerComposition, emotions: List[EmotionAnalysis], story: str, context: Any, excluded_keywords: List[Dict[str, str]] = None) -> str:
-    """통합 추천 이유 생성 (사연에 맞는 공감가는 설명, 제외된 키워드 고려)"""
-    if not os.getenv("OPENAI_API_KEY"):
-        return _fallback_recommendation_reason(matched_flower, composition, emotions, story)
+# 추천 이유 / 꽃카드 메시지 LLM 호출 설정은 model_router 의 작업 프로필에서 결정
+# (일반 호출과 스트리밍 호출이 같은 프로필을 써서 같은 캐시 키를 공유)
+
+
+def _build_recommendation_reason_messages(matched_flower: FlowerMatch, emotions: List[EmotionAnalysis], story: str, excluded_keywords: List[Dict[str, str]] = None) -> List[Dict[str, str]]:
+    """추천 이유 프롬프트 메시지 생성"""
+    emotion_text = ", ".join([f"{e.emotion}({e.percentage}%)" for e in emotions])
     
-    try:
-        import openai
-        client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        
-        emotion_text = ", ".join([f"{e.emotion}({e.percentage}%)" for e in emotions])
-        
-        # 실제 선택된 꽃의 색상 사용 (제외된 색상 피하기)
-        flower_colors = matched_flower.color_keywords if matched_flower.color_keywords and len(matched_flower.color_keywords) > 0 else []
-        
-        # 제외된 색상 필터링
-        excluded_colors = [kw.get('text', '') for kw in (excluded_keywords or []) if kw.get('type') == 'color']
-        filtered_colors = [color for color in flower_colors if color not in excluded_colors]
-        
-        color_text = ", ".join(filtered_colors) if filtered_colors else "자연스러운 색감"
-        
-        print(f"🎨 원본 색상: {flower_colors}")
-        print(f"🚫 제외된 색상: {excluded_colors}")
-        print(f"✅ 필터링된 색상: {filtered_colors}")
-        
-        # 제외된 키워드 정보 추가
-        excluded_text = ""
-        if excluded_keywords:
-            excluded_texts = [kw.get('text', '') for kw in excluded_keywords]
-            excluded_text = f"\n제외된 키워드: {', '.join(excluded_texts)} (이 키워드들은 언급하지 마세요)"
-        
-        prompt = f"""
+    # 실제 선택된 꽃의 색상 사용 (제외된 색상 피하기)
+    flower_colors = matched_flower.color_keywords if matched_flower.color_keywords and len(matched_flower.color_keywords) > 0 else []
+    
+    # 제외된 색상 필터링
+    excluded_colors = [kw.get('text', '') for kw in (excluded_keywords or []) if kw.get('type') == 'color']
+    filtered_colors = [color for color in flower_colors if color not in excluded_colors]
+    
+    color_text = ", ".join(filtered_colors) if filtered_colors else "자연스러운 색감"
+    
+    print(f"🎨 원본 색상: {flower_colors}")
+    print(f"🚫 제외된 색상: {excluded_colors}")
+    print(f"✅ 필터링된 색상: {filtered_colors}")
+    
+    # 제외된 키워드 정보 추가
+    excluded_text = ""
+    if excluded_keywords:
+        excluded_texts = [kw.get('text', '') for kw in excluded_keywords]
+        excluded_text = f"\n제외된 키워드: {', '.join(excluded_texts)} (이 키워드들은 언급하지 마세요)"
+    
+    prompt = f"""
 당신은 꽃 추천 전문가입니다. 고객의 사연과 감정을 깊이 이해하고, 선택된 메인 꽃의 의미를 설명해주세요.
 
 고객 사연: "{story}"
@@ -348,18 +311,26 @@ def _generate_unified_recommendation_reason(matched_flower: FlowerMatch, composi
 
 한국어로 자연스럽고 전문적으로 작성해주세요.
 """
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "당신은 꽃 추천 전문가입니다. 고객의 사연과 감정을 깊이 이해하고, 선택된 메인 꽃의 의미를 설명하여 개인적이고 진정성 있는 추천 이유를 작성해주세요."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.8,
-            max_tokens=200
+    
+    return [
+        {"role": "system", "content": "당신은 꽃 추천 전문가입니다. 고객의 사연과 감정을 깊이 이해하고, 선택된 메인 꽃의 의미를 설명하여 개인적이고 진정성 있는 추천 이유를 작성해주세요."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _generate_unified_recommendation_reason(matched_flower: FlowerMatch, composition: FlowerComposition, emotions: List[EmotionAnalysis], story: str, context: Any, excluded_keywords: List[Dict[str, str]] = None) -> str:
+    """통합 추천 이유 생성 (사연에 맞는 공감가는 설명, 제외된 키워드 고려)"""
+    if not os.getenv("OPENAI_API_KEY"):
+        return _fallback_recommendation_reason(matched_flower, composition, emotions, story)
+    
+    try:
+        client = get_openai_client()
+        reason = llm_cache.chat_completion(
+            client, "recommendation_reason",
+            messages=_build_recommendation_reason_messages(matched_flower, emotions, story, excluded_keywords),
+            **model_router.route("recommendation_reason", story).params()
         )
-        
-        return response.choices[0].message.content.strip()
+        return reason.strip()
         
     except Exception as e:
         print(f"❌ 통합 추천 이유 생성 실패: {e}")
@@ -367,6 +338,25 @@ def _generate_unified_recommendation_reason(matched_flower: FlowerMatch, composi
 
 
 
+
+async def _generate_unified_recommendation_reason_async(matched_flower: FlowerMatch, composition: FlowerComposition, emotions: List[EmotionAnalysis], story: str, context: Any, excluded_keywords: List[Dict[str, str]] = None) -> str:
+    """_generate_unified_recommendation_reason 의 비동기 버전 (AsyncOpenAI)"""
+    if not os.getenv("OPENAI_API_KEY"):
+        return _fallback_recommendation_reason(matched_flower, composition, emotions, story)
+    
+    try:
+        client = get_async_openai_client()
+        reason = await llm_cache.achat_completion(
+            client, "recommendation_reason",
+            messages=_build_recommendation_reason_messages(matched_flower, emotions, story, excluded_keywords),
+            **model_router.route("recommendation_reason", story).params()
+        )
+        return reason.strip()
+        
+    except Exception as e:
+        print(f"❌ 통합 추천 이유 생성 실패: {e}")
+        return _fallback_recommendation_reason(matched_flower, composition, emotions, story)
+
 def _fallback_recommendation_reason(matched_flower: FlowerMatch, composition: FlowerComposition, emotions: List[EmotionAnalysis], story: str) -> str:
     """폴백 추천 이유"""
     flower_name = matched_flower.korean_name
@@ -387,73 +377,42 @@ def _fallback_recommendation_reason(matched_flower: FlowerMatch, composition: Fl
         return f"{flower_color} {flower_name}의 아름다움이 마음을 담아 전해줘요."
 
 
-def _generate_flower_card_message(matched_flower: FlowerMatch, emotions: List[EmotionAnalysis], story: str) -> FlowerCardMessage:
-    """꽃카드 메시지 생성 (영어 시적 문구)"""
-    if not os.getenv("OPENAI_API_KEY"):
+def _card_message_from_quote(quote: Optional[CardQuote], matched_flower: FlowerMatch, emotions: List[EmotionAnalysis], story: str) -> FlowerCardMessage:
+    """인용구 → 카드 메시지 (라인 1 인용구, 라인 2 "- 출처 -")"""
+    if quote is None:
         return _fallback_flower_card_message(matched_flower, emotions, story)
-    
+    return FlowerCardMessage(quote=quote.quote, source=f"- {quote.source} -")
+
+
+def _generate_flower_card_message(matched_flower: FlowerMatch, emotions: List[EmotionAnalysis], story: str) -> FlowerCardMessage:
+    """꽃카드 메시지 생성 (인용구 라이브러리 로컬 검색, 설정 시 상위 후보만 LLM 재정렬)"""
     try:
-        import openai
-        client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        
-        emotion_text = ", ".join([f"{e.emotion}({e.percentage}%)" for e in emotions])
-        
-        prompt = f"""
-Create a poetic English message for a flower card using famous quotes from movies, literature, songs, or dramas.
-
-Customer's Story: "{story}"
-Customer's Emotions: {emotion_text}
-Flower: {matched_flower.flower_name} ({matched_flower.korean_name})
-
-**Requirements**:
-- **Line 1**: A famous quote (40 characters max) that EXACTLY matches the customer's situation and emotions
-- **Line 2**: The source in format "- Source Name -" (with spaces around the dash)
-- **Style**: Choose quotes that directly relate to love, gratitude, support, or the specific emotion mentioned
-- **Format**: Two lines separated by \\n
-
-**Context Analysis**:
-- If the story mentions "고맙고 사랑한다" → Choose love/gratitude quotes
-- If the story mentions "지쳐보여요" → Choose supportive/comforting quotes
-- If the story mentions "아내/남편" → Choose romantic/marriage quotes
-- If the story mentions "회사일" → Choose supportive/encouraging quotes
-
-**Examples for Love/Gratitude**:
-- "You make me want to be a better man."\\n- As Good As It Gets -
-- "Thank you for being you."\\n- Friends -
-- "You are my sunshine."\\n- You Are My Sunshine -
-- "I love you more than words."\\n- The Notebook -
-
-**Examples for Support/Comfort**:
-- "I'll be there for you."\\n- Friends -
-- "You are stronger than you know."\\n- The Princess Diaries -
-- "I believe in you always.\\n- The Little Engine That Could -
-- "You make every day beautiful.\\n- The Sound of Music -
-
-Choose a quote that DIRECTLY matches the customer's specific situation and emotions. Write only the message text in English with line break.
-"""
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a poetic message writer for flower cards. Create short, touching English messages."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.8,
-            max_tokens=50
-        )
-        
-        message_content = response.choices[0].message.content.strip()
-        
-        # 메시지 내용에서 라인 1과 라인 2를 분리
-        lines = message_content.split('\n')
-        quote = lines[0] if len(lines) > 0 else ""
-        source = lines[1] if len(lines) > 1 else ""
-        
-        return FlowerCardMessage(quote=quote, source=source)
-        
+        quote = select_card_quote(story, emotions, matched_flower.keywords)
     except Exception as e:
         print(f"❌ 꽃카드 메시지 생성 실패: {e}")
-        return _fallback_flower_card_message(matched_flower, emotions, story)
+        quote = None
+    return _card_message_from_quote(quote, matched_flower, emotions, story)
+
+
+async def _generate_flower_card_message_async(matched_flower: FlowerMatch, emotions: List[EmotionAnalysis], story: str) -> FlowerCardMessage:
+    """_generate_flower_card_message 의 비동기 버전 (재정렬 시 AsyncOpenAI)"""
+    try:
+        quote = await select_card_quote_async(story, emotions, matched_flower.keywords)
+    except Exception as e:
+        print(f"❌ 꽃카드 메시지 생성 실패: {e}")
+        quote = None
+    return _card_message_from_quote(quote, matched_flower, emotions, story)
+
+
+def _local_flower_card_message(matched_flower: FlowerMatch, emotions: List[EmotionAnalysis], story: str) -> FlowerCardMessage:
+    """꽃카드 메시지 - 인용구 라이브러리 1위 (LLM 재정렬 없이)"""
+    try:
+        candidates = get_quote_index().search(story, emotions, matched_flower.keywords, k=1)
+        quote = candidates[0].quote if candidates else None
+    except Exception as e:
+        print(f"❌ 꽃카드 메시지 생성 실패: {e}")
+        quote = None
+    return _card_message_from_quote(quote, matched_flower, emotions, story)
 
 
 def _fallback_flower_card_message(matched_flower: FlowerMatch, emotions: List[EmotionAnalysis], story: str) -> FlowerCardMessage:
@@ -461,31 +420,31 @@ def _fallback_flower_card_message(matched_flower: FlowerMatch, emotions: List[Em
     flower_name = matched_flower.flower_name.lower()
     
     # 스토리 내용 기반으로 더 구체적인 메시지 선택
-    story_lower = story.lower()
+    hits = scan_keywords(story)
     
     # 아내/남편 관련 (결혼/로맨스)
-    if any(word in story_lower for word in ["아내", "남편", "와이프", "부인", "남편님"]):
-        if any(word in story_lower for word in ["고맙", "감사", "사랑"]):
+    if hits.any("card.spouse"):
+        if hits.any("card.gratitude"):
             return FlowerCardMessage(quote="I love you more than words.", source="- The Notebook -")
-        elif any(word in story_lower for word in ["지쳐", "피곤", "힘들"]):
+        elif hits.any("card.tired"):
             return FlowerCardMessage(quote="I'll be there for you.", source="- Friends -")
         else:
             return FlowerCardMessage(quote="You make me want to be a better man.", source="- As Good As It Gets -")
     
     # 감사/사랑 관련
-    elif any(word in story_lower for word in ["고맙", "감사", "사랑"]):
+    elif hits.any("card.gratitude"):
         return FlowerCardMessage(quote="Thank you for being you.", source="- Friends -")
     
     # 지침/위로 관련
-    elif any(word in story_lower for word in ["지쳐", "피곤", "힘들", "스트레스"]):
+    elif hits.any("card.exhausted"):
         return FlowerCardMessage(quote="You are stronger than you know.", source="- The Princess Diaries -")
     
     # 응원/격려 관련
-    elif any(word in story_lower for word in ["응원", "격려", "힘내"]):
+    elif hits.any("card.cheer"):
         return FlowerCardMessage(quote="I believe in you always.", source="- The Little Engine That Could -")
     
     # 기쁨/행복 관련
-    elif any(word in story_lower for word in ["기쁨", "행복", "즐거"]):
+    elif hits.any("card.joy"):
         return FlowerCardMessage(quote="You are my sunshine.", source="- You Are My Sunshine -")
     
     # 감정 분석 결과 기반
@@ -504,36 +463,28 @@ def _fallback_flower_card_message(matched_flower: FlowerMatch, emotions: List[Em
 def _get_season_info(flower_name: str) -> Dict[str, str]:
     """꽃의 계절 정보 가져오기 (시즌과 월 분리)"""
     try:
-        # flower_dictionary.json에서 꽃 정보 찾기
-        with open("data/flower_dictionary.json", "r", encoding="utf-8") as f:
-            flower_data = json.load(f)
-        
-        # 꽃 이름으로 검색 (한글명 또는 영문명)
-        for flower_id, flower_info in flower_data["flowers"].items():
-            if (flower_info.get("korean_name") == flower_name or 
-                flower_info.get("scientific_name") == flower_name or
-                flower_name.lower() in flower_info.get("korean_name", "").lower()):
-                
-                seasonality = flower_info.get("seasonality", [])
-                if len(seasonality) == 4:
-                    return {"season": "All Season", "months": "01-12"}
-                elif len(seasonality) == 2:
-                    seasons = " ".join(seasonality)
-                    if "봄" in seasons and "여름" in seasons:
-                        return {"season": "Spring/Summer", "months": "03-08"}
-                    elif "가을" in seasons and "겨울" in seasons:
-                        return {"season": "Fall/Winter", "months": "09-02"}
-                elif len(seasonality) == 1:
-                    season = seasonality[0]
-                    if season == "봄":
-                        return {"season": "Spring", "months": "03-05"}
-                    elif season == "여름":
-                        return {"season": "Summer", "months": "06-08"}
-                    elif season == "가을":
-                        return {"season": "Fall", "months": "09-11"}
-                    elif season == "겨울":
-                        return {"season": "Winter", "months": "12-02"}
-                break
+        # 공유 꽃 카탈로그에서 꽃 정보 찾기 (한글명 또는 영문명)
+        flower_info = get_flower_catalog().find_by_name(flower_name, partial=True)
+        if flower_info is not None:
+            seasonality = flower_info.get("seasonality", [])
+            if len(seasonality) == 4:
+                return {"season": "All Season", "months": "01-12"}
+            elif len(seasonality) == 2:
+                seasons = " ".join(seasonality)
+                if "봄" in seasons and "여름" in seasons:
+                    return {"season": "Spring/Summer", "months": "03-08"}
+                elif "가을" in seasons and "겨울" in seasons:
+                    return {"season": "Fall/Winter", "months": "09-02"}
+            elif len(seasonality) == 1:
+                season = seasonality[0]
+                if season == "봄":
+                    return {"season": "Spring", "months": "03-05"}
+                elif season == "여름":
+                    return {"season": "Summer", "months": "06-08"}
+                elif season == "가을":
+                    return {"season": "Fall", "months": "09-11"}
+                elif season == "겨울":
+                    return {"season": "Winter", "months": "12-02"}
         
         # 찾지 못한 경우 기본값 반환
         return {"season": "Spring/Summer", "months": "03-08"}
@@ -608,7 +559,7 @@ async def extract_context_stream(story: str):
         try:
             # 실시간 맥락 추출
             context_extractor = RealtimeContextExtractor()
-            context = context_extractor.extract_context_realtime(story)
+            context = await context_extractor.extract_context_realtime_async(story)
             
             # SSE 형식으로 데이터 전송
             data = {
@@ -635,3 +586,278 @@ async def extract_context_stream(story: str):
             "Access-Control-Allow-Headers": "*",
         }
     )
+
+
+def _sse_event(event_type: str, data: Any) -> str:
+    """SSE 이벤트 한 건 직렬화"""
+    payload = {"type": event_type, "data": data}
+    return f"event: {event_type}\ndata: {json.dumps(payload, ensure_ascii=False, default=str)}\n\n"
+
+
+def _serialize_context(context: Any) -> Dict[str, Any]:
+    """추출된 맥락(ExtractedContext)을 dict 로 변환"""
+    if dataclasses.is_dataclass(context):
+        return dataclasses.asdict(context)
+    return dict(vars(context))
+
+
+async def _stream_text_stage(queue: asyncio.Queue, event_type: str, call_site: str,
+                             messages: List[Dict[str, str]], params: Dict[str, Any]) -> Optional[str]:
+    """LLM 응답을 토큰 단위 {event_type}_delta 이벤트로 전송하고 전체 텍스트 반환 (실패 시 None → 폴백)"""
+    if not os.getenv("OPENAI_API_KEY"):
+        return None
+    try:
+        client = get_async_openai_client()
+        parts = []
+        async for delta in llm_cache.stream_chat_completion(client, call_site, messages=messages, **params):
+            parts.append(delta)
+            await queue.put(_sse_event(f"{event_type}_delta", {"text": delta}))
+        return "".join(parts).strip() or None
+    except Exception as e:
+        print(f"❌ {call_site} 스트리밍 실패: {e}")
+        return None
+
+
+@router.post("/emotion-analysis/stream")
+async def emotion_analysis_stream(req: RecommendRequest):
+    """감정 분석 + 꽃 추천 SSE 스트리밍 (준비되는 순서대로 이벤트 전송)
+    - emotions / context → matched_flower → composition / season / card_message → reason_delta* → reason → done
+    """
+    excluded_keywords = req.excluded_keywords or []
+    pipeline_run = emotion_analysis_pipeline.new_run(story=req.story, req=req, excluded_keywords=excluded_keywords)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def emit_stage(stage_name: str, event_type: str, serialize):
+        value = await pipeline_run.get(stage_name)
+        await queue.put(_sse_event(event_type, serialize(value)))
+
+    async def stream_reason():
+        matched_flower, composition, emotions = await pipeline_run.resolve("matched_flower", "composition", "emotions")
+        reason = await _stream_text_stage(
+            queue, "reason", "recommendation_reason",
+            _build_recommendation_reason_messages(matched_flower, emotions, req.story, excluded_keywords),
+            model_router.route("recommendation_reason", req.story).params()
+        )
+        if reason is None:
+            reason = _fallback_recommendation_reason(matched_flower, composition, emotions, req.story)
+        # 스토리 저장 스테이지가 같은 텍스트를 쓰도록 결과 주입
+        pipeline_run.provide("reason", reason)
+        await queue.put(_sse_event("reason", {"text": reason}))
+
+    async def stream_card_message():
+        # 카드 문구는 로컬 인용구 검색이라 조각 스트리밍 없이 바로 전송
+        flower_card_message = await pipeline_run.get("flower_card_message")
+        await queue.put(_sse_event("card_message", flower_card_message.dict()))
+
+    async def produce():
+        # 요청 예산은 produce 태스크 안에서 시작해야 하위 스테이지 태스크에 전달됨
+        with deadline_scope() as deadline:
+            await _produce(deadline)
+
+    async def _produce(deadline):
+        try:
+            await asyncio.gather(
+                emit_stage("emotions", "emotions", lambda emotions: [e.dict() for e in emotions]),
+                emit_stage("context", "context", _serialize_context),
+                emit_stage("matched_flower", "matched_flower", lambda matched_flower: matched_flower.dict()),
+                emit_stage("composition", "composition", lambda composition: composition.dict()),
+                emit_stage("season_info", "season", lambda season_info: season_info),
+                stream_reason(),
+                stream_card_message(),
+            )
+            story_id, ranked_flowers = await pipeline_run.resolve("story_id", "ranked_flowers")
+            await queue.put(_sse_event("done", {
+                "story_id": story_id,
+                "degraded_stages": deadline.degraded_stages(),
+                "ranked_flowers": [ranked_flower.dict() for ranked_flower in ranked_flowers],
+            }))
+        except Exception as e:
+            print(f"❌ 감정 분석 스트리밍 오류: {e}")
+            await queue.put(_sse_event("error", {"message": str(e)}))
+        finally:
+            await queue.put(None)
+
+    async def generate():
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            # 클라이언트 연결이 끊기면 남은 스테이지 취소
+            if not producer.done():
+                producer.cancel()
+            pipeline_run.cancel_pending()
+            print(pipeline_run.summary())
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
+# ============================
+# 감정 분석 파이프라인 (DAG)
+# ============================
+
+async def _extract_stage(story: str, excluded_keywords: List[Dict[str, str]]) -> Tuple[List[EmotionAnalysis], Any]:
+    """1. 감정 분석 + 2. 컨텍스트 추출 (EXTRACTION_MODE 에 따라 fused 1회 / legacy 2회 호출)"""
+    emotions, context = await extract_emotions_and_context_async(story, excluded_keywords)
+    print(f"📊 추출된 맥락: {context}")
+    return emotions, context
+
+
+def _emotions_stage(extraction: Tuple[List[EmotionAnalysis], Any]) -> List[EmotionAnalysis]:
+    """감정 분석 결과"""
+    return extraction[0]
+
+
+def _extract_context_stage(extraction: Tuple[List[EmotionAnalysis], Any], req: RecommendRequest) -> Any:
+    """컨텍스트에 선택/업데이트된 키워드, 제외된 키워드 반영"""
+    context = extraction[1]
+    
+    # 3. 선택된 키워드나 업데이트된 컨텍스트가 있으면 컨텍스트 업데이트
+    if hasattr(req, 'selected_keywords') and req.selected_keywords:
+        print(f"🎯 선택된 키워드: {req.selected_keywords}")
+        # 선택된 키워드로 컨텍스트 업데이트
+        if req.selected_keywords.get('emotions'):
+            context.emotions = req.selected_keywords['emotions']
+        if req.selected_keywords.get('situations'):
+            context.situations = req.selected_keywords['situations']
+        if req.selected_keywords.get('moods'):
+            context.moods = req.selected_keywords['moods']
+        if req.selected_keywords.get('colors'):
+            context.colors = req.selected_keywords['colors']
+        print(f"🔄 업데이트된 컨텍스트: {context}")
+    
+    # 업데이트된 컨텍스트가 있으면 우선 적용
+    if hasattr(req, 'updated_context') and req.updated_context:
+        print(f"🔄 업데이트된 컨텍스트: {req.updated_context}")
+        # 업데이트된 컨텍스트로 덮어쓰기
+        if req.updated_context.get('emotions'):
+            context.emotions = req.updated_context['emotions']
+        if req.updated_context.get('situations'):
+            context.situations = req.updated_context['situations']
+        if req.updated_context.get('moods'):
+            context.moods = req.updated_context['moods']
+        if req.updated_context.get('colors'):
+            context.colors = req.updated_context['colors']
+        print(f"🔄 최종 업데이트된 컨텍스트: {context}")
+    
+    # 4. 제외된 키워드가 있으면 컨텍스트에서 제거
+    if hasattr(req, 'excluded_keywords') and req.excluded_keywords:
+        print(f"🚫 제외된 키워드: {req.excluded_keywords}")
+        
+        # 제외된 키워드들을 각 카테고리에서 제거
+        excluded_texts = [kw.get('text', '') for kw in req.excluded_keywords]
+        
+        context.emotions = [emotion for emotion in context.emotions if emotion not in excluded_texts]
+        context.situations = [situation for situation in context.situations if situation not in excluded_texts]
+        context.moods = [mood for mood in context.moods if mood not in excluded_texts]
+        context.colors = [color for color in context.colors if color not in excluded_texts]
+        
+        print(f"🔄 제외 키워드 제거 후 컨텍스트: {context}")
+    
+    return context
+
+
+def _flower_ranking_stage(story: str, emotions: List[EmotionAnalysis], context: Any, excluded_keywords: List[Dict[str, str]]) -> Tuple[FlowerMatch, FlowerMatcher]:
+    """4. 꽃 매칭 (제외 조건 반영) - 매칭 결과 + 점수 벡터를 가진 매칭기"""
+    flower_matcher = FlowerMatcher()
+    
+    # 언급된 꽃 정보 전달
+    mentioned_flower = context.mentioned_flower if hasattr(context, 'mentioned_flower') else None
+    matched_flower = flower_matcher.match(emotions, story, context.user_intent, excluded_keywords, mentioned_flower, context)
+    return matched_flower, flower_matcher
+
+
+def _match_flower_stage(flower_ranking: Tuple[FlowerMatch, FlowerMatcher]) -> FlowerMatch:
+    """매칭된 꽃"""
+    return flower_ranking[0]
+
+
+def _ranked_flowers_stage(flower_ranking: Tuple[FlowerMatch, FlowerMatcher], story_id: str, req: RecommendRequest) -> List[RankedFlower]:
+    """10. 상위 top_k 개 꽃 + 점수 분해, 점수 벡터를 story_id 순위 세션에 보관 (/emotion-analysis/rerank)"""
+    flower_matcher = flower_ranking[1]
+    ranking = flower_matcher.last_ranking
+    if ranking is None:
+        return []
+    try:
+        ranked_flowers = flower_matcher.rank_flowers(ranking, req.top_k)
+    except Exception as e:
+        print(f"⚠️ 상위 꽃 순위 계산 실패: {e}")
+        return []
+    if story_id:
+        ranking_sessions.put(story_id, ranking)
+    return ranked_flowers
+
+
+def _recommend_composition_stage(matched_flower: FlowerMatch, emotions: List[EmotionAnalysis]) -> FlowerComposition:
+    """5. 꽃 구성 추천"""
+    composition_recommender = CompositionRecommender()
+    return composition_recommender.recommend(matched_flower, emotions)
+
+
+def _season_info_stage(matched_flower: FlowerMatch) -> Dict[str, str]:
+    """8. 계절 정보 가져오기"""
+    return _get_season_info(matched_flower.flower_name)
+
+
+async def _save_story_stage(story: str, emotions: List[EmotionAnalysis], matched_flower: FlowerMatch, composition: FlowerComposition,
+                            reason: str, flower_card_message: FlowerCardMessage, season_info: Dict[str, str], context: Any,
+                            excluded_keywords: List[Dict[str, str]]) -> str:
+    """9. 스토리 데이터베이스에 저장 후 story_id 반환"""
+    try:
+        story_request = StoryCreateRequest(
+            story=story,
+            emotions=emotions,
+            matched_flower=matched_flower,
+            composition=composition,
+            recommendation_reason=reason,
+            flower_card_message=flower_card_message,
+            season_info=season_info,
+            keywords=context.emotions + context.situations + context.moods + context.colors if hasattr(context, 'emotions') else [],
+            hashtags=matched_flower.hashtags,
+            color_keywords=matched_flower.color_keywords,
+            excluded_keywords=excluded_keywords or []
+        )
+        
+        story_data = await story_manager.create_story_async(story_request)
+        print(f"✅ 스토리 저장 완료: {story_data.story_id}")
+        return story_data.story_id
+        
+    except Exception as e:
+        print(f"⚠️ 스토리 저장 실패: {e}")
+        # Fallback: 꽃 이름으로 story_id 생성
+        try:
+            story_id = story_manager._generate_story_id(matched_flower.flower_name)
+            print(f"✅ Fallback story_id 생성: {story_id}")
+            return story_id
+        except Exception as e:
+            print(f"⚠️ Fallback story_id 생성 실패: {e}")
+            return f"FALLBACK-{int(time.time())}"
+
+
+emotion_analysis_pipeline = Pipeline("emotion-analysis")
+emotion_analysis_pipeline.add_stage("extraction", _extract_stage, ["story", "excluded_keywords"], memo=extraction_memo)
+emotion_analysis_pipeline.add_stage("emotions", _emotions_stage, ["extraction"])
+emotion_analysis_pipeline.add_stage("context", _extract_context_stage, ["extraction", "req"])
+emotion_analysis_pipeline.add_stage("flower_ranking", _flower_ranking_stage, ["story", "emotions", "context", "excluded_keywords"])
+emotion_analysis_pipeline.add_stage("matched_flower", _match_flower_stage, ["flower_ranking"])
+emotion_analysis_pipeline.add_stage("composition", _recommend_composition_stage, ["matched_flower", "emotions"])
+# 6~8. 추천 이유 / 꽃카드 메시지 / 계절 정보는 서로 독립적이라 동시에 실행
+emotion_analysis_pipeline.add_stage("reason", _generate_unified_recommendation_reason_async,
+                                    ["matched_flower", "composition", "emotions", "story", "context", "excluded_keywords"])
+emotion_analysis_pipeline.add_stage("flower_card_message", _generate_flower_card_message_async, ["matched_flower", "emotions", "story"])
+emotion_analysis_pipeline.add_stage("season_info", _season_info_stage, ["matched_flower"])
+emotion_analysis_pipeline.add_stage("story_id", _save_story_stage,
+                                    ["story", "emotions", "matched_flower", "composition", "reason",
+                                     "flower_card_message", "season_info", "context", "excluded_keywords"])
+emotion_analysis_pipeline.add_stage("ranked_flowers", _ranked_flowers_stage, ["flower_ranking", "story_id", "req"])
@@ -2,11 +2,14 @@ from fastapi import APIRouter, HTTPException
 from typing import List, Dict, Any
 import json
 import os
+import asyncio
 from datetime import datetime
 from app.models.schemas import FlowerMatch, EmotionAnalysis, FlowerComposition
 from app.services.flower_matcher import FlowerMatcher
 from app.services.composition_recommender import CompositionRecommender
-from app.api.v1.endpoints.recommend import _generate_unified_recommendation_reason, _generate_flower_card_message
+from app.api.v1.endpoints.recommend import _generate_unified_recommendation_reason_async, _generate_flower_card_message_async
+from app.services.request_deadline import deadline_scope
+from app.services.sample_story_responses import sample_story_responses
 import random
 
 router = APIRouter()
@@ -70,167 +73,187 @@ async def get_sample_story(story_id: str):
     
     return story
 
-@router.post("/sample-stories/{story_id}/recommend")
-async def recommend_from_sample_story(story_id: str):
-    """샘플 사연의 미리 설정된 키워드로 꽃을 추천합니다."""
-    try:
-        # 샘플 사연 로드
-        stories = load_sample_stories()
-        story = next((s for s in stories if s["id"] == story_id), None)
-        
-        if not story:
-            raise HTTPException(status_code=404, detail="사연을 찾을 수 없습니다.")
-        
-        # 미리 설정된 키워드 추출
-        predefined_keywords = story["predefined_keywords"]
-        
-        # EmotionAnalysis 객체 생성 (3개로 확장)
-        emotions = []
-        if predefined_keywords.get("emotions"):
-            emotion_list = predefined_keywords["emotions"]
-            # 최대 3개까지 처리
-            for i, emotion in enumerate(emotion_list[:3]):
-                if i == 0:
-                    percentage = 40.0  # 첫 번째 감정
-                elif i == 1:
-                    percentage = 35.0  # 두 번째 감정
-                else:
-                    percentage = 25.0  # 세 번째 감정
-                
-                emotions.append(EmotionAnalysis(
-                    emotion=emotion,
-                    percentage=percentage,
-                    description=f"{emotion}한 마음"
-                ))
+async def build_sample_story_response(story: Dict[str, Any]) -> Dict[str, Any]:
+    """샘플 사연 하나의 전체 추천 응답 계산 (엔드포인트 실시간 경로 + 사전 계산 빌드 스크립트 공용)"""
+    # 미리 설정된 키워드 추출
+    predefined_keywords = story["predefined_keywords"]
+    
+    # EmotionAnalysis 객체 생성 (3개로 확장)
+    emotions = []
+    if predefined_keywords.get("emotions"):
+        emotion_list = predefined_keywords["emotions"]
+        # 최대 3개까지 처리
+        for i, emotion in enumerate(emotion_list[:3]):
+            if i == 0:
+                percentage = 40.0  # 첫 번째 감정
+            elif i == 1:
+                percentage = 35.0  # 두 번째 감정
+            else:
+                percentage = 25.0  # 세 번째 감정
             
-            # 감정이 2개만 있는 경우 3번째 감정 추가
-            if len(emotions) == 2:
-                emotions.append(EmotionAnalysis(
-                    emotion="차분함",
-                    percentage=25.0,
-                    description="차분한 마음"
-                ))
-        else:
-            # 기본 감정 설정 (3개)
-            emotions = [
-                EmotionAnalysis(emotion="기쁨", percentage=40.0, description="기쁜 마음"),
-                EmotionAnalysis(emotion="감사", percentage=35.0, description="감사한 마음"),
-                EmotionAnalysis(emotion="희망", percentage=25.0, description="희망찬 마음")
-            ]
-        
-        # 꽃 매칭 서비스 초기화
-        flower_matcher = FlowerMatcher()
-        
-        # 색상 키워드 추출
-        color_keywords = predefined_keywords.get("colors", [])
+            emotions.append(EmotionAnalysis(
+                emotion=emotion,
+                percentage=percentage,
+                description=f"{emotion}한 마음"
+            ))
         
-        # 꽃 추천 실행 (기존 match() 메서드 사용)
-        matched_flower = flower_matcher.match(
-            emotions=emotions,
-            story=story["story"],
-            user_intent="meaning_based",  # 의미 기반 매칭
-            excluded_keywords=None,
-            mentioned_flower=None,
-            context=None
-        )
-        
-        if not matched_flower:
-            raise HTTPException(status_code=404, detail="적합한 꽃을 찾을 수 없습니다.")
-        
-        # 꽃 조합 추천
-        composition_recommender = CompositionRecommender()
-        composition = composition_recommender.recommend(
-            matched_flower=matched_flower,
-            emotions=emotions
-        )
-        
-        # 추천 이유 생성 (GPT 사용)
-        recommendation_reason = _generate_unified_recommendation_reason(
+        # 감정이 2개만 있는 경우 3번째 감정 추가
+        if len(emotions) == 2:
+            emotions.append(EmotionAnalysis(
+                emotion="차분함",
+                percentage=25.0,
+                description="차분한 마음"
+            ))
+    else:
+        # 기본 감정 설정 (3개)
+        emotions = [
+            EmotionAnalysis(emotion="기쁨", percentage=40.0, description="기쁜 마음"),
+            EmotionAnalysis(emotion="감사", percentage=35.0, description="감사한 마음"),
+            EmotionAnalysis(emotion="희망", percentage=25.0, description="희망찬 마음")
+        ]
+    
+    # 꽃 매칭 서비스 초기화
+    flower_matcher = FlowerMatcher()
+    
+    # 색상 키워드 추출
+    color_keywords = predefined_keywords.get("colors", [])
+    
+    # 꽃 추천 실행 (기존 match() 메서드 사용, LLM 보조 분석이 있어 스레드에서 실행)
+    matched_flower = await asyncio.to_thread(
+        flower_matcher.match,
+        emotions=emotions,
+        story=story["story"],
+        user_intent="meaning_based",  # 의미 기반 매칭
+        excluded_keywords=None,
+        mentioned_flower=None,
+        context=None
+    )
+    
+    if not matched_flower:
+        raise HTTPException(status_code=404, detail="적합한 꽃을 찾을 수 없습니다.")
+    
+    # 꽃 조합 추천
+    composition_recommender = CompositionRecommender()
+    composition = composition_recommender.recommend(
+        matched_flower=matched_flower,
+        emotions=emotions
+    )
+    
+    # 추천 이유 / 꽃 카드 메시지 동시 생성 (GPT 사용, AsyncOpenAI)
+    recommendation_reason, flower_card_message = await asyncio.gather(
+        _generate_unified_recommendation_reason_async(
             matched_flower=matched_flower,
             composition=composition,
             emotions=emotions,
             story=story["story"],
             context=None,
             excluded_keywords=[]
-        )
-        
-        # 꽃 카드 메시지 생성 (GPT 사용)
-        flower_card_message = _generate_flower_card_message(
+        ),
+        _generate_flower_card_message_async(
             matched_flower=matched_flower,
             emotions=emotions,
             story=story["story"]
         )
+    )
+    
+    # 이미지 URL에서 spp 제거
+    image_url = matched_flower.image_url
+    if image_url and "-spp-" in image_url:
+        image_url = image_url.replace("-spp-", "-")
+    
+    # 스토리 ID 생성 (S{순번}만 사용)
+    story_number = story["id"].replace("story_", "").replace("S", "")
+    formatted_story_id = f"S{story_number}"  # T01 제거
+    
+    # 계절 정보 생성 (시즌과 월 분리)
+    season_info = {"season": "All Season", "months": "01-12"}  # 기본값, 실제로는 꽃 데이터에서 가져와야 함
+    
+    # 해시태그 생성 (감정 2개, 무드 1개)
+    hashtags = []
+    
+    # 감정 2개 추가
+    if predefined_keywords.get("emotions"):
+        emotions_list = predefined_keywords["emotions"]
+        for i, emotion in enumerate(emotions_list[:2]):  # 최대 2개
+            hashtags.append(f"#{emotion}")
+    
+    # 무드 1개 추가
+    if predefined_keywords.get("moods"):
+        moods_list = predefined_keywords["moods"]
+        if moods_list:
+            hashtags.append(f"#{moods_list[0]}")
+    
+    # 3개가 안 되면 기본값 추가
+    while len(hashtags) < 3:
+        hashtags.append("#특별한")
+    
+    # 응답 생성 (수정된 구조)
+    response = {
+        "story_id": formatted_story_id,
+        "original_story": story["story"],
         
-        # 이미지 URL에서 spp 제거
-        image_url = matched_flower.image_url
-        if image_url and "-spp-" in image_url:
-            image_url = image_url.replace("-spp-", "-")
+        # 해시태그 (감정과 무드 중심 3개)
+        "hashtags": hashtags[:3],
         
-        # 스토리 ID 생성 (S{순번}만 사용)
-        story_number = story_id.replace("story_", "").replace("S", "")
-        formatted_story_id = f"S{story_number}"  # T01 제거
+        # 감정 분석 결과 (3개로 확장, 100을 3개로 분리)
+        "emotions": [
+            {
+                "emotion": emotion.emotion,
+                "percentage": emotion.percentage
+            } for emotion in emotions[:3]  # 최대 3개
+        ],
         
-        # 계절 정보 생성 (시즌과 월 분리)
-        season_info = {"season": "All Season", "months": "01-12"}  # 기본값, 실제로는 꽃 데이터에서 가져와야 함
+        # 꽃 정보
+        "flower_name": matched_flower.korean_name,
+        "flower_name_en": matched_flower.flower_name,
+        "scientific_name": matched_flower.scientific_name,
+        "flower_card_message": flower_card_message.dict(),
+        "flower_image_url": image_url,  # spp 제거된 URL 사용
         
-        # 해시태그 생성 (감정 2개, 무드 1개)
-        hashtags = []
+        # 꽃 조합 정보 (메인꽃 한글로 통일, 서브 플라워 2개로 확장)
+        "flower_blend": {
+            "main_flower": matched_flower.korean_name,  # 한글로 통일
+            "sub_flowers": _ensure_two_sub_flowers(composition.sub_flowers),  # 2개로 확장
+            "composition_name": composition.composition_name
+        },
         
-        # 감정 2개 추가
-        if predefined_keywords.get("emotions"):
-            emotions_list = predefined_keywords["emotions"]
-            for i, emotion in enumerate(emotions_list[:2]):  # 최대 2개
-                hashtags.append(f"#{emotion}")
+        # 계절 정보
+        "season_info": season_info,
         
-        # 무드 1개 추가
-        if predefined_keywords.get("moods"):
-            moods_list = predefined_keywords["moods"]
-            if moods_list:
-                hashtags.append(f"#{moods_list[0]}")
+        # 추천 코멘트 (필드명 변경)
+        "comment": recommendation_reason
+    }
+    
+    return response
+
+@router.post("/sample-stories/{story_id}/recommend")
+async def recommend_from_sample_story(story_id: str):
+    """샘플 사연의 미리 설정된 키워드로 꽃을 추천합니다. (사전 계산된 응답이 있으면 LLM 호출 없이 반환)"""
+    try:
+        # 사전 계산 / 이전에 계산한 응답 (카탈로그·프롬프트 버전이 바뀌면 자동 무효화)
+        cached = sample_story_responses.get(story_id)
+        if cached is not None:
+            return cached
         
-        # 3개가 안 되면 기본값 추가
-        while len(hashtags) < 3:
-            hashtags.append("#특별한")
+        # 샘플 사연 로드
+        stories = load_sample_stories()
+        story = next((s for s in stories if s["id"] == story_id), None)
         
-        # 응답 생성 (수정된 구조)
-        response = {
-            "story_id": formatted_story_id,
-            "original_story": story["story"],
-            
-            # 해시태그 (감정과 무드 중심 3개)
-            "hashtags": hashtags[:3],
-            
-            # 감정 분석 결과 (3개로 확장, 100을 3개로 분리)
-            "emotions": [
-                {
-                    "emotion": emotion.emotion,
-                    "percentage": emotion.percentage
-                } for emotion in emotions[:3]  # 최대 3개
-            ],
-            
-            # 꽃 정보
-            "flower_name": matched_flower.korean_name,
-            "flower_name_en": matched_flower.flower_name,
-            "scientific_name": matched_flower.scientific_name,
-            "flower_card_message": flower_card_message,
-            "flower_image_url": image_url,  # spp 제거된 URL 사용
-            
-            # 꽃 조합 정보 (메인꽃 한글로 통일, 서브 플라워 2개로 확장)
-            "flower_blend": {
-                "main_flower": matched_flower.korean_name,  # 한글로 통일
-                "sub_flowers": _ensure_two_sub_flowers(composition.sub_flowers),  # 2개로 확장
-                "composition_name": composition.composition_name
-            },
-            
-            # 계절 정보
-            "season_info": season_info,
-            
-            # 추천 코멘트 (필드명 변경)
-            "comment": recommendation_reason
-        }
+        if not story:
+            raise HTTPException(status_code=404, detail="사연을 찾을 수 없습니다.")
+        
+        fingerprint = sample_story_responses.current_fingerprint()
+        with deadline_scope() as deadline:
+            response = await build_sample_story_response(story)
+        
+        # 폴백으로 만든 응답은 보관하지 않음 (다음 요청에서 다시 LLM 으로 계산)
+        if not deadline.degraded_stages():
+            sample_story_responses.put(story_id, response, fingerprint)
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ 샘플 사연 추천 실패: {e}")
         raise HTTPException(status_code=500, detail=f"추천 처리 중 오류가 발생했습니다: {str(e)}")
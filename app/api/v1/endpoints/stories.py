@@ -14,7 +14,7 @@ router = APIRouter()
 async def create_story(request: StoryCreateRequest):
     """새로운 스토리 생성"""
     try:
-        story_data = story_manager.create_story(request)
+        story_data = await story_manager.create_story_async(request)
         return StoryResponse(
             success=True,
             message="스토리가 성공적으로 생성되었습니다.",
@@ -27,7 +27,7 @@ async def create_story(request: StoryCreateRequest):
 @router.get("/{story_id}", response_model=StoryResponse)
 async def get_story(story_id: str):
     """스토리 ID로 스토리 조회"""
-    story_data = story_manager.get_story(story_id)
+    story_data = await story_manager.get_story_async(story_id)
     if not story_data:
         raise HTTPException(status_code=404, detail="스토리를 찾을 수 없습니다.")
     
@@ -41,7 +41,7 @@ async def get_story(story_id: str):
 @router.post("/share", response_model=StoryShareResponse)
 async def share_story(request: StoryShareRequest):
     """스토리 공유 URL 생성"""
-    story_data = story_manager.get_story(request.story_id)
+    story_data = await story_manager.get_story_async(request.story_id)
     if not story_data:
         raise HTTPException(status_code=404, detail="스토리를 찾을 수 없습니다.")
     
@@ -64,7 +64,7 @@ async def get_shared_story(encoded_id: str):
     try:
         import base64
         story_id = base64.urlsafe_b64decode(encoded_id.encode()).decode()
-        story_data = story_manager.get_story(story_id)
+        story_data = await story_manager.get_story_async(story_id)
         
         if not story_data:
             raise HTTPException(status_code=404, detail="공유된 스토리를 찾을 수 없습니다.")
@@ -81,7 +81,7 @@ async def get_shared_story(encoded_id: str):
 @router.put("/{story_id}", response_model=StoryResponse)
 async def update_story(story_id: str, update_data: Dict[str, Any]):
     """스토리 업데이트"""
-    story_data = story_manager.update_story(story_id, update_data)
+    story_data = await story_manager.update_story_async(story_id, update_data)
     if not story_data:
         raise HTTPException(status_code=404, detail="스토리를 찾을 수 없습니다.")
     
@@ -95,7 +95,7 @@ async def update_story(story_id: str, update_data: Dict[str, Any]):
 @router.delete("/{story_id}")
 async def delete_story(story_id: str):
     """스토리 삭제"""
-    success = story_manager.delete_story(story_id)
+    success = await story_manager.delete_story_async(story_id)
     if not success:
         raise HTTPException(status_code=404, detail="스토리를 찾을 수 없습니다.")
     
@@ -119,7 +119,7 @@ async def get_daily_story_count(date_str: str):
 @router.get("/list/all")
 async def get_all_stories():
     """모든 스토리 목록 조회 (관리자용)"""
-    stories = story_manager.get_all_stories()
+    stories = await story_manager.get_all_stories_async()
     return {
         "success": True,
         "total_count": len(stories),
@@ -130,7 +130,7 @@ async def get_all_stories():
 @router.get("/list/by-date/{date_str}")
 async def get_stories_by_date(date_str: str):
     """특정 날짜의 스토리 목록 조회"""
-    stories = story_manager.get_stories_by_date(date_str)
+    stories = await story_manager.get_stories_by_date_async(date_str)
     return {
         "success": True,
         "date": date_str,
@@ -142,7 +142,7 @@ async def get_stories_by_date(date_str: str):
 @router.get("/list/by-flower/{flower_name}")
 async def get_stories_by_flower(flower_name: str):
     """특정 꽃에 대한 스토리 목록 조회"""
-    stories = story_manager.get_stories_by_flower(flower_name)
+    stories = await story_manager.get_stories_by_flower_async(flower_name)
     return {
         "success": True,
         "flower_name": flower_name,
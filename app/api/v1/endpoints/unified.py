@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import os
 import json
 from datetime import datetime
@@ -10,7 +10,14 @@ from app.services.realtime_context_extractor import RealtimeContextExtractor
 from app.services.flower_matcher import FlowerMatcher
 from app.services.composition_recommender import CompositionRecommender
 from app.services.smart_websocket_extractor import SmartWebSocketExtractor
+from app.services.fused_extractor import extract_emotions_and_context_async, extraction_memo
+from app.services.flower_catalog import get_flower_catalog
+from app.services.openai_client import get_async_openai_client
+from app.services.llm_cache import llm_cache
+from app.services.model_router import model_router
+from app.services.request_deadline import deadline_scope
 from app.utils.request_deduplication import request_deduplicator
+from app.pipelines.dag_executor import Pipeline
 
 router = APIRouter()
 
@@ -55,6 +62,9 @@ class UnifiedRecommendResponse(BaseModel):
     
     # 식별자
     story_id: Optional[str] = None  # 스토리 ID (추천 ID와 동일)
+    
+    # 요청 예산 초과 / LLM 실패로 폴백된 스테이지
+    degraded_stages: List[str] = []
 
 
 
@@ -220,100 +230,24 @@ async def unified_recommend(req: UnifiedRecommendRequest):
         if not request_deduplicator.should_process_request(request_id):
             raise HTTPException(status_code=429, detail="요청이 너무 빠릅니다. 잠시 후 다시 시도해주세요.")
         
-        # 1. 감정 분석
-        emotion_analyzer = EmotionAnalyzer()
-        emotions = emotion_analyzer.analyze(req.story)
-        
-        # 2. 컨텍스트 추출
-        context_extractor = RealtimeContextExtractor()
-        excluded_keywords = req.excluded_flowers if req.excluded_flowers else []
-        context = context_extractor.extract_context_realtime(req.story, emotions, excluded_keywords)
-        
-        # 3. 업데이트된 컨텍스트 적용
-        if req.updated_context:
-            if req.updated_context.get('emotions'):
-                context.emotions = req.updated_context['emotions']
-            if req.updated_context.get('situations'):
-                context.situations = req.updated_context['situations']
-            if req.updated_context.get('moods'):
-                context.moods = req.updated_context['moods']
-            if req.updated_context.get('colors'):
-                context.colors = req.updated_context['colors']
-        
-        # 4. 꽃 매칭
-        flower_matcher = FlowerMatcher()
-        mentioned_flower = context.mentioned_flower if hasattr(context, 'mentioned_flower') else None
-        matched_flower = flower_matcher.match(emotions, req.story, context.user_intent, excluded_keywords, mentioned_flower, context)
-        
-        # flower_dictionary.json에서 계절 정보 가져오기
-        def get_season_from_dictionary(flower_name: str, scientific_name: str) -> tuple:
-            """flower_dictionary.json에서 계절 정보 반환"""
-            try:
-                with open("data/flower_dictionary.json", "r", encoding="utf-8") as f:
-                    flower_dict = json.load(f)
-                
-                # 꽃 이름으로 매칭
-                for flower_id, flower_data in flower_dict["flowers"].items():
-                    if (flower_data.get("korean_name") == flower_name or 
-                        flower_data.get("scientific_name") == scientific_name):
-                        
-                        seasonality = flower_data.get("seasonality", ["봄", "여름"])
-                        
-                        # 한글 계절명을 영문으로 변환
-                        season_mapping = {
-                            "봄": "Spring",
-                            "여름": "Summer", 
-                            "가을": "Fall",
-                            "겨울": "Winter"
-                        }
-                        
-                        english_seasons = []
-                        for season in seasonality:
-                            if season in season_mapping:
-                                english_seasons.append(season_mapping[season])
-                        
-                        # 계절 범위 결정
-                        if len(english_seasons) >= 4:
-                            return ("All Season", "01-12")
-                        elif "Spring" in english_seasons and "Summer" in english_seasons:
-                            return ("Spring / Summer", "03-08")
-                        elif "Summer" in english_seasons and "Fall" in english_seasons:
-                            return ("Summer / Fall", "06-11")
-                        elif "Fall" in english_seasons and "Winter" in english_seasons:
-                            return ("Fall / Winter", "09-02")
-                        elif "Winter" in english_seasons and "Spring" in english_seasons:
-                            return ("Winter / Spring", "12-05")
-                        else:
-                            return ("Spring / Summer", "03-08")
-                
-                return ("Spring / Summer", "03-08")  # 기본값
-                
-            except Exception as e:
-                print(f"❌ flower_dictionary.json 로드 실패: {e}")
-                return ("Spring / Summer", "03-08")
-        
-        # 현재 추천된 꽃의 계절 정보 추출
-        season_display, season_range = get_season_from_dictionary(
-            matched_flower.korean_name, 
-            matched_flower.scientific_name
+        # DAG 파이프라인 실행 (계절 / 구성 / 추천 이유 / 영문 설명 / 해시태그는 동시에 실행)
+        pipeline_run = unified_recommend_pipeline.new_run(
+            story=req.story,
+            req=req,
+            excluded_keywords=req.excluded_flowers if req.excluded_flowers else []
         )
-        
-        # 5. 구성 추천
-        composition_recommender = CompositionRecommender()
-        composition = composition_recommender.recommend(matched_flower, emotions)
-        
-        # 6. 추천 이유 생성
-        from app.api.v1.endpoints.recommend import _generate_unified_recommendation_reason
-        reason = _generate_unified_recommendation_reason(matched_flower, composition, emotions, req.story, context, excluded_keywords)
-        
-        # 7. 영문 설명 생성
-        english_description = _generate_english_description(matched_flower, context)
-        
-        # 8. 해시태그 생성
-        hashtags = _generate_hashtags(matched_flower, context)
-        
-        # 9. 스토리 저장
-        story_id = _save_story(req.story, emotions, matched_flower, composition, reason)
+        # 요청 예산 안에서 실행 (예산이 끝난 LLM 스테이지는 규칙 기반 폴백)
+        with deadline_scope() as deadline:
+            try:
+                (emotions, matched_flower, season, composition, reason,
+                 english_description, hashtags, story_id) = await pipeline_run.resolve(
+                    "emotions", "matched_flower", "season", "composition", "reason",
+                    "english_description", "hashtags", "story_id"
+                )
+            finally:
+                pipeline_run.cancel_pending()
+                print(pipeline_run.summary())
+        season_display, season_range = season
         
         # 10. 응답 구성 - UI 요구사항에 맞춰 확장
         # 기존 데이터베이스 구조에 맞춰 필드명 수정
@@ -337,7 +271,8 @@ async def unified_recommend(req: UnifiedRecommendRequest):
             created_at=datetime.now().strftime("%Y-%m-%d"),
             your_story=req.story,
             comment=reason,
-            story_id=story_id  # 추천 ID와 동일
+            story_id=story_id,  # 추천 ID와 동일
+            degraded_stages=deadline.degraded_stages()
         )
         
         # 결과 캐시
@@ -348,11 +283,10 @@ async def unified_recommend(req: UnifiedRecommendRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"추천 실패: {str(e)}")
 
-def _generate_english_description(flower: Any, context: Any) -> str:
-    """영문 설명 생성"""
+async def _generate_english_description(flower: Any, context: Any) -> str:
+    """영문 설명 생성 (AsyncOpenAI)"""
     try:
-        import openai
-        client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        client = get_async_openai_client()
         
         prompt = f"""
 Create a brief, elegant English description for this flower recommendation:
@@ -364,14 +298,15 @@ Write a 1-2 sentence description that captures the essence of this flower recomm
 Make it poetic and meaningful.
 """
         
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+        # 캐시 / 스케줄러 / 요청 예산을 공통 경로에서 처리
+        content = await llm_cache.achat_completion(
+            client,
+            "english_description",
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=100,
-            temperature=0.7
+            **model_router.route("english_description").params()
         )
         
-        return response.choices[0].message.content.strip()
+        return content.strip()
         
     except Exception as e:
         # 폴백 영문 설명
@@ -432,3 +367,109 @@ def _save_story(story: str, emotions: List, flower: Any, composition: Any, reaso
     except Exception as e:
         print(f"스토리 저장 실패: {e}")
         return None
+
+
+# ============================
+# 통합 추천 파이프라인 (DAG)
+# ============================
+
+def _get_season_from_dictionary(flower_name: str, scientific_name: str) -> tuple:
+    """꽃 카탈로그에서 계절 정보 반환"""
+    try:
+        # 꽃 이름으로 매칭 (공유 꽃 카탈로그)
+        flower_data = get_flower_catalog().find_by_name(flower_name, scientific_name)
+        if flower_data is not None:
+            seasonality = flower_data.get("seasonality", ["봄", "여름"])
+            
+            # 한글 계절명을 영문으로 변환
+            season_mapping = {
+                "봄": "Spring",
+                "여름": "Summer", 
+                "가을": "Fall",
+                "겨울": "Winter"
+            }
+            
+            english_seasons = []
+            for season in seasonality:
+                if season in season_mapping:
+                    english_seasons.append(season_mapping[season])
+            
+            # 계절 범위 결정
+            if len(english_seasons) >= 4:
+                return ("All Season", "01-12")
+            elif "Spring" in english_seasons and "Summer" in english_seasons:
+                return ("Spring / Summer", "03-08")
+            elif "Summer" in english_seasons and "Fall" in english_seasons:
+                return ("Summer / Fall", "06-11")
+            elif "Fall" in english_seasons and "Winter" in english_seasons:
+                return ("Fall / Winter", "09-02")
+            elif "Winter" in english_seasons and "Spring" in english_seasons:
+                return ("Winter / Spring", "12-05")
+            else:
+                return ("Spring / Summer", "03-08")
+        
+        return ("Spring / Summer", "03-08")  # 기본값
+        
+    except Exception as e:
+        print(f"❌ 꽃 카탈로그 계절 정보 조회 실패: {e}")
+        return ("Spring / Summer", "03-08")
+
+async def _extract_stage(story: str, excluded_keywords: List) -> Tuple[List, Any]:
+    """1. 감정 분석 + 2. 컨텍스트 추출 (EXTRACTION_MODE 에 따라 fused / legacy)"""
+    return await extract_emotions_and_context_async(story, excluded_keywords)
+
+def _emotions_stage(extraction: Tuple[List, Any]) -> List:
+    """감정 분석 결과"""
+    return extraction[0]
+
+def _extract_context_stage(extraction: Tuple[List, Any], req: UnifiedRecommendRequest) -> Any:
+    """3. 업데이트된 컨텍스트 적용"""
+    context = extraction[1]
+    
+    # 업데이트된 컨텍스트 적용
+    if req.updated_context:
+        if req.updated_context.get('emotions'):
+            context.emotions = req.updated_context['emotions']
+        if req.updated_context.get('situations'):
+            context.situations = req.updated_context['situations']
+        if req.updated_context.get('moods'):
+            context.moods = req.updated_context['moods']
+        if req.updated_context.get('colors'):
+            context.colors = req.updated_context['colors']
+    
+    return context
+
+def _match_flower_stage(story: str, emotions: List, context: Any, excluded_keywords: List) -> Any:
+    """4. 꽃 매칭"""
+    flower_matcher = FlowerMatcher()
+    mentioned_flower = context.mentioned_flower if hasattr(context, 'mentioned_flower') else None
+    return flower_matcher.match(emotions, story, context.user_intent, excluded_keywords, mentioned_flower, context)
+
+def _season_stage(matched_flower: Any) -> tuple:
+    """현재 추천된 꽃의 계절 정보 추출"""
+    return _get_season_from_dictionary(matched_flower.korean_name, matched_flower.scientific_name)
+
+def _recommend_composition_stage(matched_flower: Any, emotions: List) -> Any:
+    """5. 구성 추천"""
+    composition_recommender = CompositionRecommender()
+    return composition_recommender.recommend(matched_flower, emotions)
+
+async def _generate_reason_stage(matched_flower: Any, composition: Any, emotions: List, story: str, context: Any, excluded_keywords: List) -> str:
+    """6. 추천 이유 생성"""
+    from app.api.v1.endpoints.recommend import _generate_unified_recommendation_reason_async
+    return await _generate_unified_recommendation_reason_async(matched_flower, composition, emotions, story, context, excluded_keywords)
+
+unified_recommend_pipeline = Pipeline("unified-recommend")
+unified_recommend_pipeline.add_stage("extraction", _extract_stage, ["story", "excluded_keywords"], memo=extraction_memo)
+unified_recommend_pipeline.add_stage("emotions", _emotions_stage, ["extraction"])
+unified_recommend_pipeline.add_stage("context", _extract_context_stage, ["extraction", "req"])
+unified_recommend_pipeline.add_stage("matched_flower", _match_flower_stage, ["story", "emotions", "context", "excluded_keywords"])
+unified_recommend_pipeline.add_stage("season", _season_stage, ["matched_flower"])
+unified_recommend_pipeline.add_stage("composition", _recommend_composition_stage, ["matched_flower", "emotions"])
+unified_recommend_pipeline.add_stage("reason", _generate_reason_stage,
+                                     ["matched_flower", "composition", "emotions", "story", "context", "excluded_keywords"])
+# 7. 영문 설명 / 8. 해시태그
+unified_recommend_pipeline.add_stage("english_description", _generate_english_description, ["matched_flower", "context"])
+unified_recommend_pipeline.add_stage("hashtags", _generate_hashtags, ["matched_flower", "context"])
+# 9. 스토리 저장
+unified_recommend_pipeline.add_stage("story_id", _save_story, ["story", "emotions", "matched_flower", "composition", "reason"])
@@ -5,6 +5,82 @@ import os
 class Settings(BaseModel):
     app_env: str = os.getenv("APP_ENV", "dev")
 
+    # 꽃 카탈로그 백그라운드 동기화 (Google Drive / Spreadsheet)
+    catalog_sync_enabled: bool = os.getenv("CATALOG_SYNC_ENABLED", "false").lower() == "true"
+    catalog_sync_interval_seconds: int = int(os.getenv("CATALOG_SYNC_INTERVAL_SECONDS", "3600"))
+
+    # 공유 OpenAI 클라이언트 (커넥션 풀 / 타임아웃)
+    openai_timeout_seconds: float = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "20"))
+    openai_connect_timeout_seconds: float = float(os.getenv("OPENAI_CONNECT_TIMEOUT_SECONDS", "5"))
+    openai_max_connections: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "50"))
+    openai_max_keepalive_connections: int = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    openai_keepalive_expiry_seconds: float = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY_SECONDS", "60"))
+    openai_max_retries: int = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+    # 감정 분석 + 맥락 추출 방식 (legacy: 2회 호출, fused: 1회 통합 호출)
+    extraction_mode: str = os.getenv("EXTRACTION_MODE", "legacy")
+    fused_extraction_model: str = os.getenv("FUSED_EXTRACTION_MODEL", "gpt-4o-mini")
+
+    # 로컬 감정 분류기 (off | primary - 신뢰도가 임계값 이상이면 LLM 감정 분석 생략)
+    emotion_classifier_mode: str = os.getenv("EMOTION_CLASSIFIER_MODE", "off")
+    emotion_classifier_threshold: float = float(os.getenv("EMOTION_CLASSIFIER_THRESHOLD", "0.7"))
+    emotion_classifier_path: str = os.getenv("EMOTION_CLASSIFIER_PATH", "data/models/emotion_classifier.npz")
+
+    # 꽃 매칭 후보 역색인 (키워드 / 무드 / 색상으로 점수가 0 이 아닐 수 있는 꽃만 점수 계산)
+    flower_candidate_index_enabled: bool = os.getenv("FLOWER_CANDIDATE_INDEX_ENABLED", "true").lower() == "true"
+
+    # 사연별 순위 세션 (story_id 로 키워드 제외 / 다른 꽃 보기 / 색상 변경을 다시 순위만 계산)
+    ranking_session_ttl_seconds: float = float(os.getenv("RANKING_SESSION_TTL_SECONDS", "1800"))
+    ranking_session_max_size: int = int(os.getenv("RANKING_SESSION_MAX_SIZE", "1000"))
+
+    # 컴파일된 꽃 카탈로그 아티팩트 (scripts/compile_flower_catalog.py, 원본 JSON 해시가 같을 때만 사용, 빈 값이면 사용 안 함)
+    flower_catalog_artifact_path: str = os.getenv("FLOWER_CATALOG_ARTIFACT_PATH", "data/flower_catalog.bin")
+
+    # 감정 분석 + 맥락 추출 결과를 사연 단위로 메모 (키워드 칩만 바뀐 요청은 꽃 매칭부터 다시 계산)
+    stage_memo_enabled: bool = os.getenv("STAGE_MEMO_ENABLED", "true").lower() == "true"
+    stage_memo_ttl_seconds: float = float(os.getenv("STAGE_MEMO_TTL_SECONDS", "600"))
+    stage_memo_max_size: int = int(os.getenv("STAGE_MEMO_MAX_SIZE", "500"))
+
+    # 요청 단위 지연 시간 예산 (초과 시 스테이지별 규칙 기반 폴백)
+    request_deadline_seconds: float = float(os.getenv("REQUEST_DEADLINE_SECONDS", "4.0"))
+
+    # 전역 LLM 스케줄러 (모델별 동시 실행 제한 / 대기열)
+    llm_max_concurrency: int = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+    llm_model_concurrency: str = os.getenv("LLM_MODEL_CONCURRENCY", "gpt-4=8,gpt-4o-mini=32,gpt-3.5-turbo=16")
+    llm_max_queue_depth: int = int(os.getenv("LLM_MAX_QUEUE_DEPTH", "64"))
+    llm_max_queue_wait_seconds: float = float(os.getenv("LLM_MAX_QUEUE_WAIT_SECONDS", "2.0"))
+
+    # 모델 라우터 (작업별 모델 선택, SLO 는 "작업=ms" 목록으로 덮어쓰기)
+    llm_router_enabled: bool = os.getenv("LLM_ROUTER_ENABLED", "true").lower() == "true"
+    llm_router_slo_ms: str = os.getenv("LLM_ROUTER_SLO_MS", "")
+
+    # 꽃카드 인용구 검색 (LLM 은 상위 후보 재정렬에만 선택적으로 사용)
+    card_quote_top_k: int = int(os.getenv("CARD_QUOTE_TOP_K", "5"))
+    card_quote_llm_rerank: bool = os.getenv("CARD_QUOTE_LLM_RERANK", "false").lower() == "true"
+
+    # 실시간 키워드 WebSocket 에서 추천 파이프라인 예측 실행 (세션당 / 전체 동시 실행 상한)
+    speculative_prefetch_enabled: bool = os.getenv("SPECULATIVE_PREFETCH_ENABLED", "false").lower() == "true"
+    speculative_prefetch_max_per_session: int = int(os.getenv("SPECULATIVE_PREFETCH_MAX_PER_SESSION", "2"))
+    speculative_prefetch_max_in_flight: int = int(os.getenv("SPECULATIVE_PREFETCH_MAX_IN_FLIGHT", "8"))
+    speculative_prefetch_budget_seconds: float = float(os.getenv("SPECULATIVE_PREFETCH_BUDGET_SECONDS", "20"))
+    speculative_prefetch_ttl_seconds: float = float(os.getenv("SPECULATIVE_PREFETCH_TTL_SECONDS", "300"))
+
+    # OpenAI 서킷 브레이커 (실패가 몰리면 네트워크 호출 없이 바로 폴백)
+    llm_breaker_enabled: bool = os.getenv("LLM_BREAKER_ENABLED", "true").lower() == "true"
+    llm_breaker_failure_threshold: int = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+    llm_breaker_window_seconds: float = float(os.getenv("LLM_BREAKER_WINDOW_SECONDS", "30"))
+    llm_breaker_open_seconds: float = float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "15"))
+    llm_breaker_half_open_probes: int = int(os.getenv("LLM_BREAKER_HALF_OPEN_PROBES", "1"))
+    llm_breaker_close_successes: int = int(os.getenv("LLM_BREAKER_CLOSE_SUCCESSES", "2"))
+
+    # LLM 응답 캐시 (메모리 LRU + 로컬 SQLite)
+    llm_cache_enabled: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    llm_cache_path: str = os.getenv("LLM_CACHE_PATH", "data/cache/llm_cache.sqlite3")
+    llm_cache_memory_size: int = int(os.getenv("LLM_CACHE_MEMORY_SIZE", "512"))
+
+    # 시작 시 워밍업
+    warmup_recommendation_enabled: bool = os.getenv("WARMUP_RECOMMENDATION_ENABLED", "true").lower() == "true"
+
 @lru_cache()
 def get_settings():
     return Settings()
@@ -3,15 +3,41 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from fastapi import WebSocket
+from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
 import os
+import asyncio
 from datetime import datetime
 
 from app.api.v1.router import api_v1_router
+from app.core.config import get_settings
+from app.services.catalog_sync_scheduler import catalog_sync_scheduler
+from app.services.openai_client import close_openai_clients
+from app.services.warmup import run_warmup, warmup_state
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작/종료 훅 - 워밍업, 카탈로그 동기화, 공유 클라이언트 정리"""
+    # 워밍업은 백그라운드에서 실행하고 /ready 로 완료 여부를 알림
+    warmup_task = asyncio.create_task(asyncio.to_thread(run_warmup, warmup_state))
+    
+    # 꽃 카탈로그 백그라운드 동기화 (요청 경로에서 동기화하지 않음)
+    if get_settings().catalog_sync_enabled:
+        catalog_sync_scheduler.start()
+    
+    yield
+    
+    if not warmup_task.done():
+        warmup_task.cancel()
+    if catalog_sync_scheduler.running:
+        catalog_sync_scheduler.stop()
+    await close_openai_clients()
 
 app = FastAPI(
     title="Floiy-Reco API",
     description="꽃 추천 시스템 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -54,18 +80,41 @@ async def health_check():
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/ready")
+async def readiness_check():
+    """레디니스 체크 엔드포인트 (워밍업 완료 후에만 ready)"""
+    if not warmup_state.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up", **warmup_state.to_dict()})
+    return {"status": "ready", "timestamp": datetime.now().isoformat()}
+
 @app.get("/health/detailed")
 async def detailed_health_check():
-    """상세 헬스체크 엔드포인트 (모니터링용)"""
+    """상세 헬스체크 엔드포인트 (모니터링용, 실제 상태 확인)"""
+    from app.services.flower_catalog import get_flower_catalog
+    from app.services.story_manager import story_manager
+    from app.services.llm_scheduler import llm_scheduler
+    from app.services.llm_circuit_breaker import llm_circuit_breaker
+    
+    catalog = get_flower_catalog()
+    services = {
+        "api": "running",
+        "warmup": "ready" if warmup_state.ready else "warming_up",
+        "catalog": "loaded" if len(catalog) > 0 else "empty",
+        "database": "supabase" if story_manager.supabase_available else "local_only",
+        "openai": "configured" if os.getenv("OPENAI_API_KEY") else "not_configured"
+    }
+    healthy = warmup_state.ready and len(catalog) > 0
+    
     return {
-        "status": "healthy",
+        "status": "healthy" if healthy else "degraded",
         "timestamp": datetime.now().isoformat(),
         "version": "1.0.0",
-        "services": {
-            "api": "running",
-            "database": "connected",
-            "openai": "available"
-        }
+        "services": services,
+        "catalog": catalog.info(),
+        "catalog_sync": catalog_sync_scheduler.get_status(),
+        "llm_scheduler": llm_scheduler.get_stats(),
+        "llm_circuit_breaker": llm_circuit_breaker.get_stats(),
+        "warmup": warmup_state.to_dict()
     }
 
 @app.get("/admin")
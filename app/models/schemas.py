@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -43,6 +43,7 @@ class RecommendRequest(BaseModel):
     selected_keywords: Optional[Dict[str, List[str]]] = None  # 선택된 키워드 (emotions, situations, moods, colors)
     excluded_keywords: Optional[List[Dict[str, str]]] = None  # 제외된 키워드 (text, type)
     updated_context: Optional[Dict[str, List[str]]] = None  # 업데이트된 컨텍스트 (emotions, situations, moods, colors)
+    session_token: Optional[str] = None  # 실시간 키워드 WebSocket 세션 토큰 (미리 실행된 추천 결과 이어받기)
 
 class RecommendationItem(BaseModel):
     id: str
@@ -64,6 +65,8 @@ class RecommendationItem(BaseModel):
 class EmotionAnalysis(BaseModel):
     emotion: str
     percentage: float
+    # 감정 블렌드 출처 (llm / local / fallback) - 서버에서만 기록, 요청으로 받거나 응답에 내보내지 않음
+    _source: Optional[str] = PrivateAttr(default=None)
 
 class RecommendResponse(BaseModel):
     recommendations: List[RecommendationItem]
@@ -73,6 +76,7 @@ class RecommendResponse(BaseModel):
     # 새로운 키워드 구조 추가
     extracted_keywords: Optional[KeywordDimension] = None  # 추출된 키워드 (메인 + 대안)
     final_keywords: Optional[Dict[str, List[str]]] = None  # 최종 선택된 키워드
+    degraded_stages: List[str] = []  # 요청 예산 초과 / LLM 실패로 폴백된 스테이지
 
 class FlowerMatch(BaseModel):
     flower_name: str
@@ -88,6 +92,15 @@ class FlowerComposition(BaseModel):
     sub_flowers: List[str]
     composition_name: str
 
+class RankedFlower(BaseModel):
+    """순위가 매겨진 꽃 (점수 분해 포함)"""
+    flower_id: str
+    korean_name: str
+    scientific_name: str
+    color: str = ""
+    score: float
+    breakdown: Dict[str, float] = {}  # 감정 / 색상 / 관계 / 맥락 / 이벤트 / 꽃말 점수, 배율 (의미 기반 매칭만)
+
 class EmotionAnalysisResponse(BaseModel):
     emotions: List[EmotionAnalysis]
     matched_flower: FlowerMatch
@@ -99,6 +112,25 @@ class EmotionAnalysisResponse(BaseModel):
     # 새로운 키워드 구조 추가
     extracted_keywords: Optional[KeywordDimension] = None  # 추출된 키워드 (메인 + 대안)
     final_keywords: Optional[str] = None  # 최종 선택된 키워드
+    degraded_stages: List[str] = []  # 요청 예산 초과 / LLM 실패로 폴백된 스테이지
+    ranked_flowers: List[RankedFlower] = []  # 상위 top_k 개 꽃 (1위 = matched_flower)
+
+class RerankRequest(BaseModel):
+    """보관된 점수로 다시 순위 계산 (감정 분석 / 맥락 추출 없이)"""
+    story_id: str
+    excluded_keywords: Optional[List[Dict[str, str]]] = None  # 제외된 키워드 전체 (text, type)
+    excluded_flowers: List[str] = []  # 제외할 꽃 (flower_id / 학명 / 한국어 이름)
+    preferred_colors: Optional[List[str]] = None  # 색상 변경
+    show_another: bool = False  # 지금까지 보여준 꽃을 빼고 다음 꽃
+    top_k: int = Field(default=3, ge=1, le=10)
+
+class RerankResponse(BaseModel):
+    story_id: str
+    matched_flower: FlowerMatch
+    composition: FlowerComposition
+    recommendation_reason: str  # 규칙 기반 추천 이유 (LLM 재호출 없음)
+    flower_card_message: Optional[FlowerCardMessage] = None
+    ranked_flowers: List[RankedFlower] = []
 
 class FlowerInfo(BaseModel):
     """꽃 정보 모델"""
@@ -193,6 +225,7 @@ class StoryData(BaseModel):
     hashtags: List[str] = []  # 해시태그
     color_keywords: List[str] = []  # 색상 키워드
     excluded_keywords: List[Dict[str, str]] = []  # 제외된 키워드들
+    emotion_source: Optional[str] = None  # 감정 블렌드 출처 (llm / local / fallback, 없으면 출처 미상)
 
 class StoryCreateRequest(BaseModel):
     """스토리 생성 요청"""
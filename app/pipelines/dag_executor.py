@@ -0,0 +1,160 @@
+"""
+DAG 기반 파이프라인 실행기
+- 각 스테이지는 입력(다른 스테이지 이름 또는 초기값 키)을 선언
+- 서로 의존하지 않는 스테이지는 asyncio 로 동시에 실행
+- 스테이지 결과는 요청(실행) 단위로 메모이즈
+- memo 를 지정한 스테이지는 요청 간에도 입력 키로 결과를 재사용 (stage_memo.StageMemo)
+"""
+import time
+import asyncio
+import inspect
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from app.pipelines.stage_memo import StageMemo, degraded_count
+
+
+class Stage:
+    """파이프라인 스테이지 정의"""
+
+    def __init__(self, name: str, func: Callable[..., Any], inputs: Sequence[str] = (), memo: Optional[StageMemo] = None):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.memo = memo
+        # 코루틴 함수는 이벤트 루프에서, 일반 함수는 스레드에서 실행 (블로킹 I/O 대비)
+        self.is_async = inspect.iscoroutinefunction(func)
+
+
+class Pipeline:
+    """스테이지 그래프 정의 (요청 간 공유, 불변으로 사용)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stages: Dict[str, Stage] = {}
+
+    def add_stage(self, name: str, func: Callable[..., Any], inputs: Sequence[str] = (),
+                  memo: Optional[StageMemo] = None) -> "Pipeline":
+        """스테이지 추가 (입력 순서대로 인자 전달, memo 가 있으면 요청 간 결과 재사용)"""
+        if name in self.stages:
+            raise ValueError(f"중복된 스테이지 이름: {name}")
+        self.stages[name] = Stage(name, func, inputs, memo)
+        return self
+
+    def stage(self, name: str, inputs: Sequence[str] = ()):
+        """스테이지 등록 데코레이터"""
+        def decorator(func):
+            self.add_stage(name, func, inputs)
+            return func
+        return decorator
+
+    def validate(self, initial_keys: Iterable[str] = ()):
+        """누락된 입력과 순환 의존성 검사"""
+        known = set(initial_keys) | set(self.stages)
+        for stage in self.stages.values():
+            missing = [dep for dep in stage.inputs if dep not in known]
+            if missing:
+                raise ValueError(f"스테이지 '{stage.name}' 입력 누락: {missing}")
+
+        visiting, visited = set(), set()
+
+        def visit(name: str, path: List[str]):
+            if name in visited or name not in self.stages:
+                return
+            if name in visiting:
+                raise ValueError(f"순환 의존성: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dep in self.stages[name].inputs:
+                visit(dep, path + [name])
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.stages:
+            visit(name, [])
+
+    def new_run(self, **initial: Any) -> "PipelineRun":
+        """요청 단위 실행 컨텍스트 생성"""
+        self.validate(initial.keys())
+        return PipelineRun(self, initial)
+
+    async def run(self, targets: Optional[Sequence[str]] = None, **initial: Any) -> Dict[str, Any]:
+        """파이프라인 실행 후 전체 결과 반환"""
+        pipeline_run = self.new_run(**initial)
+        await pipeline_run.resolve(*(targets or self.stages.keys()))
+        return pipeline_run.values
+
+
+class PipelineRun:
+    """요청 단위 실행 상태 (스테이지 결과 메모이즈)"""
+
+    def __init__(self, pipeline: Pipeline, initial: Dict[str, Any]):
+        self.pipeline = pipeline
+        self.values: Dict[str, Any] = dict(initial)
+        self.timings: Dict[str, int] = {}
+        self.memo_hits: List[str] = []
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._started_at = time.time()
+
+    async def get(self, name: str) -> Any:
+        """스테이지 결과 조회 (아직 실행 전이면 실행, 실행 중이면 대기)"""
+        if name in self.values:
+            return self.values[name]
+        if name not in self.pipeline.stages:
+            raise KeyError(f"알 수 없는 스테이지: {name}")
+        task = self._tasks.get(name)
+        if task is None:
+            task = asyncio.ensure_future(self._execute(self.pipeline.stages[name]))
+            self._tasks[name] = task
+        return await asyncio.shield(task)
+
+    def provide(self, name: str, value: Any):
+        """스테이지 밖에서 계산한 결과 주입 (예: 스트리밍으로 생성한 텍스트) - 이후 해당 스테이지는 실행하지 않음"""
+        if name in self._tasks:
+            raise ValueError(f"이미 실행된 스테이지: {name}")
+        self.values[name] = value
+
+    async def resolve(self, *names: str) -> List[Any]:
+        """여러 스테이지를 동시에 실행하고 결과 반환"""
+        return list(await asyncio.gather(*(self.get(name) for name in names)))
+
+    async def _execute(self, stage: Stage) -> Any:
+        """입력 스테이지를 모두 기다린 뒤 스테이지 실행"""
+        args = await self.resolve(*stage.inputs)
+        start_time = time.time()
+        memo_key = stage.memo.key(*args) if stage.memo is not None else None
+        if memo_key is not None:
+            hit, result = stage.memo.lookup(memo_key)
+            if hit:
+                self.timings[stage.name] = int((time.time() - start_time) * 1000)
+                self.memo_hits.append(stage.name)
+                self.values[stage.name] = result
+                return result
+        degraded_before = degraded_count()
+        try:
+            if stage.is_async:
+                result = await stage.func(*args)
+            else:
+                result = await asyncio.to_thread(stage.func, *args)
+        finally:
+            self.timings[stage.name] = int((time.time() - start_time) * 1000)
+        if memo_key is not None:
+            # 실행 중에 폴백이 기록됐으면 (예산 초과 / LLM 오류) 메모하지 않음
+            if degraded_count() > degraded_before:
+                stage.memo.skip_degraded()
+            else:
+                stage.memo.store(memo_key, result)
+        self.values[stage.name] = result
+        return result
+
+    def cancel_pending(self):
+        """아직 끝나지 않은 스테이지 취소"""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+
+    def summary(self) -> str:
+        """스테이지별 소요 시간 요약"""
+        total_ms = int((time.time() - self._started_at) * 1000)
+        stages = ", ".join(
+            f"{name}={ms}ms" + ("(메모)" if name in self.memo_hits else "") for name, ms in self.timings.items()
+        )
+        return f"⏱️ [{self.pipeline.name}] 총 {total_ms}ms ({stages})"
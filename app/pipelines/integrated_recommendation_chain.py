@@ -2,6 +2,7 @@
 통합 추천 체인 (LLM 기반 실시간 맥락 추출 + 꽃 추천)
 """
 import time
+import asyncio
 from typing import List, Dict, Any
 from app.services.realtime_context_extractor import RealtimeContextExtractor, ExtractedContext
 from app.services.emotion_analyzer import EmotionAnalyzer
@@ -11,7 +12,9 @@ from app.services.recommendation_reason_generator import RecommendationReasonGen
 from app.services.image_matcher import ImageMatcher
 from app.services.recommendation_logger import RecommendationLogger
 from app.services.story_manager import StoryManager
+from app.services.flower_catalog import get_flower_catalog
 from app.utils.flower_card_generator import generate_flower_card_message
+from app.pipelines.dag_executor import Pipeline
 from app.models.schemas import RecommendRequest, RecommendResponse, RecommendationItem, FlowerCardMessage
 import json
 
@@ -25,17 +28,26 @@ class IntegratedRecommendationChain:
         self.image_matcher = ImageMatcher()
         self.logger = RecommendationLogger()
         self.story_manager = StoryManager()
+        self.pipeline = self._build_pipeline()
     
-    def run(self, request: RecommendRequest) -> RecommendResponse:
-        """통합 추천 체인 실행"""
-        start_time = time.time()
-        
-        print(f"🚀 통합 추천 체인 시작")
-        print(f"   고객 스토리: {request.story[:50]}...")
-        
-        # 1단계: LLM 기반 실시간 맥락 추출
+    def _build_pipeline(self) -> Pipeline:
+        """추천 체인 DAG 구성 (맥락 추출 / 감정 분석, 추천 이유 / 카드 메시지 / 시즌 / 스토리 ID 는 동시에 실행)"""
+        pipeline = Pipeline("integrated-recommendation")
+        pipeline.add_stage("extracted_context", self._extract_context_stage, ["story"])
+        pipeline.add_stage("emotion_analysis", self._analyze_emotions_stage, ["story"])
+        pipeline.add_stage("matched_flower", self._match_flower_stage, ["emotion_analysis", "story"])
+        pipeline.add_stage("composition", self._composition_stage, ["matched_flower", "emotion_analysis"])
+        pipeline.add_stage("recommendation_reason", self._reason_stage,
+                           ["emotion_analysis", "matched_flower", "composition", "story", "extracted_context"])
+        pipeline.add_stage("card_message", self._card_message_stage, ["matched_flower", "emotion_analysis", "story"])
+        pipeline.add_stage("season_info", self._season_info_stage, ["matched_flower"])
+        pipeline.add_stage("story_id", self._story_id_stage, ["matched_flower"])
+        return pipeline
+    
+    def _extract_context_stage(self, story: str) -> ExtractedContext:
+        """1단계: LLM 기반 실시간 맥락 추출"""
         print(f"🔍 1단계: LLM 실시간 맥락 추출")
-        extracted_context = self.context_extractor.extract_context_realtime(request.story)
+        extracted_context = self.context_extractor.extract_context_realtime(story)
         
         print(f"   추출된 맥락:")
         print(f"     감정: {extracted_context.emotions}")
@@ -43,44 +55,80 @@ class IntegratedRecommendationChain:
         print(f"     무드: {extracted_context.moods}")
         print(f"     컬러: {extracted_context.colors}")
         print(f"     신뢰도: {extracted_context.confidence:.2f}")
-        
-        # 2단계: 감정 분석 (원래 EmotionAnalyzer 서비스 사용)
+        return extracted_context
+    
+    def _analyze_emotions_stage(self, story: str):
+        """2단계: 감정 분석 (원래 EmotionAnalyzer 서비스 사용)"""
         print(f"🎯 2단계: 감정 분석")
-        emotion_analysis = self.emotion_analyzer.analyze(request.story)
+        emotion_analysis = self.emotion_analyzer.analyze(story)
         
         # 첫 번째 감정의 emotion 속성 사용
         primary_emotion = emotion_analysis[0].emotion if emotion_analysis else "따뜻함"
         print(f"   주요 감정: {primary_emotion}")
         print(f"   감정 비율: {[f'{e.emotion}({e.percentage}%)' for e in emotion_analysis]}")
-        
-        # 3단계: 꽃 매칭
+        return emotion_analysis
+    
+    def _match_flower_stage(self, emotion_analysis, story: str):
+        """3단계: 꽃 매칭"""
         print(f"🌺 3단계: 꽃 매칭")
-        matched_flower = self.flower_matcher.match(emotion_analysis, request.story, "meaning_based")
-        
+        matched_flower = self.flower_matcher.match(emotion_analysis, story, "meaning_based")
         print(f"   매칭된 꽃: {matched_flower.flower_name}")
-        
-        # 4단계: 꽃 구성 추천
+        return matched_flower
+    
+    def _composition_stage(self, matched_flower, emotion_analysis):
+        """4단계: 꽃 구성 추천"""
         print(f"🌿 4단계: 꽃 구성 추천")
         composition = self.composition_recommender.recommend(matched_flower, emotion_analysis)
-        
         print(f"   구성: {composition.composition_name}")
-        
-        # 5단계: 추천 이유 생성
+        return composition
+    
+    def _reason_stage(self, emotion_analysis, matched_flower, composition, story: str, extracted_context: ExtractedContext) -> Dict[str, str]:
+        """5단계: 추천 이유 생성"""
         print(f"💭 5단계: 추천 이유 생성")
-        
-        # 추천 이유 생성
-        recommendation_reason = self.reason_generator.generate_reason(
+        return self.reason_generator.generate_reason(
             emotion_analysis,
             [matched_flower],  # 단일 꽃을 리스트로 변환
             composition,  # CompositionRecommender 결과 사용
-            request.story,
+            story,
             extracted_context.colors
         )
-        
-        # 6단계: 스토리 ID 생성
+    
+    def _card_message_stage(self, matched_flower, emotion_analysis, story: str) -> Dict[str, str]:
+        """꽃카드 메시지 생성 (요청당 한 번만 호출)"""
+        return generate_flower_card_message(matched_flower, emotion_analysis, story)
+    
+    def _season_info_stage(self, matched_flower) -> Dict[str, str]:
+        """시즌 정보 조회"""
+        return self._get_season_info(matched_flower.flower_name)
+    
+    def _story_id_stage(self, matched_flower) -> str:
+        """6단계: 스토리 ID 생성"""
         print(f"📝 6단계: 스토리 ID 생성")
         story_id = self.story_manager._generate_story_id(matched_flower.flower_name)
         print(f"   생성된 스토리 ID: {story_id}")
+        return story_id
+    
+    def run(self, request: RecommendRequest) -> RecommendResponse:
+        """통합 추천 체인 실행 (동기 호출용)"""
+        return asyncio.run(self.arun(request))
+    
+    async def arun(self, request: RecommendRequest) -> RecommendResponse:
+        """통합 추천 체인 실행"""
+        start_time = time.time()
+        
+        print(f"🚀 통합 추천 체인 시작")
+        print(f"   고객 스토리: {request.story[:50]}...")
+        
+        pipeline_run = self.pipeline.new_run(story=request.story)
+        try:
+            (extracted_context, emotion_analysis, matched_flower, composition,
+             recommendation_reason, card_message, season_info, story_id) = await pipeline_run.resolve(
+                "extracted_context", "emotion_analysis", "matched_flower", "composition",
+                "recommendation_reason", "card_message", "season_info", "story_id"
+            )
+        finally:
+            pipeline_run.cancel_pending()
+            print(pipeline_run.summary())
         
         # 단일 추천 아이템 생성
         recommendation_id = f"R{story_id.split('-')[-1]}"  # 스토리 ID의 마지막 부분 사용
@@ -98,8 +146,8 @@ class IntegratedRecommendationChain:
             original_story=request.story,
             extracted_keywords=extracted_context.emotions + extracted_context.situations + extracted_context.moods + extracted_context.colors,
             flower_keywords=matched_flower.keywords,
-            season_info=self._get_season_info(matched_flower.flower_name),
-            english_message=f"{generate_flower_card_message(matched_flower, emotion_analysis, request.story)['quote']}\n{generate_flower_card_message(matched_flower, emotion_analysis, request.story)['source']}",
+            season_info=season_info,
+            english_message=f"{card_message['quote']}\n{card_message['source']}",
             recommendation_reason=recommendation_reason["professional_reason"]
         )
         
@@ -209,33 +257,28 @@ class IntegratedRecommendationChain:
     def _get_season_info(self, flower_name: str) -> Dict[str, str]:
         """꽃의 시즌 정보 반환 (시즌과 월 분리)"""
         try:
-            # flower_dictionary.json에서 꽃 정보 찾기
-            with open("data/flower_dictionary.json", "r", encoding="utf-8") as f:
-                flower_data = json.load(f)
-            
-            # 꽃 이름으로 검색
-            for flower_id, flower_info in flower_data["flowers"].items():
-                if (flower_info.get("korean_name") == flower_name or 
-                    flower_info.get("scientific_name") == flower_name):
-                    seasonality = flower_info.get("seasonality", [])
-                    if len(seasonality) == 4:
-                        return {"season": "All Season", "months": "01-12"}
-                    elif len(seasonality) == 2:
-                        seasons = " ".join(seasonality)
-                        if "봄" in seasons and "여름" in seasons:
-                            return {"season": "Spring/Summer", "months": "03-08"}
-                        elif "가을" in seasons and "겨울" in seasons:
-                            return {"season": "Fall/Winter", "months": "09-02"}
-                    elif len(seasonality) == 1:
-                        season = seasonality[0]
-                        if season == "봄":
-                            return {"season": "Spring", "months": "03-05"}
-                        elif season == "여름":
-                            return {"season": "Summer", "months": "06-08"}
-                        elif season == "가을":
-                            return {"season": "Fall", "months": "09-11"}
-                        elif season == "겨울":
-                            return {"season": "Winter", "months": "12-02"}
+            # 공유 꽃 카탈로그에서 꽃 이름으로 검색
+            flower_info = get_flower_catalog().find_by_name(flower_name)
+            if flower_info is not None:
+                seasonality = flower_info.get("seasonality", [])
+                if len(seasonality) == 4:
+                    return {"season": "All Season", "months": "01-12"}
+                elif len(seasonality) == 2:
+                    seasons = " ".join(seasonality)
+                    if "봄" in seasons and "여름" in seasons:
+                        return {"season": "Spring/Summer", "months": "03-08"}
+                    elif "가을" in seasons and "겨울" in seasons:
+                        return {"season": "Fall/Winter", "months": "09-02"}
+                elif len(seasonality) == 1:
+                    season = seasonality[0]
+                    if season == "봄":
+                        return {"season": "Spring", "months": "03-05"}
+                    elif season == "여름":
+                        return {"season": "Summer", "months": "06-08"}
+                    elif season == "가을":
+                        return {"season": "Fall", "months": "09-11"}
+                    elif season == "겨울":
+                        return {"season": "Winter", "months": "12-02"}
             
             return {"season": "All Season", "months": "01-12"}  # 기본값
             
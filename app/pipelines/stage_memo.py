@@ -0,0 +1,89 @@
+"""
+요청 간 스테이지 결과 메모 (입력으로 만든 키 → 결과)
+- 같은 사연에 키워드 칩만 바꾼 요청은 감정 분석 / 맥락 추출 같은 앞쪽 스테이지를 다시 실행하지 않고
+  바뀐 입력에 의존하는 뒤쪽 스테이지 (꽃 매칭 / 구성 / 추천 이유) 만 다시 계산
+- 결과는 꺼낼 때마다 깊은 복사 (다음 스테이지가 결과를 고쳐 써도 메모는 그대로)
+- 실행 중에 폴백(degraded)이 기록된 결과는 메모하지 않음 (다음 요청에서 LLM 결과로 다시 시도)
+- TTL + 최대 개수 (오래된 것부터 제거) 로 제한
+"""
+import copy
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.services.request_deadline import current_deadline
+
+
+class StageMemo:
+    """스테이지 결과 메모 (key_func 는 스테이지 입력을 그대로 받아 해시 가능한 키를 반환)"""
+
+    def __init__(self, name: str, key_func: Callable[..., Hashable], ttl_seconds: float, max_size: int):
+        self.name = name
+        self.key_func = key_func
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "stored": 0, "skipped_degraded": 0, "expired": 0, "evicted": 0}
+
+    def key(self, *args: Any) -> Optional[Hashable]:
+        """메모 키 (키를 만들 수 없는 입력이면 None → 메모 없이 실행)"""
+        try:
+            return self.key_func(*args)
+        except Exception as e:
+            print(f"⚠️ [{self.name}] 메모 키 생성 실패: {e}")
+            return None
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """(적중 여부, 결과 복사본)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            value = entry[1]
+        return True, copy.deepcopy(value)
+
+    def store(self, key: Hashable, value: Any):
+        """결과 복사본 저장"""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats["evicted"] += 1
+            self.stats["stored"] += 1
+
+    def skip_degraded(self):
+        with self._lock:
+            self.stats["skipped_degraded"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "ttl_seconds": self.ttl_seconds,
+                "max_size": self.max_size,
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+
+def degraded_count() -> int:
+    """현재 요청에 기록된 폴백 스테이지 수 (요청 예산 밖이면 0)"""
+    deadline = current_deadline()
+    return len(deadline.degraded_stages()) if deadline is not None else 0
@@ -0,0 +1,150 @@
+"""
+꽃 카탈로그 백그라운드 동기화 스케줄러
+"""
+import time
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.core.config import get_settings
+from app.services.flower_catalog import FlowerCatalog, get_flower_catalog, set_flower_catalog
+
+
+class CatalogSyncScheduler:
+    """Google Drive / Spreadsheet 동기화를 요청 경로 밖에서 실행하고 카탈로그를 원자적으로 교체"""
+
+    def __init__(self, interval_seconds: int = 3600):
+        self.interval_seconds = interval_seconds
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._sync_lock = threading.Lock()
+        self._swap_lock = threading.Lock()
+
+        # 상태 정보
+        self.last_sync_started_at: Optional[datetime] = None
+        self.last_sync_finished_at: Optional[datetime] = None
+        self.last_sync_duration_ms: Optional[int] = None
+        self.last_sync_success: Optional[bool] = None
+        self.last_sync_error: Optional[str] = None
+        self.last_swapped_at: Optional[datetime] = None
+        self.sync_count = 0
+        self.swap_count = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """주기적 동기화 스레드 시작"""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="catalog-sync", daemon=True)
+        self._thread.start()
+        print(f"🔄 카탈로그 동기화 스케줄러 시작 (주기: {self.interval_seconds}초)")
+
+    def stop(self):
+        """동기화 스레드 중지"""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+        print("🛑 카탈로그 동기화 스케줄러 중지")
+
+    def trigger(self) -> bool:
+        """즉시 동기화 요청 (스레드가 없으면 별도 스레드로 1회 실행)"""
+        if self._sync_lock.locked():
+            return False
+        if self.running:
+            self._wake_event.set()
+        else:
+            threading.Thread(target=self.sync_once, name="catalog-sync-once", daemon=True).start()
+        return True
+
+    def _run_loop(self):
+        """동기화 루프"""
+        while not self._stop_event.is_set():
+            self.sync_once()
+            self._wake_event.wait(timeout=self.interval_seconds)
+            self._wake_event.clear()
+
+    def sync_once(self) -> bool:
+        """동기화 1회 실행 후 새 카탈로그 버전으로 교체"""
+        if not self._sync_lock.acquire(blocking=False):
+            print("⚠️ 카탈로그 동기화가 이미 진행 중입니다")
+            return False
+
+        start_time = time.time()
+        self.last_sync_started_at = datetime.now()
+        try:
+            success = self._run_drive_sync()
+            if success:
+                self.reload_catalog()
+            self.last_sync_success = success
+            self.last_sync_error = None if success else "동기화 결과 없음"
+            return success
+        except Exception as e:
+            print(f"❌ 카탈로그 동기화 실패: {e}")
+            self.last_sync_success = False
+            self.last_sync_error = str(e)
+            return False
+        finally:
+            self.last_sync_duration_ms = int((time.time() - start_time) * 1000)
+            self.last_sync_finished_at = datetime.now()
+            self.sync_count += 1
+            self._sync_lock.release()
+
+    def reload_catalog(self) -> bool:
+        """flower_dictionary.json 으로 새 카탈로그를 만든 뒤 버전이 바뀌었으면 한 번에 교체 (교체 여부 반환)
+        - 동기화 스레드와 관리자 API (꽃 사전 수정 / 삭제, 스프레드시트 / 드라이브 동기화) 가 함께 사용
+        """
+        with self._swap_lock:
+            new_catalog = FlowerCatalog.from_file()
+            if len(new_catalog) == 0:
+                raise ValueError("동기화된 카탈로그가 비어 있습니다")
+            if new_catalog.version == get_flower_catalog().version:
+                print(f"✅ 꽃 카탈로그 변경 없음 (version={new_catalog.version})")
+                return False
+            self._prepare_catalog(new_catalog)
+            set_flower_catalog(new_catalog)
+            self.last_swapped_at = datetime.now()
+            self.swap_count += 1
+            print(f"✅ 꽃 카탈로그 교체 완료: {len(new_catalog)}개 꽃 (version={new_catalog.version})")
+            return True
+
+    def _prepare_catalog(self, catalog: FlowerCatalog):
+        """교체 전에 새 카탈로그의 점수 인덱스 / 유사도 표를 미리 컴파일 (교체 직후 요청이 컴파일하지 않도록)"""
+        try:
+            from app.services.flower_score_index import derive_flower_scoring_index
+            derive_flower_scoring_index(catalog)
+        except Exception as e:
+            print(f"⚠️ 새 카탈로그 점수 인덱스 사전 컴파일 실패 (첫 요청에서 컴파일): {e}")
+
+    def _run_drive_sync(self) -> bool:
+        """Google Drive API 동기화 실행"""
+        from scripts.google_drive_api_sync import GoogleDriveAPISync
+        syncer = GoogleDriveAPISync()
+        return bool(syncer.sync())
+
+    def get_status(self) -> Dict[str, Any]:
+        """동기화 상태 정보"""
+        return {
+            "running": self.running,
+            "in_progress": self._sync_lock.locked(),
+            "interval_seconds": self.interval_seconds,
+            "last_sync_started_at": self.last_sync_started_at.isoformat() if self.last_sync_started_at else None,
+            "last_sync_finished_at": self.last_sync_finished_at.isoformat() if self.last_sync_finished_at else None,
+            "last_sync_duration_ms": self.last_sync_duration_ms,
+            "last_sync_success": self.last_sync_success,
+            "last_sync_error": self.last_sync_error,
+            "last_swapped_at": self.last_swapped_at.isoformat() if self.last_swapped_at else None,
+            "sync_count": self.sync_count,
+            "swap_count": self.swap_count,
+            "catalog": get_flower_catalog().info(),
+        }
+
+
+# 전역 인스턴스
+catalog_sync_scheduler = CatalogSyncScheduler(interval_seconds=get_settings().catalog_sync_interval_seconds)
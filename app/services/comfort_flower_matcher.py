@@ -5,16 +5,14 @@
 from typing import Dict, List, Tuple
 import re
 
+from app.services.keyword_automaton import scan_keywords
+
 
 class ComfortFlowerMatcher:
     """위로/슬픔 상황 특화 꽃 매칭"""
     
     def __init__(self):
-        # 위로/슬픔 상황 키워드
-        self.comfort_keywords = [
-            "무지개다리를 건넌", "돌아가신", "별이 된", "위로", "슬픔", "이별", 
-            "반려견", "반려동물", "애도", "추모", "고인", "상주", "장례", "별세"
-        ]
+        # 위로/슬픔 상황 키워드는 data/keyword_rules.json 의 comfort.situations (오토마톤으로 컴파일)
         
         # 위로 관련 꽃말 키워드
         self.comfort_flower_keywords = [
@@ -76,8 +74,7 @@ class ComfortFlowerMatcher:
     
     def is_comfort_situation(self, story: str) -> bool:
         """위로/슬픔 상황인지 판단"""
-        story_lower = story.lower()
-        return any(keyword in story_lower for keyword in self.comfort_keywords)
+        return scan_keywords(story).any("comfort.situations")
     
     def apply_comfort_bonus(self, flower_data: Dict, story: str, base_score: float) -> Tuple[float, List[str]]:
         """위로/슬픔 상황 보너스 적용"""
@@ -122,7 +119,7 @@ class ComfortFlowerMatcher:
             applied_bonuses.append(f"❌ 화려한 색상 페널티: {flower_color} (x0.3)")
         
         # 5. 무지개 관련 키워드가 있을 때 특별 처리
-        if "무지개" in story.lower():
+        if scan_keywords(story).any("comfort.rainbow"):
             # 무지개색상 꽃에 강한 페널티
             rainbow_colors = ["레드", "오렌지", "옐로우", "그린", "블루", "퍼플"]
             if flower_color in rainbow_colors:
@@ -159,10 +156,9 @@ class ComfortFlowerMatcher:
             return color_keywords
         
         filtered_colors = []
-        story_lower = story.lower()
         
         # 무지개 관련 키워드가 있을 때 강력한 필터링
-        if "무지개" in story_lower:
+        if scan_keywords(story).any("comfort.rainbow"):
             # 무지개색상 완전 제거, 위로에 적합한 색상만 사용
             for color in self.comfort_colors:
                 if color not in filtered_colors:
@@ -5,6 +5,10 @@ import os
 import json
 from typing import List, Dict, Any
 from app.models.schemas import FlowerMatch
+from app.services.openai_client import get_openai_client
+from app.services.llm_scheduler import llm_scheduler
+from app.services.llm_circuit_breaker import llm_circuit_breaker
+from app.services.model_router import model_router
 
 class DesignFlowerMatcher:
     def __init__(self):
@@ -78,20 +82,19 @@ class DesignFlowerMatcher:
             return self._fallback_design_match(design_preferences, story)
         
         try:
-            import openai
-            client = openai.OpenAI(api_key=self.openai_api_key)
+            client = get_openai_client(self.openai_api_key)
             
             prompt = self._create_design_matching_prompt(design_preferences, story)
             
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "당신은 디자인과 스타일 요구사항에 맞는 꽃을 매칭하는 전문가입니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=300
-            )
+            route = model_router.route("design_flower_matching", story)
+            with llm_circuit_breaker.guard("design_flower_matching"), llm_scheduler.slot(route.model):
+                response = client.chat.completions.create(
+                    messages=[
+                        {"role": "system", "content": "당신은 디자인과 스타일 요구사항에 맞는 꽃을 매칭하는 전문가입니다."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    **route.params()
+                )
             
             result = response.choices[0].message.content
             return self._parse_design_matching_response(result, design_preferences)
@@ -6,6 +6,12 @@ import json
 from typing import List
 from dotenv import load_dotenv
 from app.models.schemas import EmotionAnalysis
+from app.services.openai_client import get_openai_client, get_async_openai_client
+from app.services.llm_cache import llm_cache
+from app.services.model_router import model_router
+from app.services.local_emotion_classifier import (
+    EMOTION_SOURCE_FALLBACK, EMOTION_SOURCE_LLM, EMOTION_SOURCE_LOCAL, local_emotion_classifier, mark_emotion_source
+)
 
 class EmotionAnalyzer:
     def __init__(self):
@@ -18,46 +24,79 @@ class EmotionAnalyzer:
             print(f"✅ OpenAI API 키 로드됨: {self.openai_api_key[:10]}...")
     
     def analyze(self, story: str) -> List[EmotionAnalysis]:
-        """LLM 기반 감정 분석"""
+        """LLM 기반 감정 분석 (로컬 분류기 신뢰도가 높으면 LLM 생략)"""
+        local_emotions = self._local_analysis(story)
+        if local_emotions:
+            return local_emotions
+        
         if not self.openai_api_key:
             return self._fallback_analysis(story)
         
         try:
-            import openai
-            client = openai.OpenAI(api_key=self.openai_api_key)
-            
-            prompt = self._create_emotion_prompt(story)
-            
-            response = client.chat.completions.create(
-                model="gpt-4",  # GPT-4로 업그레이드 (더 정교한 감정 분석)
-                messages=[
-                    {"role": "system", "content": "당신은 고객의 이야기에서 감정을 정확히 분석하는 전문가입니다. 반드시 3가지 감정을 블렌딩하여 분석해주세요."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=400
-            )
-            
-            result = response.choices[0].message.content
-            print(f"🤖 LLM 감정 분석 응답: {result}")
-            
-            # 특별 키워드 체크 제거 - LLM에 맡김
-            
-            try:
-                print(f"🔍 감정 분석 파싱 시도...")
-                emotions = self._parse_emotion_response(result)
-                print(f"🔍 파싱 성공: {emotions}")
-                return emotions
-                
-            except Exception as e:
-                print(f"❌ 감정 분석 파싱 실패: {e}")
-                print(f"🔧 폴백 시스템으로 전환")
-                return self._fallback_analysis(story)
-            
+            client = get_openai_client(self.openai_api_key)
+            result = llm_cache.chat_completion(client, "emotion_analysis", **self._create_llm_request(story))
         except Exception as e:
             print(f"❌ LLM 감정 분석 실패: {e}")
             print(f"🔧 폴백 시스템으로 전환")
             return self._fallback_analysis(story)
+        
+        return self._handle_llm_result(result, story)
+    
+    async def analyze_async(self, story: str) -> List[EmotionAnalysis]:
+        """LLM 기반 감정 분석 (AsyncOpenAI - 이벤트 루프를 막지 않음)"""
+        local_emotions = self._local_analysis(story)
+        if local_emotions:
+            return local_emotions
+        
+        if not self.openai_api_key:
+            return self._fallback_analysis(story)
+        
+        try:
+            client = get_async_openai_client(self.openai_api_key)
+            result = await llm_cache.achat_completion(client, "emotion_analysis", **self._create_llm_request(story))
+        except Exception as e:
+            print(f"❌ LLM 감정 분석 실패: {e}")
+            print(f"🔧 폴백 시스템으로 전환")
+            return self._fallback_analysis(story)
+        
+        return self._handle_llm_result(result, story)
+    
+    def _local_analysis(self, story: str) -> List[EmotionAnalysis]:
+        """로컬 감정 분류기 결과 (비활성화 / 신뢰도 미달이면 빈 리스트 → LLM)"""
+        prediction = local_emotion_classifier.predict(story)
+        if prediction is None:
+            return []
+        return mark_emotion_source([
+            EmotionAnalysis(emotion=emotion, percentage=percentage, description="")
+            for emotion, percentage in prediction.blend
+        ], EMOTION_SOURCE_LOCAL)
+    
+    def _create_llm_request(self, story: str) -> dict:
+        """감정 분석 LLM 호출 파라미터 (동기/비동기 공통)"""
+        # 모델 / 토큰 / 온도는 라우터가 결정 (기본 GPT-4, 짧은 사연이나 지연 시 gpt-4o-mini)
+        return {
+            **model_router.route("emotion_analysis", story).params(),
+            "messages": [
+                {"role": "system", "content": "당신은 고객의 이야기에서 감정을 정확히 분석하는 전문가입니다. 반드시 3가지 감정을 블렌딩하여 분석해주세요."},
+                {"role": "user", "content": self._create_emotion_prompt(story)}
+            ]
+        }
+    
+    def _handle_llm_result(self, result: str, story: str) -> List[EmotionAnalysis]:
+        """LLM 응답 파싱 (실패 시 폴백)"""
+        print(f"🤖 LLM 감정 분석 응답: {result}")
+        
+        try:
+            print(f"🔍 감정 분석 파싱 시도...")
+            emotions = self._parse_emotion_response(result)
+            print(f"🔍 파싱 성공: {emotions}")
+            local_emotion_classifier.record_llm_result(story, emotions[0].emotion if emotions else "")
+            return emotions
+            
+        except Exception as e:
+            print(f"❌ 감정 분석 파싱 실패: {e}")
+            print(f"🔧 폴백 시스템으로 전환")
+            return self._fallback_analysis(story)
     
     # 특별 키워드 체크 함수 제거 - LLM에 맡김
 
@@ -152,7 +191,7 @@ class EmotionAnalyzer:
                 print(f"⚠️ 비율 합계가 100%가 아님 ({total_percentage}%), 폴백 로직 사용")
                 return self._fallback_analysis("")
             
-            return emotions
+            return mark_emotion_source(emotions, EMOTION_SOURCE_LLM)
             
         except Exception as e:
             print(f"❌ LLM 응답 파싱 실패: {e}")
@@ -253,7 +292,7 @@ class EmotionAnalyzer:
             emotions[0].percentage += (100 - total_percentage)
             emotions[0].percentage = round(emotions[0].percentage, 1)
         
-        return emotions[:3]
+        return mark_emotion_source(emotions[:3], EMOTION_SOURCE_FALLBACK)
     
     def _get_emotion_description(self, emotion: str) -> str:
         # 감정 설명 제거 - 추천 이유에서 풍부하게 설명
@@ -0,0 +1,117 @@
+"""
+꽃 후보 역색인 (사연 → 점수가 0 보다 클 수 있는 꽃만 골라 점수 계산)
+- 점수 계산이 읽는 필드로 색인: moods / flower_meanings(primary) / usage_contexts / seasonal_events /
+  relationship_suitability 키워드 → 꽃 posting 목록, 꽃 색상값 → 꽃 posting 목록
+- 감정명은 moods 어휘 중 감정 유사도 > 0 인 항목, 요청 색상은 색상 유사도 > 0 인 색상값으로 확장 (감정 / 색상별 캐시)
+- 사연은 키워드 어휘 + 키워드의 단어 + 유사 키워드 그룹을 컴파일한 오토마톤으로 한 번 훑어
+  키워드 유사도 > 0 인 키워드를 찾음
+- 후보가 아닌 꽃은 감정 / 색상 / 키워드 유사도가 모두 0 이라 점수가 정확히 0
+  → 후보 중 최고 점수가 0 보다 크면 전체 계산과 1위가 같음 (아니면 FlowerMatcher 가 전체 계산으로 폴백)
+"""
+import threading
+from typing import Any, Dict, Iterable, List, Set
+
+from app.services.keyword_automaton import KeywordAutomaton
+from app.services.flower_score_index import (
+    SIMILAR_KEYWORDS, emotion_similarity, color_similarity, related_groups, flatten_moods, flower_colors,
+)
+
+# 감정 / 색상 확장 캐시 상한 (점수 인덱스의 열 캐시와 같은 이유)
+_EXPANSION_CACHE_SIZE = 512
+
+
+def _scored_keywords(flower: Dict) -> Iterable[str]:
+    """키워드 유사도 계산에 쓰이는 키워드 (관계 적합성 / 사용 맥락 / 계절 이벤트 / 대표 꽃말)"""
+    for keywords in flower.get('relationship_suitability', {}).values():
+        if isinstance(keywords, list):
+            yield from keywords
+    yield from flower.get('usage_contexts', [])
+    yield from flower.get('seasonal_events', [])
+    yield from flower.get('flower_meanings', {}).get('primary', [])
+
+
+class FlowerCandidateIndex:
+    """키워드 / 무드 / 색상 → 꽃 위치 역색인"""
+
+    def __init__(self, flowers: Dict[str, Dict]):
+        self.flower_ids = list(flowers)
+        self.size = len(self.flower_ids)
+        self._mood_postings: Dict[str, List[int]] = {}
+        self._color_postings: Dict[str, List[int]] = {}
+        keyword_postings: Dict[str, Set[int]] = {}
+
+        for position, flower in enumerate(flowers.values()):
+            for mood in flatten_moods(flower):
+                self._add(self._mood_postings, mood, position)
+            for color in flower_colors(flower):
+                self._add(self._color_postings, color, position)
+            for keyword in _scored_keywords(flower):
+                keyword_postings.setdefault(keyword.lower(), set()).add(position)
+
+        # 사연에 등장하면 키워드 유사도가 0 보다 커지는 패턴 → 꽃 위치
+        # (키워드 자체 = 완전 일치, 키워드의 단어 = 부분 일치, 관련 그룹의 유사 키워드 = 유사 키워드 매칭)
+        pattern_postings: Dict[str, Set[int]] = {}
+        for keyword, positions in keyword_postings.items():
+            patterns = {keyword, *keyword.split()}
+            for related, similar_list in zip(related_groups(keyword), SIMILAR_KEYWORDS.values()):
+                if related:
+                    patterns.update(similar_list)
+            for pattern in patterns:
+                pattern_postings.setdefault(pattern, set()).update(positions)
+        self._pattern_postings = [sorted(positions) for positions in pattern_postings.values()]
+        self._automaton = KeywordAutomaton(list(pattern_postings))
+
+        self._emotion_moods: Dict[str, List[str]] = {}
+        self._color_values: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _add(postings: Dict[str, List[int]], key: Any, position: int):
+        if not isinstance(key, str):
+            return
+        positions = postings.setdefault(key, [])
+        if not positions or positions[-1] != position:
+            positions.append(position)
+
+    def _expand(self, cache: Dict[str, List[str]], key: str, vocabulary: Iterable[str], similar) -> List[str]:
+        """감정명 / 색상명 → 유사도 > 0 인 어휘 (유사도 함수는 항목별로 독립이라 항목 하나씩 판정)"""
+        key = key.lower()
+        expanded = cache.get(key)
+        if expanded is None:
+            expanded = [term for term in vocabulary if similar(key, [term]) > 0]
+            with self._lock:
+                if len(cache) >= _EXPANSION_CACHE_SIZE:
+                    cache.clear()
+                cache[key] = expanded
+        return expanded
+
+    def candidates(self, emotions: List[Any], story: str, color_keywords: List[str]) -> List[int]:
+        """점수가 0 보다 클 수 있는 꽃 위치 (카탈로그 순서)"""
+        found: Set[int] = set()
+        for emotion in emotions:
+            for mood in self._expand(self._emotion_moods, emotion.emotion, self._mood_postings, emotion_similarity):
+                found.update(self._mood_postings[mood])
+        for color in color_keywords:
+            for value in self._expand(self._color_values, color, self._color_postings, color_similarity):
+                found.update(self._color_postings[value])
+        for pattern_id in self._automaton.scan(story.lower()):
+            found.update(self._pattern_postings[pattern_id])
+        return sorted(found)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "flowers": self.size,
+            "moods": len(self._mood_postings),
+            "colors": len(self._color_postings),
+            "patterns": len(self._pattern_postings),
+        }
+
+
+def get_flower_candidate_index(flowers: Dict[str, Dict]) -> FlowerCandidateIndex:
+    """꽃 데이터에 맞는 후보 역색인 (공유 카탈로그면 카탈로그 버전별로 한 번만 구축)"""
+    from app.services.flower_catalog import get_flower_catalog
+
+    catalog = get_flower_catalog()
+    if flowers is catalog.flowers:
+        return catalog.derive("flower_candidate_index", lambda c: FlowerCandidateIndex(c.flowers))
+    return FlowerCandidateIndex(flowers)
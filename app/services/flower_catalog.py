@@ -0,0 +1,275 @@
+"""
+꽃 카탈로그 서비스 (프로세스 전역, 불변)
+- flower_dictionary.json 은 로드할 때 인코딩 복구 + 색상 / 계절 정규화 (flower_catalog_compiler)
+- 꽃 레코드는 __slots__ 기반 읽기 전용 매핑 (FlowerRecord)
+"""
+import os
+import json
+import hashlib
+import threading
+from collections.abc import Mapping as MappingABC
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from app.core.config import get_settings
+from app.services.data_loader import DATA_DIR
+
+FLOWER_DICTIONARY_PATH = os.path.join(DATA_DIR, "flower_dictionary.json")
+
+# 모든 꽃 레코드에 있는 필드 (슬롯), 나머지 드문 필드는 extra 딕셔너리
+FLOWER_RECORD_FIELDS = (
+    "id", "scientific_name", "korean_name", "color", "flower_meanings", "moods", "characteristics",
+    "cultural_references", "design_compatibility", "design_incompatibility", "seasonality",
+    "care_level", "lifespan", "source", "created_at", "updated_at",
+)
+_FLOWER_RECORD_FIELD_SET = frozenset(FLOWER_RECORD_FIELDS)
+
+
+class FlowerRecord(MappingABC):
+    """꽃 레코드 (읽기 전용 매핑, 공통 필드는 __slots__ 에 보관해 레코드별 dict 를 만들지 않음)"""
+
+    __slots__ = FLOWER_RECORD_FIELDS + ("_extra",)
+
+    def __init__(self, data: Mapping[str, Any]):
+        extra = {}
+        for key, value in data.items():
+            if key in _FLOWER_RECORD_FIELD_SET:
+                object.__setattr__(self, key, value)
+            else:
+                extra[key] = value
+        object.__setattr__(self, "_extra", extra or None)
+
+    @classmethod
+    def from_row(cls, mask: int, values: List[Any], extra: Optional[Dict[str, Any]] = None) -> "FlowerRecord":
+        """컴파일된 행 (필드 존재 비트마스크 + 있는 필드 값 목록) 으로 생성"""
+        record = cls.__new__(cls)
+        values_iter = iter(values)
+        for bit, field in enumerate(FLOWER_RECORD_FIELDS):
+            if mask >> bit & 1:
+                object.__setattr__(record, field, next(values_iter))
+        object.__setattr__(record, "_extra", extra or None)
+        return record
+
+    def to_row(self) -> Tuple[int, List[Any], Optional[Dict[str, Any]]]:
+        """(필드 존재 비트마스크, 있는 필드 값 목록, 드문 필드)"""
+        mask, values = 0, []
+        for bit, field in enumerate(FLOWER_RECORD_FIELDS):
+            try:
+                values.append(getattr(self, field))
+            except AttributeError:
+                continue
+            mask |= 1 << bit
+        return mask, values, self._extra
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("FlowerRecord 는 읽기 전용입니다")
+
+    def __reduce__(self):
+        return FlowerRecord, (dict(self),)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FLOWER_RECORD_FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FLOWER_RECORD_FIELD_SET:
+            return getattr(self, key, default)
+        return self._extra.get(key, default) if self._extra is not None else default
+
+    def __contains__(self, key: object) -> bool:
+        if key in _FLOWER_RECORD_FIELD_SET:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for field in FLOWER_RECORD_FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> Dict[str, Any]:
+        """dict 복사본 (MappingProxyType.copy 와 같은 동작)"""
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return f"FlowerRecord({dict(self)!r})"
+
+
+class FlowerCatalog:
+    """flower_dictionary.json 을 한 번만 읽어 두는 읽기 전용 카탈로그"""
+
+    def __init__(self, flowers: Mapping[str, Mapping[str, Any]], version: Optional[str] = None, source: str = "memory"):
+        # 꽃 레코드는 읽기 전용 레코드로 바꿔서 서비스 간 공유
+        frozen = {
+            flower_id: data if isinstance(data, FlowerRecord) else FlowerRecord(data)
+            for flower_id, data in flowers.items()
+        }
+        self.flowers: Mapping[str, Mapping[str, Any]] = MappingProxyType(frozen)
+        self.version = version or self._compute_version(flowers)
+        self.source = source
+        self.loaded_at = datetime.now()
+
+        # 조회용 인덱스 (동일 이름의 색상별 레코드가 여러 개이므로 id 튜플로 보관)
+        self._by_korean_name = self._build_index("korean_name")
+        self._by_scientific_name = self._build_index("scientific_name")
+
+        # 카탈로그 버전별 파생 데이터 캐시
+        self._derived: Dict[str, Any] = {}
+        self._derived_lock = threading.Lock()
+
+    @staticmethod
+    def _compute_version(flowers: Mapping[str, Mapping[str, Any]]) -> str:
+        """내용 해시 기반 카탈로그 버전"""
+        payload = json.dumps(
+            {flower_id: dict(data) for flower_id, data in flowers.items()},
+            ensure_ascii=False, sort_keys=True, default=str
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+    def _build_index(self, field: str) -> Mapping[str, Tuple[str, ...]]:
+        """필드 값 -> flower_id 목록 인덱스 생성 (원본 순서 유지)"""
+        index: Dict[str, List[str]] = {}
+        for flower_id, data in self.flowers.items():
+            value = data.get(field)
+            if value:
+                index.setdefault(value, []).append(flower_id)
+        return MappingProxyType({key: tuple(ids) for key, ids in index.items()})
+
+    def __len__(self) -> int:
+        return len(self.flowers)
+
+    def __contains__(self, flower_id: str) -> bool:
+        return flower_id in self.flowers
+
+    def get(self, flower_id: str) -> Optional[Mapping[str, Any]]:
+        """flower_id 로 조회"""
+        return self.flowers.get(flower_id)
+
+    def get_by_korean_name(self, korean_name: str) -> List[Mapping[str, Any]]:
+        """한글명으로 조회 (색상별 레코드 전체)"""
+        return [self.flowers[flower_id] for flower_id in self._by_korean_name.get(korean_name, ())]
+
+    def get_by_scientific_name(self, scientific_name: str) -> List[Mapping[str, Any]]:
+        """학명으로 조회 (색상별 레코드 전체)"""
+        return [self.flowers[flower_id] for flower_id in self._by_scientific_name.get(scientific_name, ())]
+
+    def find_by_name(self, name: str, scientific_name: Optional[str] = None,
+                     partial: bool = False) -> Optional[Mapping[str, Any]]:
+        """한글명/학명으로 첫 번째 레코드 조회 (partial=True 면 한글명 부분 일치까지 허용)"""
+        if not name and not scientific_name:
+            return None
+
+        if partial:
+            # 부분 일치는 원본 순서대로 스캔해야 기존 결과와 동일함
+            name_lower = (name or "").lower()
+            exact_names = tuple(n for n in (name, scientific_name) if n)
+            for data in self.flowers.values():
+                if (data.get("korean_name") == name or
+                        data.get("scientific_name") in exact_names or
+                        (name_lower and name_lower in data.get("korean_name", "").lower())):
+                    return data
+            return None
+
+        # 정확 일치는 인덱스에서 원본 순서가 가장 빠른 레코드 선택
+        candidates = list(self._by_korean_name.get(name, ()))
+        candidates.extend(self._by_scientific_name.get(scientific_name or name, ()))
+        if not candidates:
+            return None
+        order = self._order()
+        return self.flowers[min(candidates, key=order.__getitem__)]
+
+    def get_seasonality(self, name: str, default: Optional[List[str]] = None) -> List[str]:
+        """꽃 이름으로 계절 정보 조회"""
+        data = self.find_by_name(name, partial=True)
+        if data is None:
+            return list(default or [])
+        return list(data.get("seasonality", default or []))
+
+    def _order(self) -> Dict[str, int]:
+        """flower_id -> 원본 순서"""
+        return self.derive("id_order", lambda catalog: {flower_id: i for i, flower_id in enumerate(catalog.flowers)})
+
+    def derive(self, key: str, builder: Callable[["FlowerCatalog"], Any]) -> Any:
+        """카탈로그 버전에 묶인 파생 데이터 (인덱스 등) 를 한 번만 계산해서 캐시"""
+        if key in self._derived:
+            return self._derived[key]
+        with self._derived_lock:
+            if key not in self._derived:
+                self._derived[key] = builder(self)
+            return self._derived[key]
+
+    def info(self) -> Dict[str, Any]:
+        """카탈로그 상태 정보"""
+        return {
+            "version": self.version,
+            "source": self.source,
+            "flower_count": len(self.flowers),
+            "loaded_at": self.loaded_at.isoformat(),
+        }
+
+    @classmethod
+    def from_file(cls, path: str = FLOWER_DICTIONARY_PATH, artifact_path: Optional[str] = None) -> "FlowerCatalog":
+        """flower_dictionary.json 에서 카탈로그 생성 (인코딩 복구 + 색상 / 계절 정규화)
+        - 같은 원본으로 컴파일한 아티팩트 (scripts/compile_flower_catalog.py) 가 있으면 파싱 / 복구 없이 아티팩트 로드"""
+        from app.services.flower_catalog_compiler import compile_flowers, load_catalog_artifact, source_digest
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = source_digest(raw)
+
+        if artifact_path is None:
+            artifact_path = get_settings().flower_catalog_artifact_path
+        if artifact_path:
+            loaded = load_catalog_artifact(artifact_path, digest)
+            if loaded is not None:
+                header, flowers = loaded
+                return cls(flowers, version=header["catalog_version"], source=artifact_path)
+
+        data = json.loads(raw.decode("utf-8"))
+        flowers, report = compile_flowers(data["flowers"] if "flowers" in data else data)
+        if report["repaired_total"] or report["invalid"]:
+            print(f"🔧 꽃 카탈로그 인코딩 복구: {report['repaired_total']}개 값 복구, "
+                  f"{len(report['invalid'])}개 값 복구 실패 (scripts/compile_flower_catalog.py 로 상세 보고서 확인)")
+        return cls(flowers, source=path)
+
+
+_catalog: Optional[FlowerCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_flower_catalog() -> FlowerCatalog:
+    """프로세스 전역 꽃 카탈로그 반환 (최초 호출 시 한 번만 로드)
+    - 로드 실패 시 빈 카탈로그를 반환하되 저장하지 않음 (다음 호출에서 다시 로드)
+    """
+    global _catalog
+    catalog = _catalog
+    if catalog is None:
+        with _catalog_lock:
+            catalog = _catalog
+            if catalog is None:
+                try:
+                    catalog = _catalog = FlowerCatalog.from_file()
+                    print(f"✅ 꽃 카탈로그 로드: {len(catalog)}개 꽃 (version={catalog.version})")
+                except Exception as e:
+                    print(f"❌ 꽃 카탈로그 로드 실패: {e}")
+                    catalog = FlowerCatalog({}, source="empty")
+    return catalog
+
+
+def set_flower_catalog(catalog: FlowerCatalog) -> FlowerCatalog:
+    """전역 카탈로그 교체 (새 버전으로 원자적 교체)"""
+    global _catalog
+    with _catalog_lock:
+        _catalog = catalog
+    return catalog
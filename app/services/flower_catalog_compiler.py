@@ -0,0 +1,291 @@
+"""
+꽃 카탈로그 컴파일러
+- 인코딩 복구: UTF-8 바이트를 latin-1 / cp1252 로 잘못 읽어 다시 저장한 값 (예: "ê±°ë² ë¼" → "거베라") 을 되돌림
+  (끝의 0xA0 바이트가 공백으로 잘려 나간 값도 복구, 정상 텍스트는 UTF-8 로 다시 읽히지 않으므로 그대로)
+- 정규화: 색상은 매칭에서 쓰는 통일된 색상명으로, 계절은 봄 / 여름 / 가을 / 겨울 로 (순서 유지, 중복 제거)
+- 검증: 복구 후에도 깨진 값 (C1 제어 문자 / U+FFFD) 과 필수 필드 누락을 보고서에 기록
+- 아티팩트: 헤더(JSON) + zlib 으로 압축한 marshal 행 목록 (flower_id + 필드 비트마스크 + 값 목록)
+  · marshal 은 같은 문자열 객체를 참조로 저장하므로 로드한 레코드도 색상 / 무드 / 꽃말 문자열을 공유
+  · 원본 JSON 의 해시, 복구 / 정규화 규칙 지문, 파이썬 버전이 헤더와 같을 때만 로드 (다르면 JSON 경로)
+"""
+import re
+import sys
+import json
+import zlib
+import marshal
+import struct
+import hashlib
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from app.services.flower_catalog import FLOWER_RECORD_FIELDS, FlowerCatalog, FlowerRecord
+
+ARTIFACT_MAGIC = b"PFCAT\n"
+ARTIFACT_FORMAT_VERSION = 1
+# 복구 / 정규화 함수의 동작을 바꾸면 올림 (규칙 표는 COMPILER_FINGERPRINT 에 자동 반영)
+COMPILER_VERSION = 1
+
+REQUIRED_FIELDS = ("id", "korean_name", "scientific_name", "color")
+
+# 카탈로그 색상 → 통일된 색상명 (FlowerMatcher 색상 매핑 / flower_id 색상 코드 기준)
+CANONICAL_COLORS = {
+    "white": "화이트", "wh": "화이트", "흰색": "화이트", "하얀색": "화이트",
+    "pink": "핑크", "pk": "핑크", "분홍": "핑크", "분홍색": "핑크",
+    "red": "레드", "rd": "레드", "빨강": "레드", "빨간색": "레드",
+    "yellow": "옐로우", "yl": "옐로우", "노랑": "옐로우", "노란색": "옐로우",
+    "orange": "오렌지", "or": "오렌지", "주황": "오렌지", "주황색": "오렌지",
+    "purple": "퍼플", "pu": "퍼플", "보라": "퍼플", "보라색": "퍼플",
+    "blue": "블루", "bl": "블루", "파랑": "블루", "파란색": "블루",
+    "green": "그린", "gr": "그린", "초록": "그린", "초록색": "그린",
+    "lilac": "라일락", "ll": "라일락", "연보라": "라일락",
+    "cream": "크림색", "cr": "크림색", "크림": "크림색",
+    "beige": "베이지", "be": "베이지",
+    "navy": "네이비", "nv": "네이비",
+}
+
+CANONICAL_SEASONS = {
+    "spring": ["봄"], "summer": ["여름"], "autumn": ["가을"], "fall": ["가을"], "winter": ["겨울"],
+    "봄철": ["봄"], "여름철": ["여름"], "가을철": ["가을"], "겨울철": ["겨울"],
+    "사계절": ["봄", "여름", "가을", "겨울"], "연중": ["봄", "여름", "가을", "겨울"],
+    "all": ["봄", "여름", "가을", "겨울"], "year-round": ["봄", "여름", "가을", "겨울"],
+}
+
+# latin-1 보충 영역 + cp1252 전용 문자 (UTF-8 바이트를 잘못 읽으면 나오는 문자)
+_MOJIBAKE_RE = re.compile(
+    "[\x80-\xff" + re.escape(bytes(range(0x80, 0xA0)).decode("cp1252", errors="ignore")) + "]"
+)
+_BROKEN_RE = re.compile("[\x80-\x9f\ufffd]")
+
+
+def _compiler_fingerprint() -> str:
+    """복구 / 정규화 규칙 지문 - 규칙이 바뀌면 이전 규칙으로 만든 아티팩트는 쓰지 않음"""
+    rules = {
+        "version": COMPILER_VERSION,
+        "required_fields": REQUIRED_FIELDS,
+        "colors": CANONICAL_COLORS,
+        "seasons": CANONICAL_SEASONS,
+        "mojibake": _MOJIBAKE_RE.pattern,
+        "broken": _BROKEN_RE.pattern,
+    }
+    raw = json.dumps(rules, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+COMPILER_FINGERPRINT = _compiler_fingerprint()
+
+
+def _mojibake_count(text: str) -> int:
+    return len(_MOJIBAKE_RE.findall(text))
+
+
+def _decode_once(text: str) -> Optional[str]:
+    """한 번 잘못 읽힌 값을 되돌림 (UTF-8 로 다시 읽히지 않으면 None)"""
+    for encoding in ("latin-1", "cp1252"):
+        try:
+            raw = text.encode(encoding)
+        except UnicodeEncodeError:
+            continue
+        try:
+            return raw.decode("utf-8")
+        except UnicodeDecodeError as e:
+            # 마지막 글자의 0xA0 바이트가 공백(NBSP)으로 취급돼 잘려 나간 경우 (예: "유" = EC 9C A0)
+            if e.reason == "unexpected end of data":
+                try:
+                    return (raw + b"\xa0").decode("utf-8")
+                except UnicodeDecodeError:
+                    pass
+    return None
+
+
+def repair_mojibake(text: str) -> str:
+    """잘못 읽힌 UTF-8 값 복구 (두 번 깨진 값까지, 복구할 수 없으면 원본 그대로)"""
+    if text.isascii() or not _MOJIBAKE_RE.search(text):
+        return text
+    for _ in range(2):
+        repaired = _decode_once(text)
+        # 깨진 문자가 줄어들 때만 채택 ("Café" 같은 정상 텍스트는 UTF-8 로 읽히지 않아 그대로)
+        if repaired is None or _mojibake_count(repaired) >= _mojibake_count(text):
+            break
+        text = repaired
+    return text
+
+
+def is_broken_text(text: str) -> bool:
+    """복구 후에도 깨진 값 (C1 제어 문자 / 대체 문자)"""
+    return _BROKEN_RE.search(text) is not None
+
+
+def canonical_color(color: str) -> str:
+    return CANONICAL_COLORS.get(color.strip().lower(), color.strip())
+
+
+def canonical_seasons(seasons: List[str]) -> List[str]:
+    result = []
+    for season in seasons:
+        if not isinstance(season, str):
+            continue
+        for canonical in CANONICAL_SEASONS.get(season.strip().lower(), [season.strip()]):
+            if canonical and canonical not in result:
+                result.append(canonical)
+    return result
+
+
+def _repair_value(value: Any, path: str, flower_id: str, report: Dict[str, Any],
+                  memo: Dict[str, Tuple[str, bool, bool]]) -> Any:
+    """값 전체를 재귀적으로 복구 (같은 문자열은 한 번만 복구 / 검증하고 sys.intern 으로 공유)"""
+    if isinstance(value, str):
+        entry = memo.get(value)
+        if entry is None:
+            repaired = sys.intern(repair_mojibake(value))
+            entry = memo[value] = (repaired, repaired != value, is_broken_text(repaired))
+        repaired, changed, broken = entry
+        if changed:
+            report["repaired"][path] += 1
+        if broken:
+            report["invalid"].append((flower_id, path, repaired))
+        return repaired
+    if isinstance(value, list):
+        item_path = f"{path}[]"
+        return [_repair_value(item, item_path, flower_id, report, memo) for item in value]
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            repaired_key = repair_mojibake(key) if isinstance(key, str) else key
+            result[repaired_key] = _repair_value(item, f"{path}.{repaired_key}" if path else repaired_key, flower_id, report, memo)
+        return result
+    return value
+
+
+def compile_flowers(flowers: Mapping[str, Mapping[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
+    """꽃 레코드 인코딩 복구 + 색상 / 계절 정규화 + 검증 → (복구된 레코드, 보고서)"""
+    report: Dict[str, Any] = {
+        "flowers": len(flowers),
+        "repaired": Counter(),
+        "invalid": [],
+        "missing": [],
+        "colors": Counter(),
+        "seasons": Counter(),
+    }
+    compiled = {}
+    memo: Dict[str, Tuple[str, bool, bool]] = {}
+    for flower_id, data in flowers.items():
+        record = _repair_value(dict(data), "", flower_id, report, memo)
+
+        color = record.get("color")
+        if isinstance(color, str) and color:
+            canonical = canonical_color(color)
+            if canonical != color:
+                report["colors"][f"{color} → {canonical}"] += 1
+                record["color"] = sys.intern(canonical)
+
+        seasonality = record.get("seasonality")
+        if isinstance(seasonality, list):
+            canonical = canonical_seasons(seasonality)
+            if canonical != seasonality:
+                report["seasons"][f"{seasonality} → {canonical}"] += 1
+                record["seasonality"] = canonical
+
+        for field in REQUIRED_FIELDS:
+            if not record.get(field):
+                report["missing"].append((flower_id, field))
+
+        compiled[flower_id] = record
+
+    report["repaired_total"] = sum(report["repaired"].values())
+    return compiled, report
+
+
+def format_compile_report(report: Dict[str, Any]) -> List[str]:
+    """보고서 출력용 줄 목록"""
+    lines = [f"🔧 인코딩 복구: {report['repaired_total']}개 값 ({report['flowers']}개 꽃)"]
+    for path, count in sorted(report["repaired"].items(), key=lambda item: (-item[1], item[0])):
+        lines.append(f"   - {path}: {count}")
+    if report["colors"]:
+        lines.append(f"🎨 색상 정규화: {sum(report['colors'].values())}개")
+        lines.extend(f"   - {change}: {count}" for change, count in report["colors"].most_common())
+    if report["seasons"]:
+        lines.append(f"🗓️ 계절 정규화: {sum(report['seasons'].values())}개")
+        lines.extend(f"   - {change}: {count}" for change, count in report["seasons"].most_common())
+    if report["invalid"]:
+        lines.append(f"⚠️ 복구 실패: {len(report['invalid'])}개 값")
+        lines.extend(f"   - {flower_id} {path}: {value!r}" for flower_id, path, value in report["invalid"][:20])
+    if report["missing"]:
+        lines.append(f"⚠️ 필수 필드 누락: {len(report['missing'])}개")
+        lines.extend(f"   - {flower_id}: {field}" for flower_id, field in report["missing"][:20])
+    return lines
+
+
+def source_digest(raw: bytes) -> str:
+    """원본 flower_dictionary.json 해시 (아티팩트가 같은 원본으로 만들어졌는지 확인)"""
+    return hashlib.sha1(raw).hexdigest()
+
+
+def write_catalog_artifact(path: str, catalog: FlowerCatalog, source_sha1: str, report: Optional[Dict[str, Any]] = None) -> int:
+    """카탈로그를 아티팩트로 저장 → 파일 크기 (바이트)"""
+    rows = []
+    for flower_id, data in catalog.flowers.items():
+        record = data if isinstance(data, FlowerRecord) else FlowerRecord(data)
+        mask, values, extra = record.to_row()
+        rows.append([flower_id, mask, values, extra])
+    payload = zlib.compress(marshal.dumps(rows), 9)
+    header = json.dumps({
+        "format": ARTIFACT_FORMAT_VERSION,
+        "catalog_version": catalog.version,
+        "source_sha1": source_sha1,
+        "compiler": COMPILER_FINGERPRINT,
+        "built_at": datetime.now().isoformat(),
+        "flower_count": len(rows),
+        "fields": list(FLOWER_RECORD_FIELDS),
+        "python": list(sys.version_info[:2]),
+        "repaired": (report or {}).get("repaired_total", 0),
+    }, ensure_ascii=False).encode("utf-8")
+
+    with open(path, "wb") as f:
+        f.write(ARTIFACT_MAGIC)
+        f.write(struct.pack(">I", len(header)))
+        f.write(header)
+        f.write(payload)
+    return len(ARTIFACT_MAGIC) + 4 + len(header) + len(payload)
+
+
+def read_catalog_artifact(path: str) -> Tuple[Dict[str, Any], Dict[str, FlowerRecord]]:
+    """아티팩트 → (헤더, flower_id → FlowerRecord) - 형식이 다르면 ValueError"""
+    with open(path, "rb") as f:
+        blob = f.read()
+    if not blob.startswith(ARTIFACT_MAGIC):
+        raise ValueError("꽃 카탈로그 아티팩트 형식이 아닙니다")
+    offset = len(ARTIFACT_MAGIC)
+    (header_length,) = struct.unpack_from(">I", blob, offset)
+    offset += 4
+    header = json.loads(blob[offset:offset + header_length].decode("utf-8"))
+    if header.get("format") != ARTIFACT_FORMAT_VERSION or header.get("fields") != list(FLOWER_RECORD_FIELDS):
+        raise ValueError(f"지원하지 않는 아티팩트 형식: format={header.get('format')}")
+    if header.get("python") != list(sys.version_info[:2]):
+        raise ValueError(f"다른 파이썬 버전으로 만든 아티팩트: {header.get('python')}")
+
+    rows = marshal.loads(zlib.decompress(blob[offset + header_length:]))
+    flowers = {}
+    for flower_id, mask, values, extra in rows:
+        flowers[flower_id] = FlowerRecord.from_row(mask, values, extra)
+    if len(flowers) != header.get("flower_count"):
+        raise ValueError(f"아티팩트 꽃 개수 불일치: {len(flowers)} != {header.get('flower_count')}")
+    return header, flowers
+
+
+def load_catalog_artifact(path: str, source_sha1: str) -> Optional[Tuple[Dict[str, Any], Dict[str, FlowerRecord]]]:
+    """원본 해시가 같은 아티팩트만 로드 (없거나 오래됐거나 깨졌으면 None → JSON 경로)"""
+    try:
+        header, flowers = read_catalog_artifact(path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"⚠️ 꽃 카탈로그 아티팩트 로드 실패, JSON 에서 로드: {e}")
+        return None
+    if header.get("source_sha1") != source_sha1:
+        print("⚠️ 꽃 카탈로그 아티팩트가 원본과 다릅니다 (동기화 후 재컴파일 필요), JSON 에서 로드")
+        return None
+    if header.get("compiler") != COMPILER_FINGERPRINT:
+        print("⚠️ 꽃 카탈로그 아티팩트의 복구 / 정규화 규칙이 현재와 다릅니다 (재컴파일 필요), JSON 에서 로드")
+        return None
+    return header, flowers
@@ -1,4 +1,4 @@
-import openai
+from app.services.openai_client import get_openai_client
 import json
 from typing import Dict, List, Any, Optional
 from datetime import datetime
@@ -8,7 +8,7 @@ class FlowerInfoCollector:
     """LLM 기반 꽃 정보 수집 서비스"""
     
     def __init__(self, api_key: str):
-        self.client = openai.OpenAI(api_key=api_key)
+        self.client = get_openai_client(api_key)
         self.dictionary_service = FlowerDictionaryService()
         
     def collect_flower_info(self, scientific_name: str, korean_name: str, color: str) -> Dict[str, Any]:
@@ -4,12 +4,26 @@
 import os
 import json
 import random
-from typing import List, Dict, Optional
-from app.models.schemas import EmotionAnalysis, FlowerMatch
+from typing import List, Dict, Optional, Tuple
+from app.models.schemas import EmotionAnalysis, FlowerMatch, RankedFlower
 from app.services.realtime_context_extractor import RealtimeContextExtractor
 from app.services.comfort_flower_matcher import ComfortFlowerMatcher
+from app.services.flower_catalog import get_flower_catalog
+from app.services.openai_client import get_openai_client
+from app.services.llm_cache import llm_cache
+from app.services.model_router import model_router
+from app.services.keyword_automaton import scan_keywords
+from app.services.flower_score_index import (
+    get_flower_scoring_index, emotion_similarity, color_similarity, keyword_similarity,
+)
+from app.services.flower_candidate_index import get_flower_candidate_index
+from app.services.flower_ranking import FlowerRanking
+from app.core.config import get_settings
 
 class FlowerMatcher:
+    # base64_images.json 프로세스 전역 캐시
+    _base64_cache: Dict = {}
+    
     def __init__(self):
         """꽃 매칭 서비스 초기화"""
         # 실시간 맥락 추출기
@@ -20,9 +34,8 @@ class FlowerMatcher:
         
         # LLM 클라이언트 초기화
         try:
-            from openai import OpenAI
-            self.llm_client = OpenAI()
-        except ImportError:
+            self.llm_client = get_openai_client()
+        except Exception:
             print("⚠️ OpenAI 클라이언트 초기화 실패")
             self.llm_client = None
         
@@ -32,53 +45,29 @@ class FlowerMatcher:
         # 꽃 데이터베이스 로드 (flower_dictionary.json에서)
         self.flower_database = self._load_flower_database()
         
+        # 마지막 매칭의 점수 벡터 (사연별 순위 세션 / 상위 K 개 응답용)
+        self.last_ranking: Optional[FlowerRanking] = None
+        
         print(f"🌸 꽃 매칭 시스템 초기화 완료")
         print(f"📚 꽃 데이터베이스: {len(self.flower_database)}개 꽃")
         print(f"🖼️ Base64 이미지: {len(self.base64_images)}개 폴더")
     
     def _load_flower_database(self) -> Dict[str, Dict]:
-        """꽃 데이터베이스 로드 (Google Spreadsheet 동기화 우선)"""
+        """꽃 데이터베이스 로드 (공유 카탈로그 사용, 동기화는 백그라운드 스케줄러가 담당)"""
         try:
-            # 1. Google Spreadsheet 동기화 시도
-            synced_data = self._load_from_google_spreadsheet()
-            if synced_data:
-                print(f"✅ Google Spreadsheet에서 {len(synced_data)}개 꽃 데이터 로드")
-                return synced_data
-            
-            # 2. 로컬 JSON 파일 시도
-            with open("data/flower_dictionary.json", 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if "flowers" in data:
-                    print(f"✅ 로컬 JSON에서 {len(data['flowers'])}개 꽃 데이터 로드")
-                    return data["flowers"]
-                return data
+            # 프로세스 전역 카탈로그 (요청 시점의 버전을 스냅샷으로 사용)
+            catalog = get_flower_catalog()
+            if len(catalog) > 0:
+                return catalog.flowers
+            
+            # 폴백: 하드코딩된 데이터 사용
+            return self._create_flower_database_fallback()
                 
         except Exception as e:
             print(f"❌ 꽃 데이터베이스 로드 실패: {e}")
             # 폴백: 하드코딩된 데이터 사용
             return self._create_flower_database_fallback()
     
-    def _load_from_google_spreadsheet(self) -> Optional[Dict[str, Dict]]:
-        """Google Spreadsheet에서 꽃 데이터 로드"""
-        try:
-            # Google Drive API 동기화 실행
-            from scripts.google_drive_api_sync import GoogleDriveAPISync
-            syncer = GoogleDriveAPISync()
-            success = syncer.sync()
-            
-            if success:
-                # 동기화된 데이터 로드
-                with open("data/flower_dictionary.json", 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if "flowers" in data:
-                        return data["flowers"]
-            
-            return None
-            
-        except Exception as e:
-            print(f"❌ Google Spreadsheet 동기화 실패: {e}")
-            return None
-    
     def _create_flower_database_fallback(self) -> Dict[str, Dict]:
         """하드코딩된 꽃 데이터베이스 (폴백용)"""
         return {
@@ -871,17 +860,10 @@ class FlowerMatcher:
     
     def _extract_season_from_story(self, story: str) -> str:
         """스토리에서 시즌 정보 추출"""
-        story_lower = story.lower()
-        
-        # 명시적 시즌 키워드
-        if any(keyword in story_lower for keyword in ["새해", "1월", "정월", "설날", "겨울", "추운"]):
-            return "겨울"
-        elif any(keyword in story_lower for keyword in ["봄", "3월", "4월", "5월", "따뜻한", "개화"]):
-            return "봄"
-        elif any(keyword in story_lower for keyword in ["여름", "6월", "7월", "8월", "더운", "휴가"]):
-            return "여름"
-        elif any(keyword in story_lower for keyword in ["가을", "9월", "10월", "11월", "선선한", "단풍"]):
-            return "가을"
+        # 명시적 시즌 키워드 (겨울 → 봄 → 여름 → 가을 순서로 우선)
+        season = scan_keywords(story).first("matcher.season")
+        if season:
+            return season
         
         # 현재 날짜 기준 (기본값)
         from datetime import datetime
@@ -914,6 +896,39 @@ class FlowerMatcher:
         print(f"🎭 추출된 무드: {mood_keywords}")
         
         # 3. 컬러 + 무드 + 시즌 기반 점수 계산 (제외 조건 반영)
+        flower_scores = self._calculate_design_scores(emotions, color_keywords, mood_keywords, current_season, excluded_keywords)
+        
+        # 최고 점수 꽃 선택
+        if not flower_scores:
+            return self._fallback_match(emotions, story)
+        
+        best_flower_id = max(flower_scores, key=flower_scores.get)
+        best_flower = self.flower_database[best_flower_id]
+        
+        print(f"🏆 디자인 기반 최종 선택: {best_flower['korean_name']} (점수: {flower_scores[best_flower_id]:.2f})")
+        self.last_ranking = FlowerRanking(
+            story=story, emotions=emotions, color_keywords=color_keywords, user_intent="design_based",
+            current_season=current_season, scores=flower_scores, best_flower_id=best_flower_id,
+            excluded_keywords=list(excluded_keywords or []), mood_keywords=mood_keywords, shown=[best_flower_id],
+        )
+        
+        # 결과 생성
+        image_url = self._get_flower_image_url(best_flower, color_keywords)
+        emotion_names = [e.emotion if hasattr(e, 'emotion') else str(e) for e in emotions]
+        hashtags = self._generate_hashtags(best_flower, emotion_names, excluded_keywords)
+        
+        return FlowerMatch(
+            flower_name=best_flower['scientific_name'],
+            korean_name=best_flower['korean_name'],
+            scientific_name=best_flower['scientific_name'],
+            image_url=image_url,
+            keywords=best_flower.get('flower_meanings', {}).get('meanings', best_flower.get('flower_meanings', {}).get('primary', []))[:2],
+            hashtags=hashtags,
+            color_keywords=color_keywords
+        )
+    
+    def _calculate_design_scores(self, emotions: List[EmotionAnalysis], color_keywords: List[str], mood_keywords: List[str], current_season: str = None, excluded_keywords: List[Dict[str, str]] = None) -> Dict[str, float]:
+        """디자인 기반 점수 계산 (컬러 + 무드 + 시즌, 제외 조건 반영)"""
         flower_scores = {}
         excluded_texts = [kw.get('text', '') for kw in (excluded_keywords or [])]
         print(f"🚫 제외할 키워드들: {excluded_texts}")
@@ -990,29 +1005,7 @@ class FlowerMatcher:
             
             flower_scores[flower_id] = score
         
-        # 최고 점수 꽃 선택
-        if not flower_scores:
-            return self._fallback_match(emotions, story)
-        
-        best_flower_id = max(flower_scores, key=flower_scores.get)
-        best_flower = self.flower_database[best_flower_id]
-        
-        print(f"🏆 디자인 기반 최종 선택: {best_flower['korean_name']} (점수: {flower_scores[best_flower_id]:.2f})")
-        
-        # 결과 생성
-        image_url = self._get_flower_image_url(best_flower, color_keywords)
-        emotion_names = [e.emotion if hasattr(e, 'emotion') else str(e) for e in emotions]
-        hashtags = self._generate_hashtags(best_flower, emotion_names, excluded_keywords)
-        
-        return FlowerMatch(
-            flower_name=best_flower['scientific_name'],
-            korean_name=best_flower['korean_name'],
-            scientific_name=best_flower['scientific_name'],
-            image_url=image_url,
-            keywords=best_flower.get('flower_meanings', {}).get('meanings', best_flower.get('flower_meanings', {}).get('primary', []))[:2],
-            hashtags=hashtags,
-            color_keywords=color_keywords
-        )
+        return flower_scores
     
     def _meaning_based_match(self, emotions: List[EmotionAnalysis], story: str, current_season: str = None, excluded_keywords: List[Dict[str, str]] = None, mentioned_flower: str = None, context: object = None) -> FlowerMatch:
         """의미 기반 매칭: 꽃말과 꽃 특징 우선"""
@@ -1030,6 +1023,12 @@ class FlowerMatcher:
         if mentioned_flower and mentioned_flower in self.flower_database:
             best_flower = self.flower_database[mentioned_flower]
             print(f"🌸 언급된 꽃 우선 선택: {best_flower['korean_name']} ({mentioned_flower})")
+            # 점수는 상위 K 개 / 다시 순위 계산이 필요할 때 계산
+            self.last_ranking = FlowerRanking(
+                story=story, emotions=emotions, color_keywords=color_keywords, user_intent="meaning_based",
+                current_season=current_season, scores=None, best_flower_id=mentioned_flower,
+                excluded_keywords=list(excluded_keywords or []), shown=[mentioned_flower],
+            )
             
             # 결과 생성
             image_url = self._get_flower_image_url(best_flower, color_keywords)
@@ -1057,6 +1056,11 @@ class FlowerMatcher:
         best_flower = self.flower_database[best_flower_id]
         
         print(f"🏆 의미 기반 최종 선택: {best_flower['korean_name']} (점수: {flower_scores[best_flower_id]:.2f})")
+        self.last_ranking = FlowerRanking(
+            story=story, emotions=emotions, color_keywords=color_keywords, user_intent="meaning_based",
+            current_season=current_season, scores=flower_scores, best_flower_id=best_flower_id,
+            excluded_keywords=list(excluded_keywords or []), shown=[best_flower_id],
+        )
         
         # 결과 생성
         image_url = self._get_flower_image_url(best_flower, color_keywords)
@@ -1073,6 +1077,130 @@ class FlowerMatcher:
             color_keywords=color_keywords
         )
     
+    def _build_flower_match(self, flower_id: str, emotions: List[EmotionAnalysis], color_keywords: List[str], excluded_keywords: List[Dict[str, str]] = None) -> FlowerMatch:
+        """flower_id → 매칭 결과"""
+        best_flower = self.flower_database[flower_id]
+        image_url = self._get_flower_image_url(best_flower, color_keywords)
+        emotion_names = [e.emotion if hasattr(e, 'emotion') else str(e) for e in emotions]
+        hashtags = self._generate_hashtags(best_flower, emotion_names, excluded_keywords)
+        
+        return FlowerMatch(
+            flower_name=best_flower['scientific_name'],
+            korean_name=best_flower['korean_name'],
+            scientific_name=best_flower['scientific_name'],
+            image_url=image_url,
+            keywords=best_flower.get('flower_meanings', {}).get('meanings', best_flower.get('flower_meanings', {}).get('primary', []))[:2],
+            hashtags=hashtags,
+            color_keywords=color_keywords
+        )
+    
+    def _rescore_ranking(self, ranking: FlowerRanking, color_keywords: List[str], excluded_keywords: List[Dict[str, str]]):
+        """순위 세션의 점수 벡터만 다시 계산 (감정 / 사연 / 시즌 / 무드는 보관된 값, LLM 호출 없음)"""
+        if ranking.user_intent == "design_based":
+            ranking.scores = self._calculate_design_scores(ranking.emotions, color_keywords, ranking.mood_keywords, ranking.current_season, excluded_keywords)
+        else:
+            ranking.scores = self._calculate_flower_scores(ranking.emotions, ranking.story, color_keywords, ranking.current_season)
+        ranking.color_keywords = color_keywords
+        ranking.excluded_keywords = excluded_keywords
+    
+    def _resolve_flower_ids(self, names: List[str]) -> set:
+        """flower_id / 학명 / 한국어 이름 → flower_id (이름이면 같은 꽃의 모든 색상)"""
+        flower_ids = set()
+        for name in names or []:
+            if name in self.flower_database:
+                flower_ids.add(name)
+                continue
+            flower_ids.update(
+                flower_id for flower_id, flower_data in self.flower_database.items()
+                if name in (flower_data.get('korean_name'), flower_data.get('scientific_name'))
+            )
+        return flower_ids
+    
+    def _is_excluded_by_keywords(self, flower_data: Dict, excluded_keywords: List[Dict[str, str]]) -> bool:
+        """제외된 색상 / 무드 키워드와 겹치는 꽃 (디자인 기반 매칭의 제외 조건과 같은 기준)"""
+        for excluded_kw in excluded_keywords:
+            excluded_text = excluded_kw.get('text', '')
+            excluded_type = excluded_kw.get('type', '')
+            if not excluded_text:
+                continue
+            if excluded_type == 'color' and excluded_text in flower_data.get('color', ''):
+                return True
+            if excluded_type == 'mood':
+                flower_moods = flower_data.get('moods', {})
+                all_moods = flower_moods.get('primary', []) + flower_moods.get('secondary', [])
+                if any(excluded_text in mood for mood in all_moods):
+                    return True
+        return False
+    
+    def rank_flowers(self, ranking: FlowerRanking, top_k: int = 3, excluded_ids: Optional[set] = None, pin_best: bool = True) -> List[RankedFlower]:
+        """상위 K 개 꽃 + 점수 분해 (pin_best 면 실제로 고른 꽃이 1위 - 언급된 꽃 우선 선택 포함)"""
+        if ranking.scores is None:
+            self._rescore_ranking(ranking, ranking.color_keywords, ranking.excluded_keywords)
+        excluded_ids = excluded_ids or set()
+        ordered = [flower_id for flower_id in ranking.ordered(list(self.flower_database)) if flower_id not in excluded_ids]
+        if pin_best and ranking.best_flower_id in ordered:
+            ordered.remove(ranking.best_flower_id)
+            ordered.insert(0, ranking.best_flower_id)
+        top_ids = ordered[:top_k]
+        
+        # 점수 분해는 의미 기반 점수 인덱스가 있을 때만 (디자인 기반 / numpy 없음은 점수만)
+        breakdowns = [{} for _ in top_ids]
+        scoring_index = get_flower_scoring_index(self.flower_database) if ranking.user_intent != "design_based" else None
+        if scoring_index is not None and top_ids:
+            try:
+                rows = [scoring_index.positions[flower_id] for flower_id in top_ids]
+                breakdowns = scoring_index.breakdown(ranking.emotions, ranking.story, ranking.color_keywords, rows)
+            except Exception as e:
+                print(f"⚠️ 점수 분해 실패: {e}")
+        
+        return [
+            RankedFlower(
+                flower_id=flower_id,
+                korean_name=self.flower_database[flower_id].get('korean_name', ''),
+                scientific_name=self.flower_database[flower_id].get('scientific_name', ''),
+                color=str(self.flower_database[flower_id].get('color', '')),
+                score=round(ranking.scores.get(flower_id, 0.0), 4),
+                breakdown=breakdown,
+            )
+            for flower_id, breakdown in zip(top_ids, breakdowns)
+        ]
+    
+    def rerank(self, ranking: FlowerRanking, excluded_keywords: List[Dict[str, str]] = None, excluded_flowers: List[str] = None, preferred_colors: List[str] = None, show_another: bool = False, top_k: int = 3) -> Optional[Tuple[FlowerMatch, List[RankedFlower]]]:
+        """보관된 점수 벡터로 다시 순위 계산 (키워드 제외 / 다른 꽃 보기 / 색상 변경)
+        - 색상이 바뀌거나 디자인 기반 제외 조건이 바뀌면 점수 벡터만 다시 계산 (인덱스로 1ms 미만)
+        - 남은 꽃이 없으면 None"""
+        excluded_keywords = list(excluded_keywords or [])
+        excluded_colors = [kw.get('text', '') for kw in excluded_keywords if kw.get('type') == 'color']
+        color_keywords = list(preferred_colors) if preferred_colors else list(ranking.color_keywords)
+        color_keywords = [color for color in color_keywords if color not in excluded_colors]
+        
+        with ranking.lock:
+            design_exclusions_changed = ranking.user_intent == "design_based" and excluded_keywords != ranking.excluded_keywords
+            if ranking.scores is None or color_keywords != ranking.color_keywords or design_exclusions_changed:
+                print(f"🔁 점수 다시 계산: 색상 {ranking.color_keywords} → {color_keywords}")
+                self._rescore_ranking(ranking, color_keywords, excluded_keywords)
+            ranking.excluded_keywords = excluded_keywords
+            
+            excluded_ids = self._resolve_flower_ids(excluded_flowers)
+            if show_another:
+                excluded_ids.update(ranking.shown)
+            excluded_ids.update(
+                flower_id for flower_id, flower_data in self.flower_database.items()
+                if self._is_excluded_by_keywords(flower_data, excluded_keywords)
+            )
+            
+            ranked = self.rank_flowers(ranking, top_k, excluded_ids, pin_best=False)
+            if not ranked:
+                print("⚠️ 제외 조건을 적용하면 남은 꽃이 없습니다")
+                return None
+            
+            ranking.best_flower_id = ranked[0].flower_id
+            if ranking.best_flower_id not in ranking.shown:
+                ranking.shown.append(ranking.best_flower_id)
+        
+        print(f"🔁 다시 순위 계산 1위: {ranked[0].korean_name} ({ranked[0].flower_id}, 점수 {ranked[0].score})")
+        return self._build_flower_match(ranking.best_flower_id, ranking.emotions, color_keywords, excluded_keywords), ranked
+    
     def _calculate_flower_scores_with_dictionary(self, emotions: List[EmotionAnalysis], story: str, all_flowers: List, color_keywords: List[str]) -> Dict[str, float]:
         """꽃 사전 데이터를 사용한 점수 계산 (컬러 우선 필터링 → 꽃말/상징/감정 유사도)"""
         scores = {}
@@ -1203,24 +1331,29 @@ class FlowerMatcher:
         return scores
     
     def _load_base64_images(self):
-        """Base64 이미지 데이터 로드"""
+        """Base64 이미지 데이터 로드 (파일 변경 시에만 다시 읽음)"""
         try:
             # 현재 작업 디렉토리에서 직접 찾기
             import os
             base64_path = os.path.join(os.getcwd(), "base64_images.json")
             
-            print(f"🔍 Base64 이미지 경로: {base64_path}")
-            print(f"🔍 현재 작업 디렉토리: {os.getcwd()}")
-            
             if not os.path.exists(base64_path):
                 print(f"❌ 파일이 존재하지 않음: {base64_path}")
                 return {}
             
+            # 프로세스 전역 캐시 (admin 에서 파일을 갱신하면 mtime 으로 감지)
+            mtime = os.path.getmtime(base64_path)
+            cached = FlowerMatcher._base64_cache
+            if cached.get("path") == base64_path and cached.get("mtime") == mtime:
+                return cached["data"]
+            
+            print(f"🔍 Base64 이미지 경로: {base64_path}")
             with open(base64_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
                 print(f"✅ Base64 이미지 로드 성공: {len(data)} 개 폴더")
                 print(f"📁 사용 가능한 폴더: {list(data.keys())}")
-                return data
+            FlowerMatcher._base64_cache = {"path": base64_path, "mtime": mtime, "data": data}
+            return data
         except Exception as e:
             print(f"❌ Base64 이미지 로드 실패: {e}")
             import traceback
@@ -1674,45 +1807,38 @@ class FlowerMatcher:
     
     def _get_fallback_flower_by_context(self, story: str) -> str:
         """컨텍스트 기반 폴백 꽃 선택"""
-        # 우선순위 규칙
-        if any(keyword in story.lower() for keyword in ["알록달록", "화려한", "형형색색", "비비드", "선명한"]):
+        # 우선순위 규칙 (data/keyword_rules.json 의 matcher.fallback_flower 순서)
+        rule = scan_keywords(story).first("matcher.fallback_flower")
+        if rule == "vivid":
             # 알록달록/비비드 색상 요청 - 가장 밝고 선명한 꽃들 우선
             vivid_flowers = ["Gerbera Daisy", "Dahlia", "Cockscomb", "Drumstick Flower", "Zinnia Elegans"]
-            import random
             return random.choice(vivid_flowers)
-        elif any(keyword in story.lower() for keyword in ["해외 유학", "유학 완료", "돌아왔어", "여행지"]):
+        elif rule == "welcome_home":
             # 해외 유학 완료 환영 - 밝고 경쾌한 꽃 우선
             celebration_flowers = ["Gerbera Daisy", "Dahlia", "Tulip", "Cockscomb", "Drumstick Flower", "Tagetes Erecta"]
-            import random
             return random.choice(celebration_flowers)
-        elif any(keyword in story.lower() for keyword in ["형형색색", "화려한", "축하", "합격", "성취"]):
+        elif rule == "celebration":
             celebration_flowers = ["Dahlia", "Gerbera Daisy", "Cockscomb", "Zinnia Elegans"]
-            import random
             return random.choice(celebration_flowers)
-        elif any(keyword in story.lower() for keyword in ["우드톤", "내추럴", "인테리어"]):
+        elif rule == "natural":
             # 내추럴한 꽃들 중에서 선택 (Lisianthus 우선순위 낮춤)
             natural_flowers = ["Lily", "Garden Peony", "Cotton Plant", "Babys Breath", "Marguerite Daisy", "Ammi Majus"]
-            import random
             return random.choice(natural_flowers)
-        elif any(keyword in story.lower() for keyword in ["독특한", "모던한", "포인트"]):
+        elif rule == "unique":
             # 독특한 꽃들 중에서 선택
             unique_flowers = ["Scabiosa", "Drumstick Flower", "Cockscomb", "Globe Amaranth", "Astilbe Japonica"]
-            import random
             return random.choice(unique_flowers)
-        elif any(keyword in story.lower() for keyword in ["부드러운", "자연스러운", "순수한"]):
+        elif rule == "soft":
             # 부드러운 꽃들 중에서 선택
             soft_flowers = ["Babys Breath", "Marguerite Daisy", "Cotton Plant", "Lily", "Ammi Majus"]
-            import random
             return random.choice(soft_flowers)
-        elif any(keyword in story.lower() for keyword in ["그리움", "추억", "이사", "떠남", "20년지기", "만남", "기념"]):
+        elif rule == "memory":
             # 그리움/추억 관련 꽃들 중에서 선택 (Lisianthus 우선순위 낮춤)
             memory_flowers = ["Scabiosa", "Stock Flower", "Hydrangea", "Lathyrus Odoratus", "Garden Peony", "Veronica Spicata"]
-            import random
             return random.choice(memory_flowers)
-        elif any(keyword in story.lower() for keyword in ["위로", "응원", "힘들어", "격려", "후배", "발표", "긴장"]):
+        elif rule == "encouragement":
             # 격려/응원 관련 꽃들 중에서 선택
             encouragement_flowers = ["Freesia Refracta", "Gerbera Daisy", "Tulip", "Dahlia", "Gentiana Andrewsii"]
-            import random
             return random.choice(encouragement_flowers)
         else:
             # 점수 기반 선택
@@ -1720,10 +1846,53 @@ class FlowerMatcher:
             return max(scores, key=scores.get)
     
     def _calculate_flower_scores(self, emotions: List[EmotionAnalysis], story: str, color_keywords: List[str], current_season: str = None) -> Dict[str, float]:
-        """꽃 점수 계산 (유사도 기반)"""
+        """꽃 점수 계산 (유사도 기반) - 역색인으로 고른 후보 꽃만 계산 (후보가 없거나 모두 0 점이면 전체 계산)"""
+        candidates = self._select_candidate_flowers(emotions, story, color_keywords)
+        if candidates:
+            scores = self._score_flowers(emotions, story, color_keywords, current_season, candidates)
+            if max(scores.values()) > 0:
+                return scores
+            print("🔎 후보 꽃 점수가 모두 0 - 전체 꽃 점수 계산")
+        return self._score_flowers(emotions, story, color_keywords, current_season)
+    
+    def _select_candidate_flowers(self, emotions: List[EmotionAnalysis], story: str, color_keywords: List[str]) -> Optional[List[int]]:
+        """감정 / 색상 / 사연 키워드로 점수가 0 보다 클 수 있는 꽃 위치 (후보가 아닌 꽃은 점수가 정확히 0)"""
+        if not get_settings().flower_candidate_index_enabled:
+            return None
+        try:
+            candidates = get_flower_candidate_index(self.flower_database).candidates(emotions, story, color_keywords)
+        except Exception as e:
+            print(f"⚠️ 후보 꽃 선택 실패, 전체 꽃 점수 계산: {e}")
+            return None
+        print(f"🔎 후보 꽃: {len(candidates)}/{len(self.flower_database)}개")
+        return candidates
+    
+    def _score_flowers(self, emotions: List[EmotionAnalysis], story: str, color_keywords: List[str], current_season: str = None, candidates: Optional[List[int]] = None) -> Dict[str, float]:
+        """점수 계산 - 컴파일된 점수 인덱스로 한 번에 계산 (candidates 가 있으면 그 위치의 꽃만)"""
+        scoring_index = get_flower_scoring_index(self.flower_database)
+        if scoring_index is None:
+            flower_ids = None
+            if candidates is not None:
+                all_ids = list(self.flower_database)
+                flower_ids = [all_ids[i] for i in candidates]
+            return self._calculate_flower_scores_loop(emotions, story, color_keywords, current_season, flower_ids)
+        
+        scores = scoring_index.score_dict(emotions, story, color_keywords, candidates)
+        
+        print(f"📊 꽃 점수 요약: {len(scores)}개 꽃 중 상위 5개")
+        sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:5]
+        for flower_id, score in sorted_scores:
+            flower_data = self.flower_database[flower_id]
+            print(f"  {flower_data['korean_name']}: {score:.2f}")
+        
+        return scores
+    
+    def _calculate_flower_scores_loop(self, emotions: List[EmotionAnalysis], story: str, color_keywords: List[str], current_season: str = None, flower_ids: Optional[List[str]] = None) -> Dict[str, float]:
+        """꽃 점수 계산 - 꽃마다 반복하는 기존 구현 (numpy 가 없을 때 / 점수 인덱스 정합성 확인 기준)"""
         scores = {}
         
-        for flower_id, flower_data in self.flower_database.items():
+        for flower_id in (self.flower_database if flower_ids is None else flower_ids):
+            flower_data = self.flower_database[flower_id]
             score = 0.0
             
             # 1. 감정 유사도 매칭 점수
@@ -1840,118 +2009,15 @@ class FlowerMatcher:
     
     def _calculate_emotion_similarity(self, emotion: str, mood_list: List[str]) -> float:
         """감정 유사도 계산"""
-        emotion_lower = emotion.lower()
-        
-        # 감정 유사도 매핑
-        emotion_similarities = {
-            "사랑/로맨스": ["사랑", "로맨틱한", "열정적인", "매혹적인", "사랑스러운"],
-            "기쁨": ["기쁜", "행복한", "즐거운", "밝은", "활기찬"],
-            "위로": ["위로하는", "따뜻한", "안정적인", "편안한", "포근한"],
-            "응원/격려": ["응원하는", "격려하는", "지지하는", "용기있는", "희망적인"],
-            "감사/존경": ["감사한", "존경하는", "고귀한", "아름다운", "우아한"],
-            "그리움/추억": ["그리운", "추억하는", "아련한", "회상하는", "기억하는"],
-            "희망": ["희망적인", "미래의", "새로운", "신뢰할 수 있는", "완벽한"],
-            "순수": ["순수한", "순결한", "깨끗한", "자연스러운", "이상적인"]
-        }
-        
-        # 감정 그룹 찾기
-        for group, similar_emotions in emotion_similarities.items():
-            if emotion_lower in group.lower() or any(similar in emotion_lower for similar in similar_emotions):
-                # 해당 그룹의 감정들과 매칭
-                for mood in mood_list:
-                    mood_lower = mood.lower()
-                    if any(similar in mood_lower for similar in similar_emotions):
-                        return 0.8  # 높은 유사도
-                    elif any(word in mood_lower for word in emotion_lower.split()):
-                        return 0.6  # 중간 유사도
-        
-        # 직접 매칭
-        for mood in mood_list:
-            mood_lower = mood.lower()
-            if emotion_lower in mood_lower or mood_lower in emotion_lower:
-                return 1.0  # 완전 일치
-            elif any(word in mood_lower for word in emotion_lower.split()):
-                return 0.7  # 부분 일치
-        
-        return 0.0  # 유사도 없음
+        return emotion_similarity(emotion, mood_list)
     
     def _calculate_color_similarity(self, requested_color: str, available_colors: List[str]) -> float:
         """색상 유사도 계산"""
-        requested_lower = requested_color.lower()
-        
-        # 색상 유사도 매핑
-        color_similarities = {
-            "핑크": ["핑크", "연핑크", "라이트핑크", "로즈", "살구색"],
-            "레드": ["레드", "빨강", "크림슨", "버건디", "마론"],
-            "화이트": ["화이트", "흰색", "아이보리", "크림", "오프화이트"],
-            "옐로우": ["옐로우", "노랑", "골드", "크림", "베이지"],
-            "블루": ["블루", "파랑", "네이비", "스카이블루", "옅은 블루"],
-            "퍼플": ["퍼플", "보라", "라일락", "라벤더", "바이올렛"],
-            "오렌지": ["오렌지", "코랄", "살구색", "피치", "어프리콧"],
-            "그린": ["그린", "초록", "민트", "세이지", "올리브"]
-        }
-        
-        # 색상 그룹 찾기
-        for group, similar_colors in color_similarities.items():
-            if requested_lower in group.lower() or any(similar in requested_lower for similar in similar_colors):
-                # 해당 그룹의 색상들과 매칭
-                for color in available_colors:
-                    color_lower = color.lower()
-                    if any(similar in color_lower for similar in similar_colors):
-                        return 0.9  # 높은 유사도
-                    elif any(word in color_lower for word in requested_lower.split()):
-                        return 0.7  # 중간 유사도
-        
-        # 직접 매칭
-        for color in available_colors:
-            color_lower = color.lower()
-            if requested_lower in color_lower or color_lower in requested_lower:
-                return 1.0  # 완전 일치
-            elif any(word in color_lower for word in requested_lower.split()):
-                return 0.8  # 부분 일치
-        
-        return 0.0  # 유사도 없음
+        return color_similarity(requested_color, available_colors)
     
     def _calculate_keyword_similarity(self, story: str, keywords: List[str]) -> float:
         """키워드 유사도 계산"""
-        if not keywords:
-            return 0.0
-        
-        max_similarity = 0.0
-        
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            
-            # 완전 일치
-            if keyword_lower in story:
-                max_similarity = max(max_similarity, 1.0)
-            # 부분 일치
-            elif any(word in story for word in keyword_lower.split()):
-                max_similarity = max(max_similarity, 0.7)
-            # 유사 키워드 매칭
-            else:
-                # 유사 키워드 매핑
-                similar_keywords = {
-                    "사랑": ["연인", "고백", "첫사랑", "로맨스", "애정"],
-                    "기쁨": ["행복", "즐거움", "웃음", "밝음", "활기"],
-                    "위로": ["안정", "편안함", "포근함", "따뜻함", "힐링"],
-                    "응원": ["격려", "지지", "힘내", "화이팅", "후원"],
-                    "감사": ["고마움", "은인", "축복", "보답", "존경"],
-                    "희망": ["미래", "꿈", "새로운", "신뢰", "완벽"],
-                    "순수": ["순결", "깨끗함", "자연", "이상", "완벽"],
-                    "우정": ["친구", "지지", "동료", "함께", "우정"],
-                    "축하": ["생일", "성취", "합격", "기념", "경쾌"],
-                    "그리움": ["추억", "과거", "회상", "아련함", "이사"]
-                }
-                
-                for base_keyword, similar_list in similar_keywords.items():
-                    if keyword_lower in base_keyword or any(similar in keyword_lower for similar in similar_list):
-                        for similar in similar_list:
-                            if similar in story:
-                                max_similarity = max(max_similarity, 0.6)
-                                break
-        
-        return max_similarity
+        return keyword_similarity(story, keywords)
     
     def _is_wedding_bouquet(self, story: str) -> bool:
         """웨딩 부케 관련 사연인지 확인"""
@@ -2037,43 +2103,21 @@ class FlowerMatcher:
     
     def _fallback_color_extraction(self, story: str) -> List[str]:
         """폴백 색상 추출 로직"""
-        story_lower = story.lower()
-        
         # 명시적 색상 요청 우선 처리
         explicit_colors = self._extract_explicit_colors(story)
         if explicit_colors:
             return explicit_colors
         
-        # 맥락 기반 색상 추천
-        contextual_colors = []
-        
-        # 위로/힐링/편안함 관련 색상
-        if any(word in story_lower for word in ["위로", "힐링", "편안", "차분", "가벼운", "한결", "편안하게", "쉬고", "휴식", "편안히", "쉬고 싶어", "편안한", "차분한", "조용한", "평온한"]):
-            contextual_colors = ["그린", "화이트", "블루"]
-        
-        # 희망/기쁨/축하 관련 색상
-        elif any(word in story_lower for word in ["희망", "기쁨", "밝", "활기", "경쾌", "축하", "합격", "성취"]):
-            contextual_colors = ["노랑", "오렌지", "핑크", "레드"]
-        
-        # 형형색색/화려한 색상
-        elif any(word in story_lower for word in ["형형색색", "화려", "다양한", "컬러풀"]):
-            contextual_colors = ["노랑", "오렌지", "핑크", "레드", "퍼플"]
-        
-        # 사랑/로맨스 관련 색상
-        elif any(word in story_lower for word in ["사랑", "로맨스", "고백", "연인"]):
-            contextual_colors = ["핑크", "레드", "화이트"]
-        
-        # 그린톤 소파와 어울리는 색상
-        elif "그린" in story_lower or "green" in story_lower:
-            contextual_colors = ["그린", "화이트", "크림"]
-        
-        # 우드톤/내추럴 관련 색상
-        elif "우드톤" in story_lower or "내추럴" in story_lower:
-            contextual_colors = ["그린", "화이트", "크림", "베이지"]
-        
-        # 강렬한 포인트 색상
-        elif any(word in story_lower for word in ["강렬", "포인트", "대비"]):
-            contextual_colors = ["노랑", "오렌지", "빨강"]
+        # 맥락 기반 색상 추천 (위로/힐링 → 희망/축하 → 형형색색 → 사랑 → 그린톤 → 우드톤 → 강렬한 포인트 순서)
+        contextual_colors = {
+            "comfort": ["그린", "화이트", "블루"],
+            "joy": ["노랑", "오렌지", "핑크", "레드"],
+            "colorful": ["노랑", "오렌지", "핑크", "레드", "퍼플"],
+            "love": ["핑크", "레드", "화이트"],
+            "green": ["그린", "화이트", "크림"],
+            "natural": ["그린", "화이트", "크림", "베이지"],
+            "accent": ["노랑", "오렌지", "빨강"],
+        }.get(scan_keywords(story).first("matcher.fallback_color"), [])
         
         # 기본 위로 색상 (아무 조건도 만족하지 않을 때)
         if not contextual_colors:
@@ -2365,14 +2409,11 @@ JSON 형식으로 응답:
 """
 
         try:
-            response = self.llm_client.chat.completions.create(
-                model="gpt-4o-mini",
+            result = llm_cache.chat_completion(
+                self.llm_client, "flower_context_analysis",
                 messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-                max_tokens=500
-            )
-            
-            result = response.choices[0].message.content.strip()
+                **model_router.route("flower_context_analysis", story).params()
+            ).strip()
             
             # JSON 파싱
             import json
@@ -2392,8 +2433,6 @@ JSON 형식으로 응답:
     
     def _fallback_contextual_analysis(self, story: str) -> Dict[str, List[str]]:
         """폴백: 규칙 기반 맥락 분석"""
-        story_lower = story.lower()
-        
         context = {
             "intent": [],
             "situation": [],
@@ -2404,43 +2443,13 @@ JSON 형식으로 응답:
             "colors": []
         }
         
-        # 의도 분석
-        if any(word in story_lower for word in ["축하", "합격", "성취", "기념"]):
-            context["intent"].append("축하")
-        elif any(word in story_lower for word in ["위로", "힐링", "편안", "차분"]):
-            context["intent"].append("위로")
-        elif any(word in story_lower for word in ["사랑", "고백", "로맨스"]):
-            context["intent"].append("사랑표현")
-        elif any(word in story_lower for word in ["감사", "고마움", "존경"]):
-            context["intent"].append("감사")
-        
-        # 상황 분석
-        if any(word in story_lower for word in ["생일", "기념일"]):
-            context["situation"].append("생일")
-        elif any(word in story_lower for word in ["졸업", "합격", "취업"]):
-            context["situation"].append("성취")
-        elif any(word in story_lower for word in ["병문안", "회복", "건강"]):
-            context["situation"].append("건강")
-        elif any(word in story_lower for word in ["고백", "프로포즈"]):
-            context["situation"].append("로맨스")
-        
-        # 관계 분석
-        if any(word in story_lower for word in ["연인", "남자친구", "여자친구", "애인"]):
-            context["relationship"].append("연인")
-        elif any(word in story_lower for word in ["부모님", "어머니", "아버지"]):
-            context["relationship"].append("부모자식")
-        elif any(word in story_lower for word in ["친구", "동료", "지인"]):
-            context["relationship"].append("친구")
-        
-        # 분위기 분석
-        if any(word in story_lower for word in ["로맨틱", "사랑스러운"]):
-            context["mood"].append("로맨틱")
-        elif any(word in story_lower for word in ["우아", "고급스러운"]):
-            context["mood"].append("우아")
-        elif any(word in story_lower for word in ["활기", "밝은"]):
-            context["mood"].append("활기찬")
-        elif any(word in story_lower for word in ["차분", "편안한"]):
-            context["mood"].append("차분한")
+        # 의도 / 상황 / 관계 / 분위기 분석 (각 표에서 우선순위가 가장 높은 매칭 1개)
+        hits = scan_keywords(story)
+        for dimension, group in (("intent", "matcher.context_intent"), ("situation", "matcher.context_situation"),
+                                 ("relationship", "matcher.context_relationship"), ("mood", "matcher.context_mood")):
+            category = hits.first(group)
+            if category:
+                context[dimension].append(category)
         
         # 색상 분석 (기존 로직 활용)
         context["colors"] = self._fallback_color_extraction(story)
@@ -2454,9 +2463,7 @@ JSON 형식으로 응답:
     
     def _apply_comfort_situation_bonus(self, flower_data: Dict, story: str, score: float) -> float:
         """위로/슬픔 상황 특별 보너스 적용"""
-        comfort_keywords = ["무지개다리를 건넌", "돌아가신", "별이 된", "위로", "슬픔", "이별", "반려견", "반려동물"]
-        
-        if any(keyword in story.lower() for keyword in comfort_keywords):
+        if scan_keywords(story).any("matcher.comfort"):
             # 위로 관련 꽃말을 가진 꽃들에 높은 가중치
             flower_meanings = flower_data.get('flower_meanings', {})
             all_meanings = []
@@ -0,0 +1,88 @@
+"""
+사연에서 언급된 꽃 감지 (꽃 이름 / 학명 / 별칭 → flower_id, 가장 긴 이름 우선)
+- 카탈로그의 한국어 이름 / 학명 (+ 각 단어) 과 data/flower_name_aliases.json 의 별칭을
+  카탈로그 버전별로 한 번만 오토마톤으로 컴파일
+- 사연을 한 번 훑어 등장한 이름 중 가장 긴 이름의 꽃을 선택
+  (길이가 같으면 매핑 순서 = 이름을 길이순으로 정렬해 하나씩 찾던 기존 방식과 같은 결과)
+- 별칭은 학명의 속명(첫 단어, 소문자) 기준이고, 카탈로그 이름과 겹치면 카탈로그 이름이 우선
+"""
+import json
+from typing import Dict, List, Optional, Tuple
+
+from app.services.keyword_automaton import KeywordAutomaton
+
+FLOWER_NAME_ALIASES_PATH = "data/flower_name_aliases.json"
+
+
+def load_flower_name_aliases(path: str = FLOWER_NAME_ALIASES_PATH) -> Dict[str, List[str]]:
+    """속명 → 별칭 목록 (파일이 없거나 깨지면 별칭 없이 진행)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("aliases", {})
+    except Exception as e:
+        print(f"⚠️ 꽃 별칭 로드 실패: {e}")
+        return {}
+
+
+def build_flower_name_mapping(catalog, aliases: Optional[Dict[str, List[str]]] = None) -> Dict[str, str]:
+    """꽃 이름 / 별칭 -> flower_id 매핑 생성"""
+    flower_mapping = {}
+    alias_mapping = {}
+    for flower_id, flower_data in catalog.flowers.items():
+        korean_name = flower_data.get("korean_name", "")
+        scientific_name = flower_data.get("scientific_name", "")
+
+        # 한국어 이름 매핑
+        if korean_name:
+            flower_mapping[korean_name] = flower_id
+            # 부분 매칭을 위한 키워드도 추가
+            for word in korean_name.split():
+                if len(word) > 1:
+                    flower_mapping[word] = flower_id
+
+        # 학명 매핑
+        if scientific_name:
+            flower_mapping[scientific_name] = flower_id
+            # 부분 매칭을 위한 키워드도 추가
+            for word in scientific_name.split():
+                if len(word) > 2:
+                    flower_mapping[word] = flower_id
+
+            # 속명 별칭 (같은 속 꽃이 여럿이면 이름과 마찬가지로 마지막 꽃)
+            for alias in (aliases or {}).get(scientific_name.split()[0].lower(), []):
+                alias_mapping[alias] = flower_id
+
+    for alias, flower_id in alias_mapping.items():
+        flower_mapping.setdefault(alias, flower_id)
+
+    return flower_mapping
+
+
+class FlowerNameDetector:
+    """꽃 이름 매핑을 컴파일한 최장 일치 감지기"""
+
+    def __init__(self, flower_names: Dict[str, str]):
+        self.flower_names = flower_names
+        self._names = list(flower_names)
+        self._automaton = KeywordAutomaton([name.lower() for name in self._names])
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def detect(self, story: str) -> Optional[Tuple[str, str]]:
+        """(매칭된 이름, flower_id) - 가장 긴 이름, 길이가 같으면 매핑 순서가 앞선 이름"""
+        found = self._automaton.scan((story or "").lower())
+        if not found:
+            return None
+        name = self._names[min(found, key=lambda name_id: (-len(self._names[name_id]), name_id))]
+        return name, self.flower_names[name]
+
+
+def get_flower_name_detector() -> FlowerNameDetector:
+    """공유 카탈로그의 꽃 이름 감지기 (카탈로그 버전별로 한 번만 컴파일)"""
+    from app.services.flower_catalog import get_flower_catalog
+
+    return get_flower_catalog().derive(
+        "flower_name_detector",
+        lambda catalog: FlowerNameDetector(build_flower_name_mapping(catalog, load_flower_name_aliases())),
+    )
@@ -0,0 +1,97 @@
+"""
+꽃 순위 + 사연별 순위 세션 캐시
+- FlowerMatcher 가 매칭할 때 계산한 전체 점수 벡터와 점수 입력(감정 / 사연 / 색상 / 시즌 / 의도)을 보관
+- /emotion-analysis 응답의 story_id 로 세션을 찾아 키워드 제외 / "다른 꽃 보기" / 색상 변경을
+  보관된 점수로 다시 순위만 계산 (감정 분석 / 맥락 추출 LLM 은 다시 실행하지 않음)
+- 세션은 TTL + 최대 개수 (오래된 것부터 제거) 로 제한
+"""
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.core.config import get_settings
+
+
+@dataclass
+class FlowerRanking:
+    """매칭 한 번의 점수 벡터 + 다시 순위를 계산하는 데 필요한 입력"""
+    story: str
+    emotions: List[Any]
+    color_keywords: List[str]
+    user_intent: str
+    current_season: Optional[str]
+    scores: Optional[Dict[str, float]]  # flower_id → 점수 (후보 밖 꽃은 0 점이라 빠질 수 있음, 언급된 꽃 우선 선택이면 None)
+    best_flower_id: Optional[str]  # 실제로 고른 꽃
+    excluded_keywords: List[Dict[str, str]] = field(default_factory=list)
+    mood_keywords: List[str] = field(default_factory=list)  # 디자인 기반 매칭의 무드 (다시 추출하지 않도록)
+    shown: List[str] = field(default_factory=list)  # 지금까지 보여준 꽃 ("다른 꽃 보기" 에서 제외)
+    last_seen: float = field(default_factory=time.time)
+    # 다시 순위 계산 (보여준 꽃 / 색상 / 점수 갱신) 은 세션마다 하나씩
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def ordered(self, flower_ids: List[str]) -> List[str]:
+        """점수 내림차순 꽃 id (동점이면 카탈로그 순서 = 매칭의 max() 와 같은 1위)"""
+        scores = self.scores or {}
+        return sorted(flower_ids, key=lambda flower_id: -scores.get(flower_id, 0.0))
+
+
+class RankingSessionStore:
+    """story_id → FlowerRanking (TTL + 최대 개수)"""
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._sessions: "OrderedDict[str, FlowerRanking]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"stored": 0, "hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+
+    def _expire_locked(self):
+        now = time.time()
+        for story_id, ranking in list(self._sessions.items()):
+            if now - ranking.last_seen > self.ttl_seconds:
+                del self._sessions[story_id]
+                self.stats["expired"] += 1
+
+    def put(self, story_id: str, ranking: FlowerRanking):
+        with self._lock:
+            self._expire_locked()
+            ranking.last_seen = time.time()
+            self._sessions[story_id] = ranking
+            self._sessions.move_to_end(story_id)
+            while len(self._sessions) > self.max_size:
+                self._sessions.popitem(last=False)
+                self.stats["evicted"] += 1
+            self.stats["stored"] += 1
+
+    def get(self, story_id: str) -> Optional[FlowerRanking]:
+        with self._lock:
+            self._expire_locked()
+            ranking = self._sessions.get(story_id)
+            if ranking is None:
+                self.stats["misses"] += 1
+                return None
+            ranking.last_seen = time.time()
+            self._sessions.move_to_end(story_id)
+            self.stats["hits"] += 1
+            return ranking
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._expire_locked()
+            return {
+                "sessions": len(self._sessions),
+                "ttl_seconds": self.ttl_seconds,
+                "max_size": self.max_size,
+                **self.stats,
+            }
+
+
+_settings = get_settings()
+
+# 전역 인스턴스
+ranking_sessions = RankingSessionStore(
+    ttl_seconds=_settings.ranking_session_ttl_seconds,
+    max_size=_settings.ranking_session_max_size,
+)
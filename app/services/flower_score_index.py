@@ -0,0 +1,501 @@
+"""
+꽃 점수 계산 인덱스 (FlowerMatcher._calculate_flower_scores 의 벡터화 버전)
+- 카탈로그를 한 번 컴파일: 꽃 × 키워드 슬롯 인덱스 행렬 (관계 / 사용 맥락 / 계절 이벤트 / 꽃말) + 정적 마스크
+- 사연마다 키워드 어휘 전체의 유사도 벡터를 한 번만 계산하고, 모든 꽃 점수를 배열 연산으로 계산
+- 감정 / 색상 유사도 표: 컴파일 시 표준 감정명 / 색상 그룹 / 카탈로그 색상값마다 꽃별 유사도 열을 미리 계산
+  (키는 소문자 이름 - 유사도 함수가 소문자 이름만 보므로 정확, 표에 없는 이름만 요청 시 계산해 캐시)
+- 유사도 열은 서로 다른 무드 / 색상 목록마다 한 번만 계산 (같은 꽃의 색상 변형이 많아서)
+- 덧셈 / 곱셈 순서를 기존 반복문과 같게 유지해 점수가 비트 단위로 같음 (순위 동일,
+  scripts/benchmark_flower_scoring.py 로 확인)
+"""
+import threading
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy 가 없으면 FlowerMatcher 가 기존 반복문으로 계산
+    np = None
+
+# 감정 유사도 매핑
+EMOTION_SIMILARITIES: Dict[str, List[str]] = {
+    "사랑/로맨스": ["사랑", "로맨틱한", "열정적인", "매혹적인", "사랑스러운"],
+    "기쁨": ["기쁜", "행복한", "즐거운", "밝은", "활기찬"],
+    "위로": ["위로하는", "따뜻한", "안정적인", "편안한", "포근한"],
+    "응원/격려": ["응원하는", "격려하는", "지지하는", "용기있는", "희망적인"],
+    "감사/존경": ["감사한", "존경하는", "고귀한", "아름다운", "우아한"],
+    "그리움/추억": ["그리운", "추억하는", "아련한", "회상하는", "기억하는"],
+    "희망": ["희망적인", "미래의", "새로운", "신뢰할 수 있는", "완벽한"],
+    "순수": ["순수한", "순결한", "깨끗한", "자연스러운", "이상적인"]
+}
+
+# 색상 유사도 매핑
+COLOR_SIMILARITIES: Dict[str, List[str]] = {
+    "핑크": ["핑크", "연핑크", "라이트핑크", "로즈", "살구색"],
+    "레드": ["레드", "빨강", "크림슨", "버건디", "마론"],
+    "화이트": ["화이트", "흰색", "아이보리", "크림", "오프화이트"],
+    "옐로우": ["옐로우", "노랑", "골드", "크림", "베이지"],
+    "블루": ["블루", "파랑", "네이비", "스카이블루", "옅은 블루"],
+    "퍼플": ["퍼플", "보라", "라일락", "라벤더", "바이올렛"],
+    "오렌지": ["오렌지", "코랄", "살구색", "피치", "어프리콧"],
+    "그린": ["그린", "초록", "민트", "세이지", "올리브"]
+}
+
+# 유사 키워드 매핑
+SIMILAR_KEYWORDS: Dict[str, List[str]] = {
+    "사랑": ["연인", "고백", "첫사랑", "로맨스", "애정"],
+    "기쁨": ["행복", "즐거움", "웃음", "밝음", "활기"],
+    "위로": ["안정", "편안함", "포근함", "따뜻함", "힐링"],
+    "응원": ["격려", "지지", "힘내", "화이팅", "후원"],
+    "감사": ["고마움", "은인", "축복", "보답", "존경"],
+    "희망": ["미래", "꿈", "새로운", "신뢰", "완벽"],
+    "순수": ["순결", "깨끗함", "자연", "이상", "완벽"],
+    "우정": ["친구", "지지", "동료", "함께", "우정"],
+    "축하": ["생일", "성취", "합격", "기념", "경쾌"],
+    "그리움": ["추억", "과거", "회상", "아련함", "이사"]
+}
+
+# 밝은 기분이 필요한 사연 → 옐로우 톤 우선
+YELLOW_TRIGGERS = ["흐린 날씨", "흐려서", "기분이 처져요", "처져", "우울", "침침한", "밝아질", "밝게", "활기", "기운"]
+YELLOW_COLORS = ['옐로우', '노랑', '골드']
+
+# 부정적 감정 → 치유 꽃말을 가진 꽃 우선
+NEGATIVE_EMOTIONS = ["우울", "스트레스", "외로움", "불안", "슬픔", "걱정"]
+HEALING_KEYWORDS = ["희망", "기쁨", "행복", "활기", "위로", "따뜻함", "사랑", "기운"]
+
+# 컴파일 시 유사도 열을 미리 계산하는 감정명 (감정 분석 / 폴백 분석 / 로컬 분류기가 내는 감정)
+CANONICAL_EMOTIONS = [
+    "기쁨", "축하", "따뜻함", "위로", "응원", "희망", "감사", "사랑", "그리움", "환영",
+    "존경", "격려", "추억", "설렘", "열정", "순수함", "슬픔", "불안", "애뜻함", "평온", "자랑스러움",
+]
+
+# 표에 없는 감정 / 색상 유사도 열 캐시 상한 (LLM 이 만든 감정명이 계속 늘어나는 경우 대비)
+_COLUMN_CACHE_SIZE = 512
+
+
+def emotion_similarity(emotion: str, mood_list: List[str]) -> float:
+    """감정 유사도 계산"""
+    emotion_lower = emotion.lower()
+
+    # 감정 그룹 찾기
+    for group, similar_emotions in EMOTION_SIMILARITIES.items():
+        if emotion_lower in group.lower() or any(similar in emotion_lower for similar in similar_emotions):
+            # 해당 그룹의 감정들과 매칭
+            for mood in mood_list:
+                mood_lower = mood.lower()
+                if any(similar in mood_lower for similar in similar_emotions):
+                    return 0.8  # 높은 유사도
+                elif any(word in mood_lower for word in emotion_lower.split()):
+                    return 0.6  # 중간 유사도
+
+    # 직접 매칭
+    for mood in mood_list:
+        mood_lower = mood.lower()
+        if emotion_lower in mood_lower or mood_lower in emotion_lower:
+            return 1.0  # 완전 일치
+        elif any(word in mood_lower for word in emotion_lower.split()):
+            return 0.7  # 부분 일치
+
+    return 0.0  # 유사도 없음
+
+
+def color_similarity(requested_color: str, available_colors: List[str]) -> float:
+    """색상 유사도 계산"""
+    requested_lower = requested_color.lower()
+
+    # 색상 그룹 찾기
+    for group, similar_colors in COLOR_SIMILARITIES.items():
+        if requested_lower in group.lower() or any(similar in requested_lower for similar in similar_colors):
+            # 해당 그룹의 색상들과 매칭
+            for color in available_colors:
+                color_lower = color.lower()
+                if any(similar in color_lower for similar in similar_colors):
+                    return 0.9  # 높은 유사도
+                elif any(word in color_lower for word in requested_lower.split()):
+                    return 0.7  # 중간 유사도
+
+    # 직접 매칭
+    for color in available_colors:
+        color_lower = color.lower()
+        if requested_lower in color_lower or color_lower in requested_lower:
+            return 1.0  # 완전 일치
+        elif any(word in color_lower for word in requested_lower.split()):
+            return 0.8  # 부분 일치
+
+    return 0.0  # 유사도 없음
+
+
+def related_groups(keyword_lower: str) -> List[bool]:
+    """키워드가 어떤 유사 키워드 그룹에 속하는지 (그룹 순서대로)"""
+    return [
+        keyword_lower in base_keyword or any(similar in keyword_lower for similar in similar_list)
+        for base_keyword, similar_list in SIMILAR_KEYWORDS.items()
+    ]
+
+
+def keyword_similarity(story: str, keywords: List[str]) -> float:
+    """키워드 유사도 계산 (story 는 소문자로 변환된 사연)"""
+    if not keywords:
+        return 0.0
+
+    max_similarity = 0.0
+
+    for keyword in keywords:
+        keyword_lower = keyword.lower()
+
+        # 완전 일치
+        if keyword_lower in story:
+            max_similarity = max(max_similarity, 1.0)
+        # 부분 일치
+        elif any(word in story for word in keyword_lower.split()):
+            max_similarity = max(max_similarity, 0.7)
+        # 유사 키워드 매칭
+        else:
+            for related, similar_list in zip(related_groups(keyword_lower), SIMILAR_KEYWORDS.values()):
+                if related and any(similar in story for similar in similar_list):
+                    max_similarity = max(max_similarity, 0.6)
+
+    return max_similarity
+
+
+def similarity_emotions() -> List[str]:
+    """유사도 표에 넣을 감정명 (표준 감정 + 감정 그룹 / 그룹의 감정)"""
+    names = list(CANONICAL_EMOTIONS)
+    for group, similar_emotions in EMOTION_SIMILARITIES.items():
+        names.append(group)
+        names.extend(group.split("/"))
+        names.extend(similar_emotions)
+    return list(dict.fromkeys(name.lower() for name in names))
+
+
+def similarity_colors(catalog_colors: List[str]) -> List[str]:
+    """유사도 표에 넣을 색상명 (색상 그룹 / 그룹의 색상 + 카탈로그 색상값)"""
+    names = []
+    for group, similar_colors in COLOR_SIMILARITIES.items():
+        names.append(group)
+        names.extend(similar_colors)
+    names.extend(catalog_colors)
+    return list(dict.fromkeys(name.lower() for name in names))
+
+
+def flatten_moods(flower_data: Dict) -> List[str]:
+    """moods 는 딕셔너리 형태이므로 모든 값들을 평면화"""
+    all_moods = []
+    for mood_list in flower_data.get('moods', {}).values():
+        if isinstance(mood_list, list):
+            all_moods.extend(mood_list)
+    return all_moods
+
+
+def flower_colors(flower_data: Dict) -> List[str]:
+    colors = flower_data.get('color', [])
+    return [colors] if isinstance(colors, str) else colors
+
+
+class FlowerScoringIndex:
+    """카탈로그를 컴파일한 꽃 점수 계산 인덱스"""
+
+    def __init__(self, flowers: Dict[str, Dict]):
+        self.flower_ids = list(flowers)
+        self.size = len(self.flower_ids)
+        flower_list = list(flowers.values())
+
+        self.positions = {flower_id: i for i, flower_id in enumerate(self.flower_ids)}
+
+        # 감정 / 색상 유사도 열 계산용 (서로 다른 목록 + 꽃 → 목록 위치)
+        self._moods, self._mood_rows = self._distinct([flatten_moods(flower) for flower in flower_list])
+        self._colors, self._color_rows = self._distinct([flower_colors(flower) for flower in flower_list])
+        self._primary_colors, self._primary_color_rows = self._distinct(
+            [[flower.get('color', '')] for flower in flower_list]
+        )
+        self._emotion_columns: Dict[str, Any] = {}
+        self._color_columns: Dict[str, Any] = {}
+        self._primary_color_columns: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+        # 정적 마스크
+        self.korean_names = [flower['korean_name'] for flower in flower_list]
+        self._lisianthus = np.array([name == '리시안서스' for name in self.korean_names], dtype=bool)
+        self._yellow = np.array([flower.get('color') in YELLOW_COLORS for flower in flower_list], dtype=bool)
+        self._healing = np.array([self._is_healing(flower) for flower in flower_list], dtype=bool)
+
+        # 색상 정확 일치용 (꽃 색상값 → 고유 색상 id, 문자열이 아니면 -1)
+        self._color_values: List[str] = []
+        color_ids: Dict[str, int] = {}
+        exact_ids = []
+        for flower in flower_list:
+            value = flower.get('color', '')
+            if isinstance(value, str):
+                if value not in color_ids:
+                    color_ids[value] = len(self._color_values)
+                    self._color_values.append(value)
+                exact_ids.append(color_ids[value])
+            else:
+                exact_ids.append(-1)
+        self._exact_color_ids = np.array(exact_ids, dtype=np.int64)
+
+        # 미리 계산한 유사도 표 (소문자 감정명 / 색상명 → 꽃별 유사도 열, 캐시에서 밀려나지 않음)
+        colors = similarity_colors(self._color_values)
+        self._emotion_table = self._table(similarity_emotions(), self._moods, self._mood_rows, emotion_similarity)
+        self._color_table = self._table(colors, self._colors, self._color_rows, color_similarity)
+        self._primary_color_table = self._table(colors, self._primary_colors, self._primary_color_rows,
+                                                color_similarity)
+
+        # 키워드 어휘 (소문자) + 꽃별 키워드 슬롯
+        self._keywords: List[str] = []
+        self._keyword_ids: Dict[str, int] = {}
+        relationship_slots = [
+            [self._slots(keywords) for keywords in flower.get('relationship_suitability', {}).values()
+             if isinstance(keywords, list)]
+            for flower in flower_list
+        ]
+        usage_slots = [self._slots(flower.get('usage_contexts', [])) for flower in flower_list]
+        event_slots = [self._slots(flower.get('seasonal_events', [])) for flower in flower_list]
+        meaning_slots = [self._slots(flower.get('flower_meanings', {}).get('primary', [])) for flower in flower_list]
+
+        # 패딩은 어휘 끝의 센티널 (유사도 0.0)
+        self._sentinel = len(self._keywords)
+        self._relationship_slots = self._pad_3d(relationship_slots)
+        self._usage_slots = self._pad_2d(usage_slots)
+        self._event_slots = self._pad_2d(event_slots)
+        self._meaning_slots = self._pad_2d(meaning_slots)
+
+        # 키워드 → 단어 (부분 일치), 키워드 → 유사 키워드 그룹
+        self._words: List[str] = []
+        word_ids: Dict[str, int] = {}
+        keyword_words = []
+        for keyword in self._keywords:
+            ids = []
+            for word in keyword.split():
+                if word not in word_ids:
+                    word_ids[word] = len(self._words)
+                    self._words.append(word)
+                ids.append(word_ids[word])
+            keyword_words.append(ids)
+        width = max([len(ids) for ids in keyword_words] + [1])
+        self._keyword_words = np.full((len(self._keywords), width), len(self._words), dtype=np.int64)
+        for row, ids in enumerate(keyword_words):
+            self._keyword_words[row, :len(ids)] = ids
+        self._keyword_groups = np.array(
+            [related_groups(keyword) for keyword in self._keywords], dtype=bool
+        ).reshape(len(self._keywords), len(SIMILAR_KEYWORDS))
+
+    @staticmethod
+    def _is_healing(flower: Dict) -> bool:
+        flower_meanings = flower.get('flower_meanings', {})
+        all_meanings = []
+        all_meanings.extend(flower_meanings.get('primary', []))
+        all_meanings.extend(flower_meanings.get('secondary', []))
+        all_meanings.extend(flower_meanings.get('other', []))
+        return any(keyword in str(all_meanings) for keyword in HEALING_KEYWORDS)
+
+    @staticmethod
+    def _distinct(lists: List[List[Any]]):
+        """서로 다른 목록 + 꽃별 목록 위치"""
+        distinct: List[List[Any]] = []
+        ids: Dict[str, int] = {}
+        rows = []
+        for values in lists:
+            key = repr(values)
+            if key not in ids:
+                ids[key] = len(distinct)
+                distinct.append(values)
+            rows.append(ids[key])
+        return distinct, np.array(rows, dtype=np.int64)
+
+    @staticmethod
+    def _column(distinct: List[List[Any]], rows, compute):
+        """서로 다른 목록마다 한 번 계산한 유사도 → 꽃별 열"""
+        return np.array([compute(values) for values in distinct], dtype=np.float64)[rows]
+
+    def _table(self, names: List[str], distinct: List[List[Any]], rows, similarity) -> Dict[str, Any]:
+        """이름별 유사도 열 (계산할 수 없는 이름은 빼고 요청 시 계산 경로로)"""
+        table = {}
+        for name in names:
+            try:
+                table[name] = self._column(distinct, rows, lambda values: similarity(name, values))
+            except Exception:
+                continue
+        return table
+
+    def _slots(self, keywords) -> List[int]:
+        """키워드 목록 (딕셔너리면 키) → 어휘 id 목록"""
+        slots = []
+        for keyword in keywords:
+            keyword_lower = keyword.lower()
+            if keyword_lower not in self._keyword_ids:
+                self._keyword_ids[keyword_lower] = len(self._keywords)
+                self._keywords.append(keyword_lower)
+            slots.append(self._keyword_ids[keyword_lower])
+        return slots
+
+    def _pad_2d(self, rows: List[List[int]]):
+        width = max([len(row) for row in rows] + [1])
+        padded = np.full((len(rows), width), self._sentinel, dtype=np.int64)
+        for i, row in enumerate(rows):
+            padded[i, :len(row)] = row
+        return padded
+
+    def _pad_3d(self, groups: List[List[List[int]]]):
+        depth = max([len(group) for group in groups] + [0])
+        width = max([len(row) for group in groups for row in group] + [1])
+        padded = np.full((len(groups), depth, width), self._sentinel, dtype=np.int64)
+        for i, group in enumerate(groups):
+            for j, row in enumerate(group):
+                padded[i, j, :len(row)] = row
+        return padded
+
+    def _cached_column(self, table: Dict[str, Any], cache: Dict[str, Any], key: str, distinct, rows, similarity) -> Any:
+        key = key.lower()
+        column = table.get(key)
+        if column is None:
+            column = cache.get(key)
+        if column is None:
+            column = self._column(distinct, rows, lambda values: similarity(key, values))
+            with self._lock:
+                if len(cache) >= _COLUMN_CACHE_SIZE:
+                    cache.clear()
+                cache[key] = column
+        return column
+
+    def emotion_column(self, emotion: str):
+        """꽃별 감정 유사도"""
+        return self._cached_column(self._emotion_table, self._emotion_columns, emotion,
+                                   self._moods, self._mood_rows, emotion_similarity)
+
+    def color_column(self, color: str):
+        """꽃별 색상 유사도 (꽃의 색상 목록 기준)"""
+        return self._cached_column(self._color_table, self._color_columns, color,
+                                   self._colors, self._color_rows, color_similarity)
+
+    def primary_color_column(self, color: str):
+        """꽃별 색상 유사도 (꽃의 대표 색상값 기준)"""
+        return self._cached_column(self._primary_color_table, self._primary_color_columns, color,
+                                   self._primary_colors, self._primary_color_rows, color_similarity)
+
+    def emotion_similarity(self, emotion: str, flower_id: str) -> float:
+        """꽃 하나의 감정 유사도 (표 조회)"""
+        return self.emotion_column(emotion)[self.positions[flower_id]]
+
+    def color_similarity(self, color: str, flower_id: str) -> float:
+        """꽃 하나의 색상 유사도 (표 조회)"""
+        return self.color_column(color)[self.positions[flower_id]]
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "flowers": self.size,
+            "distinct_moods": len(self._moods),
+            "distinct_colors": len(self._colors),
+            "emotion_table": len(self._emotion_table),
+            "color_table": len(self._color_table),
+            "cached_emotions": len(self._emotion_columns),
+            "cached_colors": len(self._color_columns),
+        }
+
+    def keyword_values(self, story_lower: str):
+        """사연 기준 어휘 전체의 키워드 유사도 (+ 끝에 패딩용 0.0)"""
+        full = np.fromiter((keyword in story_lower for keyword in self._keywords), dtype=bool, count=len(self._keywords))
+        word_hits = np.fromiter((word in story_lower for word in self._words), dtype=bool, count=len(self._words))
+        word_any = np.append(word_hits, False)[self._keyword_words].any(axis=1)
+        group_hits = np.fromiter(
+            (any(similar in story_lower for similar in similar_list) for similar_list in SIMILAR_KEYWORDS.values()),
+            dtype=bool, count=len(SIMILAR_KEYWORDS)
+        )
+        group_any = (self._keyword_groups & group_hits).any(axis=1)
+        values = np.where(full, 1.0, np.where(word_any, 0.7, np.where(group_any, 0.6, 0.0)))
+        return np.append(values, 0.0)
+
+    def score(self, emotions: List[Any], story: str, color_keywords: List[str], rows: Optional[List[int]] = None):
+        """꽃 점수 배열 (카탈로그 순서, rows 가 있으면 그 위치의 꽃만)"""
+        rows = slice(None) if rows is None else np.asarray(rows, dtype=np.int64)
+        story_lower = story.lower()
+        score = np.zeros(len(self._exact_color_ids[rows]), dtype=np.float64)
+
+        # 1. 감정 유사도
+        for emotion in emotions:
+            score += self.emotion_column(emotion.emotion)[rows] * emotion.percentage * 0.01
+
+        # 2. 색상 유사도
+        for color in color_keywords:
+            score += self.color_column(color)[rows] * 0.3
+
+        # 3~6. 관계 적합성 / 사용 맥락 / 계절 이벤트 / 꽃말 (키워드 유사도는 사연당 한 번 계산)
+        values = self.keyword_values(story_lower)
+        relationship = values[self._relationship_slots[rows]].max(axis=2)
+        for j in range(relationship.shape[1]):
+            score += relationship[:, j] * 0.4
+        score += values[self._usage_slots[rows]].max(axis=1) * 0.3
+        score += values[self._event_slots[rows]].max(axis=1) * 0.2
+        score += values[self._meaning_slots[rows]].max(axis=1) * 0.2
+
+        # 7. 리시안서스 점수 조정 (다양성 확보)
+        score[self._lisianthus[rows]] *= 0.7
+
+        # 8. 옐로우 톤 꽃 우선순위 (밝은 기분을 위한)
+        if any(keyword in story_lower for keyword in YELLOW_TRIGGERS):
+            score[self._yellow[rows]] *= 1.5
+
+        # 9. 부정적 감정 해결 꽃 우선순위
+        if any(emotion in str(emotions) for emotion in NEGATIVE_EMOTIONS):
+            score[self._healing[rows]] *= 1.3
+
+        # 대표 색상 유사도 + 요청 색상 정확 일치 시 2배 / 불일치 시 0.3배
+        if color_keywords:
+            score += self.primary_color_column(color_keywords[0])[rows] * 0.3
+            requested = np.array([value in color_keywords for value in self._color_values] + [False], dtype=bool)
+            exact = requested[self._exact_color_ids[rows]]
+            score = np.where(exact, score * 2.0, score * 0.3)
+
+        return score
+
+    def breakdown(self, emotions: List[Any], story: str, color_keywords: List[str], rows: List[int]) -> List[Dict[str, float]]:
+        """꽃별 점수 분해 (상위 K 개 설명용 - 덧셈 항목 / 배율 / 최종 점수)"""
+        rows = np.asarray(rows, dtype=np.int64)
+        story_lower = story.lower()
+        values = self.keyword_values(story_lower)
+        parts = {
+            "emotion": sum((self.emotion_column(e.emotion)[rows] * e.percentage * 0.01 for e in emotions),
+                           np.zeros(len(rows))),
+            "color": sum((self.color_column(color)[rows] * 0.3 for color in color_keywords), np.zeros(len(rows))),
+            "relationship": values[self._relationship_slots[rows]].max(axis=2).sum(axis=1) * 0.4,
+            "usage_context": values[self._usage_slots[rows]].max(axis=1) * 0.3,
+            "seasonal_event": values[self._event_slots[rows]].max(axis=1) * 0.2,
+            "meaning": values[self._meaning_slots[rows]].max(axis=1) * 0.2,
+        }
+        multiplier = np.where(self._lisianthus[rows], 0.7, 1.0)
+        if any(keyword in story_lower for keyword in YELLOW_TRIGGERS):
+            multiplier = multiplier * np.where(self._yellow[rows], 1.5, 1.0)
+        if any(emotion in str(emotions) for emotion in NEGATIVE_EMOTIONS):
+            multiplier = multiplier * np.where(self._healing[rows], 1.3, 1.0)
+        parts["multiplier"] = multiplier
+        if color_keywords:
+            parts["primary_color"] = self.primary_color_column(color_keywords[0])[rows] * 0.3
+            requested = np.array([value in color_keywords for value in self._color_values] + [False], dtype=bool)
+            parts["color_match"] = np.where(requested[self._exact_color_ids[rows]], 2.0, 0.3)
+        parts["score"] = self.score(emotions, story, color_keywords, rows)
+        return [{name: round(float(part[i]), 4) for name, part in parts.items()} for i in range(len(rows))]
+
+    def score_dict(self, emotions: List[Any], story: str, color_keywords: List[str],
+                   rows: Optional[List[int]] = None) -> Dict[str, float]:
+        """꽃 id → 점수 (기존 _calculate_flower_scores 와 같은 형태)"""
+        flower_ids = self.flower_ids if rows is None else [self.flower_ids[i] for i in rows]
+        return dict(zip(flower_ids, self.score(emotions, story, color_keywords, rows).tolist()))
+
+
+def derive_flower_scoring_index(catalog) -> Optional[FlowerScoringIndex]:
+    """카탈로그 버전별 점수 인덱스 (유사도 표 포함, 한 번만 컴파일, numpy 가 없으면 None)"""
+    if np is None:
+        return None
+    return catalog.derive("flower_scoring_index", lambda c: FlowerScoringIndex(c.flowers))
+
+
+def get_flower_scoring_index(flowers: Dict[str, Dict]) -> Optional[FlowerScoringIndex]:
+    """꽃 데이터에 맞는 점수 인덱스 (공유 카탈로그면 카탈로그 버전별로 한 번만 컴파일, numpy 가 없으면 None)"""
+    if np is None:
+        return None
+    from app.services.flower_catalog import get_flower_catalog
+
+    catalog = get_flower_catalog()
+    if flowers is catalog.flowers:
+        return derive_flower_scoring_index(catalog)
+    # 하드코딩된 폴백 데이터 등 (드물어서 캐시하지 않음)
+    return FlowerScoringIndex(flowers)
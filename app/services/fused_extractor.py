@@ -0,0 +1,192 @@
+"""
+감정 분석 + 맥락 추출 통합(fused) 서비스 - LLM 1회 호출
+"""
+import os
+import json
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.models.schemas import EmotionAnalysis
+from app.services.emotion_analyzer import EmotionAnalyzer
+from app.services.realtime_context_extractor import RealtimeContextExtractor, ExtractedContext
+from app.services.openai_client import get_openai_client, get_async_openai_client
+from app.services.llm_cache import llm_cache
+from app.services.model_router import model_router
+from app.services.flower_catalog import get_flower_catalog
+from app.pipelines.stage_memo import StageMemo
+
+EXTRACTION_MODE_LEGACY = "legacy"
+EXTRACTION_MODE_FUSED = "fused"
+
+
+class FusedContextExtractor:
+    """감정 블렌드와 감정/상황/무드/색상/의도를 한 번의 구조화 출력 호출로 추출"""
+
+    def __init__(self):
+        self.openai_api_key = os.getenv("OPENAI_API_KEY")
+        self.emotion_analyzer = EmotionAnalyzer()
+        self.context_extractor = RealtimeContextExtractor()
+
+    def extract(self, story: str, excluded_keywords: List[Dict[str, str]] = None) -> Tuple[List[EmotionAnalysis], ExtractedContext]:
+        """감정 분석 결과와 맥락을 함께 반환 (실패 시 기존 2단계 방식으로 폴백)"""
+        if not self.openai_api_key:
+            return self._legacy_extract(story, excluded_keywords)
+
+        try:
+            client = get_openai_client(self.openai_api_key)
+            result = llm_cache.chat_completion(client, "fused_extraction", **self._create_llm_request(story))
+            print(f"🤖 통합 추출 응답: {result}")
+            return self._parse_fused_response(result, story, excluded_keywords)
+
+        except Exception as e:
+            print(f"❌ 통합 추출 실패: {e}")
+            print(f"🔧 기존 2단계 추출로 전환")
+            return self._legacy_extract(story, excluded_keywords)
+
+    async def extract_async(self, story: str, excluded_keywords: List[Dict[str, str]] = None) -> Tuple[List[EmotionAnalysis], ExtractedContext]:
+        """extract 의 비동기 버전 (AsyncOpenAI)"""
+        if not self.openai_api_key:
+            return await self._legacy_extract_async(story, excluded_keywords)
+
+        try:
+            client = get_async_openai_client(self.openai_api_key)
+            result = await llm_cache.achat_completion(client, "fused_extraction", **self._create_llm_request(story))
+            print(f"🤖 통합 추출 응답: {result}")
+            return self._parse_fused_response(result, story, excluded_keywords)
+
+        except Exception as e:
+            print(f"❌ 통합 추출 실패: {e}")
+            print(f"🔧 기존 2단계 추출로 전환")
+            return await self._legacy_extract_async(story, excluded_keywords)
+
+    def _legacy_extract(self, story: str, excluded_keywords: List[Dict[str, str]] = None) -> Tuple[List[EmotionAnalysis], ExtractedContext]:
+        """기존 방식: 감정 분석 후 그 결과를 반영해 맥락 추출"""
+        emotions = self.emotion_analyzer.analyze(story)
+        context = self.context_extractor.extract_context_realtime(story, emotions, excluded_keywords)
+        return emotions, context
+
+    async def _legacy_extract_async(self, story: str, excluded_keywords: List[Dict[str, str]] = None) -> Tuple[List[EmotionAnalysis], ExtractedContext]:
+        """_legacy_extract 의 비동기 버전"""
+        emotions = await self.emotion_analyzer.analyze_async(story)
+        context = await self.context_extractor.extract_context_realtime_async(story, emotions, excluded_keywords)
+        return emotions, context
+
+    def _create_llm_request(self, story: str) -> Dict:
+        """통합 추출 LLM 호출 파라미터 (동기/비동기 공통)"""
+        return {
+            **model_router.route("fused_extraction", story).params(),  # 기본 FUSED_EXTRACTION_MODEL
+            "messages": [
+                {"role": "system", "content": "당신은 고객의 이야기에서 감정과 꽃 추천 키워드를 함께 분석하는 전문가입니다. 반드시 JSON 으로만 응답하세요."},
+                {"role": "user", "content": self._create_fused_prompt(story)}
+            ],
+            "response_format": {"type": "json_object"}
+        }
+
+    def _create_fused_prompt(self, story: str) -> str:
+        """통합 추출 프롬프트 생성"""
+        return f"""
+다음 고객의 이야기에서 감정 블렌드와 꽃 추천 키워드를 함께 추출해주세요:
+
+고객 이야기: "{story}"
+
+다음 JSON 형식으로만 응답:
+{{
+    "emotion_blend": [
+        {{"emotion": "감정1", "percentage": 50.0}},
+        {{"emotion": "감정2", "percentage": 30.0}},
+        {{"emotion": "감정3", "percentage": 20.0}}
+    ],
+    "situations": ["상황1"],
+    "moods": ["무드1"],
+    "colors": ["색상1"],
+    "user_intent": "meaning_based",
+    "confidence": 0.85
+}}
+
+**emotion_blend 규칙:**
+1. 반드시 3가지 감정을 블렌딩하고 비율의 합은 100
+2. 생일/축하, "밝고 경쾌한" 요청은 "기쁨", "축하", "희망"
+3. 이사/동네를 떠남은 "그리움/추억"과 "응원/격려"
+4. 병원/입원 사연은 "희망", "위로", "따뜻함" ("환영" 금지)
+5. 번아웃/힘든 상황, 위로/응원 사연은 "위로", "따뜻함", "응원" ("사랑/로맨스", "기쁨", "감사", "존경" 금지)
+6. "환영"은 새로운 멤버가 왔을 때만 사용
+
+**키워드 규칙 (각 1개):**
+- situations: 목적/상황 (기분전환, 자기위로, 방꾸미기, 위로, 격려, 축하, 감사, 생일, 졸업, 합격, 결혼 등)
+- moods: 원하는 분위기 (따뜻한, 편안한, 활기찬, 밝은, 우아한, 자연스러운, 로맨틱한 등)
+- colors: 화이트, 오렌지, 레드, 옐로우, 핑크, 라일락, 블루, 퍼플 중 1개 (명시적 색상 표현 우선)
+- user_intent: 꽃말/마음 전달이 중심이면 "meaning_based", 인테리어/색감/스타일이 중심이면 "design_based"
+"""
+
+    def _parse_fused_response(self, response: str, story: str,
+                              excluded_keywords: List[Dict[str, str]] = None) -> Tuple[List[EmotionAnalysis], ExtractedContext]:
+        """통합 응답을 기존 EmotionAnalysis 리스트와 ExtractedContext 로 변환"""
+        data = json.loads(response)
+
+        # 1. 감정 블렌드 - 기존 감정 분석 파서/검증 재사용
+        emotions = self.emotion_analyzer._parse_emotion_response(
+            json.dumps({"emotions": data.get("emotion_blend", [])}, ensure_ascii=False)
+        )
+
+        # 2. 맥락 - 기존 파서와 후처리 재사용 (emotions 는 감정 블렌드로 대체됨)
+        mentioned_flower = self.context_extractor._detect_mentioned_flower(story)
+        context_data = {
+            "emotions": [emotions[0].emotion] if emotions else [],
+            "situations": data.get("situations", []),
+            "moods": data.get("moods", []),
+            "colors": data.get("colors", []),
+            "confidence": data.get("confidence", 0.5),
+        }
+        parsed_context = self.context_extractor._parse_llm_response(
+            json.dumps(context_data, ensure_ascii=False), mentioned_flower
+        )
+        context = self.context_extractor._finalize_llm_context(
+            parsed_context, story, emotions, excluded_keywords, mentioned_flower
+        )
+
+        user_intent = data.get("user_intent")
+        if user_intent in ("meaning_based", "design_based"):
+            context.user_intent = user_intent
+        return emotions, context
+
+
+def extract_emotions_and_context(story: str, excluded_keywords: List[Dict[str, str]] = None,
+                                 mode: Optional[str] = None) -> Tuple[List[EmotionAnalysis], ExtractedContext]:
+    """설정(EXTRACTION_MODE)에 따라 fused / legacy 추출 실행"""
+    mode = mode or get_settings().extraction_mode
+    extractor = FusedContextExtractor()
+    if mode == EXTRACTION_MODE_FUSED:
+        return extractor.extract(story, excluded_keywords)
+    return extractor._legacy_extract(story, excluded_keywords)
+
+
+async def extract_emotions_and_context_async(story: str, excluded_keywords: List[Dict[str, str]] = None,
+                                             mode: Optional[str] = None) -> Tuple[List[EmotionAnalysis], ExtractedContext]:
+    """extract_emotions_and_context 의 비동기 버전"""
+    mode = mode or get_settings().extraction_mode
+    extractor = FusedContextExtractor()
+    if mode == EXTRACTION_MODE_FUSED:
+        return await extractor.extract_async(story, excluded_keywords)
+    return await extractor._legacy_extract_async(story, excluded_keywords)
+
+
+def extraction_memo_key(story: str, excluded_keywords: List[Dict[str, str]] = None) -> Tuple:
+    """추출 결과 메모 키 - 사연 + 제외 키워드 (순서 무관) + 추출 모드 + 카탈로그 버전 (언급된 꽃 감지)
+    updated_context / selected_keywords 는 추출 뒤 컨텍스트 스테이지에서 덮어쓰므로 키에 넣지 않음
+    제외 키워드는 dict ({type, text}) 또는 문자열 (통합 추천의 excluded_flowers) 모두 허용"""
+    excluded = tuple(sorted(
+        (kw.get('type', ''), kw.get('text', '')) if isinstance(kw, dict) else ('', str(kw))
+        for kw in excluded_keywords or []
+    ))
+    return story, excluded, get_settings().extraction_mode, get_flower_catalog().version
+
+
+def _build_extraction_memo() -> Optional[StageMemo]:
+    settings = get_settings()
+    if not settings.stage_memo_enabled:
+        return None
+    return StageMemo("extraction", extraction_memo_key, settings.stage_memo_ttl_seconds, settings.stage_memo_max_size)
+
+
+# 전역 인스턴스 (감정 분석 / 통합 추천 파이프라인의 "extraction" 스테이지가 공유, 비활성화면 None)
+extraction_memo = _build_extraction_memo()
@@ -0,0 +1,187 @@
+"""
+규칙 기반 키워드 매칭 (Aho-Corasick 오토마톤)
+- data/keyword_rules.json 의 키워드 표(폴백 추출 / 시즌 / 폴백 색상 / 위로 상황 / 사연 분류 / 폴백 카드 메시지)를
+  최초 1회 하나의 오토마톤으로 컴파일
+- 사연을 한 번 훑으면 모든 그룹 / 카테고리의 매칭 결과가 나옴 (키워드 수와 무관하게 사연 길이에 비례)
+- 같은 사연은 여러 규칙에서 반복 조회되므로 최근 스캔 결과를 캐시
+- 매칭은 소문자 기준 (키워드 / 사연 모두 lower())
+"""
+import json
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+KEYWORD_RULES_PATH = "data/keyword_rules.json"
+
+
+class KeywordAutomaton:
+    """Aho-Corasick 다중 패턴 매칭 - 키워드 n개를 텍스트 한 번 훑기로 찾음"""
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+
+        # 1. 키워드 트라이
+        for keyword_id, keyword in enumerate(self.keywords):
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(keyword_id)
+
+        # 2. 실패 링크 (BFS) - 실패 상태의 출력도 합쳐서 스캔 중에는 링크를 따라가지 않아도 되게 함
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(ch, 0)
+                outputs[next_state].extend(outputs[self._fail[next_state]])
+        self._outputs: List[Tuple[int, ...]] = [tuple(output) for output in outputs]
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def scan(self, text: str) -> Set[int]:
+        """텍스트에 등장하는 키워드 id 집합"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found: Set[int] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+
+class KeywordHits:
+    """사연 한 개의 스캔 결과 - 그룹 / 카테고리 단위 조회"""
+
+    __slots__ = ("_rules", "_found", "text")
+
+    def __init__(self, rules: "KeywordRules", found: FrozenSet[int], text: str):
+        self._rules = rules
+        self._found = found
+        self.text = text
+
+    def _ids(self, group: str, category: Optional[str] = None) -> Tuple[int, ...]:
+        table = self._rules.groups.get(group, {})
+        if category is not None:
+            return table.get(category, ())
+        return tuple(keyword_id for ids in table.values() for keyword_id in ids)
+
+    def any(self, group: str, category: Optional[str] = None) -> bool:
+        """그룹(또는 카테고리) 키워드 중 하나라도 등장했는지"""
+        return any(keyword_id in self._found for keyword_id in self._ids(group, category))
+
+    def count(self, group: str, category: Optional[str] = None) -> int:
+        """등장한 키워드 수 (목록의 키워드마다 1)"""
+        return sum(1 for keyword_id in self._ids(group, category) if keyword_id in self._found)
+
+    def matched(self, group: str, category: Optional[str] = None) -> List[str]:
+        """등장한 키워드 (표 순서)"""
+        keywords = self._rules.automaton.keywords
+        return [keywords[keyword_id] for keyword_id in self._ids(group, category) if keyword_id in self._found]
+
+    def categories(self, group: str) -> List[str]:
+        """키워드가 하나라도 등장한 카테고리 (표 순서 = 우선순위)"""
+        return [category for category, ids in self._rules.groups.get(group, {}).items()
+                if any(keyword_id in self._found for keyword_id in ids)]
+
+    def first(self, group: str) -> Optional[str]:
+        """우선순위가 가장 높은 매칭 카테고리"""
+        for category, ids in self._rules.groups.get(group, {}).items():
+            if any(keyword_id in self._found for keyword_id in ids):
+                return category
+        return None
+
+    def has(self, keyword: str) -> bool:
+        """단일 키워드 등장 여부 (표에 없는 키워드는 부분 문자열 검사)"""
+        keyword_id = self._rules.keyword_ids.get(keyword.lower())
+        if keyword_id is None:
+            return keyword.lower() in self.text
+        return keyword_id in self._found
+
+
+class KeywordRules:
+    """키워드 표 전체를 컴파일한 오토마톤 + 그룹 / 카테고리 → 키워드 id"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.version = data.get("version", "unknown")
+        self.keyword_ids: Dict[str, int] = {}
+        # 그룹 이름 → {카테고리(단순 목록이면 None): 키워드 id}
+        self.groups: Dict[str, Dict[Optional[str], Tuple[int, ...]]] = {}
+        for name, spec in data.get("groups", {}).items():
+            table = spec if isinstance(spec, dict) else {None: spec}
+            self.groups[name] = {
+                category: tuple(self._intern(keyword) for keyword in keywords)
+                for category, keywords in table.items()
+            }
+        self.automaton = KeywordAutomaton(list(self.keyword_ids))
+        self.scan = lru_cache(maxsize=256)(self._scan)
+
+    @classmethod
+    def from_file(cls, path: str = KEYWORD_RULES_PATH) -> "KeywordRules":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _intern(self, keyword: str) -> int:
+        keyword = keyword.lower()
+        if keyword not in self.keyword_ids:
+            self.keyword_ids[keyword] = len(self.keyword_ids)
+        return self.keyword_ids[keyword]
+
+    def _scan(self, text: str) -> KeywordHits:
+        text = (text or "").lower()
+        return KeywordHits(self, frozenset(self.automaton.scan(text)), text)
+
+    def get_stats(self) -> Dict[str, Any]:
+        cache = self.scan.cache_info()
+        return {
+            "version": self.version,
+            "groups": len(self.groups),
+            "keywords": len(self.keyword_ids),
+            "states": len(self.automaton),
+            "scan_cache_hits": cache.hits,
+            "scan_cache_misses": cache.misses,
+        }
+
+
+_rules: Optional[KeywordRules] = None
+_rules_lock = threading.Lock()
+
+
+def get_keyword_rules() -> KeywordRules:
+    """공유 키워드 규칙 (최초 1회 컴파일, 실패 시 빈 규칙 = 모든 규칙이 기본값 경로)"""
+    global _rules
+    if _rules is None:
+        with _rules_lock:
+            if _rules is None:
+                try:
+                    _rules = KeywordRules.from_file()
+                    print(f"✅ 키워드 규칙 컴파일: 키워드 {len(_rules.keyword_ids)}개, "
+                          f"상태 {len(_rules.automaton)}개 (version={_rules.version})")
+                except Exception as e:
+                    print(f"❌ 키워드 규칙 로드 실패: {e}")
+                    _rules = KeywordRules({})
+    return _rules
+
+
+def scan_keywords(text: str) -> KeywordHits:
+    """사연 한 번 훑기 (같은 사연은 캐시된 결과)"""
+    return get_keyword_rules().scan(text)
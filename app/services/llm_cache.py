@@ -0,0 +1,378 @@
+"""
+LLM 응답 캐시 (메모리 LRU + 로컬 SQLite, 호출 지점별 TTL)
+- 키: (model, messages, temperature, max_tokens, 프롬프트 버전) 해시
+- SQLite 파일은 같은 호스트의 uvicorn 워커들이 공유하고 재시작 후에도 유지됨
+"""
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from app.core.config import get_settings
+from app.services.llm_scheduler import llm_scheduler
+from app.services.llm_circuit_breaker import llm_circuit_breaker
+from app.services.model_router import model_router
+from app.services.request_deadline import DeadlineExceeded, RequestDeadline, current_deadline, record_degraded
+
+# 호출 지점별 프롬프트 버전 (프롬프트를 수정하면 버전을 올려서 캐시 무효화)
+PROMPT_VERSIONS: Dict[str, str] = {
+    "emotion_analysis": "v1",
+    "context_extraction": "v1",
+    "fused_extraction": "v1",
+    "story_classification": "v1",
+    "flower_context_analysis": "v1",
+    "recommendation_reason": "v1",
+    "recommendation_reason_generator": "v1",
+    "flower_card_rerank": "v1",
+    "smart_lightweight_extraction": "v1",
+    "smart_full_extraction": "v1",
+    "english_description": "v1",
+}
+
+# 호출 지점별 TTL (초) - 분석 결과는 길게, 생성 문구는 짧게
+CALL_SITE_TTLS: Dict[str, int] = {
+    "emotion_analysis": 7 * 24 * 3600,
+    "context_extraction": 7 * 24 * 3600,
+    "fused_extraction": 7 * 24 * 3600,
+    "story_classification": 7 * 24 * 3600,
+    "flower_context_analysis": 7 * 24 * 3600,
+    "recommendation_reason": 24 * 3600,
+    "recommendation_reason_generator": 24 * 3600,
+    "flower_card_rerank": 7 * 24 * 3600,
+    "smart_lightweight_extraction": 7 * 24 * 3600,
+    "smart_full_extraction": 7 * 24 * 3600,
+    "english_description": 24 * 3600,
+}
+DEFAULT_TTL = 24 * 3600
+
+# 남은 요청 예산이 이보다 적으면 LLM 을 호출하지 않고 바로 폴백 (초)
+_MIN_CALL_BUDGET_SECONDS = 0.3
+
+# 캐시 키에 포함하지 않는 호출 옵션 (응답 내용에 영향 없음)
+_NON_KEY_OPTIONS = ("timeout", "stream", "user")
+
+
+class LLMResponseCache:
+    """2단계 LLM 응답 캐시"""
+
+    def __init__(self, db_path: str, memory_size: int = 512, enabled: bool = True):
+        self.db_path = db_path
+        self.memory_size = memory_size
+        self.enabled = enabled
+
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._local = threading.local()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+        self._disk_available = False
+
+        if self.enabled:
+            self._init_db()
+
+    # ----------------------------
+    # SQLite
+    # ----------------------------
+    def _init_db(self):
+        """SQLite 캐시 테이블 생성"""
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = self._connection()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " call_site TEXT NOT NULL,"
+                " response TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache (expires_at)")
+            conn.commit()
+            self._disk_available = True
+            print(f"✅ LLM 응답 캐시 준비: {self.db_path}")
+        except Exception as e:
+            print(f"⚠️ LLM 디스크 캐시 사용 불가 (메모리 캐시만 사용): {e}")
+            self._disk_available = False
+
+    def _connection(self) -> sqlite3.Connection:
+        """스레드별 SQLite 연결 (워커 간 공유를 위해 WAL 모드)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=2.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        if not self._disk_available:
+            return None
+        row = self._connection().execute(
+            "SELECT expires_at, response FROM llm_cache WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _disk_set(self, key: str, call_site: str, response: str, now: float, expires_at: float):
+        if not self._disk_available:
+            return
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, call_site, response, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+            (key, call_site, response, now, expires_at)
+        )
+        conn.commit()
+
+    # ----------------------------
+    # 메모리 LRU
+    # ----------------------------
+    def _memory_get(self, key: str, now: float) -> Optional[str]:
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if expires_at <= now:
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return response
+
+    def _memory_set(self, key: str, response: str, expires_at: float):
+        with self._memory_lock:
+            self._memory[key] = (expires_at, response)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    # ----------------------------
+    # 공개 API
+    # ----------------------------
+    @staticmethod
+    def make_key(call_site: str, model: str, messages: Any, temperature: Optional[float] = None,
+                 max_tokens: Optional[int] = None, **options: Any) -> str:
+        """캐시 키 생성 (model, messages, temperature, max_tokens, 프롬프트 버전 해시)"""
+        payload = {
+            "call_site": call_site,
+            "prompt_version": PROMPT_VERSIONS.get(call_site, "v1"),
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "options": {k: v for k, v in options.items() if k not in _NON_KEY_OPTIONS},
+        }
+        raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, call_site: str) -> Optional[str]:
+        """캐시 조회 (메모리 → 디스크)"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        response = self._memory_get(key, now)
+        if response is not None:
+            self._count(call_site, "memory_hits")
+            return response
+        try:
+            entry = self._disk_get(key, now)
+        except Exception as e:
+            print(f"⚠️ LLM 디스크 캐시 조회 실패: {e}")
+            self._count(call_site, "errors")
+            entry = None
+        if entry is not None:
+            expires_at, response = entry
+            self._memory_set(key, response, expires_at)
+            self._count(call_site, "disk_hits")
+            return response
+        self._count(call_site, "misses")
+        return None
+
+    def set(self, key: str, call_site: str, response: str, ttl: Optional[int] = None):
+        """캐시 저장 (메모리 + 디스크)"""
+        if not self.enabled or not response:
+            return
+        now = time.time()
+        ttl = ttl if ttl is not None else CALL_SITE_TTLS.get(call_site, DEFAULT_TTL)
+        expires_at = now + ttl
+        self._memory_set(key, response, expires_at)
+        try:
+            self._disk_set(key, call_site, response, now, expires_at)
+        except Exception as e:
+            print(f"⚠️ LLM 디스크 캐시 저장 실패: {e}")
+            self._count(call_site, "errors")
+        self._count(call_site, "stores")
+
+    def chat_completion(self, client, call_site: str, ttl: Optional[int] = None, **params: Any) -> str:
+        """캐시를 거치는 chat.completions.create - 응답 텍스트 반환 (실제 호출은 전역 스케줄러 슬롯 안에서)"""
+        key = self.make_key(call_site, **params)
+        cached = self.get(key, call_site)
+        if cached is not None:
+            print(f"📋 LLM 캐시 적중: {call_site}")
+            return cached
+
+        deadline = current_deadline()
+        try:
+            # 서킷이 열려 있으면 대기열에 들어가지 않고 바로 폴백
+            with llm_circuit_breaker.guard(call_site), \
+                    llm_scheduler.slot(params.get("model"), max_wait=_remaining(deadline, call_site)):
+                bound_client, call_params, _ = _bind_deadline(client, call_site, params, deadline)
+                start_time = time.time()
+                response = bound_client.chat.completions.create(**call_params)
+                model_router.record_latency(params.get("model"), (time.time() - start_time) * 1000)
+        except Exception as e:
+            record_degraded(call_site, e)
+            raise
+        content = response.choices[0].message.content
+        self.set(key, call_site, content, ttl)
+        return content
+
+    async def achat_completion(self, async_client, call_site: str, ttl: Optional[int] = None, **params: Any) -> str:
+        """chat_completion 의 비동기 버전 (AsyncOpenAI, SQLite 조회/저장은 스레드에서 실행)"""
+        key = self.make_key(call_site, **params)
+        cached = await asyncio.to_thread(self.get, key, call_site)
+        if cached is not None:
+            print(f"📋 LLM 캐시 적중: {call_site}")
+            return cached
+
+        deadline = current_deadline()
+        try:
+            with llm_circuit_breaker.guard(call_site):
+                async with llm_scheduler.aslot(params.get("model"), max_wait=_remaining(deadline, call_site)):
+                    bound_client, call_params, timeout = _bind_deadline(async_client, call_site, params, deadline)
+                    # 예산이 끝나면 호출 자체를 취소
+                    start_time = time.time()
+                    response = await asyncio.wait_for(bound_client.chat.completions.create(**call_params), timeout)
+                    model_router.record_latency(params.get("model"), (time.time() - start_time) * 1000)
+        except Exception as e:
+            record_degraded(call_site, e)
+            raise
+        content = response.choices[0].message.content
+        await asyncio.to_thread(self.set, key, call_site, content, ttl)
+        return content
+
+    async def stream_chat_completion(self, async_client, call_site: str, ttl: Optional[int] = None,
+                                     **params: Any) -> AsyncIterator[str]:
+        """캐시를 거치는 스트리밍 호출 - 텍스트 조각을 순서대로 반환 (적중 시 전체 텍스트 1회)"""
+        key = self.make_key(call_site, **params)
+        cached = await asyncio.to_thread(self.get, key, call_site)
+        if cached is not None:
+            print(f"📋 LLM 캐시 적중: {call_site}")
+            yield cached
+            return
+
+        deadline = current_deadline()
+        parts = []
+        try:
+            # 스트림이 끝날 때까지 슬롯 유지 (서킷 판정도 스트림 완료 기준)
+            with llm_circuit_breaker.guard(call_site):
+                async with llm_scheduler.aslot(params.get("model"), max_wait=_remaining(deadline, call_site)):
+                    bound_client, call_params, timeout = _bind_deadline(async_client, call_site, params, deadline)
+                    stream = await asyncio.wait_for(bound_client.chat.completions.create(stream=True, **call_params), timeout)
+                    chunks = stream.__aiter__()
+                    while True:
+                        try:
+                            # 다음 조각도 남은 예산 안에서만 대기
+                            chunk = await asyncio.wait_for(chunks.__anext__(), _remaining(deadline, call_site))
+                        except StopAsyncIteration:
+                            break
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content
+                        if delta:
+                            parts.append(delta)
+                            yield delta
+        except Exception as e:
+            record_degraded(call_site, e)
+            raise
+        # 끝까지 받은 응답만 저장 (중간에 끊긴 스트림은 저장하지 않음)
+        await asyncio.to_thread(self.set, key, call_site, "".join(parts), ttl)
+
+    def purge_expired(self) -> int:
+        """만료된 디스크 캐시 삭제"""
+        if not self._disk_available:
+            return 0
+        conn = self._connection()
+        deleted = conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+        conn.commit()
+        return deleted
+
+    def clear(self, call_site: Optional[str] = None) -> int:
+        """캐시 비우기 (call_site 지정 시 해당 지점만, 메모리는 전체)"""
+        with self._memory_lock:
+            self._memory.clear()
+        if not self._disk_available:
+            return 0
+        conn = self._connection()
+        if call_site:
+            deleted = conn.execute("DELETE FROM llm_cache WHERE call_site = ?", (call_site,)).rowcount
+        else:
+            deleted = conn.execute("DELETE FROM llm_cache").rowcount
+        conn.commit()
+        return deleted
+
+    def _count(self, call_site: str, name: str):
+        with self._stats_lock:
+            site = self._stats.setdefault(call_site, {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "errors": 0})
+            site[name] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """호출 지점별 적중/실패 통계"""
+        with self._stats_lock:
+            call_sites = {site: dict(counts) for site, counts in self._stats.items()}
+        for counts in call_sites.values():
+            hits = counts["memory_hits"] + counts["disk_hits"]
+            total = hits + counts["misses"]
+            counts["hit_rate"] = round(hits / total, 3) if total else 0.0
+
+        disk_entries = None
+        if self._disk_available:
+            try:
+                disk_entries = self._connection().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            except Exception:
+                disk_entries = None
+
+        return {
+            "enabled": self.enabled,
+            "db_path": self.db_path,
+            "disk_available": self._disk_available,
+            "memory_entries": len(self._memory),
+            "memory_size": self.memory_size,
+            "disk_entries": disk_entries,
+            "prompt_versions": PROMPT_VERSIONS,
+            "ttls": CALL_SITE_TTLS,
+            "call_sites": call_sites,
+        }
+
+
+def _remaining(deadline: Optional[RequestDeadline], call_site: str) -> Optional[float]:
+    """요청 deadline 의 남은 시간 (없으면 None, 소진됐으면 DeadlineExceeded)"""
+    return deadline.check(call_site) if deadline is not None else None
+
+
+def _bind_deadline(client, call_site: str, params: Dict[str, Any],
+                   deadline: Optional[RequestDeadline]) -> Tuple[Any, Dict[str, Any], Optional[float]]:
+    """요청 deadline 이 있으면 남은 예산을 타임아웃으로 쓰고 재시도 없이 호출하도록 클라이언트 / 파라미터 조정"""
+    if deadline is None:
+        return client, params, None
+    timeout = deadline.check(call_site)
+    if timeout < _MIN_CALL_BUDGET_SECONDS:
+        # 응답을 받을 수 없는 예산으로 호출하면 서킷 브레이커에 가짜 타임아웃만 쌓임
+        raise DeadlineExceeded(f"남은 예산 {timeout:.2f}s 로는 호출하지 않음 ({call_site})")
+    if params.get("timeout"):
+        timeout = min(timeout, params["timeout"])
+    call_params = {k: v for k, v in params.items() if k != "timeout"}
+    return client.with_options(timeout=timeout, max_retries=0), call_params, timeout
+
+
+_settings = get_settings()
+
+# 전역 인스턴스
+llm_cache = LLMResponseCache(
+    db_path=_settings.llm_cache_path,
+    memory_size=_settings.llm_cache_memory_size,
+    enabled=_settings.llm_cache_enabled,
+)
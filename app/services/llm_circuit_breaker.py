@@ -0,0 +1,199 @@
+"""
+OpenAI 호출 서킷 브레이커 (모든 LLM 호출 지점이 공유)
+- closed: 정상 호출, window 안의 실패 / 타임아웃이 threshold 에 도달하면 open
+- open: 네트워크 호출 없이 CircuitOpenError → 호출 지점의 규칙 기반 폴백으로 바로 전환
+- half_open: open_seconds 가 지나면 소수의 시험 호출만 통과, 연속 성공하면 closed / 실패하면 다시 open
+- 로컬에서 거절된 호출 (스케줄러 대기열 초과, 요청 예산 소진) 은 OpenAI 상태와 무관하므로 집계하지 않음
+"""
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Optional
+
+from app.core.config import get_settings
+
+# 상태 전환 기록 보관 개수
+_TRANSITION_HISTORY_SIZE = 50
+
+# OpenAI 상태와 무관한 로컬 거절 (실패로 집계하지 않음)
+_LOCAL_REJECTIONS = ("LLMOverloadedError", "DeadlineExceeded")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷이 열려 있어 호출하지 않음"""
+
+    def __init__(self, call_site: str, retry_after: float):
+        super().__init__(f"LLM 서킷 열림 ({call_site}), {retry_after:.1f}s 후 재시도")
+        self.call_site = call_site
+        self.retry_after = retry_after
+
+
+class LLMCircuitBreaker:
+    """실패율 기반 서킷 브레이커 (스레드 / 이벤트 루프 공용, 상태는 잠금 안에서만 변경)"""
+
+    def __init__(self, failure_threshold: int, window_seconds: float, open_seconds: float,
+                 half_open_probes: int = 1, close_successes: int = 2, enabled: bool = True):
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.close_successes = close_successes
+        self.enabled = enabled
+
+        self.state = CLOSED
+        self._lock = threading.Lock()
+        self._failures: Deque[float] = deque()
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._transitions: Deque[Dict[str, Any]] = deque(maxlen=_TRANSITION_HISTORY_SIZE)
+
+        self.successes = 0
+        self.failures = 0
+        self.short_circuited = 0
+        self.probes = 0
+
+    # 아래 _ 메서드는 모두 self._lock 을 잡은 상태에서 호출
+    def _transition(self, new_state: str, reason: str):
+        if new_state == self.state:
+            return
+        self._transitions.append({
+            "from": self.state,
+            "to": new_state,
+            "reason": reason,
+            "at": time.time(),
+        })
+        print(f"🔌 LLM 서킷 {self.state} → {new_state} ({reason})")
+        self.state = new_state
+        if new_state == OPEN:
+            self._opened_at = time.monotonic()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if new_state == CLOSED:
+            self._failures.clear()
+
+    def _prune(self, now: float):
+        while self._failures and now - self._failures[0] > self.window_seconds:
+            self._failures.popleft()
+
+    def _retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def before_call(self, call_site: str) -> bool:
+        """호출 허가 (열려 있으면 CircuitOpenError) - half_open 시험 호출이면 True"""
+        if not self.enabled:
+            return False
+        with self._lock:
+            if self.state == OPEN:
+                if self._retry_after() > 0:
+                    self.short_circuited += 1
+                    raise CircuitOpenError(call_site, self._retry_after())
+                self._transition(HALF_OPEN, "open 시간 경과")
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_probes:
+                    self.short_circuited += 1
+                    raise CircuitOpenError(call_site, 0.0)
+                self._probes_in_flight += 1
+                self.probes += 1
+                return True
+            return False
+
+    def record_success(self, probe: bool):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.successes += 1
+            if probe and self.state == HALF_OPEN:
+                self._probes_in_flight -= 1
+                self._probe_successes += 1
+                if self._probe_successes >= self.close_successes:
+                    self._transition(CLOSED, f"시험 호출 {self._probe_successes}회 연속 성공")
+
+    def record_failure(self, probe: bool, error: BaseException):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.failures += 1
+            if probe and self.state == HALF_OPEN:
+                self._transition(OPEN, f"시험 호출 실패: {type(error).__name__}")
+                return
+            if self.state != CLOSED:
+                return
+            now = time.monotonic()
+            self._failures.append(now)
+            self._prune(now)
+            if len(self._failures) >= self.failure_threshold:
+                self._transition(
+                    OPEN, f"{self.window_seconds:.0f}s 동안 {len(self._failures)}회 실패 ({type(error).__name__})"
+                )
+
+    def release_probe(self, probe: bool):
+        """결과 없이 끝난 시험 호출 (취소 / 로컬 거절) 의 자리 반납"""
+        if not probe:
+            return
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes_in_flight > 0:
+                self._probes_in_flight -= 1
+
+    @contextmanager
+    def guard(self, call_site: str):
+        """with llm_circuit_breaker.guard(call_site): ... (async 함수 안의 await 도 감쌀 수 있음)"""
+        probe = self.before_call(call_site)
+        try:
+            yield
+        except Exception as e:
+            if type(e).__name__ in _LOCAL_REJECTIONS:
+                self.release_probe(probe)
+            else:
+                self.record_failure(probe, e)
+            raise
+        except BaseException:
+            # 취소 (클라이언트 연결 끊김 등) 는 OpenAI 실패가 아님
+            self.release_probe(probe)
+            raise
+        else:
+            self.record_success(probe)
+
+    def reset(self):
+        """수동으로 closed 복귀 (관리자용)"""
+        with self._lock:
+            self._transition(CLOSED, "수동 초기화")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """현재 상태 / 최근 실패 수 / 상태 전환 기록"""
+        with self._lock:
+            self._prune(time.monotonic())
+            return {
+                "enabled": self.enabled,
+                "state": self.state,
+                "failures_in_window": len(self._failures),
+                "failure_threshold": self.failure_threshold,
+                "window_seconds": self.window_seconds,
+                "open_seconds": self.open_seconds,
+                "retry_after_seconds": round(self._retry_after(), 1) if self.state == OPEN else 0.0,
+                "half_open_probes": self.half_open_probes,
+                "close_successes": self.close_successes,
+                "successes": self.successes,
+                "failures": self.failures,
+                "short_circuited": self.short_circuited,
+                "probes": self.probes,
+                "transitions": list(self._transitions),
+            }
+
+
+_settings = get_settings()
+
+# 전역 인스턴스
+llm_circuit_breaker = LLMCircuitBreaker(
+    failure_threshold=_settings.llm_breaker_failure_threshold,
+    window_seconds=_settings.llm_breaker_window_seconds,
+    open_seconds=_settings.llm_breaker_open_seconds,
+    half_open_probes=_settings.llm_breaker_half_open_probes,
+    close_successes=_settings.llm_breaker_close_successes,
+    enabled=_settings.llm_breaker_enabled,
+)
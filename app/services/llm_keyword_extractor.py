@@ -6,6 +6,7 @@ import json
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from app.models.schemas import KeywordResponse
+from app.services.openai_client import get_openai_client
 
 @dataclass
 class ExtractedInfo:
@@ -40,8 +41,7 @@ class LLMKeywordExtractor:
             return self._fallback_extraction(story)
         
         try:
-            import openai
-            client = openai.OpenAI(api_key=self.openai_api_key)
+            client = get_openai_client(self.openai_api_key)
             
             prompt = self._create_extraction_prompt(story)
             
@@ -0,0 +1,265 @@
+"""
+전역 LLM 호출 스케줄러 (모델별 동시 실행 제한 + 대기열 + 빠른 거절)
+- 동기 호출(스레드)과 비동기 호출(이벤트 루프)이 같은 슬롯을 공유
+- 대기열이 가득 찼거나 최대 대기 시간을 넘기면 LLMOverloadedError → 호출 지점의 폴백 경로로 전환
+"""
+import time
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Deque, Dict, Optional
+
+from app.core.config import get_settings
+
+# 대기 시간 통계용 최근 샘플 수
+_WAIT_SAMPLE_SIZE = 500
+
+
+class LLMOverloadedError(RuntimeError):
+    """LLM 대기열 초과 / 대기 시간 초과로 거절됨"""
+
+    def __init__(self, model: str, reason: str):
+        super().__init__(f"LLM 호출 거절 ({model}): {reason}")
+        self.model = model
+        self.reason = reason
+
+
+class _Waiter:
+    """대기 중인 호출 (상태는 lane 잠금 안에서만 변경)"""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.state = "waiting"  # waiting | granted | cancelled
+        self.loop = loop
+        self.event = threading.Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+
+    def wake(self):
+        if self.event is not None:
+            self.event.set()
+        elif not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class _ModelLane:
+    """모델별 슬롯 / 대기열 / 통계"""
+
+    def __init__(self, model: str, limit: int):
+        self.model = model
+        self.limit = limit
+        self.in_flight = 0
+        self.waiters: Deque[_Waiter] = deque()
+        self.lock = threading.Lock()
+
+        self.acquired = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.peak_in_flight = 0
+        self.peak_queue_depth = 0
+        self.wait_ms: Deque[float] = deque(maxlen=_WAIT_SAMPLE_SIZE)
+
+    # 아래 메서드는 모두 self.lock 을 잡은 상태에서 호출
+    def _take_slot(self, wait_ms: float):
+        self.in_flight += 1
+        self.acquired += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self.wait_ms.append(wait_ms)
+
+    def _enqueue(self, waiter: _Waiter, max_queue_depth: int):
+        if len(self.waiters) >= max_queue_depth:
+            self.rejected_queue_full += 1
+            raise LLMOverloadedError(self.model, f"대기열 가득 참 ({max_queue_depth})")
+        self.waiters.append(waiter)
+        self.peak_queue_depth = max(self.peak_queue_depth, len(self.waiters))
+
+    def _cancel(self, waiter: _Waiter):
+        waiter.state = "cancelled"
+        try:
+            self.waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self):
+        """슬롯 반납 - 대기 중인 호출이 있으면 슬롯을 바로 넘겨줌"""
+        with self.lock:
+            self.in_flight -= 1
+            while self.waiters and self.in_flight < self.limit:
+                waiter = self.waiters.popleft()
+                if waiter.state != "waiting":
+                    continue
+                waiter.state = "granted"
+                self.in_flight += 1
+                waiter.wake()
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            waits = sorted(self.wait_ms)
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "queue_depth": len(self.waiters),
+                "peak_in_flight": self.peak_in_flight,
+                "peak_queue_depth": self.peak_queue_depth,
+                "acquired": self.acquired,
+                "rejected_queue_full": self.rejected_queue_full,
+                "rejected_timeout": self.rejected_timeout,
+                "wait_ms_avg": round(sum(waits) / len(waits), 1) if waits else 0.0,
+                "wait_ms_p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))], 1) if waits else 0.0,
+                "wait_ms_max": round(waits[-1], 1) if waits else 0.0,
+            }
+
+
+class LLMScheduler:
+    """모델별 동시 실행 제한 스케줄러"""
+
+    def __init__(self, default_limit: int, model_limits: Dict[str, int],
+                 max_queue_depth: int, max_queue_wait_seconds: float):
+        self.default_limit = default_limit
+        self.model_limits = model_limits
+        self.max_queue_depth = max_queue_depth
+        self.max_queue_wait_seconds = max_queue_wait_seconds
+        self._lanes: Dict[str, _ModelLane] = {}
+        self._lanes_lock = threading.Lock()
+
+    def _lane(self, model: Optional[str]) -> _ModelLane:
+        model = model or "default"
+        lane = self._lanes.get(model)
+        if lane is None:
+            with self._lanes_lock:
+                lane = self._lanes.get(model)
+                if lane is None:
+                    lane = _ModelLane(model, self.model_limits.get(model, self.default_limit))
+                    self._lanes[model] = lane
+        return lane
+
+    def _wait_budget(self, max_wait: Optional[float]) -> float:
+        return self.max_queue_wait_seconds if max_wait is None else min(max_wait, self.max_queue_wait_seconds)
+
+    # ----------------------------
+    # 동기 (스레드)
+    # ----------------------------
+    def acquire(self, model: Optional[str], max_wait: Optional[float] = None) -> _ModelLane:
+        """슬롯 획득 (대기열이 가득 찼거나 max_wait 초과 시 LLMOverloadedError)"""
+        lane = self._lane(model)
+        start_time = time.time()
+        with lane.lock:
+            if lane.in_flight < lane.limit and not lane.waiters:
+                lane._take_slot(0.0)
+                return lane
+            waiter = _Waiter()
+            lane._enqueue(waiter, self.max_queue_depth)
+
+        waiter.event.wait(self._wait_budget(max_wait))
+        return self._settle(lane, waiter, start_time)
+
+    @contextmanager
+    def slot(self, model: Optional[str], max_wait: Optional[float] = None):
+        """with llm_scheduler.slot(model): client.chat.completions.create(...)"""
+        lane = self.acquire(model, max_wait)
+        try:
+            yield
+        finally:
+            lane.release()
+
+    # ----------------------------
+    # 비동기 (이벤트 루프)
+    # ----------------------------
+    async def acquire_async(self, model: Optional[str], max_wait: Optional[float] = None) -> _ModelLane:
+        """acquire 의 비동기 버전 (대기 중 이벤트 루프를 막지 않음)"""
+        lane = self._lane(model)
+        start_time = time.time()
+        with lane.lock:
+            if lane.in_flight < lane.limit and not lane.waiters:
+                lane._take_slot(0.0)
+                return lane
+            waiter = _Waiter(asyncio.get_running_loop())
+            lane._enqueue(waiter, self.max_queue_depth)
+
+        try:
+            await asyncio.wait({waiter.future}, timeout=self._wait_budget(max_wait))
+        except asyncio.CancelledError:
+            # 대기 중 취소 - 이미 슬롯을 받았다면 반납
+            with lane.lock:
+                granted = waiter.state == "granted"
+                if not granted:
+                    lane._cancel(waiter)
+            if granted:
+                lane.release()
+            raise
+        return self._settle(lane, waiter, start_time)
+
+    @asynccontextmanager
+    async def aslot(self, model: Optional[str], max_wait: Optional[float] = None):
+        """async with llm_scheduler.aslot(model): await client.chat.completions.create(...)"""
+        lane = await self.acquire_async(model, max_wait)
+        try:
+            yield
+        finally:
+            lane.release()
+
+    # ----------------------------
+    # 공통
+    # ----------------------------
+    def _settle(self, lane: _ModelLane, waiter: _Waiter, start_time: float) -> _ModelLane:
+        """대기 종료 처리 (슬롯을 받았으면 통계 기록, 아니면 거절)"""
+        wait_ms = (time.time() - start_time) * 1000
+        with lane.lock:
+            if waiter.state == "granted":
+                # release() 에서 in_flight 는 이미 증가됨
+                lane.acquired += 1
+                lane.peak_in_flight = max(lane.peak_in_flight, lane.in_flight)
+                lane.wait_ms.append(wait_ms)
+                return lane
+            lane._cancel(waiter)
+            lane.rejected_timeout += 1
+        raise LLMOverloadedError(lane.model, f"대기 시간 초과 ({wait_ms:.0f}ms)")
+
+    def load(self, model: Optional[str]) -> Dict[str, int]:
+        """모델 하나의 현재 부하 (모델 라우터용 - 통계 계산 없이 가볍게 조회)"""
+        lane = self._lane(model)
+        with lane.lock:
+            return {"limit": lane.limit, "in_flight": lane.in_flight, "queue_depth": len(lane.waiters)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """모델별 대기열 깊이 / 대기 시간 / 실행 중 호출 수"""
+        with self._lanes_lock:
+            lanes = dict(self._lanes)
+        models = {model: lane.stats() for model, lane in lanes.items()}
+        return {
+            "default_limit": self.default_limit,
+            "model_limits": self.model_limits,
+            "max_queue_depth": self.max_queue_depth,
+            "max_queue_wait_seconds": self.max_queue_wait_seconds,
+            "total_in_flight": sum(m["in_flight"] for m in models.values()),
+            "total_queue_depth": sum(m["queue_depth"] for m in models.values()),
+            "models": models,
+        }
+
+
+def _parse_model_limits(value: str) -> Dict[str, int]:
+    """'gpt-4=8,gpt-4o-mini=32' → {'gpt-4': 8, 'gpt-4o-mini': 32}"""
+    limits = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        model, limit = item.split("=", 1)
+        try:
+            limits[model.strip()] = int(limit)
+        except ValueError:
+            print(f"⚠️ LLM 동시 실행 제한 설정 무시: {item}")
+    return limits
+
+
+_settings = get_settings()
+
+# 전역 인스턴스
+llm_scheduler = LLMScheduler(
+    default_limit=_settings.llm_max_concurrency,
+    model_limits=_parse_model_limits(_settings.llm_model_concurrency),
+    max_queue_depth=_settings.llm_max_queue_depth,
+    max_queue_wait_seconds=_settings.llm_max_queue_wait_seconds,
+)
@@ -0,0 +1,452 @@
+"""
+로컬 감정 분류기 (LLM 감정 분석 결과로 학습한 경량 모델)
+- 특징: 사연의 글자 n-gram (1~3) + 어절, 이진값을 L2 정규화
+- 모델: 감정별 선형 가중치 + softmax, LLM 감정 블렌드 비율을 그대로 정답 분포로 학습 (NumPy 만 사용)
+- 학습: scripts/train_emotion_classifier.py (data/stories.json / Supabase stories)
+  → 저장된 사연 중 emotion_source 가 llm 인 것만 사용 (폴백 / 로컬 분류기 결과 / 출처 미상은 제외)
+- 평가: scripts/evaluate_emotion_classifier.py (보류 세트에서 LLM 결과와의 일치도)
+- 실행: EMOTION_CLASSIFIER_MODE=primary 이면 신뢰도가 임계값 이상일 때 LLM 호출 없이 사용
+"""
+import os
+import json
+import zlib
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy 가 없으면 로컬 분류기 비활성화 (LLM / 규칙 기반만 사용)
+    np = None
+
+from app.core.config import get_settings
+
+STORIES_PATH = "data/stories.json"
+
+# n-gram 범위 (한글은 음절 단위라 1-gram 도 의미가 있음)
+NGRAM_RANGE = (1, 3)
+
+# 감정 블렌드 출처 (스토리 저장 시 emotion_source 로 기록)
+EMOTION_SOURCE_LLM = "llm"
+EMOTION_SOURCE_LOCAL = "local"
+EMOTION_SOURCE_FALLBACK = "fallback"
+
+# 학습 / 평가에 쓰는 출처 (로컬 분류기 자신의 예측이나 규칙 기반 폴백을 다시 학습하지 않도록)
+TRAINING_EMOTION_SOURCES = (EMOTION_SOURCE_LLM,)
+
+
+def mark_emotion_source(emotions: List[Any], source: str) -> List[Any]:
+    """감정 분석 결과 (EmotionAnalysis 목록) 에 출처 기록"""
+    for emotion in emotions:
+        emotion._source = source
+    return emotions
+
+
+def emotion_blend_source(emotions: Sequence[Any]) -> Optional[str]:
+    """감정 블렌드의 출처 (항목마다 다르거나 기록이 없으면 None = 출처 미상)"""
+    sources = {getattr(emotion, "_source", None) for emotion in emotions}
+    return sources.pop() if len(sources) == 1 else None
+
+
+@dataclass
+class EmotionSample:
+    """학습 / 평가용 사연 한 건 (LLM 감정 블렌드가 정답)"""
+    story_id: str
+    story: str
+    blend: Dict[str, float]  # 감정 → 비율 (합 100)
+
+
+@dataclass
+class LocalPrediction:
+    """로컬 분류 결과"""
+    blend: List[Tuple[str, float]]  # 상위 3개 (감정, 비율), 합 100
+    confidence: float
+
+
+def extract_features(story: str) -> List[str]:
+    """사연 → 특징 문자열 목록 (중복 제거)"""
+    text = " ".join(story.lower().split())
+    if not text:
+        return []
+    features = {f"w:{word}" for word in text.split(" ")}
+    padded = f" {text} "
+    for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+        for i in range(len(padded) - n + 1):
+            gram = padded[i:i + n]
+            if gram.strip():
+                features.add(gram)
+    return sorted(features)
+
+
+def _to_percentages(pairs: Sequence[Tuple[str, float]]) -> List[Tuple[str, float]]:
+    """확률 → 합이 100 인 비율 (소수 1자리, 반올림 오차는 1위에 반영)"""
+    total = sum(score for _, score in pairs) or 1.0
+    blend = [(emotion, round(score / total * 100, 1)) for emotion, score in pairs]
+    if blend:
+        blend[0] = (blend[0][0], round(blend[0][1] + 100 - sum(p for _, p in blend), 1))
+    return blend
+
+
+class LocalEmotionClassifier:
+    """글자 n-gram 선형 softmax 감정 분류기"""
+
+    def __init__(self, vocab: List[str], labels: List[str], weights, bias, meta: Optional[Dict[str, Any]] = None):
+        self.vocab = {feature: i for i, feature in enumerate(vocab)}
+        self.labels = list(labels)
+        self.weights = weights  # (특징 수, 감정 수)
+        self.bias = bias  # (감정 수,)
+        self.meta = meta or {}
+        self.version = self.meta.get("version", "unknown")
+
+    def _encode(self, story: str) -> Tuple[List[int], float]:
+        """사연 → 어휘 인덱스 목록 + 어휘에 있는 특징 비율"""
+        features = extract_features(story)
+        indices = [self.vocab[feature] for feature in features if feature in self.vocab]
+        coverage = len(indices) / len(features) if features else 0.0
+        return indices, coverage
+
+    def predict_proba(self, story: str) -> Tuple[Any, float]:
+        """감정별 확률 + 특징 커버리지"""
+        indices, coverage = self._encode(story)
+        logits = self.bias.copy()
+        if indices:
+            logits += self.weights[indices].sum(axis=0) / np.sqrt(len(indices))
+        logits -= logits.max()
+        probs = np.exp(logits)
+        return probs / probs.sum(), coverage
+
+    def predict(self, story: str) -> LocalPrediction:
+        """상위 3개 감정 블렌드 + 신뢰도 (상위 3개 확률 합 × 특징 커버리지)"""
+        probs, coverage = self.predict_proba(story)
+        top = np.argsort(-probs)[:3]
+        pairs = [(self.labels[i], float(probs[i])) for i in top]
+        confidence = float(sum(score for _, score in pairs)) * coverage
+        return LocalPrediction(blend=_to_percentages(pairs), confidence=round(confidence, 3))
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        vocab = sorted(self.vocab, key=self.vocab.get)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            vocab=np.array(vocab),
+            labels=np.array(self.labels),
+            weights=self.weights.astype(np.float32),
+            bias=self.bias.astype(np.float32),
+            meta=np.array(json.dumps(self.meta, ensure_ascii=False)),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "LocalEmotionClassifier":
+        with np.load(path, allow_pickle=False) as artifact:
+            return cls(
+                vocab=artifact["vocab"].tolist(),
+                labels=artifact["labels"].tolist(),
+                weights=artifact["weights"],
+                bias=artifact["bias"],
+                meta=json.loads(str(artifact["meta"])),
+            )
+
+
+# ----------------------------
+# 학습 데이터
+# ----------------------------
+
+def _parse_blend(emotions: Any) -> Dict[str, float]:
+    """저장된 emotions (리스트 또는 JSON 문자열) → 감정 블렌드"""
+    if isinstance(emotions, str):
+        emotions = json.loads(emotions)
+    blend: Dict[str, float] = {}
+    for item in emotions or []:
+        emotion = (item.get("emotion") or "").strip()
+        percentage = float(item.get("percentage") or 0.0)
+        if emotion and percentage > 0:
+            blend[emotion] = blend.get(emotion, 0.0) + percentage
+    return blend
+
+
+def _report_skipped_sources(name: str, skipped: Dict[str, int]):
+    if skipped:
+        detail = ", ".join(f"{source} {count}개" for source, count in sorted(skipped.items()))
+        print(f"⚠️ {name}: LLM 출처가 아닌 감정 블렌드 제외 ({detail})")
+
+
+def load_logged_samples(path: str = STORIES_PATH) -> List[EmotionSample]:
+    """로컬 스토리 백업 (data/stories.json) 의 사연 + LLM 감정 블렌드 (emotion_source 가 llm 인 것만)"""
+    with open(path, "r", encoding="utf-8") as f:
+        stories = json.load(f)
+    samples = []
+    skipped: Dict[str, int] = {}
+    for story_id, story_data in stories.items():
+        source = story_data.get("emotion_source")
+        if source not in TRAINING_EMOTION_SOURCES:
+            skipped[source or "unknown"] = skipped.get(source or "unknown", 0) + 1
+            continue
+        story = story_data.get("original_story") or story_data.get("story") or ""
+        blend = _parse_blend(story_data.get("emotions"))
+        if story.strip() and blend:
+            samples.append(EmotionSample(story_id=story_id, story=story, blend=blend))
+    _report_skipped_sources(path, skipped)
+    return samples
+
+
+def fetch_supabase_samples(page_size: int = 1000) -> List[EmotionSample]:
+    """Supabase stories 테이블의 사연 + LLM 감정 블렌드 (emotion_source 가 llm 인 것만, 환경변수 없으면 빈 목록)"""
+    import requests
+
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_ANON_KEY")
+    if not supabase_url or not supabase_key:
+        print("⚠️ Supabase 환경변수가 없어 로컬 스토리만 사용합니다.")
+        return []
+
+    headers = {"apikey": supabase_key, "Authorization": f"Bearer {supabase_key}"}
+    samples = []
+    skipped: Dict[str, int] = {}
+    offset = 0
+    while True:
+        response = requests.get(
+            f"{supabase_url}/rest/v1/stories",
+            headers=headers,
+            params={"select": "story_id,story,emotions,emotion_source", "order": "story_id",
+                    "limit": page_size, "offset": offset},
+            timeout=30,
+        )
+        response.raise_for_status()
+        rows = response.json()
+        for row in rows:
+            source = row.get("emotion_source")
+            if source not in TRAINING_EMOTION_SOURCES:
+                skipped[source or "unknown"] = skipped.get(source or "unknown", 0) + 1
+                continue
+            try:
+                blend = _parse_blend(row.get("emotions"))
+            except Exception:
+                continue
+            if (row.get("story") or "").strip() and blend:
+                samples.append(EmotionSample(story_id=row["story_id"], story=row["story"], blend=blend))
+        if len(rows) < page_size:
+            _report_skipped_sources("Supabase stories", skipped)
+            return samples
+        offset += page_size
+
+
+def merge_samples(*sources: List[EmotionSample]) -> List[EmotionSample]:
+    """story_id 기준 중복 제거 (뒤에 온 소스 우선)"""
+    merged: Dict[str, EmotionSample] = {}
+    for samples in sources:
+        for sample in samples:
+            merged[sample.story_id] = sample
+    return [merged[story_id] for story_id in sorted(merged)]
+
+
+def split_holdout(samples: List[EmotionSample], holdout_percent: int) -> Tuple[List[EmotionSample], List[EmotionSample]]:
+    """story_id 해시로 학습 / 보류 세트 분리 (데이터가 늘어도 기존 사연의 소속은 그대로)"""
+    train, holdout = [], []
+    for sample in samples:
+        bucket = zlib.crc32(sample.story_id.encode("utf-8")) % 100
+        (holdout if bucket < holdout_percent else train).append(sample)
+    return train, holdout
+
+
+# ----------------------------
+# 학습
+# ----------------------------
+
+def train_classifier(samples: List[EmotionSample], min_feature_count: int = 2, min_label_count: int = 2,
+                     epochs: int = 300, learning_rate: float = 0.1, l2: float = 1e-4) -> LocalEmotionClassifier:
+    """LLM 감정 블렌드를 정답 분포로 softmax 회귀 학습 (전체 배치 Adam)"""
+    if np is None:
+        raise RuntimeError("numpy 가 설치되지 않아 감정 분류기를 학습할 수 없습니다.")
+
+    # 1. 감정 라벨 (드문 감정은 제외하고 나머지 비율로 다시 정규화)
+    label_counts: Dict[str, int] = {}
+    for sample in samples:
+        for emotion in sample.blend:
+            label_counts[emotion] = label_counts.get(emotion, 0) + 1
+    labels = sorted(emotion for emotion, count in label_counts.items() if count >= min_label_count)
+    label_index = {emotion: i for i, emotion in enumerate(labels)}
+
+    # 2. 어휘 (min_feature_count 개 이상의 사연에 나온 특징)
+    sample_features = [extract_features(sample.story) for sample in samples]
+    feature_counts: Dict[str, int] = {}
+    for features in sample_features:
+        for feature in features:
+            feature_counts[feature] = feature_counts.get(feature, 0) + 1
+    vocab = sorted(feature for feature, count in feature_counts.items() if count >= min_feature_count)
+    vocab_index = {feature: i for i, feature in enumerate(vocab)}
+
+    # 3. 희소 행렬 (행별 인덱스를 이어 붙인 형태) + 정답 분포
+    rows, targets = [], []
+    for sample, features in zip(samples, sample_features):
+        indices = [vocab_index[feature] for feature in features if feature in vocab_index]
+        target = np.zeros(len(labels), dtype=np.float64)
+        for emotion, percentage in sample.blend.items():
+            if emotion in label_index:
+                target[label_index[emotion]] = percentage
+        if not indices or target.sum() <= 0:
+            continue
+        rows.append(indices)
+        targets.append(target / target.sum())
+    if not rows:
+        raise ValueError("학습할 사연이 없습니다.")
+
+    indices = np.concatenate([np.array(row, dtype=np.int64) for row in rows])
+    row_ids = np.repeat(np.arange(len(rows)), [len(row) for row in rows])
+    row_starts = np.cumsum([0] + [len(row) for row in rows[:-1]])
+    values = np.repeat([1.0 / np.sqrt(len(row)) for row in rows], [len(row) for row in rows])
+    Y = np.stack(targets)
+    n_samples = len(rows)
+
+    weights = np.zeros((len(vocab), len(labels)))
+    bias = np.log(Y.mean(axis=0) + 1e-6)
+    moments = {"w": [np.zeros_like(weights), np.zeros_like(weights)], "b": [np.zeros_like(bias), np.zeros_like(bias)]}
+
+    def adam(name, param, grad, step):
+        m, v = moments[name]
+        m *= 0.9
+        m += 0.1 * grad
+        v *= 0.999
+        v += 0.001 * grad * grad
+        param -= learning_rate * (m / (1 - 0.9 ** step)) / (np.sqrt(v / (1 - 0.999 ** step)) + 1e-8)
+
+    for step in range(1, epochs + 1):
+        logits = np.add.reduceat(weights[indices] * values[:, None], row_starts, axis=0) + bias
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        delta = (probs - Y) / n_samples  # 교차 엔트로피 기울기
+
+        grad_weights = np.zeros_like(weights)
+        np.add.at(grad_weights, indices, delta[row_ids] * values[:, None])
+        grad_weights += l2 * weights
+        adam("w", weights, grad_weights, step)
+        adam("b", bias, delta.sum(axis=0), step)
+
+    loss = float(-(Y * np.log(probs + 1e-12)).sum(axis=1).mean())
+    meta = {
+        "version": datetime.now().strftime("%Y%m%d%H%M%S"),
+        "trained_at": datetime.now().isoformat(),
+        "samples": n_samples,
+        "features": len(vocab),
+        "labels": len(labels),
+        "train_loss": round(loss, 4),
+    }
+    return LocalEmotionClassifier(vocab=vocab, labels=labels, weights=weights, bias=bias, meta=meta)
+
+
+# ----------------------------
+# 실행 시 사용
+# ----------------------------
+
+class LocalEmotionRuntime:
+    """분류기 로드 + 사용 통계 (로컬 결과 사용 / LLM 으로 넘김 / LLM 과의 일치)"""
+
+    def __init__(self, model_path: str, mode: str, threshold: float):
+        self.model_path = model_path
+        self.mode = mode
+        self.threshold = threshold
+        self._classifier: Optional[LocalEmotionClassifier] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+        self.local_hits = 0
+        self.escalations = 0
+        self.escalation_agreements = 0
+        self.escalation_compared = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode == "primary"
+
+    def classifier(self) -> Optional[LocalEmotionClassifier]:
+        """모델 파일을 최초 1회 로드 (numpy / 파일이 없으면 None)"""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._classifier = self._load()
+                    self._loaded = True
+        return self._classifier
+
+    def _load(self) -> Optional[LocalEmotionClassifier]:
+        if np is None:
+            print("⚠️ numpy 가 없어 로컬 감정 분류기를 사용하지 않습니다.")
+            return None
+        if not os.path.exists(self.model_path):
+            print(f"⚠️ 로컬 감정 분류기 모델 없음: {self.model_path}")
+            return None
+        try:
+            classifier = LocalEmotionClassifier.load(self.model_path)
+            print(f"✅ 로컬 감정 분류기 로드: 감정 {len(classifier.labels)}개, 특징 {len(classifier.vocab)}개 "
+                  f"(version={classifier.version})")
+            return classifier
+        except Exception as e:
+            print(f"❌ 로컬 감정 분류기 로드 실패: {e}")
+            return None
+
+    def predict(self, story: str) -> Optional[LocalPrediction]:
+        """신뢰도가 임계값 이상이면 로컬 결과, 아니면 None (LLM 으로 넘김)"""
+        if not self.enabled:
+            return None
+        classifier = self.classifier()
+        if classifier is None:
+            return None
+        try:
+            prediction = classifier.predict(story)
+        except Exception as e:
+            print(f"❌ 로컬 감정 분류 실패: {e}")
+            return None
+        with self._lock:
+            if prediction.confidence >= self.threshold:
+                self.local_hits += 1
+            else:
+                self.escalations += 1
+        if prediction.confidence < self.threshold:
+            print(f"🧮 로컬 감정 분류 신뢰도 낮음 ({prediction.confidence:.2f}) → LLM")
+            return None
+        print(f"🧮 로컬 감정 분류 사용 (신뢰도 {prediction.confidence:.2f}): {prediction.blend}")
+        return prediction
+
+    def record_llm_result(self, story: str, llm_top_emotion: str):
+        """LLM 으로 넘긴 사연에서 로컬 1위 감정이 LLM 1위와 같았는지 기록"""
+        classifier = self.classifier() if self.enabled else None
+        if classifier is None or not llm_top_emotion:
+            return
+        try:
+            local_top = classifier.predict(story).blend[0][0]
+        except Exception:
+            return
+        with self._lock:
+            self.escalation_compared += 1
+            if local_top == llm_top_emotion:
+                self.escalation_agreements += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        classifier = self.classifier() if self.enabled else None
+        with self._lock:
+            total = self.local_hits + self.escalations
+            return {
+                "mode": self.mode,
+                "threshold": self.threshold,
+                "model_path": self.model_path,
+                "model": classifier.meta if classifier else None,
+                "local_hits": self.local_hits,
+                "escalations": self.escalations,
+                "local_rate": round(self.local_hits / total, 3) if total else 0.0,
+                "escalation_top1_agreement": (
+                    round(self.escalation_agreements / self.escalation_compared, 3)
+                    if self.escalation_compared else None
+                ),
+            }
+
+
+_settings = get_settings()
+
+# 전역 인스턴스
+local_emotion_classifier = LocalEmotionRuntime(
+    model_path=_settings.emotion_classifier_path,
+    mode=_settings.emotion_classifier_mode,
+    threshold=_settings.emotion_classifier_threshold,
+)
@@ -0,0 +1,239 @@
+"""
+LLM 모델 라우터 (작업별 model / max_tokens / temperature 결정)
+- 사연 길이: 짧은 사연은 가벼운 모델, 아주 짧으면 LLM 생략
+- 규칙 기반 신뢰도: 충분히 높으면 LLM 생략 (호출 지점의 규칙 기반 결과 사용)
+- 지연 시간: 모델별 관측 지연 + 스케줄러 대기열로 예상 시간을 계산해,
+  작업 SLO / 남은 요청 예산을 넘으면 가벼운 모델로 낮춤
+- 호출 지점은 route() 결과의 params() 를 LLM 요청에 펼쳐 넣고, skip_llm 이면 폴백 경로로 진행
+"""
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from app.core.config import get_settings
+from app.services.llm_scheduler import llm_scheduler
+from app.services.request_deadline import current_deadline
+
+# 관측값이 쌓이기 전 모델별 예상 지연 (ms)
+_DEFAULT_LATENCY_MS: Dict[str, float] = {
+    "gpt-4": 3500.0,
+    "gpt-3.5-turbo": 1200.0,
+    "gpt-4o-mini": 1000.0,
+}
+_UNKNOWN_MODEL_LATENCY_MS = 1500.0
+
+# 관측 지연 이동 평균 가중치
+_LATENCY_EWMA_ALPHA = 0.2
+
+
+@dataclass(frozen=True)
+class ModelTier:
+    """모델 + 생성 파라미터 한 벌"""
+    model: str
+    max_tokens: int
+    temperature: float
+
+
+@dataclass(frozen=True)
+class TaskProfile:
+    """작업별 라우팅 규칙"""
+    full: ModelTier
+    light: Optional[ModelTier] = None  # 지연 / 짧은 사연일 때 쓸 가벼운 조합 (없으면 항상 full)
+    slo_ms: int = 3000  # 작업 지연 목표
+    light_below_chars: int = 0  # 이보다 짧은 사연은 light
+    skip_below_chars: int = 0  # 이보다 짧은 사연은 LLM 생략
+    skip_confidence: Optional[float] = None  # 규칙 기반 신뢰도가 이 이상이면 LLM 생략
+
+
+@dataclass
+class ModelRoute:
+    """라우팅 결과"""
+    task: str
+    tier: str  # full | light | skip
+    model: Optional[str]
+    max_tokens: int
+    temperature: float
+    reason: str
+
+    @property
+    def skip_llm(self) -> bool:
+        return self.tier == "skip"
+
+    def params(self) -> Dict[str, Any]:
+        """LLM 요청에 펼쳐 넣을 파라미터"""
+        return {"model": self.model, "max_tokens": self.max_tokens, "temperature": self.temperature}
+
+
+_settings = get_settings()
+
+# 작업별 라우팅 규칙 (full 은 기존 호출 지점의 모델 / 파라미터 그대로)
+TASK_PROFILES: Dict[str, TaskProfile] = {
+    "emotion_analysis": TaskProfile(
+        full=ModelTier("gpt-4", 400, 0.1),
+        light=ModelTier("gpt-4o-mini", 400, 0.1),
+        slo_ms=3500,
+        light_below_chars=30,
+    ),
+    "context_extraction": TaskProfile(
+        full=ModelTier("gpt-4o-mini", 100, 0.1),
+        slo_ms=3000,
+    ),
+    "fused_extraction": TaskProfile(
+        full=ModelTier(_settings.fused_extraction_model, 300, 0.1),
+        light=ModelTier("gpt-4o-mini", 300, 0.1),
+        slo_ms=3500,
+    ),
+    "story_classification": TaskProfile(
+        full=ModelTier("gpt-3.5-turbo", 400, 0.1),
+        light=ModelTier("gpt-4o-mini", 400, 0.1),
+        slo_ms=3000,
+        skip_confidence=0.9,
+    ),
+    "flower_context_analysis": TaskProfile(
+        full=ModelTier("gpt-4o-mini", 500, 0.3),
+        slo_ms=3000,
+    ),
+    "recommendation_reason": TaskProfile(
+        full=ModelTier("gpt-4o-mini", 200, 0.8),
+        slo_ms=3000,
+    ),
+    "flower_card_rerank": TaskProfile(
+        full=ModelTier("gpt-4o-mini", 5, 0.0),
+        slo_ms=1500,
+    ),
+    "smart_extraction": TaskProfile(
+        full=ModelTier("gpt-4o-mini", 200, 0.1),
+        light=ModelTier("gpt-4o-mini", 150, 0.1),
+        slo_ms=2000,
+        light_below_chars=30,
+        skip_below_chars=10,
+        skip_confidence=1.0,
+    ),
+    "english_description": TaskProfile(
+        full=ModelTier("gpt-3.5-turbo", 100, 0.7),
+        light=ModelTier("gpt-4o-mini", 100, 0.7),
+        slo_ms=3000,
+    ),
+    "recommendation_reason_generator": TaskProfile(
+        full=ModelTier("gpt-4", 200, 0.7),
+        light=ModelTier("gpt-4o-mini", 200, 0.7),
+        slo_ms=4000,
+    ),
+    "design_flower_matching": TaskProfile(
+        full=ModelTier("gpt-3.5-turbo", 300, 0.1),
+        light=ModelTier("gpt-4o-mini", 300, 0.1),
+        slo_ms=3000,
+    ),
+}
+
+
+class ModelRouter:
+    """작업별 모델 선택기"""
+
+    def __init__(self, profiles: Dict[str, TaskProfile], slo_overrides: Dict[str, int], enabled: bool = True):
+        self.profiles = profiles
+        self.slo_overrides = slo_overrides
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._latency_ms: Dict[str, float] = dict(_DEFAULT_LATENCY_MS)
+        self._observed: Dict[str, int] = {}
+        self._decisions: Dict[str, Dict[str, int]] = {}
+
+    def route(self, task: str, story: str = "", rule_confidence: Optional[float] = None) -> ModelRoute:
+        """작업에 쓸 모델 / 파라미터 결정"""
+        profile = self.profiles[task]
+        if not self.enabled:
+            return self._record(task, "full", profile.full, "라우터 비활성화")
+
+        story_length = len(story.strip())
+        if profile.skip_below_chars and story_length < profile.skip_below_chars:
+            return self._record(task, "skip", None, f"짧은 사연 ({story_length}자)")
+        if (rule_confidence is not None and profile.skip_confidence is not None
+                and rule_confidence >= profile.skip_confidence):
+            return self._record(task, "skip", None, f"규칙 기반 신뢰도 {rule_confidence:.2f}")
+
+        if profile.light is None:
+            return self._record(task, "full", profile.full, "단일 모델")
+        if story_length < profile.light_below_chars:
+            return self._record(task, "light", profile.light, f"짧은 사연 ({story_length}자)")
+
+        # 예상 지연 (관측 지연 + 대기열) 이 작업 SLO / 남은 요청 예산을 넘으면 가벼운 모델로
+        budget_ms = float(self.slo_overrides.get(task, profile.slo_ms))
+        deadline = current_deadline()
+        if deadline is not None:
+            budget_ms = min(budget_ms, deadline.remaining() * 1000)
+        expected_ms = self.expected_latency_ms(profile.full.model)
+        if expected_ms > budget_ms:
+            return self._record(task, "light", profile.light, f"예상 {expected_ms:.0f}ms > 예산 {budget_ms:.0f}ms")
+        return self._record(task, "full", profile.full, f"예상 {expected_ms:.0f}ms")
+
+    def expected_latency_ms(self, model: str) -> float:
+        """모델 호출 예상 시간 (관측 지연 + 슬롯이 모두 찼을 때의 대기열 대기)"""
+        with self._lock:
+            latency_ms = self._latency_ms.get(model, _UNKNOWN_MODEL_LATENCY_MS)
+        load = llm_scheduler.load(model)
+        if load["in_flight"] < load["limit"]:
+            return latency_ms
+        # 앞선 대기 호출들이 limit 개씩 처리된다고 보고 대기 시간 추정
+        return latency_ms * (1 + (load["queue_depth"] + 1) / max(1, load["limit"]))
+
+    def record_latency(self, model: Optional[str], elapsed_ms: float):
+        """실제 호출 지연 반영 (이동 평균)"""
+        if not model:
+            return
+        with self._lock:
+            previous = self._latency_ms.get(model, elapsed_ms)
+            self._latency_ms[model] = previous + _LATENCY_EWMA_ALPHA * (elapsed_ms - previous)
+            self._observed[model] = self._observed.get(model, 0) + 1
+
+    def _record(self, task: str, tier: str, choice: Optional[ModelTier], reason: str) -> ModelRoute:
+        label = "skip" if choice is None else f"{tier}:{choice.model}"
+        with self._lock:
+            task_decisions = self._decisions.setdefault(task, {})
+            task_decisions[label] = task_decisions.get(label, 0) + 1
+        if tier != "full":
+            print(f"🧭 모델 라우팅: {task} → {label} ({reason})")
+        return ModelRoute(
+            task=task,
+            tier=tier,
+            model=choice.model if choice else None,
+            max_tokens=choice.max_tokens if choice else 0,
+            temperature=choice.temperature if choice else 0.0,
+            reason=reason,
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """작업별 라우팅 결과 분포 / 모델별 예상 지연"""
+        with self._lock:
+            decisions = {task: dict(counts) for task, counts in self._decisions.items()}
+            latency = {model: round(ms, 1) for model, ms in self._latency_ms.items()}
+            observed = dict(self._observed)
+        return {
+            "enabled": self.enabled,
+            "slo_ms": {task: self.slo_overrides.get(task, profile.slo_ms) for task, profile in self.profiles.items()},
+            "latency_ms": latency,
+            "observed_calls": observed,
+            "decisions": decisions,
+        }
+
+
+def _parse_task_slos(value: str) -> Dict[str, int]:
+    """'emotion_analysis=2500,recommendation_reason=2000' → {'emotion_analysis': 2500, ...}"""
+    slos = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        task, slo_ms = item.split("=", 1)
+        try:
+            slos[task.strip()] = int(slo_ms)
+        except ValueError:
+            print(f"⚠️ 모델 라우터 SLO 설정 무시: {item}")
+    return slos
+
+
+# 전역 인스턴스
+model_router = ModelRouter(
+    profiles=TASK_PROFILES,
+    slo_overrides=_parse_task_slos(_settings.llm_router_slo_ms),
+    enabled=_settings.llm_router_enabled,
+)
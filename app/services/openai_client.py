@@ -0,0 +1,101 @@
+"""
+공유 OpenAI 클라이언트 제공자 (동기 / 비동기, 커넥션 풀 재사용)
+"""
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from app.core.config import get_settings
+
+_sync_clients: Dict[str, Any] = {}
+_async_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _resolve_api_key(api_key: Optional[str]) -> str:
+    """API 키 결정 (명시값 우선, 없으면 환경변수)"""
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY가 설정되지 않았습니다.")
+    return api_key
+
+
+def _http_options():
+    """타임아웃 / 커넥션 풀 설정"""
+    import httpx
+    settings = get_settings()
+    timeout = httpx.Timeout(settings.openai_timeout_seconds, connect=settings.openai_connect_timeout_seconds)
+    limits = httpx.Limits(
+        max_connections=settings.openai_max_connections,
+        max_keepalive_connections=settings.openai_max_keepalive_connections,
+        keepalive_expiry=settings.openai_keepalive_expiry_seconds,
+    )
+    return timeout, limits
+
+
+def get_openai_client(api_key: Optional[str] = None):
+    """프로세스 전역 동기 OpenAI 클라이언트 (keep-alive 커넥션 풀 공유)"""
+    api_key = _resolve_api_key(api_key)
+    client = _sync_clients.get(api_key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _sync_clients.get(api_key)
+        if client is None:
+            import httpx
+            from openai import OpenAI
+            timeout, limits = _http_options()
+            client = OpenAI(
+                api_key=api_key,
+                timeout=timeout,
+                max_retries=get_settings().openai_max_retries,
+                http_client=httpx.Client(timeout=timeout, limits=limits),
+            )
+            _sync_clients[api_key] = client
+            print("✅ 공유 OpenAI 클라이언트 생성 (sync)")
+    return client
+
+
+def get_async_openai_client(api_key: Optional[str] = None):
+    """프로세스 전역 비동기 OpenAI 클라이언트 (keep-alive 커넥션 풀 공유)"""
+    api_key = _resolve_api_key(api_key)
+    client = _async_clients.get(api_key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _async_clients.get(api_key)
+        if client is None:
+            import httpx
+            from openai import AsyncOpenAI
+            timeout, limits = _http_options()
+            client = AsyncOpenAI(
+                api_key=api_key,
+                timeout=timeout,
+                max_retries=get_settings().openai_max_retries,
+                http_client=httpx.AsyncClient(timeout=timeout, limits=limits),
+            )
+            _async_clients[api_key] = client
+            print("✅ 공유 OpenAI 클라이언트 생성 (async)")
+    return client
+
+
+async def close_openai_clients():
+    """공유 클라이언트 종료 (앱 종료 시)"""
+    with _clients_lock:
+        sync_clients = list(_sync_clients.values())
+        async_clients = list(_async_clients.values())
+        _sync_clients.clear()
+        _async_clients.clear()
+
+    for client in sync_clients:
+        try:
+            client.close()
+        except Exception as e:
+            print(f"⚠️ OpenAI 클라이언트 종료 실패: {e}")
+    for client in async_clients:
+        try:
+            await client.close()
+        except Exception as e:
+            print(f"⚠️ OpenAI 비동기 클라이언트 종료 실패: {e}")
@@ -0,0 +1,238 @@
+"""
+꽃카드 인용구 검색 인덱스
+- data/flower_card_quotes.json 의 큐레이션 인용구를 감정 / 상황 / 관계 / 꽃말 태그로 색인
+- 요청마다 사연 + 감정 블렌드 + 꽃말로 질의 태그를 만들고, 태그별 posting 목록을 더해 점수 계산 (LLM 호출 없음)
+- CARD_QUOTE_LLM_RERANK=true 일 때만 상위 k 개 후보 중 하나를 LLM 으로 고름 (실패 시 1위 후보)
+"""
+import os
+import re
+import json
+import zlib
+import heapq
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import get_settings
+from app.services.openai_client import get_openai_client, get_async_openai_client
+from app.services.llm_cache import llm_cache
+from app.services.model_router import model_router
+
+QUOTES_PATH = "data/flower_card_quotes.json"
+
+# 태그 차원별 가중치 (감정이 가장 중요, 꽃말은 보조)
+DIMENSION_WEIGHTS: Dict[str, float] = {
+    "emotions": 3.0,
+    "situations": 2.5,
+    "relationships": 1.5,
+    "meanings": 1.0,
+}
+
+# "응원·격려", "위로/공감" 같은 복합 감정명 분리
+_TAG_SPLIT = re.compile(r"[·/,]")
+
+
+@dataclass(frozen=True)
+class CardQuote:
+    """인용구 한 개"""
+    id: str
+    quote: str
+    source: str
+
+
+@dataclass
+class QuoteCandidate:
+    """검색 결과 후보"""
+    quote: CardQuote
+    score: float
+    matched: List[str]
+
+
+class QuoteIndex:
+    """태그 → 인용구 posting 목록 인덱스"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.version = data.get("version", "unknown")
+        self.emotion_aliases: Dict[str, str] = data.get("emotion_aliases", {})
+        self.situation_keywords: Dict[str, List[str]] = data.get("situation_keywords", {})
+        self.relationship_keywords: Dict[str, List[str]] = data.get("relationship_keywords", {})
+
+        # 상황 / 관계 키워드를 정규식 하나로 컴파일 (사연을 한 번만 훑음)
+        self._keyword_tags: Dict[str, List[Tuple[str, str]]] = {}
+        for dimension, table in (("situations", self.situation_keywords), ("relationships", self.relationship_keywords)):
+            for tag, keywords in table.items():
+                for keyword in keywords:
+                    self._keyword_tags.setdefault(keyword, []).append((dimension, tag))
+        keywords = sorted(self._keyword_tags, key=len, reverse=True)
+        self._keyword_pattern = re.compile("|".join(re.escape(keyword) for keyword in keywords)) if keywords else None
+
+        self.quotes: List[CardQuote] = []
+        self._postings: Dict[Tuple[str, str], List[int]] = {}
+        for position, item in enumerate(data.get("quotes", [])):
+            self.quotes.append(CardQuote(id=item["id"], quote=item["quote"], source=item["source"]))
+            for dimension in DIMENSION_WEIGHTS:
+                for tag in item.get(dimension, []):
+                    self._postings.setdefault((dimension, self._normalize(tag)), []).append(position)
+
+    @classmethod
+    def from_file(cls, path: str = QUOTES_PATH) -> "QuoteIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.quotes)
+
+    def _normalize(self, tag: str) -> str:
+        tag = tag.strip()
+        return self.emotion_aliases.get(tag, tag)
+
+    def _expand(self, tag: str) -> List[str]:
+        """복합 태그 분리 + 별칭 정규화"""
+        return [self._normalize(part) for part in _TAG_SPLIT.split(tag) if part.strip()]
+
+    def build_query(self, story: str, emotions: Sequence[Any] = (),
+                    flower_keywords: Sequence[str] = ()) -> Dict[Tuple[str, str], float]:
+        """사연 / 감정 블렌드 / 꽃말 → (차원, 태그) 가중치"""
+        query: Dict[Tuple[str, str], float] = {}
+
+        for emotion in emotions:
+            name = emotion.get("emotion") if isinstance(emotion, dict) else getattr(emotion, "emotion", "")
+            percentage = emotion.get("percentage") if isinstance(emotion, dict) else getattr(emotion, "percentage", None)
+            weight = (percentage or 100.0 / max(1, len(emotions))) / 100.0
+            for tag in self._expand(name or ""):
+                query[("emotions", tag)] = query.get(("emotions", tag), 0.0) + weight
+
+        if self._keyword_pattern is not None and story:
+            for keyword in set(self._keyword_pattern.findall(story)):
+                for dimension_tag in self._keyword_tags[keyword]:
+                    query[dimension_tag] = 1.0
+
+        for keyword in flower_keywords:
+            for tag in self._expand(keyword):
+                query[("meanings", tag)] = 1.0
+        return query
+
+    def search(self, story: str, emotions: Sequence[Any] = (), flower_keywords: Sequence[str] = (),
+               k: int = 5) -> List[QuoteCandidate]:
+        """상위 k 개 인용구 (점수가 같으면 사연 해시로 순서를 섞어 같은 감정에도 문구가 고르게 나오도록)"""
+        if not self.quotes:
+            return []
+        scores: Dict[int, float] = {}
+        matched: Dict[int, List[str]] = {}
+        for (dimension, tag), weight in self.build_query(story, emotions, flower_keywords).items():
+            for position in self._postings.get((dimension, tag), ()):
+                scores[position] = scores.get(position, 0.0) + DIMENSION_WEIGHTS[dimension] * weight
+                matched.setdefault(position, []).append(f"{dimension}:{tag}")
+
+        seed = zlib.crc32(story.encode("utf-8"))
+        count = len(self.quotes)
+        top = heapq.nsmallest(k, scores, key=lambda position: (-scores[position], (position + seed) % count))
+        if len(top) < k:
+            # 맞는 태그가 부족하면 나머지 인용구로 채움
+            rest = sorted((position for position in range(count) if position not in scores),
+                          key=lambda position: (position + seed) % count)
+            top.extend(rest[:k - len(top)])
+        return [
+            QuoteCandidate(quote=self.quotes[position], score=round(scores.get(position, 0.0), 3),
+                           matched=matched.get(position, []))
+            for position in top
+        ]
+
+
+_index: Optional[QuoteIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_quote_index() -> QuoteIndex:
+    """공유 인용구 인덱스 (최초 1회 로드, 실패 시 빈 인덱스)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                try:
+                    _index = QuoteIndex.from_file()
+                    print(f"✅ 꽃카드 인용구 인덱스 로드: {len(_index)}개 (version={_index.version})")
+                except Exception as e:
+                    print(f"❌ 꽃카드 인용구 라이브러리 로드 실패: {e}")
+                    _index = QuoteIndex({})
+    return _index
+
+
+# ----------------------------
+# LLM 재정렬 (선택)
+# ----------------------------
+
+def _build_rerank_messages(candidates: List[QuoteCandidate], story: str) -> List[Dict[str, str]]:
+    """상위 후보 중 사연에 가장 맞는 번호 하나를 고르게 하는 프롬프트"""
+    options = "\n".join(
+        f"{i}. \"{candidate.quote.quote}\" - {candidate.quote.source}"
+        for i, candidate in enumerate(candidates, 1)
+    )
+    prompt = f"""
+Customer's Story: "{story}"
+
+Which quote fits this customer's flower card best?
+{options}
+
+Answer with the number only.
+"""
+    return [
+        {"role": "system", "content": "You pick the most fitting quote for a flower card."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _parse_rerank(content: str, candidates: List[QuoteCandidate]) -> CardQuote:
+    """LLM 응답의 번호 → 후보 (해석 불가 시 1위 후보)"""
+    match = re.search(r"\d+", content or "")
+    if match and 1 <= int(match.group()) <= len(candidates):
+        return candidates[int(match.group()) - 1].quote
+    return candidates[0].quote
+
+
+def _should_rerank(candidates: List[QuoteCandidate]) -> bool:
+    return (
+        get_settings().card_quote_llm_rerank
+        and len(candidates) > 1
+        and bool(os.getenv("OPENAI_API_KEY"))
+    )
+
+
+def select_card_quote(story: str, emotions: Sequence[Any] = (),
+                      flower_keywords: Sequence[str] = ()) -> Optional[CardQuote]:
+    """꽃카드 인용구 선택 (로컬 검색, 설정 시 LLM 재정렬)"""
+    candidates = get_quote_index().search(story, emotions, flower_keywords, k=get_settings().card_quote_top_k)
+    if not candidates:
+        return None
+    if not _should_rerank(candidates):
+        return candidates[0].quote
+    try:
+        content = llm_cache.chat_completion(
+            get_openai_client(), "flower_card_rerank",
+            messages=_build_rerank_messages(candidates, story),
+            **model_router.route("flower_card_rerank", story).params()
+        )
+        return _parse_rerank(content, candidates)
+    except Exception as e:
+        print(f"⚠️ 꽃카드 인용구 재정렬 실패, 1위 후보 사용: {e}")
+        return candidates[0].quote
+
+
+async def select_card_quote_async(story: str, emotions: Sequence[Any] = (),
+                                  flower_keywords: Sequence[str] = ()) -> Optional[CardQuote]:
+    """select_card_quote 의 비동기 버전 (재정렬만 AsyncOpenAI 로 호출)"""
+    candidates = get_quote_index().search(story, emotions, flower_keywords, k=get_settings().card_quote_top_k)
+    if not candidates:
+        return None
+    if not _should_rerank(candidates):
+        return candidates[0].quote
+    try:
+        content = await llm_cache.achat_completion(
+            get_async_openai_client(), "flower_card_rerank",
+            messages=_build_rerank_messages(candidates, story),
+            **model_router.route("flower_card_rerank", story).params()
+        )
+        return _parse_rerank(content, candidates)
+    except Exception as e:
+        print(f"⚠️ 꽃카드 인용구 재정렬 실패, 1위 후보 사용: {e}")
+        return candidates[0].quote
@@ -5,6 +5,11 @@ import os
 import json
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
+from app.services.openai_client import get_openai_client, get_async_openai_client
+from app.services.llm_cache import llm_cache
+from app.services.model_router import model_router
+from app.services.keyword_automaton import scan_keywords
+from app.services.flower_name_detector import get_flower_name_detector
 
 # .env 파일 로드
 try:
@@ -51,60 +56,21 @@ class RealtimeContextExtractor:
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         if not self.openai_api_key:
             print("⚠️  OPENAI_API_KEY가 설정되지 않았습니다.")
-        
-        # 꽃 이름 매핑 데이터 로드
-        self.flower_names = self._load_flower_names()
     
-    def _load_flower_names(self) -> Dict[str, str]:
-        """꽃 이름 매핑 데이터 로드"""
+    def _detect_mentioned_flower(self, story: str) -> Optional[str]:
+        """사용자가 언급한 꽃 이름 감지 (카탈로그 이름 / 학명 / 별칭 중 가장 긴 이름, 사연 한 번 훑기)"""
         try:
-            with open("data/flower_dictionary.json", 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                flowers = data.get("flowers", {})
-                
-                flower_mapping = {}
-                for flower_id, flower_data in flowers.items():
-                    korean_name = flower_data.get("korean_name", "")
-                    scientific_name = flower_data.get("scientific_name", "")
-                    color = flower_data.get("color", "")
-                    
-                    # 한국어 이름 매핑
-                    if korean_name:
-                        flower_mapping[korean_name] = flower_id
-                        # 부분 매칭을 위한 키워드도 추가
-                        for word in korean_name.split():
-                            if len(word) > 1:
-                                flower_mapping[word] = flower_id
-                    
-                    # 학명 매핑
-                    if scientific_name:
-                        flower_mapping[scientific_name] = flower_id
-                        # 부분 매칭을 위한 키워드도 추가
-                        for word in scientific_name.split():
-                            if len(word) > 2:
-                                flower_mapping[word] = flower_id
-                
-                return flower_mapping
+            # 카탈로그 버전별로 한 번만 컴파일
+            detected = get_flower_name_detector().detect(story)
         except Exception as e:
-            print(f"❌ 꽃 이름 매핑 로드 실패: {e}")
-            return {}
-    
-    def _detect_mentioned_flower(self, story: str) -> Optional[str]:
-        """사용자가 언급한 꽃 이름 감지"""
-        if not self.flower_names:
+            print(f"❌ 꽃 이름 감지 실패: {e}")
             return None
         
-        story_lower = story.lower()
-        
-        # 꽃 이름 매칭 (긴 이름부터 매칭)
-        sorted_flowers = sorted(self.flower_names.keys(), key=len, reverse=True)
-        
-        for flower_name in sorted_flowers:
-            if flower_name.lower() in story_lower:
-                print(f"🌸 언급된 꽃 감지: {flower_name} -> {self.flower_names[flower_name]}")
-                return self.flower_names[flower_name]
-        
-        return None
+        if detected is None:
+            return None
+        flower_name, flower_id = detected
+        print(f"🌸 언급된 꽃 감지: {flower_name} -> {flower_id}")
+        return flower_id
     
     def extract_context_realtime(self, story: str, emotions: List[dict] = None, excluded_keywords: List[Dict[str, str]] = None) -> ExtractedContext:
         """실시간으로 고객 이야기에서 맥락 추출 (감정 분석 결과 반영, 제외된 키워드 고려)"""
@@ -118,68 +84,87 @@ class RealtimeContextExtractor:
             return result
         
         try:
-            import openai
-            client = openai.OpenAI(api_key=self.openai_api_key)
-            
-            prompt = self._create_extraction_prompt(story, emotions)
-            
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",  # 더 빠르고 저렴한 모델로 변경
-                messages=[
-                    {"role": "system", "content": "꽃 추천 키워드 추출 전문가입니다. 간단하고 정확하게 추출해주세요."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=100,  # 토큰 수 더 줄여서 속도 개선
-                timeout=3  # 3초 타임아웃 설정
-            )
+            client = get_openai_client(self.openai_api_key)
+            result = llm_cache.chat_completion(client, "context_extraction", **self._create_llm_request(story, emotions))
+            parsed_result = self._parse_llm_response(result, mentioned_flower)
+            return self._finalize_llm_context(parsed_result, story, emotions, excluded_keywords, mentioned_flower)
             
-            result = response.choices[0].message.content
+        except Exception as e:
+            print(f"❌ LLM 맥락 추출 실패: {e}")
+            return self._fallback_extraction(story, emotions)
+    
+    async def extract_context_realtime_async(self, story: str, emotions: List[dict] = None, excluded_keywords: List[Dict[str, str]] = None) -> ExtractedContext:
+        """extract_context_realtime 의 비동기 버전 (AsyncOpenAI - 이벤트 루프를 막지 않음)"""
+        mentioned_flower = self._detect_mentioned_flower(story)
+        
+        if not self.openai_api_key:
+            result = self._fallback_extraction(story, emotions, excluded_keywords)
+            result.mentioned_flower = mentioned_flower
+            return result
+        
+        try:
+            client = get_async_openai_client(self.openai_api_key)
+            result = await llm_cache.achat_completion(client, "context_extraction", **self._create_llm_request(story, emotions))
             parsed_result = self._parse_llm_response(result, mentioned_flower)
+            return self._finalize_llm_context(parsed_result, story, emotions, excluded_keywords, mentioned_flower)
             
-            # 감정 분석 결과가 있으면 emotions를 감정 분석 결과로 대체
-            if emotions and len(emotions) > 0:
-                # 감정 분석 결과에서 감정명만 추출
-                emotion_names = []
-                for emotion in emotions:
-                    if hasattr(emotion, 'emotion'):
-                        emotion_names.append(emotion.emotion)
-                    elif isinstance(emotion, dict) and 'emotion' in emotion:
-                        emotion_names.append(emotion['emotion'])
-                
-                if emotion_names:  # 감정명이 실제로 추출된 경우에만 적용
-                    parsed_result.emotions = emotion_names[:3]  # 최대 3개 감정 사용
-                    print(f"🔧 감정 분석 결과 적용: {emotion_names[:3]}")
-                else:
-                    # 감정 분석 결과가 없으면 기본 감정 추출
-                    parsed_result.emotions = self._extract_basic_emotions(story)
-                    print(f"🔧 기본 감정 추출: {parsed_result.emotions}")
+        except Exception as e:
+            print(f"❌ LLM 맥락 추출 실패: {e}")
+            return self._fallback_extraction(story, emotions)
+    
+    def _create_llm_request(self, story: str, emotions: List[dict] = None) -> dict:
+        """맥락 추출 LLM 호출 파라미터 (동기/비동기 공통)"""
+        return {
+            **model_router.route("context_extraction", story).params(),  # gpt-4o-mini, 100 토큰
+            "messages": [
+                {"role": "system", "content": "꽃 추천 키워드 추출 전문가입니다. 간단하고 정확하게 추출해주세요."},
+                {"role": "user", "content": self._create_extraction_prompt(story, emotions)}
+            ],
+            "timeout": 3  # 3초 타임아웃 설정
+        }
+    
+    def _finalize_llm_context(self, parsed_result: ExtractedContext, story: str, emotions: List[dict] = None,
+                              excluded_keywords: List[Dict[str, str]] = None, mentioned_flower: Optional[str] = None) -> ExtractedContext:
+        """LLM 추출 결과 후처리 (감정 분석 결과 반영, 색상 보완, 중복 제거)"""
+        # 감정 분석 결과가 있으면 emotions를 감정 분석 결과로 대체
+        if emotions and len(emotions) > 0:
+            # 감정 분석 결과에서 감정명만 추출
+            emotion_names = []
+            for emotion in emotions:
+                if hasattr(emotion, 'emotion'):
+                    emotion_names.append(emotion.emotion)
+                elif isinstance(emotion, dict) and 'emotion' in emotion:
+                    emotion_names.append(emotion['emotion'])
+            
+            if emotion_names:  # 감정명이 실제로 추출된 경우에만 적용
+                parsed_result.emotions = emotion_names[:3]  # 최대 3개 감정 사용
+                print(f"🔧 감정 분석 결과 적용: {emotion_names[:3]}")
             else:
                 # 감정 분석 결과가 없으면 기본 감정 추출
                 parsed_result.emotions = self._extract_basic_emotions(story)
                 print(f"🔧 기본 감정 추출: {parsed_result.emotions}")
-            
-            # 색상이 비어있으면 fallback 로직으로 색상 추출
-            if not parsed_result.colors:
-                print("🔧 색상이 비어있어 fallback 로직으로 색상 추출")
-                fallback_result = self._fallback_extraction(story, emotions, excluded_keywords)
-                parsed_result.colors = fallback_result.colors
-            else:
-                print(f"🎨 LLM에서 색상 추출됨: {parsed_result.colors}")
-            
-            # 중복 키워드 제거 및 후처리
-            parsed_result = self._remove_duplicates_and_postprocess(parsed_result, story)
-            
-            print(f"🔧 후처리된 키워드: emotions={parsed_result.emotions}, situations={parsed_result.situations}, moods={parsed_result.moods}, colors={parsed_result.colors}")
-            
-            # 언급된 꽃 정보 추가
-            parsed_result.mentioned_flower = mentioned_flower
-            
-            return parsed_result
-            
-        except Exception as e:
-            print(f"❌ LLM 맥락 추출 실패: {e}")
-            return self._fallback_extraction(story, emotions)
+        else:
+            # 감정 분석 결과가 없으면 기본 감정 추출
+            parsed_result.emotions = self._extract_basic_emotions(story)
+            print(f"🔧 기본 감정 추출: {parsed_result.emotions}")
+        
+        # 색상이 비어있으면 fallback 로직으로 색상 추출
+        if not parsed_result.colors:
+            print("🔧 색상이 비어있어 fallback 로직으로 색상 추출")
+            fallback_result = self._fallback_extraction(story, emotions, excluded_keywords)
+            parsed_result.colors = fallback_result.colors
+        else:
+            print(f"🎨 LLM에서 색상 추출됨: {parsed_result.colors}")
+        
+        # 중복 키워드 제거 및 후처리
+        parsed_result = self._remove_duplicates_and_postprocess(parsed_result, story)
+        
+        print(f"🔧 후처리된 키워드: emotions={parsed_result.emotions}, situations={parsed_result.situations}, moods={parsed_result.moods}, colors={parsed_result.colors}")
+        
+        # 언급된 꽃 정보 추가
+        parsed_result.mentioned_flower = mentioned_flower
+        
+        return parsed_result
     
     def _remove_duplicates_and_postprocess(self, context: ExtractedContext, story: str) -> ExtractedContext:
         """중복 키워드 제거 및 후처리"""
@@ -583,201 +568,78 @@ class RealtimeContextExtractor:
         moods = []
         colors = []
         
-        # 감정 키워드 (현재 느끼는 감정) - 더 다양하게
-        emotion_keywords = {
-            # 부정적 감정
-            "우울": ["우울", "우울해", "우울한", "우울함", "우울해서", "침울", "우울증"],
-            "슬픔": ["슬프", "슬픈", "슬퍼", "슬픔", "애도", "비통", "서럽"],
-            "스트레스": ["스트레스", "스트레스받", "스트레스 받", "스트레스받아", "압박", "부담"],
-            "피곤": ["피곤", "피곤해", "피곤한", "지쳐", "지쳤어", "허기", "무기력"],
-            "외로움": ["외로워", "외로운", "외로움", "고독", "쓸쓸", "허전"],
-            "불안": ["불안", "불안해", "불안한", "걱정", "걱정해", "근심", "조마조마"],
-            "답답함": ["답답", "답답해", "답답한", "막막", "막막해", "막막한"],
-            "지침": ["지침", "지쳐", "지쳤어", "무기력", "의욕없"],
-            "허전함": ["허전", "허전해", "허전한", "빈", "텅빈", "쓸쓸"],
-            "그리움": ["그리워", "그리운", "그리움", "보고싶", "보고싶어"],
-            "미안함": ["미안", "미안해", "미안한", "죄송", "죄송해", "죄송한"],
-            "후회": ["후회", "후회해", "후회한", "아깝", "아깝다"],
-            "분노": ["화나", "화나서", "분노", "짜증", "짜증나", "열받"],
-            "지루함": ["지루", "지루해", "지루한", "심심", "심심해", "재미없"],
-            
-            # 긍정적 감정
-            "기쁨": ["기쁘", "기뻐", "기쁜", "행복", "즐거", "신나", "웃음", "웃겨"],
-            "설렘": ["설렘", "설레", "설레는", "두근", "두근거려", "떨려"],
-            "감사": ["감사", "고마워", "은혜", "도움", "중요한", "소중한", "고맙"],
-            "만족": ["만족", "만족해", "만족한", "충족", "충족해", "충족한"],
-            "희망": ["희망", "새로운", "시작", "미래", "꿈", "꿈꿔", "꿈꾸"],
-            "자신감": ["자신감", "자신있", "자신있어", "확신", "확신있"],
-            "용기": ["용기", "용감", "용감해", "용감한", "대담", "대담해"],
-            "열정": ["열정", "열정적", "열심", "열심히", "투지", "투지있"],
-            "애정": ["애정", "사랑", "좋아", "정", "마음", "애틋"],
-            "따뜻함": ["따뜻한", "포근한", "안정적인", "편안", "편안해"],
-            "안정감": ["안정", "안정감", "안정적", "차분", "차분해", "차분한"],
-            "활력": ["활력", "활기", "활기찬", "생기", "생기있", "에너지"],
-            "격려": ["격려", "응원", "힘내", "화이팅", "도전", "다시", "괜찮아"],
-            "진심": ["진심", "진짜", "정말", "어린", "가볍지만 진심", "성실"],
-            "우정": ["친구", "우정", "동료", "친한", "오래된", "절친"]
-        }
-        
-        # 상황/목적 키워드 - 더 다양하고 구체적으로
-        situation_keywords = {
-            # 개인적 상황
-            "방꾸미기": ["방", "집", "공간", "꾸미", "인테리어", "가구", "소품", "장식"],
-            "일상": ["일상", "평소", "매일", "일상적인", "루틴", "습관"],
-            "휴식공간": ["휴식", "쉬고", "편하게", "편안하게", "쉬는", "휴가", "여행"],
-            "기분전환": ["기분 전환", "기분전환", "기분 바꿔", "새로운", "활력을", "활력이", "밝은", "밝게", "환기"],
-            "스트레스해소": ["스트레스", "스트레스 해소", "스트레스해소", "힘들", "지쳐", "피곤", "압박", "부담"],
-            "자기위로": ["자기위로", "스스로에게", "나에게", "내가", "저에게", "제가", "혼자", "혼자서"],
-            "힐링": ["힐링", "치유", "마음", "마음치유", "상처", "아픔", "회복"],
-            "명상": ["명상", "요가", "마음챙김", "집중", "집중력", "명상공간"],
-            "독서": ["독서", "책", "읽기", "도서관", "서점", "지식"],
-            "운동": ["운동", "헬스", "요가", "필라테스", "조깅", "걷기", "등산"],
-            "취미활동": ["취미", "취미활동", "그림", "그리기", "악기", "음악", "요리", "베이킹"],
-            "자기계발": ["자기계발", "학습", "공부", "스킬", "능력", "성장", "발전"],
-            "새로운시작": ["새로운", "시작", "변화", "전환", "도전", "모험", "새출발"],
-            
-            # 대인관계 상황
-            "위로": ["위로", "달래", "안아", "보듬", "쓰다듬", "어루만", "위안"],
-            "격려": ["격려", "응원", "힘내", "화이팅", "도전", "다시", "괜찮아", "버티"],
-            "축하": ["축하", "축하해", "축하하는", "경사", "경사스러운", "축하파티"],
-            "감사": ["감사", "고마워", "은혜", "도움", "중요한", "소중한", "고맙"],
-            "사과": ["사과", "미안", "용서", "잘못", "실수", "죄송"],
-            "화해": ["화해", "화해해", "화해하는", "다시", "재회", "만남"],
-            "재회": ["재회", "다시", "만남", "화해", "연락", "연락처"],
-            "이별": ["이별", "헤어짐", "작별", "안녕", "잘가", "떠남"],
-            "고백": ["고백", "고백해", "고백하는", "사랑", "마음", "진심"],
-            "프로포즈": ["프로포즈", "청혼", "결혼", "약혼", "반지", "꿈"],
-            "결혼": ["결혼", "웨딩", "부부", "신랑", "신부", "결혼식"],
-            "생일": ["생일", "기념일", "축하", "파티", "케이크", "선물"],
-            "졸업": ["졸업", "졸업식", "학위", "학사모", "캡", "캡스톤"],
-            "합격": ["합격", "성공", "합격증", "합격통지", "합격발표", "합격자"],
-            "취업": ["취업", "직장", "회사", "근무", "출근", "직장생활"],
-            "창업": ["창업", "사업", "비즈니스", "회사", "사장", "CEO"],
-            
-            # 공간/환경
-            "거실": ["거실", "응접실", "리빙룸", "소파", "TV", "가족"],
-            "침실": ["침실", "베드룸", "침대", "수면", "잠", "휴식"],
-            "사무실": ["사무실", "오피스", "책상", "업무", "일", "직장"],
-            "카페": ["카페", "커피", "음료", "분위기", "아늑", "편안"],
-            "정원": ["정원", "가든", "화단", "꽃밭", "식물", "자연"],
-            "발코니": ["발코니", "베란다", "테라스", "야외", "바람", "햇살"],
-            "베란다": ["베란다", "발코니", "테라스", "야외", "바람", "햇살"],
-            "인테리어": ["인테리어", "디자인", "스타일", "분위기", "테마", "컨셉"],
-            "홈데코": ["홈데코", "장식", "소품", "액세서리", "포인트", "포인트아이템"],
-            "공간분위기": ["분위기", "무드", "감성", "느낌", "환경", "공간"],
-            "조명": ["조명", "불", "라이트", "밝기", "어둠", "분위기조명"]
-        }
-        
-        # 무드 키워드 (원하는 감정/목표/분위기) - 의미 기반 매핑 (확장)
-        mood_keywords = {
-            "따뜻한": ["따뜻한", "포근한", "편안한", "안정적인", "고마워", "든든한"],
-            "부드러운": ["부드러운", "은은한", "조용한", "차분한", "부드러운 꽃"],
-            "로맨틱한": ["로맨틱", "달콤한", "사랑스러운", "아름다운", "사랑"],
-            "활기찬": ["활기찬", "경쾌한", "밝은", "즐거운", "활력", "활력을", "활력이"],
-            "우아한": ["우아한", "세련된", "고급스러운", "품격 있는"],
-            "자연스러운": ["자연스러운", "내추럴한", "깔끔한", "심플한"],
-            "화려한": ["화려한", "비비드한", "알록달록한", "형형색색", "눈부신", "빛나는"],
-            "심플한": ["심플한", "가벼운", "간단한", "가볍지만", "가벼운 마음"],
-            "가벼운": ["가벼운", "가볍지만", "간단한", "심플한"],
-            "감사한": ["감사", "고마워", "은혜", "도움", "든든한"],
-            "사랑스러운": ["사랑", "좋아", "애정", "정", "마음", "남편", "아내"],
-            "편안한": ["편안", "편하게", "쉬고", "휴식", "편안하게", "편안히", "쉬고 싶어"],
-            "평온한": ["평온", "차분", "조용한", "고요한", "잔잔한"],
-            "기분전환": ["기분 전환", "기분전환", "기분 바꿔", "새로운", "기분 바꾸고 싶어"],
-            "밝은": ["밝은", "밝게", "밝아지고 싶어", "밝아지고 싶은"],
-            "기쁜": ["기쁜", "기쁘고 싶어", "기쁘고 싶은", "행복하고 싶어"],
-            "위로받고 싶은": ["위로", "달래", "안아", "보듬", "쓰다듬", "어루만", "위로받고 싶어"]
-        }
-        
-        # 색상 키워드 (확장)
-        color_keywords = {
-            "블루": ["블루", "파랑", "푸른", "시원한", "바닷가", "여행"],
-            "퍼플": ["퍼플", "라벤더", "그리움", "추억"],  # "보라" 제거하여 연보라가 퍼플로 매칭되지 않도록 함
-            "라일락": ["라일락", "연보라", "연한 보라", "은은한 보라", "부드러운 보라", "보라"],  # "보라"를 라일락으로 이동
-            "핑크": ["핑크", "분홍", "로즈", "로맨틱", "사랑", "부드러운"],
-            "레드": ["레드", "빨강", "빨간", "열정", "사랑"],
-            "화이트": ["화이트", "흰색", "화이트", "순수", "깨끗한", "부드러운"],
-            "노랑": ["노랑", "옐로우", "골드", "밝은"],
-            "오렌지": ["오렌지", "주황", "따뜻한", "활기"],
-            "그린": ["그린", "초록", "자연", "내추럴"],
-            # "파스텔톤": ["파스텔톤", "파스텔", "부드러운 색", "연한 색", "부드러운"]  # 파스텔톤은 색상이 아닌 톤이므로 제외
-        }
+        # 키워드 표(data/keyword_rules.json)는 오토마톤 하나로 컴파일되어 있어 사연을 한 번만 훑음
+        hits = scan_keywords(story)
         
         # 명시적 색상 요청 우선 처리
-        story_lower = story.lower()
-        
         # 연보라/라일락 관련 키워드 → 라일락 (최우선)
-        if any(keyword in story_lower for keyword in ["연보라", "라일락", "연한 보라", "은은한 보라", "부드러운 보라"]):
+        if hits.any("context.color_rules", "lilac"):
             colors = ["라일락"]
         # 명시적 색상 요청이 있으면 최우선 처리
-        elif any(keyword in story_lower for keyword in ["옅은 핑크", "부드러운 색감", "연한 핑크"]):
+        elif hits.any("context.color_rules", "soft_pink"):
             colors = ["핑크"]  # 파스텔톤 대신 핑크로 매핑
         # 성공/창업 관련 키워드 (최우선) - 맥락에 따라 색상 결정
-        elif any(keyword in story_lower for keyword in ["성공", "창업", "합격", "졸업", "승리", "성취", "축하"]):
+        elif hits.any("context.color_rules", "success"):
             # 화려한 + 합격/성공 → 레드 (화려한 축하)
-            if any(keyword in story_lower for keyword in ["화려한", "비비드한", "알록달록한", "형형색색", "눈부신", "빛나는"]):
+            if hits.any("context.color_rules", "vivid_celebration"):
                 colors = ["레드"]  # 화려한 축하
             # 새로운 시작, 응원, 희망 키워드가 함께 있으면 옐로우/화이트
-            elif any(keyword in story_lower for keyword in ["새로운 시작", "응원", "희망", "미래", "앞으로", "시작"]):
+            elif hits.any("context.color_rules", "new_start"):
                 colors = ["옐로우"]  # 새로운 시작과 희망
             else:
                 colors = ["레드"]  # 성공 축하
         # 새로운 시작/응원 관련 키워드
-        elif any(keyword in story_lower for keyword in ["새로운 시작", "응원", "희망", "미래", "앞으로", "시작", "도전", "다시", "괜찮아", "격려", "힘내", "화이팅"]):
+        elif hits.any("context.color_rules", "encouragement"):
             # 명시적 색상 요청이 있으면 우선
-            if any(keyword in story_lower for keyword in ["핑크", "부드러운", "옅은"]):
+            if hits.any("context.color_rules", "soft_request"):
                 colors = ["핑크"]  # 파스텔톤 대신 핑크로 매핑
             else:
                 colors = ["옐로우"]
         # 사랑 관련 키워드 - 세분화된 매핑
-        elif any(keyword in story_lower for keyword in ["사랑", "로맨틱", "연인", "남자친구", "여자친구", "프로포즈", "결혼", "데이트"]):
+        elif hits.any("context.color_rules", "love"):
             # 신비로운/깊은 사랑 → 퍼플
-            if any(keyword in story_lower for keyword in ["신비로운", "깊은", "영원한", "운명적인", "숙명적인", "이루지 못한", "비밀", "숨겨진"]):
+            if hits.any("context.color_rules", "mysterious_love"):
                 colors = ["퍼플"]  # 신비로운 사랑
             # 귀여운/따뜻한 사랑 → 핑크
-            elif any(keyword in story_lower for keyword in ["귀여운", "따뜻한", "포근한", "부드러운", "은은한", "아랫사람", "조카", "아이", "딸", "아들"]):
+            elif hits.any("context.color_rules", "cute_love"):
                 colors = ["핑크"]  # 귀여운 사랑
             # 열정적인/강렬한 사랑 → 레드
-            elif any(keyword in story_lower for keyword in ["열정적인", "강렬한", "불타는", "화끈한", "뜨거운", "비비드한"]):
+            elif hits.any("context.color_rules", "passionate_love"):
                 colors = ["레드"]  # 열정적인 사랑
             # 기본 로맨틱 사랑 → 핑크
             else:
                 colors = ["핑크"]  # 기본 로맨틱 사랑
         # 우아함/고급스러움/신비로움 관련 키워드 → 퍼플
-        elif any(keyword in story_lower for keyword in ["우아한", "고급스러운", "세련된", "품격 있는", "신비로운", "아름다운", "유니크한", "특별한", "독특한"]):
+        elif hits.any("context.color_rules", "elegant"):
             colors = ["퍼플"]
 
         # 위로/따뜻함 관련 키워드 → 핑크 (명시적 색상 요청이 없을 때만)
-        elif any(keyword in story_lower for keyword in ["위로", "지쳐", "힘들", "피곤", "스트레스", "야근", "고생", "고민", "걱정", "따뜻한", "부드러운", "포근한", "부드러운 색감", "옅은 핑크"]) and not any(color in story_lower for color in ["블루", "파랑", "푸른", "블루톤", "핑크", "레드", "화이트", "노랑", "옐로우", "오렌지", "퍼플", "보라", "그린", "초록"]):
+        elif hits.any("context.color_rules", "comfort") and not hits.any("context.color_rules", "named_color"):
             colors = ["핑크"]  # 부드럽고 따뜻한 위로
         # 파스텔톤 관련 키워드 → 핑크로 매핑
-        elif any(keyword in story_lower for keyword in ["파스텔톤", "파스텔", "부드러운 색", "연한 색"]):
+        elif hits.any("context.color_rules", "pastel"):
             colors = ["핑크"]  # 파스텔톤 대신 핑크로 매핑
         # 강렬한/비비드 색상 관련 키워드
-        elif any(keyword in story_lower for keyword in ["강렬한", "알록달록", "화려한", "형형색색", "비비드", "선명한", "포인트"]):
+        elif hits.any("context.color_rules", "vivid"):
             colors = ["노랑"]  # 가장 비비드한 색상
         # 시원한 컬러 관련 키워드
-        elif any(keyword in story_lower for keyword in ["시원한", "블루톤", "푸른색", "바닷가", "여행"]):
+        elif hits.any("context.color_rules", "cool"):
             colors = ["블루"]
         # 따뜻한 컬러 관련 키워드
-        elif any(keyword in story_lower for keyword in ["따뜻한", "핑크톤", "로맨틱"]):
+        elif hits.any("context.color_rules", "warm"):
             colors = ["핑크"]
         # 밝은 컬러 관련 키워드
-        elif any(keyword in story_lower for keyword in ["밝은", "옐로우톤", "희망"]):
+        elif hits.any("context.color_rules", "bright"):
             colors = ["노랑"]
         else:
             # 일반적인 키워드 매칭 (첫 번째 매칭된 것만)
-            for category, keywords in color_keywords.items():
-                if any(keyword in story for keyword in keywords):
-                    colors = [category]  # 1개만 추가
-                    break  # 첫 번째 매칭에서 중단
+            first_color = hits.first("context.colors")
+            if first_color:
+                colors = [first_color]  # 1개만 추가
         
         # 사용자 의도 분석 (의미 기반 vs 디자인 기반)
-        meaning_based_keywords = ["의미", "꽃말", "상징", "메시지", "마음", "감정", "사랑", "감사", "위로", "격려", "축하", "응원", "희망", "우정", "사과", "용서"]
-        design_based_keywords = ["색상", "컬러", "무드", "분위기", "디자인", "화려한", "부드러운", "따뜻한", "우아한", "세련된", "핑크", "레드", "블루", "옐로우", "화이트", "퍼플"]
-        
-        meaning_based_count = sum(1 for keyword in meaning_based_keywords if keyword in story_lower)
-        design_based_count = sum(1 for keyword in design_based_keywords if keyword in story_lower)
+        meaning_based_count = hits.count("context.user_intent", "meaning_based")
+        design_based_count = hits.count("context.user_intent", "design_based")
         
         user_intent = "meaning_based" if meaning_based_count > design_based_count else "design_based"
         
@@ -807,22 +669,21 @@ class RealtimeContextExtractor:
         
         # 감정이 적으면 관련 감정 추가 (강화)
         if len(emotions) < 3:
-            story_lower = story.lower()
-            if "고마워" in story_lower or "감사" in story_lower:
+            if hits.has("고마워") or hits.has("감사"):
                 if "감사" not in emotions:
                     emotions.append("감사")
                 if "사랑" not in emotions:
                     emotions.append("사랑")
                 if "기쁨" not in emotions:
                     emotions.append("기쁨")
-            elif "남편" in story_lower or "아내" in story_lower:
+            elif hits.has("남편") or hits.has("아내"):
                 if "사랑" not in emotions:
                     emotions.append("사랑")
                 if "감사" not in emotions:
                     emotions.append("감사")
                 if "기쁨" not in emotions:
                     emotions.append("기쁨")
-            elif "부드러운" in story_lower:
+            elif hits.has("부드러운"):
                 if "사랑" not in emotions:
                     emotions.append("사랑")
                 if "감사" not in emotions:
@@ -849,63 +710,45 @@ class RealtimeContextExtractor:
             emotions = ["사랑"]
         
         # 상황 키워드 매칭 (가장 정확한 매칭 우선)
-        situations = []
-        for category, keywords in situation_keywords.items():
-            if any(keyword in story for keyword in keywords):
-                situations.append(category)  # 여러 개 추가 가능
+        situations = hits.categories("context.situations")  # 여러 개 추가 가능
         
         # 야근/스트레스 관련 특별 처리
-        if any(keyword in story_lower for keyword in ["야근", "스트레스", "지쳐", "피곤", "과로"]):
-            if "아내" in story_lower or "와이프" in story_lower or "부인" in story_lower:
+        if hits.any("context.overwork"):
+            if hits.has("아내") or hits.has("와이프") or hits.has("부인"):
                 situations = ["아내"]  # 아내가 야근/스트레스로 지쳐있음
-            elif "남편" in story_lower:
+            elif hits.has("남편"):
                 situations = ["남편"]  # 남편이 야근/스트레스로 지쳐있음
-            elif "친구" in story_lower or "동료" in story_lower:
+            elif hits.has("친구") or hits.has("동료"):
                 situations = ["친구"]  # 친구가 야근/스트레스로 지쳐있음
             else:
                 situations = ["걱정"]  # 일반적인 걱정 상황
         
         # 맥락 기반 감정/상황 구분
-        story_lower = story.lower()
-        
-        # 받는 사람의 상황 키워드 (상대방이 겪고 있는 것)
-        receiver_situation_keywords = ["스트레스", "피곤", "지쳐", "힘들", "야근", "과로", "고생"]
-        
-        # 사용자의 감정 키워드 (본인이 느끼는 것)
-        user_emotion_keywords = ["위로", "걱정", "사랑", "감사", "기쁨", "희망", "따뜻함", "외로움", "불안", "슬픔", "축하"]
-        
-        # 맥락 분석: 누구의 스트레스/피곤인지 구분
-        for keyword in receiver_situation_keywords:
-            if keyword in story_lower:
-                # "~가 스트레스로" → 받는 사람의 상황
-                if any(pronoun in story_lower for pronoun in ["가", "이", "도", "는", "을", "를"]):
-                    # 이미 situations에 추가되어 있는지 확인
-                    if keyword not in [s.lower() for s in situations]:
-                        situations.append(keyword)
-                # "저도 스트레스가" → 사용자의 감정
-                elif any(pronoun in story_lower for pronoun in ["저", "나", "제가", "내가"]):
-                    if keyword not in [e.lower() for e in emotions]:
-                        emotions.append(keyword)
+        # 맥락 분석: 누구의 스트레스/피곤인지 구분 (받는 사람의 상황 키워드 = 상대방이 겪고 있는 것)
+        for keyword in hits.matched("context.receiver_situations"):
+            # "~가 스트레스로" → 받는 사람의 상황
+            if hits.any("context.receiver_particles"):
+                # 이미 situations에 추가되어 있는지 확인
+                if keyword not in [s.lower() for s in situations]:
+                    situations.append(keyword)
+            # "저도 스트레스가" → 사용자의 감정
+            elif hits.any("context.self_pronouns"):
+                if keyword not in [e.lower() for e in emotions]:
+                    emotions.append(keyword)
         
         # 슬래시 제거: 감정과 상황에서 슬래시가 있으면 첫 번째 키워드만 사용
         emotions = [e.split('/')[0] if '/' in e else e for e in emotions]
         situations = [s.split('/')[0] if '/' in s else s for s in situations]
         
         # 무드 키워드 매칭 (더 많은 옵션 제공)
-        for category, keywords in mood_keywords.items():
-            if any(keyword in story for keyword in keywords):
-                moods.append(category)  # 여러 개 추가 가능
+        moods = hits.categories("context.moods")  # 여러 개 추가 가능
         
         # 무드 추출 전략: 무드 명시 여부와 확실성에 따라 분기
-        story_lower = story.lower()
-        
         # 명시적 무드 키워드 체크
-        explicit_mood_keywords = ["부드러운", "따뜻한", "로맨틱한", "우아한", "화려한", "자연스러운", "심플한", "가벼운", "활기찬", "감사한", "사랑스러운"]
-        has_explicit_mood = any(mood in story_lower for mood in explicit_mood_keywords)
+        has_explicit_mood = hits.any("context.explicit_moods")
         
         # 확실한 무드 표현 체크 (매우 구체적)
-        certain_mood_expressions = ["부드러운 꽃", "따뜻한 느낌", "로맨틱한 분위기", "우아한 스타일", "화려한 색상"]
-        has_certain_mood = any(expression in story_lower for expression in certain_mood_expressions)
+        has_certain_mood = hits.any("context.certain_moods")
         
         if has_explicit_mood and has_certain_mood:
             # 무드가 명시되고 확실한 경우: 2개까지 유지
@@ -914,35 +757,35 @@ class RealtimeContextExtractor:
         elif has_explicit_mood and not has_certain_mood:
             # 무드가 명시되었지만 모호한 경우: 4개 옵션 제안
             if len(moods) < 4:
-                if "부드러운" in story_lower:
+                if hits.has("부드러운"):
                     if "부드러운" not in moods:
                         moods.append("부드러운")
                     if "따뜻한" not in moods:
                         moods.append("따뜻한")
                     if "로맨틱한" not in moods:
                         moods.append("로맨틱한")
-                elif "남편" in story_lower or "아내" in story_lower:
+                elif hits.has("남편") or hits.has("아내"):
                     if "로맨틱한" not in moods:
                         moods.append("로맨틱한")
                     if "따뜻한" not in moods:
                         moods.append("따뜻한")
                     if "사랑스러운" not in moods:
                         moods.append("사랑스러운")
-                elif "고마워" in story_lower or "감사" in story_lower:
+                elif hits.has("고마워") or hits.has("감사"):
                     if "감사한" not in moods:
                         moods.append("감사한")
                     if "따뜻한" not in moods:
                         moods.append("따뜻한")
                     if "부드러운" not in moods:
                         moods.append("부드러운")
-                elif "따뜻한" in story_lower:
+                elif hits.has("따뜻한"):
                     if "따뜻한" not in moods:
                         moods.append("따뜻한")
                     if "부드러운" not in moods:
                         moods.append("부드러운")
                     if "로맨틱한" not in moods:
                         moods.append("로맨틱한")
-                elif "로맨틱한" in story_lower:
+                elif hits.has("로맨틱한"):
                     if "로맨틱한" not in moods:
                         moods.append("로맨틱한")
                     if "사랑스러운" not in moods:
@@ -977,11 +820,10 @@ class RealtimeContextExtractor:
         
         # 상황 키워드가 없으면 기본값 1개 추가
         if len(situations) < 1:
-            story_lower = story.lower()
-            if "남편" in story_lower or "아내" in story_lower:
+            if hits.has("남편") or hits.has("아내"):
                 if "남편" not in situations and "아내" not in situations:
-                    situations.append("남편" if "남편" in story_lower else "아내")
-            elif "친구" in story_lower:
+                    situations.append("남편" if hits.has("남편") else "아내")
+            elif hits.has("친구"):
                 if "친구" not in situations:
                     situations.append("친구")
             else:
@@ -1011,15 +853,11 @@ class RealtimeContextExtractor:
                 colors = colors[:1]
         
         # 색상 추출 전략: 컬러톤 명시 여부에 따라 분기
-        story_lower = story.lower()
-        
         # 관용어/비유 표현 제외 체크
-        idiom_expressions = ["무지개다리를 건넜다", "무지개다리를 건넜어", "무지개다리를 건넜습니다", "무지개다리를 건넜어요"]
-        has_idiom = any(idiom in story for idiom in idiom_expressions)
+        has_idiom = hits.any("context.idioms")
         
         # 명시적 컬러 키워드 체크 (관용어 제외)
-        explicit_color_keywords = ["핑크", "레드", "블루", "화이트", "노랑", "옐로우", "퍼플", "보라", "오렌지", "그린", "초록"]
-        has_explicit_color = any(color in story_lower for color in explicit_color_keywords)
+        has_explicit_color = hits.any("context.explicit_colors")
         
         # 관용어가 있으면 색상 추출 제외하고 위로/슬픔 감정으로 분류
         if has_idiom:
@@ -1038,8 +876,7 @@ class RealtimeContextExtractor:
             )
         
         # 분위기 키워드 체크
-        mood_color_keywords = ["부드러운", "따뜻한", "로맨틱한", "우아한", "화려한", "자연스러운", "심플한", "가벼운"]
-        has_mood_only = any(mood in story_lower for mood in mood_color_keywords) and not has_explicit_color
+        has_mood_only = hits.any("context.mood_colors") and not has_explicit_color
         
         if has_explicit_color:
             # 컬러톤이 명시된 경우: 2개까지 유지 (고객이 원하는 색상이 명확함)
@@ -1048,41 +885,41 @@ class RealtimeContextExtractor:
         elif has_mood_only:
             # 분위기만 지정된 경우: 4개 옵션 제안
             if len(colors) < 4:
-                if "부드러운" in story_lower or "부드러운 꽃" in story_lower:
+                if hits.has("부드러운") or hits.has("부드러운 꽃"):
                     if "핑크" not in colors:
                         colors.append("핑크")
                     if "화이트" not in colors:
                         colors.append("화이트")
-                elif "남편" in story_lower or "아내" in story_lower:
+                elif hits.has("남편") or hits.has("아내"):
                     if "핑크" not in colors:
                         colors.append("핑크")
                     if "레드" not in colors:
                         colors.append("레드")
-                elif "고마워" in story_lower or "감사" in story_lower:
+                elif hits.has("고마워") or hits.has("감사"):
                     if "핑크" not in colors:
                         colors.append("핑크")
                     if "화이트" not in colors:
                         colors.append("화이트")
-                elif "따뜻한" in story_lower:
+                elif hits.has("따뜻한"):
                     if "핑크" not in colors:
                         colors.append("핑크")
                     if "오렌지" not in colors:
                         colors.append("오렌지")
-                elif "로맨틱한" in story_lower:
+                elif hits.has("로맨틱한"):
                     if "핑크" not in colors:
                         colors.append("핑크")
                     if "레드" not in colors:
                         colors.append("레드")
                     if "퍼플" not in colors:
                         colors.append("퍼플")
-                elif "화려한" in story_lower:
+                elif hits.has("화려한"):
                     if "오렌지" not in colors:
                         colors.append("오렌지")
                     if "레드" not in colors:
                         colors.append("레드")
                     if "옐로우" not in colors:
                         colors.append("옐로우")
-                elif "우아한" in story_lower:
+                elif hits.has("우아한"):
                     if "화이트" not in colors:
                         colors.append("화이트")
                     if "퍼플" not in colors:
@@ -1150,7 +987,7 @@ class RealtimeContextExtractor:
         
         if colors and len(colors) > 0:
             print(f"  색상 대안 생성: {colors[0]}")
-            colors_alternatives = self._generate_color_alternatives(colors[0], context)
+            colors_alternatives = self._generate_color_alternatives(colors[0])
             print(f"  색상 대안 결과: {colors_alternatives}")
         
         print(f"🎯 대안 키워드 생성:")
@@ -1175,28 +1012,12 @@ class RealtimeContextExtractor:
     def _extract_basic_emotions(self, story: str) -> List[str]:
         """기본 감정 추출 (단계별 추출)"""
         emotions = []
-        story_lower = story.lower()
-        
-        # 1단계: 명확한 감정 키워드 우선 매칭
-        clear_emotion_keywords = {
-            "우울": ["우울", "우울해", "우울한", "우울함", "우울해서"],
-            "슬픔": ["슬프", "슬픈", "슬퍼", "슬픔"],
-            "스트레스": ["스트레스", "스트레스받", "스트레스 받", "스트레스받아"],
-            "피곤": ["피곤", "피곤해", "피곤한", "지쳐", "지쳤어"],
-            "외로움": ["외로워", "외로운", "외로움"],
-            "불안": ["불안", "불안해", "불안한", "걱정", "걱정해"],
-            "감사": ["감사", "고마워", "은혜", "도움"],
-            "기쁨": ["기쁘", "행복", "즐거", "신나", "웃음"],
-            "사랑": ["사랑", "좋아", "애정", "정", "마음"],
-            "희망": ["희망", "새로운", "시작", "미래"]
-        }
         
-        # 명확한 감정 키워드 매칭 (우선순위 높음)
-        for emotion, keywords in clear_emotion_keywords.items():
-            if any(keyword in story_lower for keyword in keywords):
-                emotions.append(emotion)
-                print(f"💭 명확한 감정 감지: {emotion}")
-                break  # 첫 번째 매칭에서 중단 (단계별 추출)
+        # 1단계: 명확한 감정 키워드 우선 매칭 (첫 번째 매칭에서 중단 = 단계별 추출)
+        clear_emotion = scan_keywords(story).first("context.basic_emotions")
+        if clear_emotion:
+            emotions.append(clear_emotion)
+            print(f"💭 명확한 감정 감지: {clear_emotion}")
         
         # 명확한 감정이 없으면 기본값 추가
         if not emotions:
@@ -8,7 +8,7 @@ import json
 import time
 from typing import List, Dict, Optional
 from dataclasses import dataclass, field
-from openai import OpenAI
+from app.services.openai_client import get_openai_client
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
@@ -51,7 +51,7 @@ class SimpleRealtimeContextExtractor:
         try:
             api_key = os.getenv("OPENAI_API_KEY")
             if api_key:
-                self.openai_client = OpenAI(api_key=api_key)
+                self.openai_client = get_openai_client(api_key)
                 print("✅ OpenAI 클라이언트 초기화 완료")
             else:
                 print("⚠️ OPENAI_API_KEY가 설정되지 않음")
@@ -6,9 +6,10 @@
 import asyncio
 import json
 import time
-from typing import Set, Dict, Any
+from typing import Set, Dict, Any, Tuple
 from websockets import WebSocketServerProtocol
 from app.services.smart_websocket_extractor import SmartWebSocketExtractor
+from app.services.speculative_prefetch import speculative_prefetcher
 
 class RealtimeWebSocketHandler:
     """실시간 WebSocket 핸들러"""
@@ -18,16 +19,21 @@ class RealtimeWebSocketHandler:
         self.debounce_timers: Dict[WebSocketServerProtocol, asyncio.Task] = {}
         self.debounce_delay = 2.0  # 2초 디바운싱
         self.extractor = SmartWebSocketExtractor()
+        # 추천 예측 실행용 세션 토큰 / 직전 추출 키워드 (두 번 연속 같으면 예측 실행)
+        self.session_tokens: Dict[WebSocketServerProtocol, str] = {}
+        self.last_keywords: Dict[WebSocketServerProtocol, Tuple] = {}
     
     async def connect(self, websocket: WebSocketServerProtocol):
         """WebSocket 연결 처리"""
         await websocket.accept()
         self.active_connections.add(websocket)
+        self.session_tokens[websocket] = speculative_prefetcher.open_session()
         
-        # 연결 확인 메시지 전송
+        # 연결 확인 메시지 전송 (session_token 은 /emotion-analysis 요청에 그대로 전달)
         await websocket.send_text(json.dumps({
             "type": "connection",
             "message": "WebSocket 연결됨",
+            "session_token": self.session_tokens[websocket],
             "timestamp": time.time()
         }))
         
@@ -42,6 +48,10 @@ class RealtimeWebSocketHandler:
             self.debounce_timers[websocket].cancel()
             del self.debounce_timers[websocket]
         
+        # 예측 실행 결과는 TTL 동안 유지 (연결이 끊긴 직후 추천 요청이 올 수 있음)
+        speculative_prefetcher.touch(self.session_tokens.pop(websocket, None))
+        self.last_keywords.pop(websocket, None)
+        
         print(f"❌ WebSocket 연결 해제됨: {websocket.remote_address}")
     
     async def handle_message(self, websocket: WebSocketServerProtocol, message: str):
@@ -130,6 +140,8 @@ class RealtimeWebSocketHandler:
                 
                 print(f"✅ 키워드 추출 완료: {context.extraction_method} (신뢰도: {context.confidence})")
                 
+                self._maybe_prefetch(websocket, story, context)
+                
             else:
                 # 추출 실패 응답
                 await websocket.send_text(json.dumps({
@@ -150,6 +162,18 @@ class RealtimeWebSocketHandler:
             }))
             print(f"❌ 키워드 추출 오류: {e}")
     
+    def _maybe_prefetch(self, websocket: WebSocketServerProtocol, story: str, context: Any):
+        """대표 키워드가 직전 추출과 같으면 (사연이 안정됨) 추천 파이프라인 예측 실행"""
+        token = self.session_tokens.get(websocket)
+        speculative_prefetcher.touch(token)
+        keywords = tuple(
+            values[0] if values else ""
+            for values in (context.emotions, context.situations, context.moods, context.colors)
+        )
+        if self.last_keywords.get(websocket) == keywords:
+            speculative_prefetcher.prefetch(token, story)
+        self.last_keywords[websocket] = keywords
+    
     def get_connection_count(self) -> int:
         """활성 연결 수 반환"""
         return len(self.active_connections)
@@ -170,5 +194,7 @@ class RealtimeWebSocketHandler:
         # 컬렉션 정리
         self.active_connections.clear()
         self.debounce_timers.clear()
+        self.session_tokens.clear()
+        self.last_keywords.clear()
         
         print("🧹 WebSocket 리소스 정리 완료")
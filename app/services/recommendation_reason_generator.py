@@ -1,14 +1,16 @@
 """
 추천 이유 생성 서비스 (MVP 버전 - 예산 제외)
 """
-import openai
+from app.services.openai_client import get_openai_client
+from app.services.llm_cache import llm_cache
+from app.services.model_router import model_router
 from typing import List, Dict, Any
 from app.models.schemas import EmotionAnalysis, FlowerMatch
 from .flower_blend_recommender import BlendRecommendation
 
 class RecommendationReasonGenerator:
     def __init__(self):
-        self.openai_client = openai.OpenAI()
+        self.openai_client = get_openai_client()
     
     def generate_reason(self, emotion_analysis: List[EmotionAnalysis], 
                                      flower_matches: List, 
@@ -26,18 +28,19 @@ class RecommendationReasonGenerator:
                 color_preference
             )
             
-            # OpenAI API 호출
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",  # GPT-4로 업그레이드 (더 정교한 추천 이유 생성)
+            # OpenAI API 호출 (기본 GPT-4, 지연 시 라우터가 gpt-4o-mini 로 낮춤)
+            # 캐시 → 서킷 브레이커 → 스케줄러 슬롯 → 요청 예산 순서로 처리 (예산 초과 / 실패는 폴백으로 기록)
+            route = model_router.route("recommendation_reason_generator", customer_story)
+            result = llm_cache.chat_completion(
+                self.openai_client, "recommendation_reason_generator",
                 messages=[
                     {"role": "system", "content": "당신은 전문적인 플로리스트입니다. 고객의 사연과 감정을 이해하고, 추천된 꽃의 꽃말과 특징을 고려하여 따뜻하고 담백한 추천 이유를 작성해주세요. 1-2문장으로 간결하게 작성하고, 블렌딩 꽃들에 대한 설명은 제외해주세요."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=200,
-                temperature=0.7
+                **route.params()
             )
             
-            professional_reason = response.choices[0].message.content.strip()
+            professional_reason = result.strip()
             
             # 첫 번째 감정의 emotion 속성 사용
             primary_emotion = emotion_analysis[0].emotion if emotion_analysis else "따뜻함"
@@ -0,0 +1,100 @@
+"""
+요청 단위 지연 시간 예산 (deadline)
+- 엔드포인트에서 deadline_scope() 로 시작하면 contextvars 로 모든 스테이지에 전달됨
+  (asyncio 태스크 / asyncio.to_thread 는 생성 시점의 컨텍스트를 복사)
+- LLM 호출은 남은 예산을 타임아웃으로 사용하고, 예산이 없으면 바로 폴백
+- 폴백으로 전환된 스테이지는 degraded 로 기록되어 응답에 포함됨
+"""
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from app.core.config import get_settings
+
+
+class DeadlineExceeded(TimeoutError):
+    """요청 예산 소진"""
+
+
+class RequestDeadline:
+    """요청 하나의 마감 시간과 폴백된 스테이지 기록"""
+
+    def __init__(self, budget_seconds: float):
+        self.budget_seconds = budget_seconds
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget_seconds
+        self.degraded: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, stage: str) -> float:
+        """남은 시간 반환 (이미 소진됐으면 DeadlineExceeded)"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"요청 예산 {self.budget_seconds}s 소진 ({stage})")
+        return remaining
+
+    def record_degraded(self, stage: str, reason: str):
+        with self._lock:
+            if stage not in self.degraded:
+                self.degraded[stage] = reason
+                print(f"⏰ 스테이지 폴백 전환: {stage} ({reason}, 남은 예산 {self.remaining():.2f}s)")
+
+    def degraded_stages(self) -> List[str]:
+        with self._lock:
+            return list(self.degraded.keys())
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            degraded = dict(self.degraded)
+        return {
+            "budget_seconds": self.budget_seconds,
+            "elapsed_ms": int((time.monotonic() - self.started_at) * 1000),
+            "degraded": degraded,
+        }
+
+
+_current_deadline: ContextVar[Optional[RequestDeadline]] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Optional[RequestDeadline]:
+    """현재 요청의 deadline (없으면 None - 배치/스크립트 등)"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(budget_seconds: Optional[float] = None):
+    """요청 예산 시작 (with 블록 안에서 만든 태스크 / 스레드에 전달됨)"""
+    if budget_seconds is None:
+        budget_seconds = get_settings().request_deadline_seconds
+    deadline = RequestDeadline(budget_seconds)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def failure_reason(error: BaseException) -> str:
+    """폴백 사유 분류 (timeout / overloaded / circuit_open / error)"""
+    if isinstance(error, TimeoutError) or "timeout" in type(error).__name__.lower():
+        return "timeout"
+    if type(error).__name__ == "LLMOverloadedError":
+        return "overloaded"
+    if type(error).__name__ == "CircuitOpenError":
+        return "circuit_open"
+    return "error"
+
+
+def record_degraded(stage: str, error: BaseException):
+    """현재 요청에 폴백된 스테이지 기록"""
+    deadline = current_deadline()
+    if deadline is not None:
+        deadline.record_degraded(stage, failure_reason(error))
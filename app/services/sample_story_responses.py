@@ -0,0 +1,167 @@
+"""
+샘플 사연 추천 응답 사전 계산 저장소
+- scripts/build_sample_story_responses.py 가 data/sample_stories.json 의 모든 사연에 대한
+  전체 응답을 계산해 버전이 붙은 아티팩트(JSON)로 저장
+- /sample-stories/{id}/recommend 는 메모리에 올린 응답을 LLM 호출 없이 바로 반환
+- 아티팩트 fingerprint (카탈로그 버전 / 프롬프트 버전 / 샘플 사연 파일 해시 / 인용구 라이브러리 버전) 가 현재 값과 다르면
+  자동으로 무효화하고, 요청 시 실시간 계산 결과로 다시 채움
+"""
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from app.services.flower_catalog import get_flower_catalog
+from app.services.llm_cache import PROMPT_VERSIONS
+from app.services.quote_index import get_quote_index
+
+SAMPLE_STORIES_PATH = "data/sample_stories.json"
+ARTIFACT_PATH = "data/precomputed/sample_story_responses.json"
+
+# 응답 구조가 바뀌면 올림 (기존 아티팩트 무효화)
+ARTIFACT_FORMAT_VERSION = 1
+
+# 샘플 사연 응답에 쓰이는 LLM 호출 지점 (프롬프트 버전이 바뀌면 무효화)
+PRECOMPUTED_CALL_SITES = ("recommendation_reason", "flower_card_rerank", "flower_context_analysis")
+
+
+class SampleStoryResponseStore:
+    """샘플 사연 응답 메모리 저장소 (아티팩트 로드 + 실시간 계산 결과 보관)"""
+
+    def __init__(self, artifact_path: str = ARTIFACT_PATH, stories_path: str = SAMPLE_STORIES_PATH):
+        self.artifact_path = artifact_path
+        self.stories_path = stories_path
+        self._lock = threading.Lock()
+        self._responses: Dict[str, Dict[str, Any]] = {}
+        self._fingerprint: Optional[Dict[str, Any]] = None
+        self._loaded = False
+        self._artifact_built_at: Optional[str] = None
+        self._stories_hash_cache: Tuple[Optional[Tuple[float, int]], str] = (None, "")
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _stories_hash(self) -> str:
+        """샘플 사연 파일 해시 (mtime / 크기가 같으면 재계산하지 않음)"""
+        try:
+            stat = os.stat(self.stories_path)
+        except OSError:
+            return ""
+        signature = (stat.st_mtime, stat.st_size)
+        cached_signature, cached_hash = self._stories_hash_cache
+        if cached_signature == signature:
+            return cached_hash
+        with open(self.stories_path, "rb") as f:
+            stories_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+        self._stories_hash_cache = (signature, stories_hash)
+        return stories_hash
+
+    def current_fingerprint(self) -> Dict[str, Any]:
+        """현재 서버 상태 기준 fingerprint"""
+        return {
+            "format_version": ARTIFACT_FORMAT_VERSION,
+            "catalog_version": get_flower_catalog().version,
+            "prompt_versions": {call_site: PROMPT_VERSIONS.get(call_site, "v1") for call_site in PRECOMPUTED_CALL_SITES},
+            "sample_stories": self._stories_hash(),
+            "quote_library": get_quote_index().version,
+        }
+
+    def _load_artifact(self):
+        """아티팩트 파일 로드 (lock 안에서 호출)"""
+        self._loaded = True
+        if not os.path.exists(self.artifact_path):
+            print(f"⚠️ 샘플 사연 사전 계산 아티팩트 없음: {self.artifact_path}")
+            return
+        try:
+            with open(self.artifact_path, "r", encoding="utf-8") as f:
+                artifact = json.load(f)
+            self._responses = dict(artifact.get("responses", {}))
+            self._fingerprint = artifact.get("fingerprint")
+            self._artifact_built_at = artifact.get("built_at")
+            print(f"✅ 샘플 사연 사전 계산 응답 로드: {len(self._responses)}개 (built_at={self._artifact_built_at})")
+        except Exception as e:
+            print(f"❌ 샘플 사연 아티팩트 로드 실패: {e}")
+            self._responses = {}
+            self._fingerprint = None
+
+    def _ensure_current(self) -> Dict[str, Any]:
+        """필요하면 아티팩트를 로드하고, fingerprint 가 바뀌었으면 무효화"""
+        fingerprint = self.current_fingerprint()
+        with self._lock:
+            if not self._loaded:
+                self._load_artifact()
+            if self._fingerprint != fingerprint:
+                if self._responses:
+                    self.invalidations += 1
+                    print(f"🔄 샘플 사연 사전 계산 응답 무효화 ({len(self._responses)}개): "
+                          f"{self._fingerprint} → {fingerprint}")
+                self._responses = {}
+                self._fingerprint = fingerprint
+        return fingerprint
+
+    def get(self, story_id: str) -> Optional[Dict[str, Any]]:
+        """사전 계산 / 보관된 응답 (없으면 None)"""
+        self._ensure_current()
+        with self._lock:
+            response = self._responses.get(story_id)
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return response
+
+    def put(self, story_id: str, response: Dict[str, Any], fingerprint: Optional[Dict[str, Any]] = None):
+        """실시간 계산 응답 보관 (계산 중 카탈로그 / 프롬프트가 바뀌었으면 버림)"""
+        fingerprint = fingerprint or self.current_fingerprint()
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                self._responses[story_id] = response
+
+    def save_artifact(self, responses: Dict[str, Dict[str, Any]], fingerprint: Dict[str, Any]) -> str:
+        """빌드 스크립트용 - 아티팩트 저장 후 메모리에도 반영"""
+        artifact = {
+            "fingerprint": fingerprint,
+            "built_at": datetime.now().isoformat(),
+            "responses": responses,
+        }
+        os.makedirs(os.path.dirname(self.artifact_path), exist_ok=True)
+        tmp_path = f"{self.artifact_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(artifact, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.artifact_path)
+        with self._lock:
+            self._loaded = True
+            self._responses = dict(responses)
+            self._fingerprint = fingerprint
+            self._artifact_built_at = artifact["built_at"]
+        return self.artifact_path
+
+    def reload(self) -> int:
+        """아티팩트 다시 읽기 (관리자용)"""
+        with self._lock:
+            self._loaded = False
+            self._responses = {}
+            self._fingerprint = None
+        self._ensure_current()
+        with self._lock:
+            return len(self._responses)
+
+    def get_stats(self) -> Dict[str, Any]:
+        fingerprint = self._ensure_current()
+        with self._lock:
+            return {
+                "artifact_path": self.artifact_path,
+                "artifact_built_at": self._artifact_built_at,
+                "fingerprint": fingerprint,
+                "cached_responses": len(self._responses),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+# 전역 인스턴스
+sample_story_responses = SampleStoryResponseStore()
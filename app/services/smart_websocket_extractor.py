@@ -7,7 +7,9 @@ import json
 import asyncio
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
-from openai import OpenAI
+from app.services.openai_client import get_async_openai_client
+from app.services.llm_cache import llm_cache
+from app.services.model_router import model_router
 import os
 from dotenv import load_dotenv
 
@@ -41,7 +43,8 @@ class SmartWebSocketExtractor:
     """스마트 WebSocket 키워드 추출기"""
     
     def __init__(self):
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # AsyncOpenAI - WebSocket 이벤트 루프를 막지 않도록 비동기 클라이언트 사용
+        self.openai_client = get_async_openai_client()
         
         # 규칙 기반 키워드 매핑
         self.rule_keywords = {
@@ -122,20 +125,29 @@ class SmartWebSocketExtractor:
         }
     
     async def extract_with_confidence(self, story: str) -> SmartExtractedContext:
-        """텍스트 길이에 따라 스마트 추출"""
-        story_length = len(story.strip())
+        """모델 라우터 결정에 따라 스마트 추출 (사연 길이 / 규칙 기반 신뢰도 / 대기열 / SLO)"""
+        route = model_router.route("smart_extraction", story, rule_confidence=self._rule_confidence(story))
         
-        if story_length < 10:
-            # 빠른 추출 (규칙 기반)
+        if route.skip_llm:
+            # 빠른 추출 (규칙 기반) - 아주 짧은 사연이거나 규칙 키워드로 4개 차원이 모두 채워진 경우
             return self._rule_based_extract(story)
         
-        elif story_length < 30:
-            # 중간 정확도 (간단한 LLM)
-            return await self._lightweight_llm_extract(story)
+        elif route.tier == "light":
+            # 중간 정확도 (간단한 LLM) - 짧은 사연이거나 지연이 큰 경우
+            return await self._lightweight_llm_extract(story, route.params())
         
         else:
             # 높은 정확도 (전체 LLM)
-            return await self._full_llm_extract(story)
+            return await self._full_llm_extract(story, route.params())
+    
+    def _rule_confidence(self, story: str) -> float:
+        """규칙 키워드로 채워지는 차원 비율 (감정/상황/무드/색상)"""
+        story_lower = story.lower()
+        matched = sum(
+            1 for keywords in self.rule_keywords.values()
+            if any(kw in story_lower for kw in keywords)
+        )
+        return matched / len(self.rule_keywords)
     
     def _rule_based_extract(self, story: str) -> SmartExtractedContext:
         """규칙 기반 빠른 추출 (낮은 정확도, 높은 속도)"""
@@ -173,7 +185,7 @@ class SmartWebSocketExtractor:
             extraction_method="rule_based"
         )
     
-    async def _lightweight_llm_extract(self, story: str) -> SmartExtractedContext:
+    async def _lightweight_llm_extract(self, story: str, llm_params: Dict[str, Any]) -> SmartExtractedContext:
         """간단한 LLM 추출 (중간 정확도, 중간 속도)"""
         try:
             prompt = f"""
@@ -199,24 +211,21 @@ class SmartWebSocketExtractor:
             }}
             """
             
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
+            result = await llm_cache.achat_completion(
+                self.openai_client, "smart_lightweight_extraction",
                 messages=[
                     {"role": "system", "content": "꽃 추천을 위한 키워드 추출 전문가입니다."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.1,
-                max_tokens=150
+                **llm_params
             )
-            
-            result = response.choices[0].message.content
             return self._parse_llm_response(result, story, "lightweight_llm")
             
         except Exception as e:
             print(f"❌ 간단한 LLM 추출 실패: {e}")
             return self._rule_based_extract(story)
     
-    async def _full_llm_extract(self, story: str) -> SmartExtractedContext:
+    async def _full_llm_extract(self, story: str, llm_params: Dict[str, Any]) -> SmartExtractedContext:
         """전체 LLM 추출 (높은 정확도, 낮은 속도)"""
         try:
             prompt = f"""
@@ -249,22 +258,19 @@ class SmartWebSocketExtractor:
             }}
             """
             
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
+            result = await llm_cache.achat_completion(
+                self.openai_client, "smart_full_extraction",
                 messages=[
                     {"role": "system", "content": "꽃 추천을 위한 맥락 기반 키워드 추출 전문가입니다."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.1,
-                max_tokens=200
+                **llm_params
             )
-            
-            result = response.choices[0].message.content
             return self._parse_llm_response(result, story, "full_llm")
             
         except Exception as e:
             print(f"❌ 전체 LLM 추출 실패: {e}")
-            return await self._lightweight_llm_extract(story)
+            return await self._lightweight_llm_extract(story, llm_params)
     
     def _parse_llm_response(self, response: str, story: str, method: str) -> SmartExtractedContext:
         """LLM 응답 파싱"""
@@ -0,0 +1,230 @@
+"""
+추천 결과 예측 실행 (실시간 키워드 WebSocket → /emotion-analysis)
+- WebSocket 연결마다 세션 토큰 발급 (connection 메시지의 session_token)
+- 디바운스된 키워드 추출 결과가 두 번 연속 같으면 사연이 안정됐다고 보고,
+  감정 분석 파이프라인(감정 분석 → 매칭 → 구성 → 추천 이유 / 카드 메시지 / 계절 정보)을 백그라운드에서 미리 실행
+- /emotion-analysis 요청에 같은 session_token + 같은 사연이 오면 진행 중 / 완료된 실행을 그대로 이어받고,
+  사연이 다르면 취소 후 새로 실행 (스토리 저장은 실제 요청에서만 실행)
+- 세션당 예측 실행 횟수 / 전체 동시 실행 수에 상한, LLM 대기열이 밀리거나 서킷이 열려 있으면 시작하지 않음
+"""
+import time
+import asyncio
+import secrets
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from app.core.config import get_settings
+from app.services.request_deadline import RequestDeadline, deadline_scope
+
+# 예측 실행할 스테이지 (story_id = 스토리 저장은 부수 효과라 제외)
+SPECULATIVE_STAGES = ("emotions", "matched_flower", "composition", "reason", "flower_card_message", "season_info")
+
+# 파이프라인 스테이지가 읽는 요청 필드 (context: 키워드 선택 / 수정 / 제외, ranked_flowers: top_k)
+# - 실제 요청의 값이 예측 실행 요청과 하나라도 다르면 이어받지 않음
+PIPELINE_REQUEST_FIELDS = ("selected_keywords", "updated_context", "excluded_keywords", "top_k")
+
+
+def _normalize_story(story: str) -> str:
+    return " ".join(story.split())
+
+
+@dataclass
+class PrefetchEntry:
+    """예측 실행 한 건"""
+    story: str
+    req: Any  # 예측 실행에 쓴 RecommendRequest
+    pipeline_run: Any  # PipelineRun
+    deadline: RequestDeadline
+    task: asyncio.Task
+    started_at: float = field(default_factory=time.time)
+
+    def cancel(self):
+        self.task.cancel()
+        self.pipeline_run.cancel_pending()
+
+
+@dataclass
+class PrefetchSession:
+    """WebSocket 세션 하나의 예측 실행 상태"""
+    token: str
+    started: int = 0  # 이 세션에서 시작한 예측 실행 수 (상한 비교)
+    entry: Optional[PrefetchEntry] = None
+    last_seen: float = field(default_factory=time.time)
+
+
+class SpeculativePrefetcher:
+    """세션 토큰별 예측 실행 관리"""
+
+    def __init__(self, enabled: bool, max_per_session: int, max_in_flight: int,
+                 budget_seconds: float, ttl_seconds: float):
+        self.enabled = enabled
+        self.max_per_session = max_per_session
+        self.max_in_flight = max_in_flight
+        self.budget_seconds = budget_seconds
+        self.ttl_seconds = ttl_seconds
+        self._sessions: Dict[str, PrefetchSession] = {}
+        self._lock = threading.Lock()
+
+        self.stats: Dict[str, int] = {
+            "started": 0,
+            "consumed": 0,
+            "cancelled_replaced": 0,
+            "cancelled_mismatch": 0,
+            "discarded_degraded": 0,
+            "expired": 0,
+            "skipped_session_cap": 0,
+            "skipped_in_flight_cap": 0,
+            "skipped_overloaded": 0,
+        }
+
+    def open_session(self) -> str:
+        """새 세션 토큰 발급"""
+        token = secrets.token_urlsafe(16)
+        with self._lock:
+            self._expire_locked()
+            self._sessions[token] = PrefetchSession(token=token)
+        return token
+
+    def touch(self, token: Optional[str]):
+        """세션 사용 시각 갱신 - 입력 중인 세션은 만료되지 않고, 연결이 끊긴 세션도 결과는 TTL 동안 유지
+        (추천 버튼 직후 페이지 이동으로 WebSocket 이 먼저 끊기는 경우)"""
+        with self._lock:
+            session = self._sessions.get(token) if token else None
+            if session is not None:
+                session.last_seen = time.time()
+
+    def _expire_locked(self):
+        """TTL 이 지난 세션 정리 (lock 안에서 호출)"""
+        now = time.time()
+        for token, session in list(self._sessions.items()):
+            if now - session.last_seen > self.ttl_seconds:
+                if session.entry is not None:
+                    session.entry.cancel()
+                    self.stats["expired"] += 1
+                del self._sessions[token]
+
+    def _in_flight_locked(self) -> int:
+        return sum(1 for s in self._sessions.values() if s.entry is not None and not s.entry.task.done())
+
+    def _overloaded(self) -> bool:
+        """실제 요청이 먼저 - LLM 대기열이 쌓였거나 서킷이 닫혀 있지 않으면 예측 실행 안 함"""
+        from app.services.llm_scheduler import llm_scheduler
+        from app.services.llm_circuit_breaker import llm_circuit_breaker, CLOSED
+        return llm_scheduler.get_stats()["total_queue_depth"] > 0 or llm_circuit_breaker.state != CLOSED
+
+    def prefetch(self, token: Optional[str], story: str) -> bool:
+        """사연이 안정됐을 때 호출 - 예측 실행 시작 (이미 같은 사연이면 그대로 둠)"""
+        if not self.enabled or not token:
+            return False
+        normalized = _normalize_story(story)
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                return False
+            session.last_seen = time.time()
+            if session.entry is not None and session.entry.story == normalized:
+                return False
+            if session.started >= self.max_per_session:
+                self.stats["skipped_session_cap"] += 1
+                return False
+            if self._in_flight_locked() >= self.max_in_flight:
+                self.stats["skipped_in_flight_cap"] += 1
+                return False
+            if self._overloaded():
+                self.stats["skipped_overloaded"] += 1
+                return False
+
+            if session.entry is not None:
+                session.entry.cancel()
+                self.stats["cancelled_replaced"] += 1
+            session.entry = self._start(story)
+            session.started += 1
+            self.stats["started"] += 1
+        print(f"🔮 추천 예측 실행 시작 ({session.started}/{self.max_per_session}): {normalized[:30]}")
+        return True
+
+    def _start(self, story: str) -> PrefetchEntry:
+        """감정 분석 파이프라인을 백그라운드 태스크로 실행 (예측 실행 전용 예산)"""
+        from app.models.schemas import RecommendRequest
+        from app.api.v1.endpoints.recommend import emotion_analysis_pipeline
+
+        req = RecommendRequest(story=story)
+        pipeline_run = emotion_analysis_pipeline.new_run(story=story, req=req, excluded_keywords=[])
+        # 스테이지 태스크는 만들어질 때의 context(= 이 deadline)를 그대로 가져감
+        with deadline_scope(self.budget_seconds) as deadline:
+            task = asyncio.ensure_future(self._run(pipeline_run))
+        return PrefetchEntry(story=_normalize_story(story), req=req, pipeline_run=pipeline_run, deadline=deadline, task=task)
+
+    async def _run(self, pipeline_run) -> bool:
+        """성공하면 True (실패한 실행은 이어받지 않음)"""
+        try:
+            await pipeline_run.resolve(*SPECULATIVE_STAGES)
+            print(pipeline_run.summary())
+            return True
+        except asyncio.CancelledError:
+            pipeline_run.cancel_pending()
+            raise
+        except Exception as e:
+            print(f"⚠️ 추천 예측 실행 실패: {e}")
+            return False
+
+    def take(self, token: Optional[str], story: str, req: Any) -> Optional[PrefetchEntry]:
+        """/emotion-analysis 요청이 이어받을 예측 실행 (사연 / 스테이지가 읽는 요청 필드가 다르면 취소 후 None)"""
+        if not self.enabled or not token:
+            return None
+        with self._lock:
+            self._expire_locked()
+            session = self._sessions.get(token)
+            if session is None or session.entry is None:
+                return None
+            entry, session.entry = session.entry, None
+
+        # 예측 실행은 키워드 선택 / 수정 / 제외 없이 기본 top_k 로 계산 (빈 목록 == None)
+        customized = any((getattr(req, name, None) or None) != (getattr(entry.req, name, None) or None)
+                         for name in PIPELINE_REQUEST_FIELDS)
+        if customized or entry.story != _normalize_story(story):
+            entry.cancel()
+            self.stats["cancelled_mismatch"] += 1
+            return None
+        if entry.task.cancelled():
+            # TTL 만료 / 교체 경합으로 이미 취소된 예측 실행
+            self.stats["discarded_degraded"] += 1
+            return None
+        if entry.task.done() and (not entry.task.result() or entry.deadline.degraded_stages()):
+            # 실패 / 폴백 결과로 끝난 예측 실행은 버리고 새로 계산
+            self.stats["discarded_degraded"] += 1
+            return None
+        self.stats["consumed"] += 1
+        print(f"🔮 추천 예측 실행 이어받음 ({int((time.time() - entry.started_at) * 1000)}ms 전 시작, "
+              f"{'완료' if entry.task.done() else '진행 중'})")
+        return entry
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._expire_locked()
+            sessions = len(self._sessions)
+            in_flight = self._in_flight_locked()
+            stats = dict(self.stats)
+        return {
+            "enabled": self.enabled,
+            "max_per_session": self.max_per_session,
+            "max_in_flight": self.max_in_flight,
+            "budget_seconds": self.budget_seconds,
+            "sessions": sessions,
+            "in_flight": in_flight,
+            "hit_rate": round(stats["consumed"] / stats["started"], 3) if stats["started"] else 0.0,
+            **stats,
+        }
+
+
+_settings = get_settings()
+
+# 전역 인스턴스
+speculative_prefetcher = SpeculativePrefetcher(
+    enabled=_settings.speculative_prefetch_enabled,
+    max_per_session=_settings.speculative_prefetch_max_per_session,
+    max_in_flight=_settings.speculative_prefetch_max_in_flight,
+    budget_seconds=_settings.speculative_prefetch_budget_seconds,
+    ttl_seconds=_settings.speculative_prefetch_ttl_seconds,
+)
@@ -5,6 +5,10 @@ import os
 import json
 from typing import Dict, Any
 from enum import Enum
+from app.services.openai_client import get_openai_client
+from app.services.llm_cache import llm_cache
+from app.services.model_router import model_router
+from app.services.keyword_automaton import scan_keywords
 
 class StoryType(Enum):
     EMOTION_FOCUSED = "emotion_focused"  # 감정 중심
@@ -23,35 +27,37 @@ class StoryClassifier:
         if not self.openai_api_key:
             return self._fallback_classification(story)
         
+        # 규칙으로 유형이 확정되는 사연은 LLM 생략
+        route = model_router.route("story_classification", story, rule_confidence=self._rule_confidence(story))
+        if route.skip_llm:
+            return self._fallback_classification(story)
+        
         try:
-            import openai
-            client = openai.OpenAI(api_key=self.openai_api_key)
+            client = get_openai_client(self.openai_api_key)
             
             prompt = self._create_classification_prompt(story)
             
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
+            result = llm_cache.chat_completion(
+                client, "story_classification",
                 messages=[
                     {"role": "system", "content": "당신은 고객의 사연을 분석하여 꽃다발 추천에 필요한 정보를 분류하는 전문가입니다."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.1,
-                max_tokens=400
+                **route.params()
             )
-            
-            result = response.choices[0].message.content
             print(f"🤖 LLM 응답: {result}")
             classification = self._parse_classification_response(result)
             print(f"🔍 원래 분류: {classification['story_type']}")
             
             # 생일/베프/밝고 경쾌한 사연은 감정 중심으로 강제 분류
-            if "생일" in story or "베프" in story or "밝고 경쾌" in story:
+            hits = scan_keywords(story)
+            if hits.any("classifier.emotion_forced"):
                 print(f"🔧 생일/베프 강제로 emotion_focused로 변경")
                 classification["story_type"] = "emotion_focused"
                 classification["primary_focus"] = "생일 축하 (감정 중심)"
             
             # 우드톤/내추럴 키워드가 있으면 강제로 design_focused로 분류
-            elif "우드톤" in story or "내추럴" in story or "인테리어" in story:
+            elif hits.any("classifier.design_forced"):
                 print(f"🔧 강제로 design_focused로 변경")
                 classification["story_type"] = "design_focused"
                 classification["primary_focus"] = "디자인 요구사항 (우드톤/내추럴/인테리어)"
@@ -138,26 +144,24 @@ class StoryClassifier:
             print(f"❌ 분류 응답 파싱 실패: {e}")
             return self._fallback_classification(story)
     
+    def _rule_confidence(self, story: str) -> float:
+        """규칙 기반 분류 신뢰도 (LLM 결과를 덮어쓰는 강제 분류 키워드가 있으면 높음)"""
+        if scan_keywords(story).any("classifier.forced"):
+            return 0.95
+        return 0.6
+    
     def _fallback_classification(self, story: str) -> Dict[str, Any]:
         """폴백 분류 로직"""
-        # 간단한 키워드 기반 분류
-        story_lower = story.lower()
-        
-        # 디자인 관련 키워드
-        design_keywords = ["인테리어", "미니멀", "화이트", "컬러", "색상", "스타일", "분위기", "포인트", "그린톤", "소파", "거실", "우드톤", "내추럴", "가게", "카페", "어울리는"]
-        # 감정 관련 키워드
-        emotion_keywords = ["사랑", "감사", "그리움", "응원", "기쁨", "슬픔", "마음", "정성", "신입", "환영", "따뜻", "싱그럽", "화병", "책상", "병원", "입원", "병실", "삭막", "가족", "위로", "생일", "베프", "밝고 경쾌"]
-        # 기념일 관련 키워드
-        occasion_keywords = ["생일", "결혼", "승진", "졸업", "기념일", "축하", "첫 출근"]
-        
-        design_score = sum(1 for kw in design_keywords if kw in story_lower)
-        emotion_score = sum(1 for kw in emotion_keywords if kw in story_lower)
-        occasion_score = sum(1 for kw in occasion_keywords if kw in story_lower)
+        # 간단한 키워드 기반 분류 (디자인 / 감정 / 기념일 키워드 수)
+        hits = scan_keywords(story)
+        design_score = hits.count("classifier.scores", "design")
+        emotion_score = hits.count("classifier.scores", "emotion")
+        occasion_score = hits.count("classifier.scores", "occasion")
         
         print(f"🔍 폴백 분류 - 디자인: {design_score}, 감정: {emotion_score}, 기념일: {occasion_score}")
         
         # 생일/베프/밝고 경쾌한 사연은 감정 중심으로 분류
-        if "생일" in story or "베프" in story or "밝고 경쾌" in story:
+        if hits.any("classifier.emotion_forced"):
             story_type = "emotion_focused"
             print(f"🎂 생일/베프 감정 중심으로 분류됨")
         # 디자인 키워드가 있으면 우선적으로 design_focused로 분류
@@ -1,6 +1,8 @@
 import json
 import os
+import asyncio
 import logging
+import threading
 from datetime import datetime
 from typing import Optional, Dict, Any
 from pathlib import Path
@@ -8,6 +10,7 @@ import requests
 from dotenv import load_dotenv
 
 from app.models.schemas import StoryData, StoryCreateRequest
+from app.services.local_emotion_classifier import emotion_blend_source
 
 # .env 파일 로드
 load_dotenv()
@@ -15,6 +18,8 @@ load_dotenv()
 # 로거 설정
 logger = logging.getLogger(__name__)
 
+SUPABASE_TIMEOUT_SECONDS = 5
+
 
 class StoryManager:
     """스토리 데이터 관리 서비스 - Supabase 직접 저장"""
@@ -22,6 +27,8 @@ class StoryManager:
     def __init__(self):
         self.stories_file = Path("data/stories.json")
         self.stories_file.parent.mkdir(exist_ok=True)
+        # 스레드(비동기 API)에서 동시에 저장할 때 ID 중복 / 파일 동시 쓰기 방지
+        self._lock = threading.RLock()
         
         # Supabase 설정
         self.supabase_url = os.getenv("SUPABASE_URL")
@@ -52,8 +59,9 @@ class StoryManager:
     
     def _save_stories(self):
         """로컬 백업 데이터 저장"""
-        with open(self.stories_file, 'w', encoding='utf-8') as f:
-            json.dump(self.stories, f, ensure_ascii=False, indent=2, default=str)
+        with self._lock:
+            with open(self.stories_file, 'w', encoding='utf-8') as f:
+                json.dump(self.stories, f, ensure_ascii=False, indent=2, default=str)
     
     def _save_to_supabase(self, story_data: StoryData) -> bool:
         """Supabase에 스토리 저장"""
@@ -66,6 +74,7 @@ class StoryManager:
                 "story_id": story_data.story_id,
                 "story": story_data.original_story,
                 "emotions": json.dumps([emotion.dict() for emotion in story_data.emotions], ensure_ascii=False),
+                "emotion_source": story_data.emotion_source,
                 "matched_flower": json.dumps(story_data.matched_flower.dict(), ensure_ascii=False),
                 "recommendation_reason": story_data.recommendation_reason,
                 "flower_card_message": story_data.flower_card_message,
@@ -80,7 +89,8 @@ class StoryManager:
             response = requests.post(
                 f"{self.supabase_url}/rest/v1/stories",
                 headers=self.headers,
-                json=supabase_data
+                json=supabase_data,
+                timeout=SUPABASE_TIMEOUT_SECONDS
             )
             
             if response.status_code == 201:
@@ -103,7 +113,8 @@ class StoryManager:
         try:
             response = requests.get(
                 f"{self.supabase_url}/rest/v1/stories?story_id=eq.{story_id}",
-                headers=self.headers
+                headers=self.headers,
+                timeout=SUPABASE_TIMEOUT_SECONDS
             )
             
             if response.status_code == 200:
@@ -302,41 +313,45 @@ class StoryManager:
             return english_name.ljust(3, 'X')
     
     def create_story(self, request: StoryCreateRequest) -> StoryData:
-        """새로운 스토리 생성 - Supabase 직접 저장"""
-        # 스토리 ID 생성
-        story_id = self._generate_story_id(request.matched_flower.flower_name)
-        
-        # 현재 시간
-        now = datetime.now()
-        
-        # StoryData 객체 생성
-        story_data = StoryData(
-            story_id=story_id,
-            original_story=request.story,
-            created_at=now,
-            updated_at=None,
-            emotions=request.emotions,
-            flower_name=request.matched_flower.flower_name,
-            flower_name_en=request.matched_flower.korean_name,  # 영문 이름은 별도 필드 필요할 수 있음
-            scientific_name=request.matched_flower.scientific_name,
-            flower_card_message=request.flower_card_message or "",
-            flower_blend=request.composition,
-            season_info=request.season_info or {"season": "All Season", "months": "01-12"},
-            recommendation_reason=request.recommendation_reason,
-            flower_image_url=request.matched_flower.image_url,
-            keywords=request.keywords,
-            hashtags=request.hashtags,
-            color_keywords=request.color_keywords,
-            excluded_keywords=request.excluded_keywords
-        )
+        """새로운 스토리 생성 - 로컬 백업 후 Supabase 저장"""
+        # ID 생성 ~ 로컬 백업까지 잠금 (동시 요청의 같은 순번 / 파일 동시 쓰기 방지)
+        with self._lock:
+            # 스토리 ID 생성
+            story_id = self._generate_story_id(request.matched_flower.flower_name)
+            
+            # 현재 시간
+            now = datetime.now()
+            
+            # StoryData 객체 생성
+            story_data = StoryData(
+                story_id=story_id,
+                original_story=request.story,
+                created_at=now,
+                updated_at=None,
+                emotions=request.emotions,
+                flower_name=request.matched_flower.flower_name,
+                flower_name_en=request.matched_flower.korean_name,  # 영문 이름은 별도 필드 필요할 수 있음
+                scientific_name=request.matched_flower.scientific_name,
+                flower_card_message=request.flower_card_message or "",
+                flower_blend=request.composition,
+                season_info=request.season_info or {"season": "All Season", "months": "01-12"},
+                recommendation_reason=request.recommendation_reason,
+                flower_image_url=request.matched_flower.image_url,
+                keywords=request.keywords,
+                hashtags=request.hashtags,
+                color_keywords=request.color_keywords,
+                excluded_keywords=request.excluded_keywords,
+                # 서버에서 분석한 감정만 출처가 남음 (직접 전달된 감정 / 출처가 섞인 블렌드는 None)
+                emotion_source=emotion_blend_source(request.emotions)
+            )
+            
+            # 1. 로컬 백업 저장 (ID 순번 확정)
+            self.stories[story_id] = story_data.dict()
+            self._save_stories()
         
-        # 1. Supabase에 직접 저장 (우선)
+        # 2. Supabase에 저장 (네트워크 I/O 는 잠금 밖에서)
         supabase_success = self._save_to_supabase(story_data)
         
-        # 2. 로컬 백업 저장
-        self.stories[story_id] = story_data.dict()
-        self._save_stories()
-        
         if supabase_success:
             logger.info(f"✅ 스토리 생성 완료 (Supabase + 로컬 백업): {story_id}")
         else:
@@ -370,32 +385,34 @@ class StoryManager:
     
     def update_story(self, story_id: str, update_data: Dict[str, Any]) -> Optional[StoryData]:
         """스토리 업데이트"""
-        if story_id not in self.stories:
-            return None
-        
-        # 기존 데이터 가져오기
-        story_dict = self.stories[story_id]
-        
-        # 업데이트할 데이터 적용
-        story_dict.update(update_data)
-        story_dict['updated_at'] = datetime.now()
-        
-        # StoryData 객체로 변환하여 검증
-        story_data = StoryData(**story_dict)
-        
-        # 저장
-        self.stories[story_id] = story_data.dict()
-        self._save_stories()
+        with self._lock:
+            if story_id not in self.stories:
+                return None
+            
+            # 기존 데이터 가져오기
+            story_dict = self.stories[story_id]
+            
+            # 업데이트할 데이터 적용
+            story_dict.update(update_data)
+            story_dict['updated_at'] = datetime.now()
+            
+            # StoryData 객체로 변환하여 검증
+            story_data = StoryData(**story_dict)
+            
+            # 저장
+            self.stories[story_id] = story_data.dict()
+            self._save_stories()
         
         return story_data
     
     def delete_story(self, story_id: str) -> bool:
         """스토리 삭제"""
-        if story_id not in self.stories:
-            return False
-        
-        del self.stories[story_id]
-        self._save_stories()
+        with self._lock:
+            if story_id not in self.stories:
+                return False
+            
+            del self.stories[story_id]
+            self._save_stories()
         return True
     
     def get_all_stories(self) -> Dict[str, StoryData]:
@@ -434,6 +451,30 @@ class StoryManager:
             if story_id.startswith(f"S{date_str}")
         ])
 
+    # ----------------------------
+    # 비동기 API (이벤트 루프에서 호출 - 파일 / Supabase I/O 는 스레드에서 실행)
+    # ----------------------------
+    async def create_story_async(self, request: StoryCreateRequest) -> StoryData:
+        return await asyncio.to_thread(self.create_story, request)
+    
+    async def get_story_async(self, story_id: str) -> Optional[StoryData]:
+        return await asyncio.to_thread(self.get_story, story_id)
+    
+    async def update_story_async(self, story_id: str, update_data: Dict[str, Any]) -> Optional[StoryData]:
+        return await asyncio.to_thread(self.update_story, story_id, update_data)
+    
+    async def delete_story_async(self, story_id: str) -> bool:
+        return await asyncio.to_thread(self.delete_story, story_id)
+    
+    async def get_all_stories_async(self) -> Dict[str, StoryData]:
+        return await asyncio.to_thread(self.get_all_stories)
+    
+    async def get_stories_by_date_async(self, date_str: str) -> Dict[str, StoryData]:
+        return await asyncio.to_thread(self.get_stories_by_date, date_str)
+    
+    async def get_stories_by_flower_async(self, flower_name: str) -> Dict[str, StoryData]:
+        return await asyncio.to_thread(self.get_stories_by_flower, flower_name)
+
 
 # 전역 인스턴스
 story_manager = StoryManager()
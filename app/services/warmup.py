@@ -0,0 +1,148 @@
+"""
+서버 시작 워밍업 서비스 (공유 서비스 생성, 인덱스 사전 계산, 폴백 경로 추천 1회)
+"""
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import get_settings
+
+WARMUP_STORY = "오랜 친구의 생일을 맞아 고마운 마음을 담아 밝고 따뜻한 꽃을 선물하고 싶어요"
+
+
+class WarmupState:
+    """워밍업 진행 상태 (/ready, /health/detailed 에서 사용)"""
+
+    def __init__(self):
+        self.ready = False
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.steps: Dict[str, Dict[str, Any]] = {}
+
+    def run_step(self, name: str, func: Callable[[], Any]) -> Any:
+        """워밍업 단계 실행 (실패해도 다음 단계 진행)"""
+        start_time = time.time()
+        try:
+            result = func()
+            self.steps[name] = {"ok": True, "duration_ms": int((time.time() - start_time) * 1000)}
+            print(f"✅ 워밍업 [{name}] 완료 ({self.steps[name]['duration_ms']}ms)")
+            return result
+        except Exception as e:
+            self.steps[name] = {"ok": False, "duration_ms": int((time.time() - start_time) * 1000), "error": str(e)}
+            print(f"⚠️ 워밍업 [{name}] 실패: {e}")
+            return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "steps": self.steps,
+        }
+
+
+def _warm_catalog():
+    """꽃 카탈로그 로드 + 매칭 인덱스 / 유사도 표 사전 계산"""
+    from app.services.flower_catalog import get_flower_catalog
+    from app.services.flower_name_detector import get_flower_name_detector
+    from app.services.flower_score_index import derive_flower_scoring_index
+
+    catalog = get_flower_catalog()
+    if len(catalog) == 0:
+        raise ValueError("꽃 카탈로그가 비어 있습니다")
+    get_flower_name_detector()
+    derive_flower_scoring_index(catalog)
+    catalog.find_by_name(next(iter(catalog.flowers.values())).get("korean_name", ""))
+    return catalog
+
+
+def _warm_flower_matcher():
+    """FlowerMatcher 생성 (base64 이미지 캐시 로드 포함)"""
+    from app.services.flower_matcher import FlowerMatcher
+    return FlowerMatcher()
+
+
+def _warm_story_manager():
+    """StoryManager 로드"""
+    from app.services.story_manager import story_manager
+    return story_manager
+
+
+def _warm_openai_client():
+    """공유 OpenAI 클라이언트 생성 (API 키가 있을 때만)"""
+    if not os.getenv("OPENAI_API_KEY"):
+        print("⚠️ OPENAI_API_KEY 없음 - OpenAI 클라이언트 워밍업 건너뜀")
+        return None
+    from app.services.openai_client import get_openai_client, get_async_openai_client
+    get_async_openai_client()
+    return get_openai_client()
+
+
+def _warm_keyword_rules():
+    """규칙 기반 키워드 표를 오토마톤으로 컴파일 (폴백 경로 첫 요청에서 컴파일하지 않도록)"""
+    from app.services.keyword_automaton import get_keyword_rules
+    rules = get_keyword_rules()
+    if not rules.groups:
+        raise ValueError("키워드 규칙이 비어 있습니다")
+    rules.scan(WARMUP_STORY)
+    return rules.get_stats()
+
+
+def _warm_sample_story_responses():
+    """사전 계산된 샘플 사연 응답 로드 (/demo 첫 요청에서 파일을 읽지 않도록)"""
+    from app.services.sample_story_responses import sample_story_responses
+    return sample_story_responses.get_stats()
+
+
+def _warm_local_emotion_classifier():
+    """로컬 감정 분류기 모델 로드 (EMOTION_CLASSIFIER_MODE=primary 일 때만)"""
+    from app.services.local_emotion_classifier import local_emotion_classifier
+    if not local_emotion_classifier.enabled:
+        return None
+    if local_emotion_classifier.classifier() is None:
+        raise ValueError(f"로컬 감정 분류기를 사용할 수 없습니다: {local_emotion_classifier.model_path}")
+    return local_emotion_classifier.classifier().predict(WARMUP_STORY)
+
+
+def _warm_recommendation(flower_matcher):
+    """폴백 경로로 추천 1회 실행 (LLM 호출 없음)"""
+    from app.services.emotion_analyzer import EmotionAnalyzer
+    from app.services.realtime_context_extractor import RealtimeContextExtractor
+    from app.services.composition_recommender import CompositionRecommender
+
+    emotions = EmotionAnalyzer()._fallback_analysis(WARMUP_STORY)
+    context = RealtimeContextExtractor()._fallback_extraction(WARMUP_STORY, emotions)
+
+    # LLM 클라이언트를 비워서 매칭 내부의 LLM 보조 분석도 폴백 경로로 실행
+    flower_matcher.llm_client = None
+    matched_flower = flower_matcher.match(emotions, WARMUP_STORY, context.user_intent, [], None, context)
+    return CompositionRecommender().recommend(matched_flower, emotions)
+
+
+def run_warmup(state: "WarmupState") -> "WarmupState":
+    """워밍업 실행 (블로킹 - 스레드에서 호출)"""
+    state.ready = False
+    state.started_at = datetime.now()
+    print("🚀 서버 워밍업 시작")
+
+    state.run_step("catalog", _warm_catalog)
+    state.run_step("story_manager", _warm_story_manager)
+    state.run_step("openai_client", _warm_openai_client)
+    state.run_step("keyword_rules", _warm_keyword_rules)
+    flower_matcher = state.run_step("flower_matcher", _warm_flower_matcher)
+    state.run_step("sample_story_responses", _warm_sample_story_responses)
+    state.run_step("local_emotion_classifier", _warm_local_emotion_classifier)
+
+    if get_settings().warmup_recommendation_enabled and flower_matcher is not None:
+        state.run_step("fallback_recommendation", lambda: _warm_recommendation(flower_matcher))
+
+    state.finished_at = datetime.now()
+    state.ready = state.steps.get("catalog", {}).get("ok", False)
+    elapsed_ms = int((state.finished_at - state.started_at).total_seconds() * 1000)
+    print(f"{'✅' if state.ready else '❌'} 서버 워밍업 종료 ({elapsed_ms}ms, ready={state.ready})")
+    return state
+
+
+# 전역 인스턴스
+warmup_state = WarmupState()
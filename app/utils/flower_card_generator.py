@@ -1,5 +1,4 @@
-import openai
-import os
+from app.services.quote_index import select_card_quote
 from app.models.schemas import EmotionAnalysis, FlowerMatch
 from typing import List, Dict
 
@@ -13,74 +12,21 @@ def generate_flower_card_message(flower_match: FlowerMatch, emotion_analysis: Li
         
         # 꽃 정보
         flower_name = flower_match.flower_name
-        flower_keywords = ", ".join(flower_match.keywords) if flower_match.keywords else "beauty, grace"
         
-        # 프롬프트 생성
-        prompt = f"""
-        Create a beautiful English flower card message for a Korean customer.
+        # 인용구 라이브러리 로컬 검색 (설정 시 상위 후보만 LLM 재정렬)
+        quote = select_card_quote(story, emotion_analysis, flower_match.keywords)
         
-        Flower: {flower_name}
-        Flower meaning: {flower_keywords}
-        Primary emotion: {primary_emotion}
-        Customer story: {story}
-        
-        Requirements:
-        1. Use a meaningful quote from literature, poetry, or famous authors
-        2. Include the source/author in parentheses
-        3. Make it warm, personal, and suitable for a flower card
-        4. Keep it concise (1-2 sentences)
-        5. Focus on the flower's meaning and the emotion
-        
-        Format: "Quote here" - (Author/Source)
-        
-        Example style:
-        "Every flower is a soul blossoming in nature" - (Gerard de Nerval)
-        "Happiness held is the seed; happiness shared is the flower" - (John Harrigan)
-        """
-        
-        # OpenAI API 호출 (새로운 버전)
-        client = openai.OpenAI()
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a poetic flower card message writer who creates beautiful, meaningful quotes for flower gifts."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=100,
-            temperature=0.7
-        )
-        
-        message = response.choices[0].message.content.strip()
-        
-        # 기본 메시지가 없으면 fallback
-        if not message or len(message) < 10:
+        # 후보가 없으면 fallback
+        if quote is None:
             return {
                 "quote": f"{flower_name} brings beauty and {primary_emotion} to your special day",
                 "source": "Flower Wisdom"
             }
         
-        # 메시지를 인용구와 출처로 분리
-        try:
-            if ' - (' in message and message.endswith(')'):
-                quote_part, source_part = message.rsplit(' - (', 1)
-                quote = quote_part.strip().strip('"')
-                source = source_part.rstrip(')').strip()
-                return {
-                    "quote": quote,
-                    "source": source
-                }
-            else:
-                # 분리할 수 없는 경우 전체를 인용구로, 기본 출처 사용
-                return {
-                    "quote": message.strip().strip('"'),
-                    "source": "Flower Wisdom"
-                }
-        except Exception as e:
-            print(f"⚠️ 메시지 파싱 실패: {e}")
-            return {
-                "quote": message.strip().strip('"'),
-                "source": "Flower Wisdom"
-            }
+        return {
+            "quote": quote.quote,
+            "source": quote.source
+        }
         
     except Exception as e:
         print(f"❌ 꽃 카드 메시지 생성 오류: {e}")
@@ -35,9 +35,13 @@ CREATE TABLE IF NOT EXISTS stories (
     hashtags JSONB,
     color_keywords JSONB,
     excluded_keywords JSONB,
+    emotion_source VARCHAR(20), -- 감정 블렌드 출처 (llm / local / fallback)
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- 기존 테이블 마이그레이션
+ALTER TABLE stories ADD COLUMN IF NOT EXISTS emotion_source VARCHAR(20);
+
 -- 3. 꽃 이미지 테이블
 CREATE TABLE IF NOT EXISTS flower_images (
     id BIGSERIAL PRIMARY KEY,
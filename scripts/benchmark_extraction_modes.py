@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+감정 분석 + 맥락 추출 방식 벤치마크 (legacy 2회 호출 vs fused 1회 호출)
+- data/sample_stories.json 의 사연으로 두 방식을 번갈아 실행
+- 사연별 지연 시간, LLM 호출 수, 토큰 사용량, 예상 비용 비교
+
+사용법:
+    python scripts/benchmark_extraction_modes.py --limit 10
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.openai_client import get_openai_client
+from app.services.fused_extractor import extract_emotions_and_context, EXTRACTION_MODE_LEGACY, EXTRACTION_MODE_FUSED
+from app.services.llm_cache import llm_cache
+
+# 1M 토큰당 USD (입력, 출력)
+MODEL_PRICING = {
+    "gpt-4": (30.0, 60.0),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-3.5-turbo": (0.50, 1.50),
+}
+
+
+class UsageRecorder:
+    """공유 OpenAI 클라이언트 호출을 감싸서 호출 수 / 토큰 사용량 기록"""
+
+    def __init__(self, client):
+        self.calls: List[Dict] = []
+        self._original_create = client.chat.completions.create
+
+        def recording_create(*args, **kwargs):
+            start_time = time.time()
+            response = self._original_create(*args, **kwargs)
+            usage = getattr(response, "usage", None)
+            self.calls.append({
+                "model": kwargs.get("model"),
+                "latency_ms": int((time.time() - start_time) * 1000),
+                "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+                "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+            })
+            return response
+
+        client.chat.completions.create = recording_create
+
+    def reset(self):
+        self.calls = []
+
+    def summary(self) -> Dict:
+        prompt_tokens = sum(c["prompt_tokens"] for c in self.calls)
+        completion_tokens = sum(c["completion_tokens"] for c in self.calls)
+        cost = 0.0
+        for call in self.calls:
+            input_price, output_price = MODEL_PRICING.get(call["model"], (0.0, 0.0))
+            cost += (call["prompt_tokens"] * input_price + call["completion_tokens"] * output_price) / 1_000_000
+        return {
+            "llm_calls": len(self.calls),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cost_usd": cost,
+        }
+
+
+def load_stories(limit: int) -> List[str]:
+    with open("data/sample_stories.json", "r", encoding="utf-8") as f:
+        stories = json.load(f)["sample_stories"]
+    return [s["story"] for s in stories[:limit]]
+
+
+def run_mode(mode: str, story: str, recorder: UsageRecorder) -> Dict:
+    recorder.reset()
+    start_time = time.time()
+    emotions, context = extract_emotions_and_context(story, [], mode=mode)
+    elapsed_ms = int((time.time() - start_time) * 1000)
+    return {
+        "latency_ms": elapsed_ms,
+        "emotions": [f"{e.emotion}({e.percentage}%)" for e in emotions],
+        "keywords": context.emotions + context.situations + context.moods + context.colors,
+        **recorder.summary(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="legacy vs fused 추출 벤치마크")
+    parser.add_argument("--limit", type=int, default=10, help="사용할 샘플 사연 수")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    if not os.getenv("OPENAI_API_KEY"):
+        print("❌ OPENAI_API_KEY가 필요합니다.")
+        sys.exit(1)
+
+    # 캐시 적중이 지연/비용 비교를 왜곡하지 않도록 비활성화
+    llm_cache.enabled = False
+    recorder = UsageRecorder(get_openai_client())
+    stories = load_stories(args.limit)
+    results = {EXTRACTION_MODE_LEGACY: [], EXTRACTION_MODE_FUSED: []}
+
+    for i, story in enumerate(stories, 1):
+        print(f"\n🔍 [{i}/{len(stories)}] {story[:40]}...")
+        # 순서 효과를 줄이기 위해 번갈아 먼저 실행
+        modes = [EXTRACTION_MODE_LEGACY, EXTRACTION_MODE_FUSED]
+        if i % 2 == 0:
+            modes.reverse()
+        for mode in modes:
+            result = run_mode(mode, story, recorder)
+            results[mode].append(result)
+            print(f"   {mode:6s} {result['latency_ms']:5d}ms  calls={result['llm_calls']}  "
+                  f"tokens={result['prompt_tokens']}+{result['completion_tokens']}  {result['keywords']}")
+
+    print("\n📋 요약")
+    print(f"{'mode':8s} {'p50 ms':>8s} {'p95 ms':>8s} {'calls':>6s} {'tokens':>8s} {'USD/1k req':>11s}")
+    for mode, rows in results.items():
+        latencies = sorted(r["latency_ms"] for r in rows)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        calls = statistics.mean(r["llm_calls"] for r in rows)
+        tokens = statistics.mean(r["prompt_tokens"] + r["completion_tokens"] for r in rows)
+        cost = statistics.mean(r["cost_usd"] for r in rows) * 1000
+        print(f"{mode:8s} {statistics.median(latencies):8.0f} {p95:8d} {calls:6.1f} {tokens:8.0f} {cost:11.3f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
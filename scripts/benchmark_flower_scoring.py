@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+꽃 매칭 엔진 벤치마크
+- 점수 계산: 꽃별 반복문 vs 컴파일된 점수 인덱스 vs 후보 역색인 + 점수 인덱스
+- 언급된 꽃 감지: 이름을 길이순으로 정렬해 하나씩 찾는 기존 방식 vs 컴파일된 최장 일치 감지기
+- 정합성: data/sample_stories.json + data/stories.json 사연(기록된 감정 / 색상)으로 두 구현의
+  1위 꽃, 상위 5개 순서, 점수 차이를 비교하고, 후보 역색인 밖의 꽃이 모두 0 점인지 확인
+  (하나라도 다르면 종료 코드 1)
+- 언급된 꽃 감지: 같은 이름 / 별칭 매핑으로 기존 방식과 감지기의 결과 비교 (사연 + 이름을 덧붙인 사연)
+- 속도: 현재 카탈로그(187개)와 카탈로그를 복제한 합성 카탈로그(기본 10,000개)에서 사연당 소요 시간 비교
+  (반복문 구현의 꽃별 print 출력은 버리고 계산 시간만 측정, 후보 경로는 후보 선택 시간 포함)
+
+사용법:
+    python scripts/benchmark_flower_scoring.py
+    python scripts/benchmark_flower_scoring.py --synthetic-size 10000 --repeat 5
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import contextlib
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.schemas import EmotionAnalysis
+from app.services.flower_catalog import get_flower_catalog
+from app.services.flower_matcher import FlowerMatcher
+from app.services.flower_score_index import FlowerScoringIndex
+from app.services.flower_candidate_index import FlowerCandidateIndex
+from app.services.flower_name_detector import FlowerNameDetector, build_flower_name_mapping, load_flower_name_aliases
+
+# 합성 카탈로그에 섞을 색상 / 키워드 (관계 / 맥락 / 이벤트 경로도 측정되도록)
+SYNTHETIC_COLORS = ["화이트", "핑크", "레드", "옐로우", "퍼플", "블루", "오렌지", "그린", "크림", "라일락"]
+SYNTHETIC_KEYWORDS = ["생일", "졸업", "결혼", "기념일", "승진", "위로", "감사", "응원", "연인", "친구",
+                      "부모님", "선생님", "동료", "집들이", "개업", "입학", "어버이날", "스승의 날", "크리스마스", "발렌타인"]
+
+
+def load_corpus() -> List[Tuple[str, List[EmotionAnalysis], List[str]]]:
+    """(사연, 감정 블렌드, 색상 키워드) 목록 - 색상 있는 경우 / 없는 경우 모두 포함"""
+    corpus = []
+    with open("data/sample_stories.json", "r", encoding="utf-8") as f:
+        for story in json.load(f)["sample_stories"]:
+            keywords = story.get("predefined_keywords", {})
+            names = keywords.get("emotions", []) or ["기쁨"]
+            percentages = [round(100.0 / len(names), 1)] * len(names)
+            emotions = [EmotionAnalysis(emotion=name, percentage=p, description="") for name, p in zip(names, percentages)]
+            corpus.append((story["story"], emotions, keywords.get("colors", [])))
+            corpus.append((story["story"], emotions, []))
+    with open("data/stories.json", "r", encoding="utf-8") as f:
+        for story in json.load(f).values():
+            emotions = [EmotionAnalysis(**emotion) for emotion in story.get("emotions", [])]
+            if story.get("original_story") and emotions:
+                corpus.append((story["original_story"], emotions, story.get("color_keywords", [])))
+    return corpus
+
+
+def build_synthetic_catalog(flowers: Dict[str, Dict], size: int) -> Dict[str, Dict]:
+    """실제 카탈로그를 복제해 색상 / 키워드를 바꾼 합성 카탈로그"""
+    base = list(flowers.values())
+    synthetic = {}
+    for i in range(size):
+        flower = dict(base[i % len(base)])
+        flower_id = f"{flower['id']}-syn{i}"
+        flower["id"] = flower_id
+        flower["color"] = SYNTHETIC_COLORS[(i * 7) % len(SYNTHETIC_COLORS)]
+        keywords = [SYNTHETIC_KEYWORDS[(i * k) % len(SYNTHETIC_KEYWORDS)] for k in (1, 3, 5)]
+        flower["usage_contexts"] = keywords[:2]
+        flower["seasonal_events"] = keywords[2:]
+        flower["relationship_suitability"] = {"friend": keywords[:1], "family": keywords[1:]}
+        synthetic[flower_id] = flower
+    return synthetic
+
+
+def make_matcher(flowers: Dict[str, Dict]) -> FlowerMatcher:
+    """점수 계산만 쓰는 FlowerMatcher (LLM 클라이언트 / 이미지 로드 생략)"""
+    matcher = FlowerMatcher.__new__(FlowerMatcher)
+    matcher.flower_database = flowers
+    return matcher
+
+
+def ranking(scores: Dict[str, float], k: int = 5) -> List[str]:
+    return [flower_id for flower_id, _ in sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k]]
+
+
+def check(matcher: FlowerMatcher, index: FlowerScoringIndex, corpus) -> bool:
+    """두 구현의 순위 / 점수 비교 + 후보 역색인 밖의 꽃이 0 점인지"""
+    candidate_index = FlowerCandidateIndex(matcher.flower_database)
+    mismatches = 0
+    leaks = 0
+    max_diff = 0.0
+    candidate_ratio = []
+    for story, emotions, colors in corpus:
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = matcher._calculate_flower_scores_loop(emotions, story, colors)
+        actual = index.score_dict(emotions, story, colors)
+        max_diff = max(max_diff, max(abs(expected[i] - actual[i]) for i in expected))
+        same_best = max(expected, key=expected.get) == max(actual, key=actual.get)
+        if not same_best or ranking(expected) != ranking(actual):
+            mismatches += 1
+            print(f"❌ 순위 불일치: {story[:30]} colors={colors}")
+            print(f"   반복문: {ranking(expected)}")
+            print(f"   인덱스: {ranking(actual)}")
+
+        candidates = set(candidate_index.candidates(emotions, story, colors))
+        candidate_ratio.append(len(candidates) / len(actual))
+        leaked = [flower_id for i, flower_id in enumerate(index.flower_ids) if i not in candidates and actual[flower_id] != 0]
+        if leaked:
+            leaks += 1
+            print(f"❌ 후보 밖 꽃 점수가 0 이 아님: {story[:30]} colors={colors} {leaked[:5]}")
+    print(f"{'✅' if mismatches == 0 else '❌'} 정합성: 사연 {len(corpus)}개 중 순위 불일치 {mismatches}개, "
+          f"최대 점수 차이 {max_diff:.3g}")
+    print(f"{'✅' if leaks == 0 else '❌'} 후보 역색인: 후보 밖 0 점 위반 {leaks}개, "
+          f"평균 후보 비율 {statistics.mean(candidate_ratio):.1%}")
+    return mismatches == 0 and leaks == 0
+
+
+def benchmark(label: str, flowers: Dict[str, Dict], corpus, repeat: int):
+    """사연당 평균 소요 시간 (ms)"""
+    matcher = make_matcher(flowers)
+
+    start_time = time.perf_counter()
+    index = FlowerScoringIndex(flowers)
+    build_ms = (time.perf_counter() - start_time) * 1000
+    start_time = time.perf_counter()
+    candidate_index = FlowerCandidateIndex(flowers)
+    candidate_build_ms = (time.perf_counter() - start_time) * 1000
+    # 감정 / 색상 유사도 열 / 확장 캐시 채우기 (운영에서는 첫 몇 요청 이후 캐시 적중)
+    for story, emotions, colors in corpus:
+        index.score(emotions, story, colors)
+        candidate_index.candidates(emotions, story, colors)
+
+    def with_candidates(emotions, story, colors):
+        return index.score_dict(emotions, story, colors, candidate_index.candidates(emotions, story, colors))
+
+    def measure(func) -> float:
+        timings = []
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            for story, emotions, colors in corpus:
+                func(emotions, story, colors)
+            timings.append((time.perf_counter() - start_time) * 1000 / len(corpus))
+        return statistics.median(timings)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        loop_ms = measure(matcher._calculate_flower_scores_loop)
+    index_ms = measure(index.score_dict)
+    candidate_ms = measure(with_candidates)
+    print(f"{label:>18}  꽃 {len(flowers):6d}개  반복문 {loop_ms:9.3f}ms  인덱스 {index_ms:7.3f}ms  "
+          f"({loop_ms / index_ms:6.1f}배)  후보+인덱스 {candidate_ms:7.3f}ms  "
+          f"컴파일 {build_ms:8.1f}ms / 역색인 {candidate_build_ms:8.1f}ms")
+
+
+def legacy_detect(flower_names: Dict[str, str], story: str) -> Optional[str]:
+    """기존 RealtimeContextExtractor._detect_mentioned_flower (매 호출 정렬 + 이름별 부분 문자열 검사)"""
+    story_lower = story.lower()
+    for flower_name in sorted(flower_names.keys(), key=len, reverse=True):
+        if flower_name.lower() in story_lower:
+            return flower_names[flower_name]
+    return None
+
+
+def name_detection_stories(flower_names: Dict[str, str], corpus) -> List[str]:
+    """사연 + 이름(별칭 포함) 을 하나씩 덧붙인 사연"""
+    stories = [story for story, _, _ in corpus]
+    for i, name in enumerate(flower_names):
+        stories.append(f"{stories[i % len(corpus)]} {name} 로 부탁드려요")
+    return stories
+
+
+def check_name_detection(flowers: Dict[str, Dict], corpus) -> bool:
+    """같은 매핑으로 기존 방식과 감지기의 결과 비교"""
+    flower_names = build_flower_name_mapping(SimpleNamespace(flowers=flowers), load_flower_name_aliases())
+    detector = FlowerNameDetector(flower_names)
+    stories = name_detection_stories(flower_names, corpus)
+    mismatches = 0
+    for story in stories:
+        detected = detector.detect(story)
+        expected = legacy_detect(flower_names, story)
+        if (detected[1] if detected else None) != expected:
+            mismatches += 1
+            print(f"❌ 꽃 감지 불일치: {story[-40:]} 기존={expected} 감지기={detected}")
+    print(f"{'✅' if mismatches == 0 else '❌'} 언급된 꽃 감지: 사연 {len(stories)}개 중 불일치 {mismatches}개 "
+          f"(이름 / 별칭 {len(flower_names)}개)")
+    return mismatches == 0
+
+
+def benchmark_name_detection(label: str, flowers: Dict[str, Dict], corpus, repeat: int):
+    """사연당 언급된 꽃 감지 시간 (ms)"""
+    flower_names = build_flower_name_mapping(SimpleNamespace(flowers=flowers), load_flower_name_aliases())
+    start_time = time.perf_counter()
+    detector = FlowerNameDetector(flower_names)
+    build_ms = (time.perf_counter() - start_time) * 1000
+    stories = name_detection_stories(flower_names, corpus)[:len(corpus) * 2]
+
+    def measure(func) -> float:
+        timings = []
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            for story in stories:
+                func(story)
+            timings.append((time.perf_counter() - start_time) * 1000 / len(stories))
+        return statistics.median(timings)
+
+    legacy_ms = measure(lambda story: legacy_detect(flower_names, story))
+    detector_ms = measure(detector.detect)
+    print(f"{label:>18}  이름 {len(flower_names):6d}개  기존 {legacy_ms:9.3f}ms  감지기 {detector_ms:7.3f}ms  "
+          f"({legacy_ms / detector_ms:6.1f}배)  컴파일 {build_ms:8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FlowerMatcher 점수 계산 벤치마크")
+    parser.add_argument("--synthetic-size", type=int, default=10000, help="합성 카탈로그 꽃 수")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--limit", type=int, default=0, help="속도 측정에 쓸 사연 수 (0 이면 전체)")
+    args = parser.parse_args()
+
+    flowers = get_flower_catalog().flowers
+    corpus = load_corpus()
+
+    ok = check(make_matcher(flowers), FlowerScoringIndex(flowers), corpus)
+    # 관계 / 맥락 / 이벤트 키워드가 채워진 합성 카탈로그로도 확인
+    synthetic = build_synthetic_catalog(flowers, 2000)
+    ok = check(make_matcher(synthetic), FlowerScoringIndex(synthetic), corpus[:20]) and ok
+    ok = check_name_detection(flowers, corpus) and ok
+    print()
+
+    speed_corpus = corpus[:args.limit] if args.limit else corpus
+    benchmark("현재 카탈로그", flowers, speed_corpus, args.repeat)
+    synthetic = build_synthetic_catalog(flowers, args.synthetic_size)
+    benchmark("합성 카탈로그", synthetic, speed_corpus[:20], args.repeat)
+    print()
+    benchmark_name_detection("현재 카탈로그", flowers, speed_corpus, args.repeat)
+    # 합성 카탈로그는 이름이 겹치므로 꽃마다 다른 한국어 이름으로 (이름 수가 꽃 수에 비례하도록)
+    renamed = {flower_id: {**flower, "korean_name": f"{flower['korean_name']}-{i}"}
+               for i, (flower_id, flower) in enumerate(synthetic.items())}
+    benchmark_name_detection("합성 카탈로그", renamed, speed_corpus[:20], args.repeat)
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
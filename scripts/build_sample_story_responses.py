@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+샘플 사연 추천 응답 사전 계산 (배포 빌드 단계)
+- data/sample_stories.json 의 모든 사연에 대해 /sample-stories/{id}/recommend 와 같은 응답을 계산해
+  data/precomputed/sample_story_responses.json 에 저장
+- 아티팩트에는 카탈로그 버전 / 프롬프트 버전 / 샘플 사연 파일 해시가 기록되어,
+  서버는 값이 다르면 자동으로 무시하고 실시간 계산으로 전환
+- LLM 실패로 폴백된 사연이 있으면 종료 코드 1 (--allow-degraded 로 허용)
+
+사용법:
+    python scripts/build_sample_story_responses.py
+    python scripts/build_sample_story_responses.py --concurrency 4 --allow-degraded
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 빌드는 요청 예산과 무관하게 끝까지 LLM 응답을 기다림
+BUILD_DEADLINE_SECONDS = 120.0
+
+
+async def build_all(concurrency: int):
+    from app.api.v1.endpoints.sample_stories import load_sample_stories, build_sample_story_response
+    from app.services.request_deadline import deadline_scope
+
+    stories = load_sample_stories()
+    semaphore = asyncio.Semaphore(concurrency)
+    responses = {}
+    degraded = {}
+
+    async def build_one(story):
+        async with semaphore:
+            start_time = time.time()
+            with deadline_scope(BUILD_DEADLINE_SECONDS) as deadline:
+                responses[story["id"]] = await build_sample_story_response(story)
+            elapsed_ms = int((time.time() - start_time) * 1000)
+            stages = deadline.degraded_stages()
+            if stages:
+                degraded[story["id"]] = stages
+            print(f"{'⚠️' if stages else '✅'} {story['id']} {elapsed_ms:6d}ms  {responses[story['id']]['flower_name']}"
+                  + (f"  (폴백: {', '.join(stages)})" if stages else ""))
+
+    await asyncio.gather(*(build_one(story) for story in stories))
+    return responses, degraded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="샘플 사연 추천 응답 사전 계산")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 계산할 사연 수")
+    parser.add_argument("--allow-degraded", action="store_true", help="LLM 폴백 응답이 있어도 저장")
+    args = parser.parse_args()
+
+    from app.services.llm_cache import llm_cache
+    from app.services.sample_story_responses import sample_story_responses
+
+    # 캐시된 예전 응답이 아니라 현재 프롬프트로 새로 생성
+    llm_cache.enabled = False
+
+    fingerprint = sample_story_responses.current_fingerprint()
+    print(f"🔧 fingerprint: {fingerprint}")
+
+    responses, degraded = asyncio.run(build_all(args.concurrency))
+
+    print()
+    if degraded and not args.allow_degraded:
+        print(f"❌ 폴백된 사연 {len(degraded)}개 - 아티팩트를 저장하지 않습니다: {', '.join(sorted(degraded))}")
+        sys.exit(1)
+
+    path = sample_story_responses.save_artifact(responses, fingerprint)
+    print(f"✅ 샘플 사연 응답 {len(responses)}개 저장: {path}")
+
+
+if __name__ == "__main__":
+    main()
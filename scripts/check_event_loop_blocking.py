@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+비동기 엔드포인트 이벤트 루프 블로킹 검사 (CI 용)
+- asyncio 디버그 모드의 slow callback 감지로, 루프에서 한 번에 threshold 이상 실행된 콜백을 잡아냄
+- 기본값은 LLM 지연을 흉내 내는 가짜 OpenAI 클라이언트를 사용
+  (동기 클라이언트는 time.sleep, 비동기 클라이언트는 asyncio.sleep 으로 응답을 지연)
+  → async 엔드포인트가 동기 클라이언트를 루프에서 직접 호출하면 바로 감지됨
+- --real-llm 을 주면 실제 OPENAI_API_KEY 로 호출
+
+사용법:
+    python scripts/check_event_loop_blocking.py
+    python scripts/check_event_loop_blocking.py --threshold 0.1 --latency 0.5
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CHECK_STORY = "오랜 친구의 생일이라 고마운 마음을 담아 밝고 따뜻한 느낌의 꽃을 선물하고 싶어요"
+
+# 가짜 LLM 응답 (파서가 받아들이지 못하는 호출 지점은 각자 폴백 경로로 진행)
+SIMULATED_CONTENT = json.dumps({
+    "emotions": [
+        {"emotion": "기쁨", "percentage": 50.0},
+        {"emotion": "감사", "percentage": 30.0},
+        {"emotion": "따뜻함", "percentage": 20.0}
+    ],
+    "emotion_blend": [
+        {"emotion": "기쁨", "percentage": 50.0},
+        {"emotion": "감사", "percentage": 30.0},
+        {"emotion": "따뜻함", "percentage": 20.0}
+    ],
+    "emotion": "기쁨",
+    "situation": "생일",
+    "mood": "밝은",
+    "color": "옐로우",
+    "situations": ["생일"],
+    "moods": ["밝은"],
+    "colors": ["옐로우"],
+    "user_intent": "meaning_based",
+    "confidence": 0.9
+}, ensure_ascii=False)
+
+
+def _completion(content: str):
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+class _SimulatedSyncClient:
+    """동기 OpenAI 클라이언트 흉내 (응답까지 스레드를 막음)"""
+
+    def __init__(self, latency: float):
+        def create(**kwargs):
+            time.sleep(latency)
+            return _completion(SIMULATED_CONTENT)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+    def with_options(self, **kwargs):
+        return self
+
+
+class _SimulatedAsyncClient:
+    """비동기 OpenAI 클라이언트 흉내 (응답까지 await)"""
+
+    def __init__(self, latency: float):
+        async def create(**kwargs):
+            await asyncio.sleep(latency)
+            if kwargs.get("stream"):
+                return _simulated_stream(SIMULATED_CONTENT)
+            return _completion(SIMULATED_CONTENT)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+    def with_options(self, **kwargs):
+        return self
+
+
+async def _simulated_stream(content: str):
+    for i in range(0, len(content), 8):
+        await asyncio.sleep(0.01)
+        delta = SimpleNamespace(content=content[i:i + 8])
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+class SlowCallbackCollector(logging.Handler):
+    """asyncio 디버그 로그 중 slow callback 경고 수집"""
+
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.records: List[str] = []
+
+    def emit(self, record: logging.LogRecord):
+        message = record.getMessage()
+        if "took" in message and "seconds" in message:
+            self.records.append(message)
+
+
+def install_simulated_llm(latency: float):
+    """공유 OpenAI 클라이언트 자리에 가짜 클라이언트 등록"""
+    from app.services import openai_client
+
+    api_key = os.environ.setdefault("OPENAI_API_KEY", "sk-simulated-blocking-check")
+    openai_client._sync_clients[api_key] = _SimulatedSyncClient(latency)
+    openai_client._async_clients[api_key] = _SimulatedAsyncClient(latency)
+
+
+def isolate_side_effects():
+    """검사 중 로컬 스토리 파일 / LLM 캐시 / Supabase 에 쓰지 않도록 격리"""
+    from app.services.story_manager import story_manager
+    from app.services.llm_cache import llm_cache
+
+    story_manager.stories_file = Path(tempfile.mkdtemp(prefix="blocking_check_")) / "stories.json"
+    story_manager.supabase_available = False
+    llm_cache.enabled = False
+
+
+def build_scenarios() -> Dict[str, Callable]:
+    """검사할 async 진입점 목록"""
+    from fastapi import HTTPException
+    from app.models.schemas import RecommendRequest
+    from app.api.v1.endpoints import recommend, unified, sample_stories, stories
+    from app.services.smart_websocket_extractor import SmartWebSocketExtractor
+
+    async def emotion_analysis():
+        await recommend.emotion_analysis(RecommendRequest(story=CHECK_STORY))
+
+    async def emotion_analysis_stream():
+        response = await recommend.emotion_analysis_stream(RecommendRequest(story=CHECK_STORY + " 스트리밍"))
+        async for _ in response.body_iterator:
+            pass
+
+    async def unified_recommend():
+        await unified.unified_recommend(unified.UnifiedRecommendRequest(story=CHECK_STORY + " 통합"))
+
+    async def unified_extract_realtime():
+        await unified.extract_keywords(unified.UnifiedRecommendRequest(story=CHECK_STORY), mode="realtime")
+
+    async def websocket_extraction():
+        await SmartWebSocketExtractor().extract_with_confidence(CHECK_STORY)
+
+    async def sample_story_recommend():
+        samples = sample_stories.load_sample_stories()
+        if samples:
+            await sample_stories.recommend_from_sample_story(samples[0]["id"])
+
+    async def story_lookup():
+        try:
+            await stories.get_story("S000000-XXX-00000")
+        except HTTPException as e:
+            if e.status_code != 404:  # 없는 스토리라 404 만 정상
+                raise
+
+    return {
+        "emotion-analysis": emotion_analysis,
+        "emotion-analysis/stream": emotion_analysis_stream,
+        "unified/recommend": unified_recommend,
+        "unified/extract-keywords(realtime)": unified_extract_realtime,
+        "websocket extraction": websocket_extraction,
+        "sample-stories/recommend": sample_story_recommend,
+        "stories/get": story_lookup,
+    }
+
+
+async def run_checks(threshold: float, collector: SlowCallbackCollector) -> Dict[str, Dict[str, Any]]:
+    """시나리오별 slow callback 목록 + 오류 (없으면 None)"""
+    loop = asyncio.get_running_loop()
+    loop.set_debug(True)
+    loop.slow_callback_duration = threshold
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, scenario in build_scenarios().items():
+        collector.records.clear()
+        start_time = time.time()
+        try:
+            await scenario()
+            error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        records = list(collector.records)
+        results[name] = {"slow_callbacks": records, "error": error}
+        status = "✅" if not records and not error else "❌"
+        print(f"{status} {name:36s} {elapsed_ms:6d}ms  slow callbacks={len(records)}"
+              + (f"  (오류: {error})" if error else ""))
+        for record in records:
+            print(f"      ↳ {record}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="async 엔드포인트 이벤트 루프 블로킹 검사")
+    parser.add_argument("--threshold", type=float, default=0.1, help="slow callback 기준 (초)")
+    parser.add_argument("--latency", type=float, default=0.5, help="가짜 LLM 응답 지연 (초)")
+    parser.add_argument("--real-llm", action="store_true", help="가짜 클라이언트 대신 실제 OpenAI 호출")
+    args = parser.parse_args()
+
+    if not args.real_llm:
+        install_simulated_llm(args.latency)
+    isolate_side_effects()
+
+    # 서버 시작과 같이 워밍업을 먼저 실행 (카탈로그 로드 등 1회성 비용은 검사 대상에서 제외)
+    from app.services.warmup import run_warmup, warmup_state
+    run_warmup(warmup_state)
+
+    collector = SlowCallbackCollector()
+    asyncio_logger = logging.getLogger("asyncio")
+    asyncio_logger.addHandler(collector)
+    asyncio_logger.setLevel(logging.WARNING)
+
+    results = asyncio.run(run_checks(args.threshold, collector))
+    blocked = [name for name, result in results.items() if result["slow_callbacks"]]
+    failed = [name for name, result in results.items() if result["error"]]
+
+    print()
+    if blocked:
+        print(f"❌ 이벤트 루프 블로킹 감지: {', '.join(blocked)}")
+    if failed:
+        # 예외로 끝난 시나리오는 루프 블로킹 여부를 끝까지 확인하지 못한 것이라 실패로 처리
+        print(f"❌ 시나리오 실행 오류: {', '.join(failed)}")
+    if blocked or failed:
+        sys.exit(1)
+    print(f"✅ 모든 async 진입점이 {args.threshold}s 이상 루프를 막지 않았습니다.")
+
+
+if __name__ == "__main__":
+    main()
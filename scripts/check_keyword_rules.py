@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+규칙 기반 키워드 오토마톤 정합성 검사 - 사연 분류 (StoryClassifier)
+- 기존 부분 문자열 규칙 (키워드 목록 + `in story`) 과 오토마톤 기반 구현의 결과 비교
+  · _rule_confidence (강제 분류 키워드)
+  · _fallback_classification (디자인 / 감정 / 기념일 점수 + 강제 분류)
+  · classify_story 의 LLM 경로 (LLM 분류 결과를 강제 분류 키워드로 덮어쓰는 부분)
+    → LLM 호출은 유형별 고정 응답으로 대체하고, 모든 유형에 대해 비교
+- 사연: data/sample_stories.json + data/stories.json + 경계 사례 (빈 사연 / 대문자 / 강제 분류 키워드)
+- 하나라도 다르면 종료 코드 1
+
+사용법:
+    python scripts/check_keyword_rules.py
+"""
+
+import io
+import os
+import sys
+import json
+import contextlib
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.services.story_classifier as story_classifier_module
+from app.services.story_classifier import StoryClassifier, StoryType
+
+# 오토마톤으로 옮기기 전 StoryClassifier 의 키워드 목록
+LEGACY_FORCED_KEYWORDS = ["생일", "베프", "밝고 경쾌", "우드톤", "내추럴", "인테리어"]
+LEGACY_EMOTION_FORCED_KEYWORDS = ["생일", "베프", "밝고 경쾌"]
+LEGACY_DESIGN_FORCED_KEYWORDS = ["우드톤", "내추럴", "인테리어"]
+LEGACY_DESIGN_KEYWORDS = ["인테리어", "미니멀", "화이트", "컬러", "색상", "스타일", "분위기", "포인트", "그린톤", "소파", "거실", "우드톤", "내추럴", "가게", "카페", "어울리는"]
+LEGACY_EMOTION_KEYWORDS = ["사랑", "감사", "그리움", "응원", "기쁨", "슬픔", "마음", "정성", "신입", "환영", "따뜻", "싱그럽", "화병", "책상", "병원", "입원", "병실", "삭막", "가족", "위로", "생일", "베프", "밝고 경쾌"]
+LEGACY_OCCASION_KEYWORDS = ["생일", "결혼", "승진", "졸업", "기념일", "축하", "첫 출근"]
+
+EDGE_CASE_STORIES = [
+    "",
+    "생일 축하해 베프야",
+    "우드톤 인테리어에 어울리는 꽃",
+    "내추럴한 분위기의 밝고 경쾌한 꽃다발",
+    "생일인데 우드톤 거실에 둘 꽃",
+    "MINIMAL WHITE 인테리어",
+    "그냥 꽃 추천해주세요",
+]
+
+
+def load_stories() -> List[str]:
+    stories = []
+    with open("data/sample_stories.json", "r", encoding="utf-8") as f:
+        stories.extend(story["story"] for story in json.load(f)["sample_stories"])
+    with open("data/stories.json", "r", encoding="utf-8") as f:
+        stories.extend(story["original_story"] for story in json.load(f).values() if story.get("original_story"))
+    return stories + EDGE_CASE_STORIES
+
+
+def legacy_rule_confidence(story: str) -> float:
+    return 0.95 if any(keyword in story for keyword in LEGACY_FORCED_KEYWORDS) else 0.6
+
+
+def legacy_fallback_story_type(story: str) -> str:
+    story_lower = story.lower()
+    design_score = sum(1 for keyword in LEGACY_DESIGN_KEYWORDS if keyword in story_lower)
+    emotion_score = sum(1 for keyword in LEGACY_EMOTION_KEYWORDS if keyword in story_lower)
+    occasion_score = sum(1 for keyword in LEGACY_OCCASION_KEYWORDS if keyword in story_lower)
+    if any(keyword in story_lower for keyword in LEGACY_EMOTION_FORCED_KEYWORDS):
+        return "emotion_focused"
+    if design_score > 0:
+        return "design_focused"
+    if emotion_score > design_score and emotion_score > occasion_score:
+        return "emotion_focused"
+    if occasion_score > 0:
+        return "occasion_focused"
+    return "emotion_focused"
+
+
+def legacy_llm_story_type(story: str, llm_story_type: str) -> str:
+    """LLM 분류 결과에 기존 강제 분류 규칙 적용"""
+    if any(keyword in story for keyword in LEGACY_EMOTION_FORCED_KEYWORDS):
+        return "emotion_focused"
+    if any(keyword in story for keyword in LEGACY_DESIGN_FORCED_KEYWORDS):
+        return "design_focused"
+    return llm_story_type
+
+
+def llm_response(story_type: str) -> str:
+    return json.dumps({"story_type": story_type, "primary_focus": "테스트", "confidence": 0.9}, ensure_ascii=False)
+
+
+@contextlib.contextmanager
+def stubbed_llm(story_type: str):
+    """LLM 호출을 고정 응답으로 대체 (라우터는 항상 LLM 사용)"""
+    module = story_classifier_module
+    originals = (module.get_openai_client, module.llm_cache.chat_completion, module.model_router.route)
+
+    def chat_completion(client, call_site, **params):
+        return llm_response(story_type)
+
+    module.get_openai_client = lambda api_key: object()
+    module.llm_cache.chat_completion = chat_completion
+    module.model_router.route = lambda task, story="", rule_confidence=None: SimpleNamespace(skip_llm=False, params=lambda: {})
+    try:
+        yield
+    finally:
+        module.get_openai_client = originals[0]
+        module.llm_cache.chat_completion = originals[1]
+        module.model_router.route = originals[2]
+
+
+def main() -> int:
+    stories = load_stories()
+    classifier = StoryClassifier()
+    classifier.openai_api_key = classifier.openai_api_key or "test-key"
+    mismatches: Dict[str, List[Any]] = {"rule_confidence": [], "fallback": [], "llm": []}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for story in stories:
+            if classifier._rule_confidence(story) != legacy_rule_confidence(story):
+                mismatches["rule_confidence"].append(story)
+            if classifier._fallback_classification(story)["story_type"] != legacy_fallback_story_type(story):
+                mismatches["fallback"].append(story)
+
+        for story_type in StoryType:
+            with stubbed_llm(story_type.value):
+                for story in stories:
+                    result = classifier.classify_story(story)
+                    expected = legacy_llm_story_type(story, story_type.value)
+                    # LLM 응답을 버리고 폴백으로 빠지면 (confidence 가 폴백 값) 불일치
+                    if result["story_type"] != expected or result.get("confidence") != 0.9:
+                        mismatches["llm"].append((story_type.value, story, result["story_type"], expected))
+
+    total = sum(len(items) for items in mismatches.values())
+    for name, items in mismatches.items():
+        status = "✅" if not items else "❌"
+        print(f"{status} {name}: 사연 {len(stories)}개 중 불일치 {len(items)}개")
+        for item in items[:5]:
+            print(f"   - {item!r}")
+    return 1 if total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+꽃 카탈로그 컴파일
+- data/flower_dictionary.json 의 깨진 인코딩 복구 + 색상 / 계절 정규화 + 검증 보고서 출력
+- 복구된 카탈로그를 아티팩트(data/flower_catalog.bin)로 저장 (앱은 원본 해시가 같을 때 아티팩트를 바로 로드)
+- 로드 시간 (기존 JSON 로드 / JSON + 복구 / 아티팩트) 과 메모리 (dict 레코드 vs FlowerRecord) 비교
+- --fix-source 면 복구된 내용으로 원본 JSON 도 다시 저장 (백업 생성)
+
+사용법:
+    python scripts/compile_flower_catalog.py
+    python scripts/compile_flower_catalog.py --fix-source
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import contextlib
+import tracemalloc
+from datetime import datetime
+from types import MappingProxyType
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import get_settings
+from app.services.flower_catalog import FLOWER_DICTIONARY_PATH, FlowerCatalog
+from app.services.flower_catalog_compiler import (
+    compile_flowers, format_compile_report, read_catalog_artifact, source_digest, write_catalog_artifact
+)
+
+
+def median_ms(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def traced_kb(func) -> float:
+    """func 결과가 붙잡고 있는 메모리 (KB)"""
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 1024
+
+
+def load_json_flowers(path: str):
+    """기존 방식: JSON 로드 + 레코드별 dict 복사 + 읽기 전용 뷰"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    flowers = data["flowers"] if "flowers" in data else data
+    return {flower_id: MappingProxyType(dict(record)) for flower_id, record in flowers.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="꽃 카탈로그 컴파일 (인코딩 복구 + 아티팩트)")
+    parser.add_argument("--source", default=FLOWER_DICTIONARY_PATH)
+    parser.add_argument("--output", default=get_settings().flower_catalog_artifact_path or "data/flower_catalog.bin")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--fix-source", action="store_true", help="복구된 내용으로 원본 JSON 다시 저장 (백업 생성)")
+    args = parser.parse_args()
+
+    with open(args.source, "rb") as f:
+        raw = f.read()
+    data = json.loads(raw.decode("utf-8"))
+    flowers, report = compile_flowers(data["flowers"] if "flowers" in data else data)
+    for line in format_compile_report(report):
+        print(line)
+
+    catalog = FlowerCatalog(flowers, source=args.source)
+    size = write_catalog_artifact(args.output, catalog, source_digest(raw), report)
+    print(f"\n📦 아티팩트: {args.output} ({size / 1024:.1f}KB, 원본 JSON {len(raw) / 1024:.1f}KB, "
+          f"{len(catalog)}개 꽃, version={catalog.version})")
+
+    # 아티팩트 검증 (복구된 레코드와 같은지)
+    header, records = read_catalog_artifact(args.output)
+    mismatches = [flower_id for flower_id, record in flowers.items() if dict(records.get(flower_id, {})) != record]
+    if list(records) != list(flowers) or mismatches or header["catalog_version"] != catalog.version:
+        print(f"❌ 아티팩트 검증 실패: {mismatches[:5]}")
+        return 1
+    print("✅ 아티팩트 검증: 복구된 레코드와 동일")
+
+    print(f"\n⏱️ 로드 시간 (중앙값, {args.repeat}회)")
+    print(f"   - 기존 JSON 로드 (복구 없음): {median_ms(lambda: load_json_flowers(args.source), args.repeat):.2f}ms")
+    print(f"   - JSON + 복구 + 정규화:      {median_ms(lambda: FlowerCatalog.from_file(args.source, artifact_path=''), args.repeat):.2f}ms")
+    print(f"   - 아티팩트:                  {median_ms(lambda: FlowerCatalog.from_file(args.source, artifact_path=args.output), args.repeat):.2f}ms")
+
+    print("\n🧠 레코드 메모리")
+    print(f"   - 기존 dict 레코드:   {traced_kb(lambda: load_json_flowers(args.source)):.1f}KB")
+    print(f"   - FlowerRecord (슬롯): {traced_kb(lambda: read_catalog_artifact(args.output)):.1f}KB")
+
+    if args.fix_source:
+        backup = f"{args.source}.backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        with open(backup, "wb") as f:
+            f.write(raw)
+        data["flowers"] = flowers
+        with open(args.source, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 원본 JSON 복구 저장: {args.source} (백업: {backup}) - 아티팩트를 다시 만들려면 한 번 더 실행")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+로컬 감정 분류기 평가 (보류 세트에서 LLM 감정 블렌드와의 일치도)
+- story_id 해시로 나눈 보류 세트의 LLM 결과를 정답으로 비교 (emotion_source 가 llm 인 사연만)
+  · 1위 감정 일치율
+  · 상위 3개 감정 겹침 (0~1)
+  · 블렌드 거리 (비율 분포의 total variation, 0 = 동일)
+- 신뢰도 임계값별로 로컬 처리 비율(= LLM 생략 비율)과 그 안에서의 일치율 출력
+- 비교용으로 규칙 기반 폴백(_fallback_analysis)의 같은 지표도 출력
+
+사용법:
+    python scripts/evaluate_emotion_classifier.py                  # 학습 세트로 새로 학습해서 평가
+    python scripts/evaluate_emotion_classifier.py --model data/models/emotion_classifier.npz
+"""
+
+import os
+import sys
+import argparse
+import statistics
+from typing import Dict, List, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import get_settings
+from app.services.emotion_analyzer import EmotionAnalyzer
+from app.services.local_emotion_classifier import (
+    STORIES_PATH, LocalEmotionClassifier, load_logged_samples, fetch_supabase_samples, merge_samples,
+    split_holdout, train_classifier,
+)
+
+THRESHOLDS = (0.0, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8)
+
+
+def compare(predicted: Sequence[Tuple[str, float]], expected: Dict[str, float]) -> Dict[str, float]:
+    """예측 블렌드 vs LLM 블렌드"""
+    expected_top = sorted(expected, key=expected.get, reverse=True)
+    predicted_names = [emotion for emotion, _ in predicted]
+    predicted_dist = {emotion: percentage / 100 for emotion, percentage in predicted}
+    expected_total = sum(expected.values()) or 1.0
+    expected_dist = {emotion: percentage / expected_total for emotion, percentage in expected.items()}
+    emotions = set(predicted_dist) | set(expected_dist)
+    return {
+        "top1": float(bool(predicted_names) and predicted_names[0] == expected_top[0]),
+        "overlap": len(set(predicted_names[:3]) & set(expected_top[:3])) / 3,
+        "distance": sum(abs(predicted_dist.get(e, 0.0) - expected_dist.get(e, 0.0)) for e in emotions) / 2,
+    }
+
+
+def summarize(rows: List[Dict[str, float]]) -> str:
+    if not rows:
+        return "n=0"
+    return (f"n={len(rows):4d}  1위 일치 {statistics.mean(r['top1'] for r in rows):.1%}  "
+            f"상위3 겹침 {statistics.mean(r['overlap'] for r in rows):.2f}  "
+            f"블렌드 거리 {statistics.mean(r['distance'] for r in rows):.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 감정 분류기 평가")
+    parser.add_argument("--stories", default=STORIES_PATH, help="로컬 스토리 백업 파일")
+    parser.add_argument("--include-supabase", action="store_true", help="Supabase stories 테이블도 사용")
+    parser.add_argument("--holdout-percent", type=int, default=20, help="보류 세트 비율 (학습 스크립트와 같게)")
+    parser.add_argument("--model", help="평가할 모델 파일 (없으면 학습 세트로 새로 학습)")
+    args = parser.parse_args()
+
+    samples = merge_samples(
+        load_logged_samples(args.stories),
+        fetch_supabase_samples() if args.include_supabase else [],
+    )
+    train, holdout = split_holdout(samples, args.holdout_percent)
+    if not holdout:
+        print("❌ 보류 세트가 비어 있습니다 (--holdout-percent 확인)")
+        sys.exit(1)
+
+    if args.model:
+        classifier = LocalEmotionClassifier.load(args.model)
+        if classifier.meta.get("holdout_percent") != args.holdout_percent:
+            print(f"⚠️ 모델 학습 시 보류 비율({classifier.meta.get('holdout_percent')})과 다릅니다 - "
+                  f"보류 세트 일부가 학습에 쓰였을 수 있습니다")
+    else:
+        classifier = train_classifier(train)
+    print(f"📚 학습 {len(train)}개 / 보류 {len(holdout)}개, 모델: {classifier.meta}")
+
+    predictions = [(classifier.predict(sample.story), sample) for sample in holdout]
+    rows = [(prediction.confidence, compare(prediction.blend, sample.blend)) for prediction, sample in predictions]
+
+    analyzer = EmotionAnalyzer()
+    fallback_rows = [
+        compare([(e.emotion, e.percentage) for e in analyzer._fallback_analysis(sample.story)], sample.blend)
+        for sample in holdout
+    ]
+
+    print()
+    print(f"로컬 분류기 (전체)   {summarize([row for _, row in rows])}")
+    print(f"규칙 기반 폴백       {summarize(fallback_rows)}")
+    print()
+    print("임계값별 (로컬 처리 = LLM 생략)")
+    current = get_settings().emotion_classifier_threshold
+    for threshold in sorted(set(THRESHOLDS) | {current}):
+        covered = [row for confidence, row in rows if confidence >= threshold]
+        marker = "  ← 현재 설정" if threshold == current else ""
+        print(f"  ≥ {threshold:.2f}  로컬 처리 {len(covered) / len(rows):6.1%}  {summarize(covered)}{marker}")
+
+
+if __name__ == "__main__":
+    main()
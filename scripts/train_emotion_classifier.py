@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+로컬 감정 분류기 학습
+- data/stories.json (+ --include-supabase 면 Supabase stories 테이블) 의 사연과
+  당시 LLM 감정 블렌드를 정답으로 글자 n-gram 선형 모델 학습
+- emotion_source 가 llm 인 사연만 사용 (규칙 기반 폴백 / 로컬 분류기 예측 / 출처 미상 사연 제외)
+- 기본으로 story_id 해시 기준 20% 는 평가용으로 남겨두고 학습
+  (scripts/evaluate_emotion_classifier.py --model 로 같은 보류 세트에서 평가 가능)
+
+사용법:
+    python scripts/train_emotion_classifier.py
+    python scripts/train_emotion_classifier.py --include-supabase --holdout-percent 0
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import get_settings
+from app.services.local_emotion_classifier import (
+    STORIES_PATH, load_logged_samples, fetch_supabase_samples, merge_samples, split_holdout, train_classifier,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 감정 분류기 학습")
+    parser.add_argument("--stories", default=STORIES_PATH, help="로컬 스토리 백업 파일")
+    parser.add_argument("--include-supabase", action="store_true", help="Supabase stories 테이블도 학습에 사용")
+    parser.add_argument("--holdout-percent", type=int, default=20, help="평가용으로 제외할 비율 (0 이면 전체 학습)")
+    parser.add_argument("--output", default=get_settings().emotion_classifier_path, help="모델 저장 경로")
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--learning-rate", type=float, default=0.1)
+    parser.add_argument("--l2", type=float, default=1e-4)
+    parser.add_argument("--min-feature-count", type=int, default=2)
+    args = parser.parse_args()
+
+    samples = merge_samples(
+        load_logged_samples(args.stories),
+        fetch_supabase_samples() if args.include_supabase else [],
+    )
+    train, holdout = split_holdout(samples, args.holdout_percent)
+    print(f"📚 사연 {len(samples)}개 (학습 {len(train)}개, 보류 {len(holdout)}개)")
+    if not train:
+        print("❌ 학습할 사연이 없습니다 (LLM 출처로 저장된 사연이 필요)")
+        sys.exit(1)
+
+    start_time = time.time()
+    classifier = train_classifier(
+        train,
+        min_feature_count=args.min_feature_count,
+        epochs=args.epochs,
+        learning_rate=args.learning_rate,
+        l2=args.l2,
+    )
+    classifier.meta["holdout_percent"] = args.holdout_percent
+    classifier.save(args.output)
+
+    print(f"✅ 학습 완료 ({time.time() - start_time:.1f}s): {classifier.meta}")
+    print(f"💾 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()